@@ -44,7 +44,7 @@ class AdminService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "updated_at"]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，使用关系映射加载AdminGroup
             query = select(AdminAdmin).options(
                 load_only(
@@ -14,6 +14,7 @@ from Modules.admin.models.admin_admin import AdminAdmin
 from Modules.admin.models.admin_group import AdminGroup
 from Modules.admin.models.admin_rule import AdminRule
 from Modules.common.libs.auth.auth_helper import AuthHelper
+from Modules.common.libs.cache import cached
 from Modules.common.libs.captcha import captcha_service
 from Modules.common.libs.database.sql.session import get_async_session
 from Modules.common.libs.jwt import get_jwt_service
@@ -379,40 +380,55 @@ class AuthService:
                 else:
                     return error("未分配权限组")
 
-                # 获取用户可访问的菜单规则
-                accessible_rule_ids = set()
-                if group and group.rules:
-                    # 解析组规则ID
-                    rule_ids = [
-                        int(rule_id)
-                        for rule_id in group.rules.split("|")
-                        if rule_id.isdigit()
-                    ]
-                    accessible_rule_ids.update(rule_ids)
-
-                # 查询所有菜单规则
-                rule_stmt = select(AdminRule).where(
-                    AdminRule.status == 1,
-                )
-                if group.id != 1:
-                    rule_stmt = rule_stmt.where(AdminRule.id.in_(accessible_rule_ids))  # type: ignore
-
-                rule_stmt = rule_stmt.order_by(
-                    AdminRule.sort.asc(),  # type: ignore
-                )
-
-                rule_result = await session.execute(rule_stmt)
-                all_rules = rule_result.scalars().all()
+                group_id, group_rules = group.id, group.rules or ""
 
-                # 构建菜单树
-                menu_tree = self._build_menu_tree(all_rules)
+            # 构建菜单树（按权限组缓存，规则变更后失效）
+            menu_tree = await self._load_menu_tree(group_id, group_rules)
 
-                return success(menu_tree, "获取菜单树成功")
+            return success(menu_tree, "获取菜单树成功")
 
         except Exception as e:
             logger.error(f"获取菜单树失败: {e}")
             return error("获取菜单树失败，请稍后重试")
 
+    @cached(
+        ttl=3600,
+        key="admin_rule:menu_tree:{group_id}:{rules}",
+        tags=["admin_rule"],
+    )
+    async def _load_menu_tree(self, group_id: int, rules: str) -> list[dict[str, Any]]:
+        """
+        查询权限组可访问的菜单规则并构建菜单树（带缓存）
+
+        缓存键包含权限组的规则串，权限组调整规则后自动使用新的缓存键。
+
+        Args:
+            group_id: 权限组ID（1 为超级管理员，拥有全部菜单）
+            rules: 权限组规则ID串，如 "1|2|3"
+
+        Returns:
+            List[Dict[str, Any]]: 菜单树
+        """
+        # 解析组规则ID
+        accessible_rule_ids = {
+            int(rule_id) for rule_id in rules.split("|") if rule_id.isdigit()
+        }
+
+        async with get_async_session() as session:
+            # 查询所有菜单规则
+            rule_stmt = select(AdminRule).where(
+                AdminRule.status == 1,
+            )
+            if group_id != 1:
+                rule_stmt = rule_stmt.where(AdminRule.id.in_(accessible_rule_ids))  # type: ignore
+
+            rule_stmt = rule_stmt.order_by(
+                AdminRule.sort.asc(),  # type: ignore
+            )
+
+            rule_result = await session.execute(rule_stmt)
+            return self._build_menu_tree(rule_result.scalars().all())
+
     def _build_menu_tree(self, rules: Sequence[AdminRule]) -> list[dict[str, Any]]:
         """
         构建菜单树
@@ -28,7 +28,7 @@ class GroupService(BaseService):
         """获取角色列表"""
         # 精确匹配字段字典
         data["exact_fields"] = ["status"]
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             query = select(AdminGroup.id, AdminGroup.name)
             query = await self.apply_search_filters(query, AdminGroup, data)
             result = await session.execute(query)
@@ -47,7 +47,7 @@ class GroupService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "updated_at"]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，使用关系映射加载AdminGroup
             query = select(AdminGroup)
             # 搜索
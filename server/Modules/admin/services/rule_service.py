@@ -18,6 +18,9 @@ from Modules.common.services.base_service import BaseService
 class RuleService(BaseService):
     """Admin菜单服务 - 负责菜单相关的业务逻辑"""
 
+    # 菜单增删改后失效各权限组的菜单树缓存
+    cache_tags = ("admin_rule",)
+
     def __init__(self):
         super().__init__()
 
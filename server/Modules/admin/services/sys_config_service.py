@@ -10,7 +10,7 @@ from sqlmodel import select
 
 from Modules.admin.models.admin_sys_config import AdminSysConfig
 from Modules.admin.models.admin_upload import AdminUpload
-from Modules.common.libs.cache import get_async_cache_service
+from Modules.common.libs.cache import async_invalidate_tags, cached
 from Modules.common.libs.config.config import Config
 from Modules.common.libs.database.sql.session import get_async_session
 from Modules.common.libs.responses.response import error, success
@@ -22,50 +22,41 @@ from Modules.common.utils.url_helper import get_base_url
 class SysConfigService(BaseService):
     """系统配置服务 - 负责系统配置相关的业务逻辑"""
 
+    @cached(
+        ttl=3600,
+        key="sys_config:group:{group_code}",
+        tags=["sys_config:{group_code}"],
+    )
     async def get_config_by_group(
-        self, group_code: str, request: Request | None = None, ttl: int = 3600
+        self, group_code: str, request: Request | None = None
     ) -> dict:
         """
-        根据分组代码获取配置（带缓存）
+        根据分组代码获取配置（带缓存，同一分组并发未命中时只查询一次数据库）
 
         Args:
             group_code: 配置分组代码
-            ttl: 缓存过期时间（秒），默认为 3600 秒（1 小时）
 
         Returns:
             配置字典，键为 config_key，值为转换后的配置值
         """
-        cache_key = f"sys_config:group:{group_code}"
-        cache = get_async_cache_service()
-
-        # 定义异步工厂函数
-        async def load_config():
-            return await self._load_config_from_db(group_code, request)
-
-        # 使用 get_or_set 方法实现缓存逻辑
-        return await cache.get_or_set(cache_key, load_config, ttl=ttl)
+        return await self._load_config_from_db(group_code, request)
 
     async def set_config_by_group(
-        self, group_code: str, request: Request | None = None, ttl: int = 3600
+        self, group_code: str, request: Request | None = None
     ) -> bool:
         """
-        手动设置配置到缓存（用于预热缓存或刷新缓存）
+        刷新指定分组的配置缓存（用于预热缓存或刷新缓存）
 
         Args:
             group_code: 配置分组代码
-            ttl: 缓存过期时间（秒），默认为 3600 秒（1 小时）
 
         Returns:
-            是否设置成功
+            是否刷新成功
         """
-        cache_key = f"sys_config:group:{group_code}"
-        cache = get_async_cache_service()
-
-        # 从数据库加载配置
-        config_data = await self._load_config_from_db(group_code, request)
-
-        # 设置到缓存
-        return await cache.set(cache_key, config_data, ttl=ttl)
+        if not await self.clear_config_cache(group_code):
+            return False
+        await self.get_config_by_group(group_code, request)
+        return True
 
     async def clear_config_cache(self, group_code: str) -> bool:
         """
@@ -77,10 +68,7 @@ class SysConfigService(BaseService):
         Returns:
             是否清除成功
         """
-        cache_key = f"sys_config:group:{group_code}"
-        cache = get_async_cache_service()
-
-        return await cache.delete(cache_key)
+        return await async_invalidate_tags(f"sys_config:{group_code}")
 
     async def _load_config_from_db(
         self, group_code: str, request: Request | None = None
@@ -132,7 +132,7 @@ class UploadService(BaseService):
         data["range_fields"] = ["created_at"]
         base_url = get_base_url(request)
         url_prefix = Config.get("upload.url_prefix", "/uploads").lstrip("/")
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，使用关系映射加载AdminUpload
             query = select(AdminUpload)
             # 搜索
@@ -10,6 +10,7 @@ from .cache import (
     AsyncCacheService,
     SyncCacheService,
     # 异步便捷函数
+    async_cache_acquire_lock,
     async_cache_clear,
     async_cache_decrement,
     async_cache_delete,
@@ -19,15 +20,19 @@ from .cache import (
     async_cache_get,
     async_cache_get_many,
     async_cache_get_or_set,
+    async_cache_hit_sliding_window,
     async_cache_increment,
     async_cache_keys,
+    async_cache_release_lock,
     async_cache_set,
     async_cache_set_many,
+    async_cache_setnx,
     async_cache_ttl,
     # 服务获取函数
     get_async_cache_service,
     get_sync_cache_service,
     # 同步便捷函数
+    sync_cache_acquire_lock,
     sync_cache_clear,
     sync_cache_decrement,
     sync_cache_delete,
@@ -37,19 +42,44 @@ from .cache import (
     sync_cache_get,
     sync_cache_get_many,
     sync_cache_get_or_set,
+    sync_cache_hit_sliding_window,
     sync_cache_increment,
     sync_cache_keys,
+    sync_cache_release_lock,
     sync_cache_set,
     sync_cache_set_many,
     sync_cache_setnx,
     sync_cache_ttl,
 )
+from .codec import CacheCodec, CacheSerializer, register_codec
+from .decorators import async_invalidate_tags, cached, invalidate_tags
+from .local_cache import (
+    CacheInvalidationListener,
+    LocalCache,
+    get_local_cache,
+)
+from .pipeline import AsyncCachePipeline, SyncCachePipeline
 
 # 导出主要接口
 __all__ = [
     # 服务类
     "SyncCacheService",
     "AsyncCacheService",
+    # 缓存管道
+    "SyncCachePipeline",
+    "AsyncCachePipeline",
+    # 缓存装饰器
+    "cached",
+    "invalidate_tags",
+    "async_invalidate_tags",
+    # 序列化
+    "CacheSerializer",
+    "CacheCodec",
+    "register_codec",
+    # 本地缓存（L1）
+    "LocalCache",
+    "CacheInvalidationListener",
+    "get_local_cache",
     # 服务获取函数
     "get_sync_cache_service",
     "get_async_cache_service",
@@ -66,12 +96,16 @@ __all__ = [
     "sync_cache_delete_many",
     "sync_cache_increment",
     "sync_cache_decrement",
+    "sync_cache_acquire_lock",
+    "sync_cache_release_lock",
+    "sync_cache_hit_sliding_window",
     "sync_cache_clear",
     "sync_cache_keys",
     "sync_cache_get_or_set",
     # 异步便捷函数
     "async_cache_get",
     "async_cache_set",
+    "async_cache_setnx",
     "async_cache_delete",
     "async_cache_exists",
     "async_cache_expire",
@@ -81,6 +115,9 @@ __all__ = [
     "async_cache_delete_many",
     "async_cache_increment",
     "async_cache_decrement",
+    "async_cache_acquire_lock",
+    "async_cache_release_lock",
+    "async_cache_hit_sliding_window",
     "async_cache_clear",
     "async_cache_keys",
     "async_cache_get_or_set",
@@ -6,14 +6,62 @@
 """
 
 import asyncio
-import json
-from collections.abc import Callable
+import math
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
 from typing import Any
 
 from loguru import logger
+from redis.asyncio.cluster import RedisCluster as AsyncRedisCluster
+from redis.cluster import RedisCluster
 
 from ..config import Config
-from ..database.redis.client import get_async_redis_client, get_redis_client
+from ..database.redis.circuit_breaker import (
+    AsyncGuardedRedis,
+    CircuitBreaker,
+    GuardedRedis,
+    get_circuit_breaker,
+)
+from ..database.redis.client import (
+    get_async_redis_client,
+    get_redis_client,
+    get_redis_script,
+)
+from ..database.redis.scripts import (
+    SCRIPT_INCR_WITH_TTL,
+    SCRIPT_LOCK_ACQUIRE,
+    SCRIPT_LOCK_RELEASE,
+    SCRIPT_SLIDING_WINDOW,
+)
+from .codec import CacheSerializer
+from .fallback import (
+    AsyncFallbackClient,
+    FallbackStore,
+    get_fallback_store,
+)
+from .local_cache import (
+    CacheInvalidationListener,
+    LocalCache,
+    get_invalidation_listener,
+    get_local_cache,
+)
+from .pipeline import AsyncCachePipeline, SyncCachePipeline
+from .single_flight import AsyncSingleFlight, SyncSingleFlight
+
+
+def _clear_fallback_on_recovery(old_state: str, new_state: str) -> None:
+    """熔断关闭（Redis 恢复）后清空降级数据，避免下次熔断时读到过期数据"""
+    if new_state == CircuitBreaker.CLOSED:
+        get_fallback_store().clear()
+
+
+# 防击穿锁轮询间隔（秒）
+_LOCK_POLL_INTERVAL = 0.05
+
+# 栅栏计数键比锁多保留的时间（秒），每次加锁时续期，长期不用的锁名不会残留计数键
+_LOCK_FENCE_EXTRA_TTL = 86400
 
 
 class _BaseCacheService:
@@ -30,7 +78,20 @@ class _BaseCacheService:
         self._config_loaded = False
         self._default_ttl: int = 3600
         self._key_prefix: str = ""
+        self._scan_count: int = 1000
         self._connection_name: str = "cache"
+        self._invalidation_channel: str = "cache:invalidate"
+        self._local_cache: LocalCache | None = None
+        self._invalidation_listener: CacheInvalidationListener | None = None
+        self._serializer = CacheSerializer()
+        self._breaker: CircuitBreaker | None = None
+        self._fallback_store: FallbackStore | None = None
+        self._read_from_replicas = False
+        self._redis_client: Any = None
+        self._replica_client: Any = None
+        self._replica_breaker: CircuitBreaker | None = None
+        # 集群模式：管道不支持 PUBLISH 和多键 DEL
+        self._cluster = False
 
     def _init_config(self) -> None:
         """初始化配置"""
@@ -38,12 +99,294 @@ class _BaseCacheService:
             try:
                 self._default_ttl = Config.get("cache.default_ttl", 3600)
                 self._key_prefix = Config.get("cache.key_prefix", "")
+                self._scan_count = Config.get("cache.scan_count", 1000)
                 self._connection_name = Config.get("cache.connection", "cache")
+                self._invalidation_channel = Config.get(
+                    "cache.invalidation_channel", "cache:invalidate"
+                )
+                self._serializer = CacheSerializer(
+                    codec=Config.get("cache.serializer", "orjson"),
+                    compression=Config.get("cache.compression", "zlib"),
+                    compress_threshold=Config.get("cache.compress_threshold", 1024),
+                    namespace_codecs=Config.get("cache.namespace_serializers", {}),
+                )
+                self._read_from_replicas = Config.get("cache.read_from_replicas", False)
+                if Config.get("cache.local_enabled", False):
+                    self._init_local_cache()
+                if Config.get("cache.breaker_enabled", True):
+                    self._init_circuit_breaker()
                 self._config_loaded = True
             except Exception as e:
                 logger.error(f"缓存配置加载失败 - error: {e}")
                 raise ValueError("缓存配置加载失败") from e
 
+    def _init_local_cache(self) -> None:
+        """初始化本地缓存（L1）和失效订阅器"""
+        connection_name = self._connection_name
+        self._local_cache = get_local_cache(
+            max_size=Config.get("cache.local_max_size", 10000),
+            default_ttl=Config.get("cache.local_ttl", 60),
+            prefixes=Config.get("cache.local_prefixes", []),
+        )
+        self._invalidation_listener = get_invalidation_listener(
+            lambda: get_redis_client(connection_name), self._invalidation_channel
+        )
+
+    def _init_circuit_breaker(self) -> None:
+        """初始化 Redis 熔断器和降级存储"""
+        self._breaker = get_circuit_breaker(
+            self._connection_name,
+            failure_threshold=Config.get("cache.breaker_failure_threshold", 5),
+            recovery_timeout=Config.get("cache.breaker_recovery_timeout", 30),
+        )
+        self._fallback_store = get_fallback_store(
+            Config.get("cache.fallback_max_size", 10000)
+        )
+        self._breaker.add_listener(_clear_fallback_on_recovery)
+
+    def _use_fallback(self) -> bool:
+        """熔断打开（或半开且探测名额已用完）时使用降级存储"""
+        return self._breaker is not None and not self._breaker.allow_request()
+
+    def _setup_clients(self, client: Any, replica: Any, guard_class: type) -> None:
+        """
+        记录主节点 / 从节点客户端，启用熔断器时分别包装
+
+        从节点使用独立的熔断器，从节点故障时只读命令回退到主节点，不影响写入。
+
+        Args:
+            client: 主节点客户端
+            replica: 从节点客户端（与主节点相同表示没有从节点）
+            guard_class: 熔断包装类（GuardedRedis / AsyncGuardedRedis）
+        """
+        if replica is client:
+            replica = None
+        self._cluster = isinstance(client, (RedisCluster, AsyncRedisCluster))
+        if self._breaker is not None:
+            client = guard_class(client, self._breaker)
+            if replica is not None:
+                self._replica_breaker = get_circuit_breaker(
+                    f"{self._connection_name}:replica",
+                    failure_threshold=self._breaker.failure_threshold,
+                    recovery_timeout=self._breaker.recovery_timeout,
+                )
+                replica = guard_class(replica, self._replica_breaker)
+        self._replica_client = replica
+        self._redis_client = client
+
+    def _select_read_client(self, client: Any) -> Any:
+        """
+        选择只读命令（get / get_many / exists / ttl）使用的客户端
+
+        Args:
+            client: 当前可用的主节点客户端（熔断时为降级存储）
+
+        Returns:
+            从节点可用时返回从节点客户端，否则返回传入的客户端
+        """
+        if self._replica_client is None or client is not self._redis_client:
+            return client
+        if (
+            self._replica_breaker is not None
+            and not self._replica_breaker.allow_request()
+        ):
+            return client
+        return self._replica_client
+
+    @staticmethod
+    def _remaining_ttl(pttl: int) -> float | None:
+        """
+        Redis PTTL 结果转换为本地缓存的过期时间（秒）
+
+        Returns:
+            剩余过期时间，None 表示键没有过期时间（使用本地缓存的默认过期时间）
+        """
+        return None if pttl == -1 else pttl / 1000
+
+    @staticmethod
+    def _mget_method(client: Any) -> Callable:
+        """批量读取命令（集群模式下的键分布在不同槽位，使用非原子的 mget_nonatomic）"""
+        return getattr(client, "mget_nonatomic", None) or client.mget
+
+    def _get_local_cache(self, key: str) -> LocalCache | None:
+        """
+        获取可用于指定键的本地缓存
+
+        未启用、键前缀不匹配或失效订阅尚未建立时返回 None，此时直接访问 Redis。
+
+        Args:
+            key: 原始键名
+
+        Returns:
+            本地缓存实例或 None
+        """
+        if self._local_cache is None or self._invalidation_listener is None:
+            return None
+        self._invalidation_listener.ensure_started()
+        if not self._invalidation_listener.healthy:
+            return None
+        if not self._local_cache.accepts(key):
+            return None
+        return self._local_cache
+
+    def _local_invalidation_keys(self, keys: list[str] | None) -> list[str] | None:
+        """
+        筛选本地缓存中需要失效的键
+
+        Args:
+            keys: 原始键名列表，None 表示清空所有本地缓存
+
+        Returns:
+            需要失效的键（None 表示全部），空列表表示无需失效
+        """
+        if self._local_cache is None:
+            return []
+        if keys is None:
+            return None
+        return [key for key in keys if self._local_cache.accepts(key)]
+
+    def _build_invalidation(self, keys: list[str] | None) -> str | None:
+        """
+        构建失效消息（不修改本地缓存）
+
+        Args:
+            keys: 原始键名列表，None 表示清空所有本地缓存
+
+        Returns:
+            需要广播的失效消息，无需广播时返回 None
+        """
+        keys = self._local_invalidation_keys(keys)
+        if keys == []:
+            return None
+        return CacheInvalidationListener.build_message(keys)
+
+    def _clear_local(self, keys: list[str] | None) -> None:
+        """
+        清除本地缓存中的键（Redis 写入完成后调用，同时使进行中的回填作废）
+
+        Args:
+            keys: 原始键名列表，None 表示清空所有本地缓存
+        """
+        keys = self._local_invalidation_keys(keys)
+        if keys is None:
+            self._local_cache.clear()
+        elif keys:
+            self._local_cache.delete_many(keys)
+
+    def local_cache_stats(self) -> dict[str, Any]:
+        """
+        获取本地缓存统计信息（按键前缀统计命中 / 未命中）
+
+        Returns:
+            统计信息字典，未启用本地缓存时 enabled 为 False
+        """
+        self._init_config()
+        if self._local_cache is None:
+            return {"enabled": False}
+
+        return {
+            "enabled": True,
+            "listener_healthy": bool(
+                self._invalidation_listener and self._invalidation_listener.healthy
+            ),
+            **self._local_cache.stats(),
+        }
+
+    def circuit_breaker_stats(self) -> dict[str, Any]:
+        """
+        获取 Redis 熔断器状态（用于监控）
+
+        Returns:
+            状态信息字典，未启用熔断器时 enabled 为 False
+        """
+        self._init_config()
+        if self._breaker is None:
+            return {"enabled": False}
+
+        stats = {
+            "enabled": True,
+            **self._breaker.stats(),
+            "fallback_size": len(self._fallback_store),
+        }
+        if self._replica_breaker is not None:
+            stats["replica"] = self._replica_breaker.stats()
+        return stats
+
+    def _lock_keys(self, key: str) -> tuple[str, str]:
+        """
+        分布式锁的锁键和栅栏计数键
+
+        两个键使用相同的哈希标签，集群模式下位于同一槽位，可以在同一个脚本中访问。
+        """
+        tag = "{" + self._build_key(key) + "}"
+        return tag, f"{tag}:fence"
+
+    @staticmethod
+    def _lock_args(owner: str, ttl: float) -> list[Any]:
+        """加锁脚本参数：持有者、锁过期时间（毫秒）、栅栏计数键过期时间（毫秒，长于锁）"""
+        ttl_ms = max(1, int(ttl * 1000))
+        return [owner, ttl_ms, ttl_ms + _LOCK_FENCE_EXTRA_TTL * 1000]
+
+    @staticmethod
+    def _sliding_window_args(limit: int, window: float) -> list[Any]:
+        """滑动窗口脚本参数：当前时间（毫秒）、窗口长度（毫秒）、允许次数、本次请求的唯一成员"""
+        now_ms = int(time.time() * 1000)
+        return [
+            now_ms,
+            max(1, int(window * 1000)),
+            limit,
+            f"{now_ms}-{uuid.uuid4().hex}",
+        ]
+
+    @staticmethod
+    def _meta_key(key: str) -> str:
+        """get_or_set 提前刷新使用的元数据键（记录计算耗时和过期时间）"""
+        return f"{key}:__meta__"
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        """get_or_set 跨进程防击穿锁的键"""
+        return f"{key}:__lock__"
+
+    @staticmethod
+    def _build_meta(delta: float, ttl: int) -> dict[str, float]:
+        """
+        构建提前刷新元数据
+
+        Args:
+            delta: 工厂函数计算耗时（秒）
+            ttl: 缓存过期时间（秒）
+
+        Returns:
+            元数据字典
+        """
+        return {"delta": round(delta, 6), "expire_at": time.time() + ttl}
+
+    @staticmethod
+    def _should_refresh_early(meta: Any, beta: float | None) -> bool:
+        """
+        按 XFetch 算法判断是否需要提前重新计算
+
+        越接近过期、计算越耗时，提前刷新的概率越高：
+        now - delta * beta * ln(rand) >= expire_at
+
+        Args:
+            meta: 提前刷新元数据
+            beta: 提前刷新系数，None 表示不启用
+
+        Returns:
+            是否需要提前刷新
+        """
+        if beta is None or not isinstance(meta, dict):
+            return False
+        try:
+            delta = float(meta["delta"])
+            expire_at = float(meta["expire_at"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        # 1 - random() 的取值范围为 (0, 1]，避免 log(0)
+        return time.time() - delta * beta * math.log(1.0 - random.random()) >= expire_at
+
     def _build_key(self, key: str) -> str:
         """
         构建完整的缓存键
@@ -58,19 +401,34 @@ class _BaseCacheService:
             return f"{self._key_prefix}{key}"
         return key
 
-    def _serialize(self, value: Any) -> str:
+    def _strip_key(self, full_key: str | bytes) -> str:
+        """
+        将 Redis 返回的完整键名还原为原始键名
+
+        Args:
+            full_key: 带前缀的完整键名
+
+        Returns:
+            原始键名
+        """
+        if isinstance(full_key, bytes):
+            full_key = full_key.decode("utf-8")
+        if self._key_prefix:
+            return full_key[len(self._key_prefix) :]
+        return full_key
+
+    def _serialize(self, value: Any, key: str | None = None) -> bytes:
         """
         序列化值
 
         Args:
             value: 要序列化的值
+            key: 原始键名，用于按前缀选择序列化格式
 
         Returns:
-            序列化后的字符串
+            序列化后的字节串
         """
-        if isinstance(value, (str, int, float, bool)):
-            return str(value)
-        return json.dumps(value, ensure_ascii=False)
+        return self._serializer.dumps(value, key)
 
     def _deserialize(self, value: str | bytes | None) -> Any:
         """
@@ -82,18 +440,7 @@ class _BaseCacheService:
         Returns:
             反序列化后的值
         """
-        if value is None:
-            return None
-
-        if isinstance(value, bytes):
-            value = value.decode("utf-8")
-
-        # 尝试解析为 JSON
-        try:
-            return json.loads(value)
-        except (json.JSONDecodeError, TypeError):
-            # 如果不是 JSON，直接返回字符串
-            return value
+        return self._serializer.loads(value)
 
 
 class SyncCacheService(_BaseCacheService):
@@ -120,16 +467,85 @@ class SyncCacheService(_BaseCacheService):
         初始化同步缓存服务
         """
         super().__init__()
-        self._redis_client: Any = None
+        self._single_flight = SyncSingleFlight()
 
     def _get_redis_client(self) -> Any:
-        """获取 Redis 客户端（延迟初始化）"""
+        """获取 Redis 客户端（延迟初始化，熔断期间返回降级存储）"""
         if self._redis_client is None:
             self._init_config()
-            self._redis_client = get_redis_client(self._connection_name)
+            self._setup_clients(
+                get_redis_client(self._connection_name),
+                get_redis_client(
+                    self._connection_name, replica=self._read_from_replicas
+                ),
+                GuardedRedis,
+            )
 
+        if self._use_fallback():
+            return self._fallback_store
         return self._redis_client
 
+    def _get_read_client(self) -> Any:
+        """获取只读命令使用的客户端（启用 read_from_replicas 时优先使用从节点）"""
+        return self._select_read_client(self._get_redis_client())
+
+    def pipeline(self, transaction: bool = False) -> SyncCachePipeline:
+        """
+        创建缓存管道，多条命令合并为一次网络往返
+
+        Args:
+            transaction: 是否使用 MULTI/EXEC 事务包裹
+
+        Returns:
+            同步缓存管道
+
+        使用示例：
+            with cache.pipeline() as p:
+                p.set("a", 1).setnx("lock", "1", ttl=10).delete("b")
+            print(p.results)
+        """
+        client = self._get_redis_client()
+        return SyncCachePipeline(
+            self, client.pipeline(transaction=transaction), cluster=self._cluster
+        )
+
+    def _invalidate_local(self, keys: list[str] | None) -> None:
+        """
+        清除本地缓存并向其他进程广播失效消息
+
+        Args:
+            keys: 原始键名列表，None 表示清空所有本地缓存
+        """
+        self._clear_local(keys)
+        message = self._build_invalidation(keys)
+        if message is not None:
+            self._publish_invalidation(message)
+
+    def _publish_invalidation(self, message: str) -> None:
+        """向其他进程广播失效消息（失败只记录日志）"""
+        self.publish(self._invalidation_channel, message)
+
+    def publish(self, channel: str, message: str) -> bool:
+        """
+        通过受熔断保护的客户端发布消息（失败只记录日志）
+
+        Args:
+            channel: 频道名称
+            message: 消息内容
+
+        Returns:
+            是否发布成功
+        """
+        try:
+            client = self._get_redis_client()
+            client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"发布消息失败 - channel: {channel}, message: {message}, error: {e}"
+            )
+            return False
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         获取缓存值
@@ -142,10 +558,31 @@ class SyncCacheService(_BaseCacheService):
             缓存值或默认值
         """
         try:
-            client = self._get_redis_client()
+            client = self._get_read_client()
+            local = self._get_local_cache(key)
+            if local is not None:
+                hit, value = local.get(key)
+                if hit:
+                    return self._deserialize(value)
+                generation = local.generation
+
             full_key = self._build_key(key)
-            value = client.get(full_key)
-            return self._deserialize(value) if value is not None else default
+            if local is None:
+                value = client.get(full_key)
+            else:
+                # 同一次往返读取剩余过期时间，本地缓存不会比 Redis 中的值晚过期
+                pipe = client.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                value, pttl = pipe.execute()
+            if value is None:
+                return default
+
+            if local is not None:
+                local.set(
+                    key, value, ttl=self._remaining_ttl(pttl), generation=generation
+                )
+            return self._deserialize(value)
         except Exception as e:
             logger.error(f"获取缓存失败 - key: {key}, error: {e}")
             return default
@@ -165,12 +602,13 @@ class SyncCacheService(_BaseCacheService):
         try:
             client = self._get_redis_client()
             full_key = self._build_key(key)
-            serialized_value = self._serialize(value)
+            serialized_value = self._serialize(value, key)
 
             if ttl is None:
                 ttl = self._default_ttl
 
             client.setex(full_key, ttl, serialized_value)
+            self._invalidate_local([key])
             logger.debug(f"设置缓存成功 - key: {key}, ttl: {ttl}")
             return True
         except Exception as e:
@@ -192,16 +630,15 @@ class SyncCacheService(_BaseCacheService):
         try:
             client = self._get_redis_client()
             full_key = self._build_key(key)
-            serialized_value = self._serialize(value)
+            serialized_value = self._serialize(value, key)
 
             if ttl is None:
                 ttl = self._default_ttl
 
-            # 使用 setnx 实现原子性设置
-            result = client.setnx(full_key, serialized_value)
+            # 使用 SET NX EX 实现原子性设置（值和过期时间一次写入）
+            result = bool(client.set(full_key, serialized_value, nx=True, ex=ttl))
             if result:
-                # 设置成功，设置过期时间
-                client.expire(full_key, ttl)
+                self._invalidate_local([key])
                 logger.debug(f"原子设置缓存成功 - key: {key}, ttl: {ttl}")
             else:
                 logger.debug(f"键已存在，跳过设置 - key: {key}")
@@ -224,6 +661,7 @@ class SyncCacheService(_BaseCacheService):
             client = self._get_redis_client()
             full_key = self._build_key(key)
             client.delete(full_key)
+            self._invalidate_local([key])
             logger.debug(f"删除缓存成功 - key: {key}")
             return True
         except Exception as e:
@@ -241,7 +679,11 @@ class SyncCacheService(_BaseCacheService):
             缓存是否存在
         """
         try:
-            client = self._get_redis_client()
+            client = self._get_read_client()
+            local = self._get_local_cache(key)
+            if local is not None and local.get(key)[0]:
+                return True
+
             full_key = self._build_key(key)
             return bool(client.exists(full_key))
         except Exception as e:
@@ -263,6 +705,7 @@ class SyncCacheService(_BaseCacheService):
             client = self._get_redis_client()
             full_key = self._build_key(key)
             client.expire(full_key, ttl)
+            self._invalidate_local([key])
             logger.debug(f"设置缓存过期时间成功 - key: {key}, ttl: {ttl}")
             return True
         except Exception as e:
@@ -280,7 +723,7 @@ class SyncCacheService(_BaseCacheService):
             剩余过期时间（秒），-1 表示永不过期，-2 表示键不存在
         """
         try:
-            client = self._get_redis_client()
+            client = self._get_read_client()
             full_key = self._build_key(key)
             return client.ttl(full_key)
         except Exception as e:
@@ -298,14 +741,40 @@ class SyncCacheService(_BaseCacheService):
             缓存键值字典
         """
         try:
-            client = self._get_redis_client()
-            full_keys = [self._build_key(key) for key in keys]
-            values = client.mget(full_keys)
-
+            client = self._get_read_client()
             result = {}
-            for key, value in zip(keys, values, strict=True):
-                if value is not None:
-                    result[key] = self._deserialize(value)
+            missing_keys = []
+            generations = {}
+            for key in keys:
+                local = self._get_local_cache(key)
+                if local is not None:
+                    hit, value = local.get(key)
+                    if hit:
+                        result[key] = self._deserialize(value)
+                        continue
+                    generations[key] = local.generation
+                missing_keys.append(key)
+
+            if missing_keys:
+                full_keys = [self._build_key(key) for key in missing_keys]
+                values = self._mget_method(client)(full_keys)
+                found = dict(zip(missing_keys, values, strict=True))
+                backfill = [key for key in generations if found.get(key) is not None]
+                if backfill:
+                    # 读取剩余过期时间，本地缓存不会比 Redis 中的值晚过期
+                    pipe = client.pipeline(transaction=False)
+                    for key in backfill:
+                        pipe.pttl(self._build_key(key))
+                    for key, pttl in zip(backfill, pipe.execute(), strict=True):
+                        self._local_cache.set(
+                            key,
+                            found[key],
+                            ttl=self._remaining_ttl(pttl),
+                            generation=generations[key],
+                        )
+                for key, value in found.items():
+                    if value is not None:
+                        result[key] = self._deserialize(value)
 
             logger.debug(f"批量获取缓存成功 - keys: {keys}")
             return result
@@ -325,16 +794,13 @@ class SyncCacheService(_BaseCacheService):
             是否全部设置成功
         """
         try:
-            client = self._get_redis_client()
-
             if ttl is None:
                 ttl = self._default_ttl
 
-            # Redis 的 mset 不支持设置 TTL，需要逐个设置
-            for key, value in mapping.items():
-                full_key = self._build_key(key)
-                serialized_value = self._serialize(value)
-                client.setex(full_key, ttl, serialized_value)
+            # Redis 的 mset 不支持设置 TTL，通过管道一次往返完成所有 SETEX
+            with self.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ttl=ttl)
 
             logger.debug(f"批量设置缓存成功 - keys: {list(mapping.keys())}, ttl: {ttl}")
             return True
@@ -353,16 +819,29 @@ class SyncCacheService(_BaseCacheService):
             成功删除的数量
         """
         try:
-            client = self._get_redis_client()
-            full_keys = [self._build_key(key) for key in keys]
-            result = client.delete(*full_keys)
+            if not keys:
+                return 0
+
+            # 通过管道分批删除，失效广播与删除命令同一次往返
+            with self.pipeline() as pipe:
+                pipe.delete(*keys)
+            result = sum(pipe.results)
             logger.debug(f"批量删除缓存成功 - keys: {keys}, 删除数量: {result}")
             return result
         except Exception as e:
             logger.error(f"批量删除缓存失败 - keys: {keys}, error: {e}")
             return 0
 
-    def get_or_set(self, key: str, factory: Callable, ttl: int | None = None) -> Any:
+    def get_or_set(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: int | None = None,
+        single_flight: bool = False,
+        early_refresh_beta: float | None = None,
+        lock_timeout: int = 10,
+        wait_timeout: float = 5.0,
+    ) -> Any:
         """
         获取缓存值，如果不存在则通过工厂函数生成并设置
 
@@ -370,22 +849,39 @@ class SyncCacheService(_BaseCacheService):
             key: 缓存键
             factory: 值工厂函数（同步函数）
             ttl: 过期时间（秒），None 表示使用默认过期时间
+            single_flight: 是否启用防击穿模式：进程内同一键只有一个调用方执行工厂函数，
+                跨进程通过 Redis 短锁保证只有一个进程计算，其余调用方等待或返回旧值
+            early_refresh_beta: 提前刷新系数（XFetch），None 表示不启用；
+                常用取值 1.0，越大越倾向于提前刷新
+            lock_timeout: 跨进程锁的过期时间（秒）
+            wait_timeout: 等待其他调用方计算结果的最长时间（秒），超时后自行计算
 
         Returns:
             缓存值
         """
         try:
-            # 先尝试从缓存获取
-            value = self.get(key)
-            if value is not None:
-                return value
+            if not single_flight and early_refresh_beta is None:
+                # 先尝试从缓存获取
+                value = self.get(key)
+                if value is not None:
+                    return value
 
-            # 缓存不存在，调用工厂函数
-            value = factory()
+                # 缓存不存在，调用工厂函数
+                value = factory()
 
-            # 设置缓存
-            self.set(key, value, ttl=ttl)
-            return value
+                # 设置缓存
+                self.set(key, value, ttl=ttl)
+                return value
+
+            return self._get_or_set_protected(
+                key,
+                factory,
+                ttl,
+                single_flight,
+                early_refresh_beta,
+                lock_timeout,
+                wait_timeout,
+            )
         except Exception as e:
             logger.error(f"获取或设置缓存失败 - key: {key}, error: {e}")
             # 降级：直接调用工厂函数
@@ -395,13 +891,121 @@ class SyncCacheService(_BaseCacheService):
                 logger.error(f"工厂函数执行失败 - key: {key}, error: {factory_error}")
                 return None
 
-    def increment(self, key: str, delta: int = 1) -> int:
+    def _get_or_set_protected(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: int | None,
+        single_flight: bool,
+        early_refresh_beta: float | None,
+        lock_timeout: int,
+        wait_timeout: float,
+    ) -> Any:
+        """防击穿 / 提前刷新模式下的 get_or_set 实现"""
+        with_meta = early_refresh_beta is not None
+        if with_meta:
+            cached = self.get_many([key, self._meta_key(key)])
+            value = cached.get(key)
+            meta = cached.get(self._meta_key(key))
+        else:
+            value = self.get(key)
+            meta = None
+
+        if value is not None and not self._should_refresh_early(
+            meta, early_refresh_beta
+        ):
+            return value
+
+        if value is not None:
+            logger.debug(f"提前刷新缓存 - key: {key}")
+
+        if not single_flight:
+            return self._compute_and_set(key, factory, ttl, with_meta)
+
+        return self._single_flight.do(
+            key,
+            lambda: self._fill_with_lock(
+                key, factory, ttl, value, with_meta, lock_timeout, wait_timeout
+            ),
+            stale=value,
+            timeout=wait_timeout,
+        )
+
+    def _compute_and_set(
+        self, key: str, factory: Callable, ttl: int | None, with_meta: bool
+    ) -> Any:
+        """执行工厂函数并写入缓存（可选写入提前刷新元数据）"""
+        if ttl is None:
+            ttl = self._default_ttl
+
+        start = time.monotonic()
+        value = factory()
+        delta = time.monotonic() - start
+
+        if with_meta:
+            with self.pipeline() as pipe:
+                pipe.set(key, value, ttl=ttl)
+                pipe.set(self._meta_key(key), self._build_meta(delta, ttl), ttl=ttl)
+        else:
+            self.set(key, value, ttl=ttl)
+        return value
+
+    def _fill_with_lock(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: int | None,
+        stale: Any,
+        with_meta: bool,
+        lock_timeout: int,
+        wait_timeout: float,
+    ) -> Any:
+        """
+        在跨进程锁保护下计算缓存值
+
+        获得锁的进程负责计算；未获得锁时有旧值直接返回旧值，
+        否则轮询等待持锁进程写入结果，超时后自行计算。
+        """
+        client = self._get_redis_client()
+        lock_key = self._build_key(self._lock_key(key))
+        token = uuid.uuid4().hex
+
+        if client.set(lock_key, token, nx=True, ex=lock_timeout):
+            try:
+                if stale is None:
+                    # 双重检查：等待锁期间其他进程可能已写入
+                    value = self.get(key)
+                    if value is not None:
+                        return value
+                return self._compute_and_set(key, factory, ttl, with_meta)
+            finally:
+                try:
+                    get_redis_script(SCRIPT_LOCK_RELEASE)(client, [lock_key], [token])
+                except Exception as e:
+                    logger.warning(f"释放缓存锁失败 - key: {key}, error: {e}")
+
+        if stale is not None:
+            return stale
+
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(_LOCK_POLL_INTERVAL)
+            value = self.get(key)
+            if value is not None:
+                return value
+
+        logger.warning(f"等待缓存计算超时，自行计算 - key: {key}")
+        return self._compute_and_set(key, factory, ttl, with_meta)
+
+    def increment(self, key: str, delta: int = 1, ttl: int | None = None) -> int:
         """
         递增缓存值（仅适用于数值类型）
 
         Args:
             key: 缓存键
             delta: 递增量，默认为 1
+            ttl: 计数键首次创建时设置的过期时间（秒），已有过期时间时保持不变（固定窗口计数）；
+                None 表示不设置。递增和设置过期时间在同一个 Lua 脚本中原子完成
 
         Returns:
             递增后的值
@@ -409,11 +1013,95 @@ class SyncCacheService(_BaseCacheService):
         try:
             client = self._get_redis_client()
             full_key = self._build_key(key)
-            return client.incrby(full_key, delta)
+            if ttl:
+                result = get_redis_script(SCRIPT_INCR_WITH_TTL)(
+                    client, [full_key], [delta, ttl]
+                )
+            else:
+                result = client.incrby(full_key, delta)
+            self._invalidate_local([key])
+            return result
         except Exception as e:
             logger.error(f"递增缓存失败 - key: {key}, delta: {delta}, error: {e}")
             return 0
 
+    def acquire_lock(
+        self, key: str, ttl: float = 30, owner: str | None = None
+    ) -> tuple[str, int] | None:
+        """
+        获取分布式锁（SET NX PX + 栅栏令牌，一次往返）
+
+        栅栏令牌随每次加锁成功单调递增，写入下游存储时携带令牌，
+        下游拒绝比已见过的令牌更小的写入，可以防止锁过期后旧持有者的延迟写入覆盖新数据。
+
+        Args:
+            key: 锁名称
+            ttl: 锁过期时间（秒），持有者崩溃后锁自动释放
+            owner: 持有者标识，None 表示自动生成
+
+        Returns:
+            (持有者标识, 栅栏令牌)，锁已被占用或 Redis 异常时返回 None
+        """
+        owner = owner or uuid.uuid4().hex
+        try:
+            client = self._get_redis_client()
+            token = get_redis_script(SCRIPT_LOCK_ACQUIRE)(
+                client, list(self._lock_keys(key)), self._lock_args(owner, ttl)
+            )
+            return (owner, int(token)) if token else None
+        except Exception as e:
+            logger.error(f"获取分布式锁失败 - key: {key}, error: {e}")
+            return None
+
+    def release_lock(self, key: str, owner: str) -> bool:
+        """
+        释放分布式锁（仅当锁仍由 owner 持有时删除）
+
+        Args:
+            key: 锁名称
+            owner: acquire_lock 返回的持有者标识
+
+        Returns:
+            是否释放成功（锁已过期或被其他持有者获取时返回 False）
+        """
+        try:
+            client = self._get_redis_client()
+            lock_key, _ = self._lock_keys(key)
+            return bool(
+                get_redis_script(SCRIPT_LOCK_RELEASE)(client, [lock_key], [owner])
+            )
+        except Exception as e:
+            logger.error(f"释放分布式锁失败 - key: {key}, error: {e}")
+            return False
+
+    def hit_sliding_window(
+        self, key: str, limit: int, window: float
+    ) -> tuple[bool, int]:
+        """
+        滑动窗口计数（限流）：记录一次请求并判断最近 window 秒内是否超过 limit 次
+
+        被拒绝的请求不计入窗口。Redis 异常时放行请求。
+
+        Args:
+            key: 计数键
+            limit: 窗口内允许的请求次数
+            window: 窗口长度（秒）
+
+        Returns:
+            (是否允许, 窗口内的请求次数)
+        """
+        try:
+            client = self._get_redis_client()
+            allowed, count = get_redis_script(SCRIPT_SLIDING_WINDOW)(
+                client,
+                [self._build_key(key)],
+                self._sliding_window_args(limit, window),
+            )
+            return bool(allowed), int(count)
+        except Exception as e:
+            logger.error(f"滑动窗口计数失败 - key: {key}, error: {e}")
+            return True, 0
+
     def decrement(self, key: str, delta: int = 1) -> int:
         """
         递减缓存值（仅适用于数值类型）
@@ -428,30 +1116,61 @@ class SyncCacheService(_BaseCacheService):
         try:
             client = self._get_redis_client()
             full_key = self._build_key(key)
-            return client.decrby(full_key, delta)
+            result = client.decrby(full_key, delta)
+            self._invalidate_local([key])
+            return result
         except Exception as e:
             logger.error(f"递减缓存失败 - key: {key}, delta: {delta}, error: {e}")
             return 0
 
+    def iter_keys(self, pattern: str = "*", count: int | None = None) -> Iterator[str]:
+        """
+        基于 SCAN 流式遍历匹配模式的键（不阻塞 Redis，内存占用恒定）
+
+        Args:
+            pattern: 键匹配模式，默认为 "*"
+            count: 每次 SCAN 迭代的 COUNT 提示值，None 表示使用配置值
+
+        Yields:
+            原始键名（不含前缀）
+        """
+        client = self._get_redis_client()
+        match = self._build_key(pattern)
+        for full_key in client.scan_iter(match=match, count=count or self._scan_count):
+            yield self._strip_key(full_key)
+
     def clear(self) -> bool:
         """
         清空所有缓存
 
+        有前缀时基于 SCAN 分批 UNLINK，避免 KEYS 阻塞 Redis。
+
         Returns:
             是否清空成功
         """
         try:
             client = self._get_redis_client()
             if self._key_prefix:
-                # 只删除带前缀的键
-                pattern = f"{self._key_prefix}*"
-                keys = client.keys(pattern)
-                if keys:
-                    client.delete(*keys)
+                # 只删除带前缀的键，按批次异步释放内存
+                deleted = 0
+                batch = []
+                for full_key in client.scan_iter(
+                    match=f"{self._key_prefix}*", count=self._scan_count
+                ):
+                    batch.append(full_key)
+                    if len(batch) >= self._scan_count:
+                        deleted += client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += client.unlink(*batch)
+                logger.debug(
+                    f"按前缀清理缓存 - prefix: {self._key_prefix}, 删除数量: {deleted}"
+                )
             else:
                 # 清空整个数据库（慎用）
                 client.flushdb()
 
+            self._invalidate_local(None)
             logger.info(f"清空缓存成功 - connection: {self._connection_name}")
             return True
         except Exception as e:
@@ -464,6 +1183,8 @@ class SyncCacheService(_BaseCacheService):
         """
         获取匹配模式的键列表
 
+        基于 SCAN 实现，键数量较多时建议直接使用 iter_keys 流式处理。
+
         Args:
             pattern: 键匹配模式，默认为 "*"
 
@@ -471,15 +1192,7 @@ class SyncCacheService(_BaseCacheService):
             键列表
         """
         try:
-            client = self._get_redis_client()
-            if self._key_prefix:
-                pattern = f"{self._key_prefix}{pattern}"
-            full_keys = client.keys(pattern)
-            # 移除前缀返回原始键名
-            if self._key_prefix:
-                prefix_len = len(self._key_prefix)
-                return [key[prefix_len:] for key in full_keys]
-            return full_keys
+            return list(self.iter_keys(pattern))
         except Exception as e:
             logger.error(f"获取键列表失败 - pattern: {pattern}, error: {e}")
             return []
@@ -509,16 +1222,92 @@ class AsyncCacheService(_BaseCacheService):
         初始化异步缓存服务
         """
         super().__init__()
-        self._redis_client: Any = None
+        self._fallback_client: AsyncFallbackClient | None = None
+        self._single_flight = AsyncSingleFlight()
 
-    async def _get_redis_client(self) -> Any:
-        """获取 Redis 客户端（延迟初始化）"""
+    def _get_redis_client_nowait(self) -> Any:
+        """获取 Redis 客户端（延迟初始化，客户端创建本身不涉及 IO；熔断期间返回降级存储）"""
         if self._redis_client is None:
             self._init_config()
-            self._redis_client = get_async_redis_client(self._connection_name)
+            if self._breaker is not None:
+                self._fallback_client = AsyncFallbackClient(self._fallback_store)
+            self._setup_clients(
+                get_async_redis_client(self._connection_name),
+                get_async_redis_client(
+                    self._connection_name, replica=self._read_from_replicas
+                ),
+                AsyncGuardedRedis,
+            )
 
+        if self._use_fallback():
+            return self._fallback_client
         return self._redis_client
 
+    async def _get_redis_client(self) -> Any:
+        """获取 Redis 客户端（延迟初始化）"""
+        return self._get_redis_client_nowait()
+
+    async def _get_read_client(self) -> Any:
+        """获取只读命令使用的客户端（启用 read_from_replicas 时优先使用从节点）"""
+        return self._select_read_client(self._get_redis_client_nowait())
+
+    def pipeline(self, transaction: bool = False) -> AsyncCachePipeline:
+        """
+        创建缓存管道，多条命令合并为一次网络往返
+
+        Args:
+            transaction: 是否使用 MULTI/EXEC 事务包裹
+
+        Returns:
+            异步缓存管道
+
+        使用示例：
+            async with cache.pipeline() as p:
+                p.set("a", 1).setnx("lock", "1", ttl=10).delete("b")
+            print(p.results)
+        """
+        client = self._get_redis_client_nowait()
+        return AsyncCachePipeline(
+            self, client.pipeline(transaction=transaction), cluster=self._cluster
+        )
+
+    async def _invalidate_local(self, keys: list[str] | None) -> None:
+        """
+        清除本地缓存并向其他进程广播失效消息
+
+        Args:
+            keys: 原始键名列表，None 表示清空所有本地缓存
+        """
+        self._clear_local(keys)
+        message = self._build_invalidation(keys)
+        if message is not None:
+            await self._publish_invalidation(message)
+
+    async def _publish_invalidation(self, message: str) -> None:
+        """向其他进程广播失效消息（失败只记录日志）"""
+        await self.publish(self._invalidation_channel, message)
+
+    async def publish(self, channel: str, message: str) -> bool:
+        """
+        通过受熔断保护的客户端发布消息（失败只记录日志）
+
+        Args:
+            channel: 频道名称
+            message: 消息内容
+
+        Returns:
+            是否发布成功
+        """
+        try:
+            client = await self._get_redis_client()
+            await client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.warning(
+                f"发布消息失败 - channel: {channel}, message: {message}, error: {e}"
+            )
+            return False
+
     async def get(self, key: str, default: Any = None) -> Any:
         """
         获取缓存值
@@ -531,10 +1320,31 @@ class AsyncCacheService(_BaseCacheService):
             缓存值或默认值
         """
         try:
-            client = await self._get_redis_client()
+            client = await self._get_read_client()
+            local = self._get_local_cache(key)
+            if local is not None:
+                hit, value = local.get(key)
+                if hit:
+                    return self._deserialize(value)
+                generation = local.generation
+
             full_key = self._build_key(key)
-            value = await client.get(full_key)
-            return self._deserialize(value) if value is not None else default
+            if local is None:
+                value = await client.get(full_key)
+            else:
+                # 同一次往返读取剩余过期时间，本地缓存不会比 Redis 中的值晚过期
+                pipe = client.pipeline(transaction=False)
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+                value, pttl = await pipe.execute()
+            if value is None:
+                return default
+
+            if local is not None:
+                local.set(
+                    key, value, ttl=self._remaining_ttl(pttl), generation=generation
+                )
+            return self._deserialize(value)
         except Exception as e:
             logger.error(f"获取缓存失败 - key: {key}, error: {e}")
             return default
@@ -554,18 +1364,51 @@ class AsyncCacheService(_BaseCacheService):
         try:
             client = await self._get_redis_client()
             full_key = self._build_key(key)
-            serialized_value = self._serialize(value)
+            serialized_value = self._serialize(value, key)
 
             if ttl is None:
                 ttl = self._default_ttl
 
             await client.setex(full_key, ttl, serialized_value)
+            await self._invalidate_local([key])
             logger.debug(f"设置缓存成功 - key: {key}, ttl: {ttl}")
             return True
         except Exception as e:
             logger.error(f"设置缓存失败 - key: {key}, error: {e}")
             return False
 
+    async def setnx(self, key: str, value: Any, ttl: int | None = None) -> bool:
+        """
+        设置缓存值（仅当键不存在时设置，原子操作）
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 过期时间（秒），None 表示使用默认过期时间
+
+        Returns:
+            是否设置成功（True表示键不存在并设置成功，False表示键已存在）
+        """
+        try:
+            client = await self._get_redis_client()
+            full_key = self._build_key(key)
+            serialized_value = self._serialize(value, key)
+
+            if ttl is None:
+                ttl = self._default_ttl
+
+            # 使用 SET NX EX 实现原子性设置（值和过期时间一次写入）
+            result = bool(await client.set(full_key, serialized_value, nx=True, ex=ttl))
+            if result:
+                await self._invalidate_local([key])
+                logger.debug(f"原子设置缓存成功 - key: {key}, ttl: {ttl}")
+            else:
+                logger.debug(f"键已存在，跳过设置 - key: {key}")
+            return result
+        except Exception as e:
+            logger.error(f"原子设置缓存失败 - key: {key}, error: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         """
         删除缓存
@@ -580,6 +1423,7 @@ class AsyncCacheService(_BaseCacheService):
             client = await self._get_redis_client()
             full_key = self._build_key(key)
             await client.delete(full_key)
+            await self._invalidate_local([key])
             logger.debug(f"删除缓存成功 - key: {key}")
             return True
         except Exception as e:
@@ -597,7 +1441,11 @@ class AsyncCacheService(_BaseCacheService):
             缓存是否存在
         """
         try:
-            client = await self._get_redis_client()
+            client = await self._get_read_client()
+            local = self._get_local_cache(key)
+            if local is not None and local.get(key)[0]:
+                return True
+
             full_key = self._build_key(key)
             return bool(await client.exists(full_key))
         except Exception as e:
@@ -619,6 +1467,7 @@ class AsyncCacheService(_BaseCacheService):
             client = await self._get_redis_client()
             full_key = self._build_key(key)
             await client.expire(full_key, ttl)
+            await self._invalidate_local([key])
             logger.debug(f"设置缓存过期时间成功 - key: {key}, ttl: {ttl}")
             return True
         except Exception as e:
@@ -636,7 +1485,7 @@ class AsyncCacheService(_BaseCacheService):
             剩余过期时间（秒），-1 表示永不过期，-2 表示键不存在
         """
         try:
-            client = await self._get_redis_client()
+            client = await self._get_read_client()
             full_key = self._build_key(key)
             return await client.ttl(full_key)
         except Exception as e:
@@ -654,14 +1503,41 @@ class AsyncCacheService(_BaseCacheService):
             缓存键值字典
         """
         try:
-            client = await self._get_redis_client()
-            full_keys = [self._build_key(key) for key in keys]
-            values = await client.mget(full_keys)
-
+            client = await self._get_read_client()
             result = {}
-            for key, value in zip(keys, values, strict=True):
-                if value is not None:
-                    result[key] = self._deserialize(value)
+            missing_keys = []
+            generations = {}
+            for key in keys:
+                local = self._get_local_cache(key)
+                if local is not None:
+                    hit, value = local.get(key)
+                    if hit:
+                        result[key] = self._deserialize(value)
+                        continue
+                    generations[key] = local.generation
+                missing_keys.append(key)
+
+            if missing_keys:
+                full_keys = [self._build_key(key) for key in missing_keys]
+                values = await self._mget_method(client)(full_keys)
+                found = dict(zip(missing_keys, values, strict=True))
+                backfill = [key for key in generations if found.get(key) is not None]
+                if backfill:
+                    # 读取剩余过期时间，本地缓存不会比 Redis 中的值晚过期
+                    pipe = client.pipeline(transaction=False)
+                    for key in backfill:
+                        pipe.pttl(self._build_key(key))
+                    pttls = await pipe.execute()
+                    for key, pttl in zip(backfill, pttls, strict=True):
+                        self._local_cache.set(
+                            key,
+                            found[key],
+                            ttl=self._remaining_ttl(pttl),
+                            generation=generations[key],
+                        )
+                for key, value in found.items():
+                    if value is not None:
+                        result[key] = self._deserialize(value)
 
             logger.debug(f"批量获取缓存成功 - keys: {keys}")
             return result
@@ -681,16 +1557,13 @@ class AsyncCacheService(_BaseCacheService):
             是否全部设置成功
         """
         try:
-            client = await self._get_redis_client()
-
             if ttl is None:
                 ttl = self._default_ttl
 
-            # Redis 的 mset 不支持设置 TTL，需要逐个设置
-            for key, value in mapping.items():
-                full_key = self._build_key(key)
-                serialized_value = self._serialize(value)
-                await client.setex(full_key, ttl, serialized_value)
+            # Redis 的 mset 不支持设置 TTL，通过管道一次往返完成所有 SETEX
+            async with self.pipeline() as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ttl=ttl)
 
             logger.debug(f"批量设置缓存成功 - keys: {list(mapping.keys())}, ttl: {ttl}")
             return True
@@ -709,9 +1582,13 @@ class AsyncCacheService(_BaseCacheService):
             成功删除的数量
         """
         try:
-            client = await self._get_redis_client()
-            full_keys = [self._build_key(key) for key in keys]
-            result = await client.delete(*full_keys)
+            if not keys:
+                return 0
+
+            # 通过管道分批删除，失效广播与删除命令同一次往返
+            async with self.pipeline() as pipe:
+                pipe.delete(*keys)
+            result = sum(pipe.results)
             logger.debug(f"批量删除缓存成功 - keys: {keys}, 删除数量: {result}")
             return result
         except Exception as e:
@@ -719,7 +1596,14 @@ class AsyncCacheService(_BaseCacheService):
             return 0
 
     async def get_or_set(
-        self, key: str, factory: Callable, ttl: int | None = None
+        self,
+        key: str,
+        factory: Callable,
+        ttl: int | None = None,
+        single_flight: bool = False,
+        early_refresh_beta: float | None = None,
+        lock_timeout: int = 10,
+        wait_timeout: float = 5.0,
     ) -> Any:
         """
         获取缓存值，如果不存在则通过工厂函数生成并设置
@@ -728,25 +1612,39 @@ class AsyncCacheService(_BaseCacheService):
             key: 缓存键
             factory: 值工厂函数，可以是同步或异步函数
             ttl: 过期时间（秒），None 表示使用默认过期时间
+            single_flight: 是否启用防击穿模式：进程内同一键只有一个调用方执行工厂函数，
+                跨进程通过 Redis 短锁保证只有一个进程计算，其余调用方等待或返回旧值
+            early_refresh_beta: 提前刷新系数（XFetch），None 表示不启用；
+                常用取值 1.0，越大越倾向于提前刷新
+            lock_timeout: 跨进程锁的过期时间（秒）
+            wait_timeout: 等待其他调用方计算结果的最长时间（秒），超时后自行计算
 
         Returns:
             缓存值
         """
         try:
-            # 先尝试从缓存获取
-            value = await self.get(key)
-            if value is not None:
-                return value
+            if not single_flight and early_refresh_beta is None:
+                # 先尝试从缓存获取
+                value = await self.get(key)
+                if value is not None:
+                    return value
 
-            # 缓存不存在，调用工厂函数
-            if asyncio.iscoroutinefunction(factory):
-                value = await factory()
-            else:
-                value = factory()
+                # 缓存不存在，调用工厂函数
+                value = await self._call_factory(factory)
 
-            # 设置缓存
-            await self.set(key, value, ttl=ttl)
-            return value
+                # 设置缓存
+                await self.set(key, value, ttl=ttl)
+                return value
+
+            return await self._get_or_set_protected(
+                key,
+                factory,
+                ttl,
+                single_flight,
+                early_refresh_beta,
+                lock_timeout,
+                wait_timeout,
+            )
         except Exception as e:
             logger.error(f"获取或设置缓存失败 - key: {key}, error: {e}")
             # 如果工厂函数是同步的，直接调用作为降级
@@ -759,13 +1657,130 @@ class AsyncCacheService(_BaseCacheService):
                     )
             return None
 
-    async def increment(self, key: str, delta: int = 1) -> int:
+    @staticmethod
+    async def _call_factory(factory: Callable) -> Any:
+        """调用工厂函数（兼容同步和异步函数）"""
+        if asyncio.iscoroutinefunction(factory):
+            return await factory()
+        return factory()
+
+    async def _get_or_set_protected(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: int | None,
+        single_flight: bool,
+        early_refresh_beta: float | None,
+        lock_timeout: int,
+        wait_timeout: float,
+    ) -> Any:
+        """防击穿 / 提前刷新模式下的 get_or_set 实现"""
+        with_meta = early_refresh_beta is not None
+        if with_meta:
+            cached = await self.get_many([key, self._meta_key(key)])
+            value = cached.get(key)
+            meta = cached.get(self._meta_key(key))
+        else:
+            value = await self.get(key)
+            meta = None
+
+        if value is not None and not self._should_refresh_early(
+            meta, early_refresh_beta
+        ):
+            return value
+
+        if value is not None:
+            logger.debug(f"提前刷新缓存 - key: {key}")
+
+        if not single_flight:
+            return await self._compute_and_set(key, factory, ttl, with_meta)
+
+        return await self._single_flight.do(
+            key,
+            lambda: self._fill_with_lock(
+                key, factory, ttl, value, with_meta, lock_timeout, wait_timeout
+            ),
+            stale=value,
+            timeout=wait_timeout,
+        )
+
+    async def _compute_and_set(
+        self, key: str, factory: Callable, ttl: int | None, with_meta: bool
+    ) -> Any:
+        """执行工厂函数并写入缓存（可选写入提前刷新元数据）"""
+        if ttl is None:
+            ttl = self._default_ttl
+
+        start = time.monotonic()
+        value = await self._call_factory(factory)
+        delta = time.monotonic() - start
+
+        if with_meta:
+            async with self.pipeline() as pipe:
+                pipe.set(key, value, ttl=ttl)
+                pipe.set(self._meta_key(key), self._build_meta(delta, ttl), ttl=ttl)
+        else:
+            await self.set(key, value, ttl=ttl)
+        return value
+
+    async def _fill_with_lock(
+        self,
+        key: str,
+        factory: Callable,
+        ttl: int | None,
+        stale: Any,
+        with_meta: bool,
+        lock_timeout: int,
+        wait_timeout: float,
+    ) -> Any:
+        """
+        在跨进程锁保护下计算缓存值
+
+        获得锁的进程负责计算；未获得锁时有旧值直接返回旧值，
+        否则轮询等待持锁进程写入结果，超时后自行计算。
+        """
+        client = await self._get_redis_client()
+        lock_key = self._build_key(self._lock_key(key))
+        token = uuid.uuid4().hex
+
+        if await client.set(lock_key, token, nx=True, ex=lock_timeout):
+            try:
+                if stale is None:
+                    # 双重检查：等待锁期间其他进程可能已写入
+                    value = await self.get(key)
+                    if value is not None:
+                        return value
+                return await self._compute_and_set(key, factory, ttl, with_meta)
+            finally:
+                try:
+                    await get_redis_script(SCRIPT_LOCK_RELEASE).run_async(
+                        client, [lock_key], [token]
+                    )
+                except Exception as e:
+                    logger.warning(f"释放缓存锁失败 - key: {key}, error: {e}")
+
+        if stale is not None:
+            return stale
+
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            value = await self.get(key)
+            if value is not None:
+                return value
+
+        logger.warning(f"等待缓存计算超时，自行计算 - key: {key}")
+        return await self._compute_and_set(key, factory, ttl, with_meta)
+
+    async def increment(self, key: str, delta: int = 1, ttl: int | None = None) -> int:
         """
         递增缓存值（仅适用于数值类型）
 
         Args:
             key: 缓存键
             delta: 递增量，默认为 1
+            ttl: 计数键首次创建时设置的过期时间（秒），已有过期时间时保持不变（固定窗口计数）；
+                None 表示不设置。递增和设置过期时间在同一个 Lua 脚本中原子完成
 
         Returns:
             递增后的值
@@ -773,11 +1788,93 @@ class AsyncCacheService(_BaseCacheService):
         try:
             client = await self._get_redis_client()
             full_key = self._build_key(key)
-            return await client.incrby(full_key, delta)
+            if ttl:
+                result = await get_redis_script(SCRIPT_INCR_WITH_TTL).run_async(
+                    client, [full_key], [delta, ttl]
+                )
+            else:
+                result = await client.incrby(full_key, delta)
+            await self._invalidate_local([key])
+            return result
         except Exception as e:
             logger.error(f"递增缓存失败 - key: {key}, delta: {delta}, error: {e}")
             return 0
 
+    async def acquire_lock(
+        self, key: str, ttl: float = 30, owner: str | None = None
+    ) -> tuple[str, int] | None:
+        """
+        获取分布式锁（SET NX PX + 栅栏令牌，一次往返）
+
+        Args:
+            key: 锁名称
+            ttl: 锁过期时间（秒），持有者崩溃后锁自动释放
+            owner: 持有者标识，None 表示自动生成
+
+        Returns:
+            (持有者标识, 栅栏令牌)，锁已被占用或 Redis 异常时返回 None
+        """
+        owner = owner or uuid.uuid4().hex
+        try:
+            client = await self._get_redis_client()
+            token = await get_redis_script(SCRIPT_LOCK_ACQUIRE).run_async(
+                client, list(self._lock_keys(key)), self._lock_args(owner, ttl)
+            )
+            return (owner, int(token)) if token else None
+        except Exception as e:
+            logger.error(f"获取分布式锁失败 - key: {key}, error: {e}")
+            return None
+
+    async def release_lock(self, key: str, owner: str) -> bool:
+        """
+        释放分布式锁（仅当锁仍由 owner 持有时删除）
+
+        Args:
+            key: 锁名称
+            owner: acquire_lock 返回的持有者标识
+
+        Returns:
+            是否释放成功（锁已过期或被其他持有者获取时返回 False）
+        """
+        try:
+            client = await self._get_redis_client()
+            lock_key, _ = self._lock_keys(key)
+            released = await get_redis_script(SCRIPT_LOCK_RELEASE).run_async(
+                client, [lock_key], [owner]
+            )
+            return bool(released)
+        except Exception as e:
+            logger.error(f"释放分布式锁失败 - key: {key}, error: {e}")
+            return False
+
+    async def hit_sliding_window(
+        self, key: str, limit: int, window: float
+    ) -> tuple[bool, int]:
+        """
+        滑动窗口计数（限流）：记录一次请求并判断最近 window 秒内是否超过 limit 次
+
+        被拒绝的请求不计入窗口。Redis 异常时放行请求。
+
+        Args:
+            key: 计数键
+            limit: 窗口内允许的请求次数
+            window: 窗口长度（秒）
+
+        Returns:
+            (是否允许, 窗口内的请求次数)
+        """
+        try:
+            client = await self._get_redis_client()
+            allowed, count = await get_redis_script(SCRIPT_SLIDING_WINDOW).run_async(
+                client,
+                [self._build_key(key)],
+                self._sliding_window_args(limit, window),
+            )
+            return bool(allowed), int(count)
+        except Exception as e:
+            logger.error(f"滑动窗口计数失败 - key: {key}, error: {e}")
+            return True, 0
+
     async def decrement(self, key: str, delta: int = 1) -> int:
         """
         递减缓存值（仅适用于数值类型）
@@ -792,30 +1889,65 @@ class AsyncCacheService(_BaseCacheService):
         try:
             client = await self._get_redis_client()
             full_key = self._build_key(key)
-            return await client.decrby(full_key, delta)
+            result = await client.decrby(full_key, delta)
+            await self._invalidate_local([key])
+            return result
         except Exception as e:
             logger.error(f"递减缓存失败 - key: {key}, delta: {delta}, error: {e}")
             return 0
 
+    async def aiter_keys(
+        self, pattern: str = "*", count: int | None = None
+    ) -> AsyncIterator[str]:
+        """
+        基于 SCAN 流式遍历匹配模式的键（不阻塞 Redis，内存占用恒定）
+
+        Args:
+            pattern: 键匹配模式，默认为 "*"
+            count: 每次 SCAN 迭代的 COUNT 提示值，None 表示使用配置值
+
+        Yields:
+            原始键名（不含前缀）
+        """
+        client = await self._get_redis_client()
+        match = self._build_key(pattern)
+        async for full_key in client.scan_iter(
+            match=match, count=count or self._scan_count
+        ):
+            yield self._strip_key(full_key)
+
     async def clear(self) -> bool:
         """
         清空所有缓存
 
+        有前缀时基于 SCAN 分批 UNLINK，避免 KEYS 阻塞 Redis。
+
         Returns:
             是否清空成功
         """
         try:
             client = await self._get_redis_client()
             if self._key_prefix:
-                # 只删除带前缀的键
-                pattern = f"{self._key_prefix}*"
-                keys = await client.keys(pattern)
-                if keys:
-                    await client.delete(*keys)
+                # 只删除带前缀的键，按批次异步释放内存
+                deleted = 0
+                batch = []
+                async for full_key in client.scan_iter(
+                    match=f"{self._key_prefix}*", count=self._scan_count
+                ):
+                    batch.append(full_key)
+                    if len(batch) >= self._scan_count:
+                        deleted += await client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += await client.unlink(*batch)
+                logger.debug(
+                    f"按前缀清理缓存 - prefix: {self._key_prefix}, 删除数量: {deleted}"
+                )
             else:
                 # 清空整个数据库（慎用）
                 await client.flushdb()
 
+            await self._invalidate_local(None)
             logger.info(f"清空缓存成功 - connection: {self._connection_name}")
             return True
         except Exception as e:
@@ -828,6 +1960,8 @@ class AsyncCacheService(_BaseCacheService):
         """
         获取匹配模式的键列表
 
+        基于 SCAN 实现，键数量较多时建议直接使用 aiter_keys 流式处理。
+
         Args:
             pattern: 键匹配模式，默认为 "*"
 
@@ -835,15 +1969,7 @@ class AsyncCacheService(_BaseCacheService):
             键列表
         """
         try:
-            client = await self._get_redis_client()
-            if self._key_prefix:
-                pattern = f"{self._key_prefix}{pattern}"
-            full_keys = await client.keys(pattern)
-            # 移除前缀返回原始键名
-            if self._key_prefix:
-                prefix_len = len(self._key_prefix)
-                return [key[prefix_len:] for key in full_keys]
-            return full_keys
+            return [key async for key in self.aiter_keys(pattern)]
         except Exception as e:
             logger.error(f"获取键列表失败 - pattern: {pattern}, error: {e}")
             return []
@@ -947,10 +2073,32 @@ def sync_cache_delete_many(keys: list[str]) -> int:
     return service.delete_many(keys)
 
 
-def sync_cache_increment(key: str, delta: int = 1) -> int:
-    """便捷函数：递增缓存值（同步）"""
+def sync_cache_increment(key: str, delta: int = 1, ttl: int | None = None) -> int:
+    """便捷函数：递增缓存值，可选在首次创建时设置过期时间（同步）"""
     service = get_sync_cache_service()
-    return service.increment(key, delta)
+    return service.increment(key, delta, ttl)
+
+
+def sync_cache_acquire_lock(
+    key: str, ttl: float = 30, owner: str | None = None
+) -> tuple[str, int] | None:
+    """便捷函数：获取分布式锁，返回 (持有者标识, 栅栏令牌)（同步）"""
+    service = get_sync_cache_service()
+    return service.acquire_lock(key, ttl, owner)
+
+
+def sync_cache_release_lock(key: str, owner: str) -> bool:
+    """便捷函数：释放分布式锁（同步）"""
+    service = get_sync_cache_service()
+    return service.release_lock(key, owner)
+
+
+def sync_cache_hit_sliding_window(
+    key: str, limit: int, window: float
+) -> tuple[bool, int]:
+    """便捷函数：滑动窗口计数，返回 (是否允许, 窗口内的请求次数)（同步）"""
+    service = get_sync_cache_service()
+    return service.hit_sliding_window(key, limit, window)
 
 
 def sync_cache_decrement(key: str, delta: int = 1) -> int:
@@ -971,10 +2119,15 @@ def sync_cache_keys(pattern: str = "*") -> list[str]:
     return service.keys(pattern)
 
 
-def sync_cache_get_or_set(key: str, factory: Callable, ttl: int | None = None) -> Any:
-    """便捷函数：获取或设置缓存（同步）"""
+def sync_cache_get_or_set(
+    key: str,
+    factory: Callable,
+    ttl: int | None = None,
+    **kwargs: Any,
+) -> Any:
+    """便捷函数：获取或设置缓存（同步），kwargs 同 SyncCacheService.get_or_set"""
     service = get_sync_cache_service()
-    return service.get_or_set(key, factory, ttl)
+    return service.get_or_set(key, factory, ttl, **kwargs)
 
 
 # ==================== 异步便捷函数 ====================
@@ -996,6 +2149,12 @@ async def async_cache_set(
     return await service.set(key, value, ttl)
 
 
+async def async_cache_setnx(key: str, value: Any, ttl: int | None = None) -> bool:
+    """便捷函数：原子设置缓存值（仅当键不存在时设置，异步）"""
+    service = get_async_cache_service()
+    return await service.setnx(key, value, ttl)
+
+
 async def async_cache_delete(key: str) -> bool:
     """便捷函数：删除缓存（异步）"""
     service = get_async_cache_service()
@@ -1038,10 +2197,34 @@ async def async_cache_delete_many(keys: list[str]) -> int:
     return await service.delete_many(keys)
 
 
-async def async_cache_increment(key: str, delta: int = 1) -> int:
-    """便捷函数：递增缓存值（异步）"""
+async def async_cache_increment(
+    key: str, delta: int = 1, ttl: int | None = None
+) -> int:
+    """便捷函数：递增缓存值，可选在首次创建时设置过期时间（异步）"""
+    service = get_async_cache_service()
+    return await service.increment(key, delta, ttl)
+
+
+async def async_cache_acquire_lock(
+    key: str, ttl: float = 30, owner: str | None = None
+) -> tuple[str, int] | None:
+    """便捷函数：获取分布式锁，返回 (持有者标识, 栅栏令牌)（异步）"""
+    service = get_async_cache_service()
+    return await service.acquire_lock(key, ttl, owner)
+
+
+async def async_cache_release_lock(key: str, owner: str) -> bool:
+    """便捷函数：释放分布式锁（异步）"""
+    service = get_async_cache_service()
+    return await service.release_lock(key, owner)
+
+
+async def async_cache_hit_sliding_window(
+    key: str, limit: int, window: float
+) -> tuple[bool, int]:
+    """便捷函数：滑动窗口计数，返回 (是否允许, 窗口内的请求次数)（异步）"""
     service = get_async_cache_service()
-    return await service.increment(key, delta)
+    return await service.hit_sliding_window(key, limit, window)
 
 
 async def async_cache_decrement(key: str, delta: int = 1) -> int:
@@ -1066,7 +2249,8 @@ async def async_cache_get_or_set(
     key: str,
     factory: Callable,
     ttl: int | None = None,
+    **kwargs: Any,
 ) -> Any:
-    """便捷函数：获取或设置缓存（异步）"""
+    """便捷函数：获取或设置缓存（异步），kwargs 同 AsyncCacheService.get_or_set"""
     service = get_async_cache_service()
-    return await service.get_or_set(key, factory, ttl)
+    return await service.get_or_set(key, factory, ttl, **kwargs)
@@ -0,0 +1,507 @@
+"""
+缓存编解码
+
+将缓存值编码为带类型头的字节串，支持可插拔的序列化格式和超过阈值时的透明压缩。
+
+编码格式：
+    [头字节][负载]
+
+    头字节取值范围为 0x80 ~ 0xBF（UTF-8 续字节，不可能出现在合法文本的开头），
+    因此可以与旧版本写入的纯文本 / JSON 值共存：
+    - bit 7：固定为 1
+    - bit 6：固定为 0
+    - bit 4~5：压缩算法编号
+    - bit 0~3：序列化格式编号
+
+整数保持旧的纯文本格式写入，保证 Redis INCRBY / DECRBY 可以继续使用。
+"""
+
+import datetime
+import json
+import zlib
+from decimal import Decimal
+from typing import Any
+
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 可选依赖
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - 可选依赖
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - 可选依赖
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - 可选依赖
+    lz4_frame = None
+
+
+# ==================== 头字节 ====================
+
+_HEADER_MASK = 0xC0
+_HEADER_FLAG = 0x80
+
+# 序列化格式编号（0 ~ 15）
+FORMAT_STR = 0
+FORMAT_BYTES = 1
+FORMAT_JSON = 2
+FORMAT_ORJSON = 3
+FORMAT_MSGPACK = 4
+
+# 压缩算法编号（0 ~ 3）
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSION_LZ4 = 3
+
+
+def _build_header(format_id: int, compression_id: int) -> bytes:
+    """构建头字节"""
+    return bytes((_HEADER_FLAG | (compression_id << 4) | format_id,))
+
+
+def is_tagged(data: bytes) -> bool:
+    """判断字节串是否为带类型头的编码值"""
+    return bool(data) and data[0] & _HEADER_MASK == _HEADER_FLAG
+
+
+# ==================== 扩展类型 ====================
+
+# JSON 类格式中扩展类型编码为单键字典，如 {"$dec": "10.01"}
+_TYPE_DECIMAL = "$dec"
+_TYPE_DATETIME = "$dt"
+_TYPE_DATE = "$date"
+_TYPE_MARKER = b'{"$'
+
+
+def _encode_extension(value: Any) -> Any:
+    """将 Decimal / datetime / date 编码为带类型标记的单键字典"""
+    # datetime 是 date 的子类，需要先判断
+    if isinstance(value, datetime.datetime):
+        return {_TYPE_DATETIME: value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_TYPE_DATE: value.isoformat()}
+    if isinstance(value, Decimal):
+        return {_TYPE_DECIMAL: str(value)}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"类型 {type(value).__name__} 无法序列化")
+
+
+def _decode_extension(obj: dict[str, Any]) -> Any:
+    """还原带类型标记的单键字典（json.loads 的 object_hook）"""
+    if len(obj) != 1:
+        return obj
+    if _TYPE_DECIMAL in obj:
+        return Decimal(obj[_TYPE_DECIMAL])
+    if _TYPE_DATETIME in obj:
+        return datetime.datetime.fromisoformat(obj[_TYPE_DATETIME])
+    if _TYPE_DATE in obj:
+        return datetime.date.fromisoformat(obj[_TYPE_DATE])
+    return obj
+
+
+# ==================== 序列化格式 ====================
+
+
+class CacheCodec:
+    """
+    序列化格式基类
+
+    自定义格式需要继承本类，指定唯一的 format_id（5 ~ 15）并通过 register_codec 注册。
+    """
+
+    name: str = ""
+    format_id: int = -1
+
+    @classmethod
+    def available(cls) -> bool:
+        """依赖是否已安装"""
+        return True
+
+    def dumps(self, value: Any) -> bytes:
+        """序列化为字节串"""
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        """从字节串反序列化"""
+        raise NotImplementedError
+
+
+class JsonCodec(CacheCodec):
+    """标准库 JSON 格式，无额外依赖"""
+
+    name = "json"
+    format_id = FORMAT_JSON
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(
+            value, ensure_ascii=False, separators=(",", ":"), default=_encode_extension
+        ).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=_decode_extension)
+
+
+class OrjsonCodec(CacheCodec):
+    """orjson 格式，序列化速度约为标准库 JSON 的数倍"""
+
+    name = "orjson"
+    format_id = FORMAT_ORJSON
+
+    @classmethod
+    def available(cls) -> bool:
+        return orjson is not None
+
+    def dumps(self, value: Any) -> bytes:
+        # 让 datetime / date 也走 default，保证反序列化时能够还原类型
+        return orjson.dumps(
+            value,
+            default=_encode_extension,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+
+    def loads(self, data: bytes) -> Any:
+        # orjson 不支持 object_hook，含类型标记时交给标准库逐个对象还原
+        if _TYPE_MARKER in data:
+            return json.loads(data, object_hook=_decode_extension)
+        return orjson.loads(data)
+
+
+# msgpack 扩展类型编号
+_MSGPACK_EXT_DECIMAL = 1
+_MSGPACK_EXT_DATETIME = 2
+_MSGPACK_EXT_DATE = 3
+
+
+def _msgpack_default(value: Any) -> Any:
+    """msgpack 扩展类型编码"""
+    if isinstance(value, datetime.datetime):
+        return msgpack.ExtType(_MSGPACK_EXT_DATETIME, value.isoformat().encode())
+    if isinstance(value, datetime.date):
+        return msgpack.ExtType(_MSGPACK_EXT_DATE, value.isoformat().encode())
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_MSGPACK_EXT_DECIMAL, str(value).encode())
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"类型 {type(value).__name__} 无法序列化")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """msgpack 扩展类型解码"""
+    if code == _MSGPACK_EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _MSGPACK_EXT_DATETIME:
+        return datetime.datetime.fromisoformat(data.decode())
+    if code == _MSGPACK_EXT_DATE:
+        return datetime.date.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCodec(CacheCodec):
+    """msgpack 二进制格式，体积更小，适合大量数值数据"""
+
+    name = "msgpack"
+    format_id = FORMAT_MSGPACK
+
+    @classmethod
+    def available(cls) -> bool:
+        return msgpack is not None
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(
+            data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False
+        )
+
+
+_codecs_by_name: dict[str, CacheCodec] = {}
+_codecs_by_id: dict[int, CacheCodec] = {}
+
+
+def register_codec(codec: CacheCodec) -> None:
+    """
+    注册序列化格式
+
+    Args:
+        codec: 序列化格式实例
+
+    Raises:
+        ValueError: 格式编号超出范围或与已注册格式冲突
+    """
+    if not 0 <= codec.format_id <= 0x0F or codec.format_id in (
+        FORMAT_STR,
+        FORMAT_BYTES,
+    ):
+        raise ValueError(f"序列化格式编号无效 - name: {codec.name}")
+    existing = _codecs_by_id.get(codec.format_id)
+    if existing is not None and existing.name != codec.name:
+        raise ValueError(
+            f"序列化格式编号冲突 - name: {codec.name}, existing: {existing.name}"
+        )
+    _codecs_by_name[codec.name] = codec
+    _codecs_by_id[codec.format_id] = codec
+
+
+for _codec in (JsonCodec(), OrjsonCodec(), MsgpackCodec()):
+    register_codec(_codec)
+
+
+# ==================== 压缩算法 ====================
+
+
+class _Compressor:
+    """压缩算法基类"""
+
+    name: str = ""
+    compression_id: int = COMPRESSION_NONE
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class _ZlibCompressor(_Compressor):
+    name = "zlib"
+    compression_id = COMPRESSION_ZLIB
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, 6)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class _ZstdCompressor(_Compressor):
+    name = "zstd"
+    compression_id = COMPRESSION_ZSTD
+
+    @classmethod
+    def available(cls) -> bool:
+        return zstandard is not None
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class _Lz4Compressor(_Compressor):
+    name = "lz4"
+    compression_id = COMPRESSION_LZ4
+
+    @classmethod
+    def available(cls) -> bool:
+        return lz4_frame is not None
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+
+_compressors_by_name: dict[str, _Compressor] = {
+    compressor.name: compressor
+    for compressor in (_ZlibCompressor(), _ZstdCompressor(), _Lz4Compressor())
+}
+_compressors_by_id: dict[int, _Compressor] = {
+    compressor.compression_id: compressor
+    for compressor in _compressors_by_name.values()
+}
+
+
+# ==================== 缓存序列化器 ====================
+
+
+class CacheSerializer:
+    """
+    缓存序列化器
+
+    主要功能：
+    - 按键前缀选择序列化格式，未匹配时使用默认格式
+    - 负载超过阈值时透明压缩（压缩后不变小则保留原文）
+    - 根据头字节自动识别格式和压缩算法，兼容旧版本写入的纯文本 / JSON 值
+
+    使用示例：
+        serializer = CacheSerializer(
+            codec="orjson",
+            compression="zstd",
+            namespace_codecs={"quant:": "msgpack"},
+        )
+        data = serializer.dumps({"price": Decimal("10.01")}, key="quant:snapshot")
+        value = serializer.loads(data)
+    """
+
+    def __init__(
+        self,
+        codec: str = "json",
+        compression: str = "none",
+        compress_threshold: int = 1024,
+        namespace_codecs: dict[str, str] | None = None,
+    ):
+        """
+        初始化序列化器
+
+        依赖未安装的格式 / 压缩算法会回退并输出警告，而不是在启动时报错。
+
+        Args:
+            codec: 默认序列化格式（json / orjson / msgpack）
+            compression: 压缩算法（none / zlib / zstd / lz4）
+            compress_threshold: 触发压缩的最小负载字节数
+            namespace_codecs: 键前缀到序列化格式的映射
+        """
+        self.default_codec = self._resolve_codec(codec)
+        self.compressor = self._resolve_compressor(compression)
+        self.compress_threshold = compress_threshold
+        # 按前缀长度倒序，保证最长前缀优先匹配
+        self.namespace_codecs: list[tuple[str, CacheCodec]] = sorted(
+            (
+                (prefix, self._resolve_codec(name))
+                for prefix, name in (namespace_codecs or {}).items()
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    @staticmethod
+    def _resolve_codec(name: str) -> CacheCodec:
+        """按名称获取序列化格式，不可用时回退为 json"""
+        codec = _codecs_by_name.get(name)
+        if codec is None:
+            logger.warning(f"未知的缓存序列化格式，使用 json - codec: {name}")
+            return _codecs_by_name["json"]
+        if not codec.available():
+            logger.warning(f"缓存序列化格式依赖未安装，使用 json - codec: {name}")
+            return _codecs_by_name["json"]
+        return codec
+
+    @staticmethod
+    def _resolve_compressor(name: str) -> _Compressor | None:
+        """按名称获取压缩算法，不可用时回退为 zlib"""
+        if not name or name == "none":
+            return None
+        compressor = _compressors_by_name.get(name)
+        if compressor is None:
+            logger.warning(f"未知的缓存压缩算法，不启用压缩 - compression: {name}")
+            return None
+        if not compressor.available():
+            logger.warning(f"缓存压缩算法依赖未安装，使用 zlib - compression: {name}")
+            return _compressors_by_name["zlib"]
+        return compressor
+
+    def codec_for(self, key: str | None) -> CacheCodec:
+        """
+        获取键对应的序列化格式
+
+        Args:
+            key: 原始键名，None 表示使用默认格式
+
+        Returns:
+            序列化格式
+        """
+        if key is not None:
+            for prefix, codec in self.namespace_codecs:
+                if key.startswith(prefix):
+                    return codec
+        return self.default_codec
+
+    def dumps(self, value: Any, key: str | None = None) -> bytes:
+        """
+        编码缓存值
+
+        Args:
+            value: 要编码的值
+            key: 原始键名，用于按前缀选择序列化格式
+
+        Returns:
+            编码后的字节串
+        """
+        # 整数保持纯文本，兼容 INCRBY / DECRBY
+        if isinstance(value, int) and not isinstance(value, bool):
+            return str(value).encode()
+
+        if isinstance(value, str):
+            format_id, payload = FORMAT_STR, value.encode("utf-8")
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            format_id, payload = FORMAT_BYTES, bytes(value)
+        else:
+            codec = self.codec_for(key)
+            format_id, payload = codec.format_id, codec.dumps(value)
+
+        compression_id = COMPRESSION_NONE
+        if self.compressor is not None and len(payload) >= self.compress_threshold:
+            compressed = self.compressor.compress(payload)
+            if len(compressed) < len(payload):
+                compression_id, payload = self.compressor.compression_id, compressed
+
+        return _build_header(format_id, compression_id) + payload
+
+    def loads(self, data: str | bytes | None) -> Any:
+        """
+        解码缓存值
+
+        Args:
+            data: Redis 返回的原始值
+
+        Returns:
+            解码后的值
+
+        Raises:
+            ValueError: 格式或压缩算法未注册 / 依赖未安装
+        """
+        if data is None:
+            return None
+        if isinstance(data, str):
+            return self._loads_legacy(data)
+        if not is_tagged(data):
+            return self._loads_legacy(data.decode("utf-8"))
+
+        header = data[0]
+        format_id = header & 0x0F
+        compression_id = (header >> 4) & 0x03
+        payload = data[1:]
+
+        if compression_id != COMPRESSION_NONE:
+            compressor = _compressors_by_id.get(compression_id)
+            if compressor is None or not compressor.available():
+                raise ValueError(
+                    f"缓存值压缩算法不可用 - compression: {compression_id}"
+                )
+            payload = compressor.decompress(payload)
+
+        if format_id == FORMAT_STR:
+            return payload.decode("utf-8")
+        if format_id == FORMAT_BYTES:
+            return payload
+
+        codec = _codecs_by_id.get(format_id)
+        if codec is None or not codec.available():
+            raise ValueError(f"缓存值序列化格式不可用 - format: {format_id}")
+        return codec.loads(payload)
+
+    @staticmethod
+    def _loads_legacy(value: str) -> Any:
+        """解码旧版本写入的值（纯文本 / JSON）"""
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
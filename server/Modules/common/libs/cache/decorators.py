@@ -0,0 +1,259 @@
+"""
+缓存装饰器
+
+为同步 / 异步的服务方法提供声明式缓存，并支持基于标签的批量失效。
+
+标签失效基于代数计数器：每个标签对应一个计数键（cache_tag:<标签>），
+缓存值写入时记录所属标签的当前代数，读取时与最新代数比较，不一致即视为失效。
+因此 invalidate_tags 只需要对计数键执行一次 INCR，复杂度 O(1)，无需扫描键。
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from loguru import logger
+
+from .cache import get_async_cache_service, get_sync_cache_service
+
+# 标签代数计数键前缀
+TAG_KEY_PREFIX = "cache_tag:"
+
+# 默认缓存键前缀
+DEFAULT_KEY_PREFIX = "cached:"
+
+
+def tag_key(tag: str) -> str:
+    """标签代数计数键"""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _wrap_entry(value: Any, versions: dict[str, int]) -> dict[str, Any]:
+    """构建带标签代数的缓存条目"""
+    return {"value": value, "tags": versions}
+
+
+def _unwrap_entry(entry: Any, versions: dict[str, int]) -> tuple[bool, Any]:
+    """
+    解析缓存条目
+
+    Returns:
+        (是否有效, 缓存值)，标签代数不一致或格式不符时视为无效
+    """
+    if (
+        isinstance(entry, dict)
+        and entry.keys() == {"value", "tags"}
+        and entry["tags"] == versions
+    ):
+        return True, entry["value"]
+    return False, None
+
+
+class _CachedCall:
+    """
+    缓存调用描述
+
+    根据被装饰函数的签名绑定参数，生成缓存键和标签列表。
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        key: str | Callable[..., str] | None,
+        tags: Iterable[str] | Callable[..., Iterable[str]] | None,
+    ):
+        self.func = func
+        self.signature = inspect.signature(func)
+        self.key = key
+        self.tags = tags
+        self.default_prefix = (
+            f"{DEFAULT_KEY_PREFIX}{func.__module__}.{func.__qualname__}"
+        )
+
+    def _bind(self, args: tuple, kwargs: dict) -> dict[str, Any]:
+        """绑定参数（去掉 self / cls）"""
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop("self", None)
+        arguments.pop("cls", None)
+        return arguments
+
+    def build(self, args: tuple, kwargs: dict) -> tuple[str, list[str]]:
+        """
+        生成缓存键和标签列表
+
+        Args:
+            args: 位置参数
+            kwargs: 关键字参数
+
+        Returns:
+            (缓存键, 标签列表)
+        """
+        arguments = self._bind(args, kwargs)
+
+        if callable(self.key):
+            cache_key = self.key(**arguments)
+        elif self.key is not None:
+            cache_key = self.key.format(**arguments)
+        else:
+            digest = hashlib.md5(
+                json.dumps(
+                    arguments, sort_keys=True, ensure_ascii=False, default=str
+                ).encode("utf-8")
+            ).hexdigest()
+            cache_key = f"{self.default_prefix}:{digest}"
+
+        if callable(self.tags):
+            tags = list(self.tags(**arguments))
+        else:
+            tags = [tag.format(**arguments) for tag in self.tags or ()]
+
+        return cache_key, tags
+
+
+def cached(
+    ttl: int | None = None,
+    key: str | Callable[..., str] | None = None,
+    tags: Iterable[str] | Callable[..., Iterable[str]] | None = None,
+    single_flight: bool = True,
+) -> Callable:
+    """
+    缓存装饰器（同时支持同步和异步函数）
+
+    缓存键和标签中的 {参数名} 会被替换为调用时的参数值；
+    未指定 key 时按函数全名和参数摘要自动生成。
+    参数中包含 Request 等每次调用都不同的对象时，应显式指定 key。
+
+    读取缓存值和所有标签代数只需要一次 MGET；
+    开启 single_flight 时，同一进程内同一个键的并发未命中只执行一次函数。
+
+    Args:
+        ttl: 过期时间（秒），None 表示使用默认过期时间
+        key: 缓存键模板或根据参数生成缓存键的函数
+        tags: 标签模板列表或根据参数生成标签的函数
+        single_flight: 是否合并进程内的并发未命中
+
+    Returns:
+        装饰器
+
+    使用示例：
+        class CategoryService(BaseService):
+            @cached(ttl=600, key="content_category:tree:{status}", tags=["content_category"])
+            async def tree_data(self, status: int | None = None) -> list[dict]:
+                ...
+
+        # 分类变更后
+        await async_invalidate_tags("content_category")
+    """
+
+    def decorator(func: Callable) -> Callable:
+        call = _CachedCall(func, key, tags)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache = get_async_cache_service()
+                cache_key, tag_names = call.build(args, kwargs)
+                tag_keys = [tag_key(tag) for tag in tag_names]
+
+                found = await cache.get_many([cache_key, *tag_keys])
+                versions = {
+                    tag: int(found.get(counter_key) or 0)
+                    for tag, counter_key in zip(tag_names, tag_keys, strict=True)
+                }
+                hit, value = _unwrap_entry(found.get(cache_key), versions)
+                if hit:
+                    return value
+
+                async def compute():
+                    result = await func(*args, **kwargs)
+                    # 使用计算前读取的代数，计算期间发生的失效会让本次结果立即过期
+                    await cache.set(cache_key, _wrap_entry(result, versions), ttl=ttl)
+                    return result
+
+                if not single_flight:
+                    return await compute()
+                return await cache._single_flight.do(cache_key, compute)
+
+            async_wrapper.cache_key = lambda *a, **kw: call.build(a, kw)[0]
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            cache = get_sync_cache_service()
+            cache_key, tag_names = call.build(args, kwargs)
+            tag_keys = [tag_key(tag) for tag in tag_names]
+
+            found = cache.get_many([cache_key, *tag_keys])
+            versions = {
+                tag: int(found.get(counter_key) or 0)
+                for tag, counter_key in zip(tag_names, tag_keys, strict=True)
+            }
+            hit, value = _unwrap_entry(found.get(cache_key), versions)
+            if hit:
+                return value
+
+            def compute():
+                result = func(*args, **kwargs)
+                cache.set(cache_key, _wrap_entry(result, versions), ttl=ttl)
+                return result
+
+            if not single_flight:
+                return compute()
+            return cache._single_flight.do(cache_key, compute)
+
+        sync_wrapper.cache_key = lambda *a, **kw: call.build(a, kw)[0]
+        return sync_wrapper
+
+    return decorator
+
+
+def invalidate_tags(*tags: str) -> bool:
+    """
+    使标签下的所有缓存失效（同步，一次网络往返）
+
+    Args:
+        *tags: 标签列表
+
+    Returns:
+        是否成功
+    """
+    if not tags:
+        return True
+    try:
+        with get_sync_cache_service().pipeline() as pipe:
+            for tag in tags:
+                pipe.increment(tag_key(tag))
+        logger.debug(f"缓存标签已失效 - tags: {tags}")
+        return True
+    except Exception as e:
+        logger.error(f"缓存标签失效失败 - tags: {tags}, error: {e}")
+        return False
+
+
+async def async_invalidate_tags(*tags: str) -> bool:
+    """
+    使标签下的所有缓存失效（异步，一次网络往返）
+
+    Args:
+        *tags: 标签列表
+
+    Returns:
+        是否成功
+    """
+    if not tags:
+        return True
+    try:
+        async with get_async_cache_service().pipeline() as pipe:
+            for tag in tags:
+                pipe.increment(tag_key(tag))
+        logger.debug(f"缓存标签已失效 - tags: {tags}")
+        return True
+    except Exception as e:
+        logger.error(f"缓存标签失效失败 - tags: {tags}, error: {e}")
+        return False
@@ -0,0 +1,416 @@
+"""
+Redis 降级存储
+
+Redis 熔断期间，缓存服务（包括验证码、JWT 黑名单、分表锁等所有基于缓存服务的调用）
+改用进程内的降级存储，接口与 redis-py 客户端中用到的命令保持一致。
+
+降级存储只在当前进程内有效：多进程部署时不同进程之间的数据互不可见，
+熔断恢复（closed）后降级数据会被清空，不会回写 Redis。
+"""
+
+import fnmatch
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+from redis.exceptions import NoScriptError, ResponseError
+
+from ..database.redis.scripts import (
+    INCR_WITH_TTL_SCRIPT,
+    LOCK_ACQUIRE_SCRIPT,
+    LOCK_RELEASE_SCRIPT,
+    SLIDING_WINDOW_SCRIPT,
+    script_sha,
+)
+
+# 脚本 SHA1 -> 降级实现，参数为 (存储, keys, args)
+_script_handlers: dict[str, Callable[["FallbackStore", list, list], Any]] = {}
+
+
+def register_fallback_script(
+    script: str, handler: Callable[["FallbackStore", list, list], Any]
+) -> None:
+    """
+    注册 Lua 脚本的降级实现（降级期间 EVAL / EVALSHA 只支持已注册的脚本）
+
+    Args:
+        script: Lua 脚本内容
+        handler: 降级实现，参数为 (存储, keys, args)
+    """
+    _script_handlers[script_sha(script)] = handler
+
+
+def _encode_key(key: str | bytes) -> str:
+    """统一键名为字符串"""
+    return key.decode("utf-8") if isinstance(key, bytes) else str(key)
+
+
+def _encode_value(value: Any) -> bytes:
+    """按 redis-py 的规则把值编码为字节串"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    if isinstance(value, bool):
+        raise TypeError("不支持写入 bool 类型，请先转换为 bytes、str 或数字")
+    return repr(value).encode("utf-8")
+
+
+class FallbackStore:
+    """
+    进程内降级存储（线程安全，容量有界，支持过期时间）
+
+    方法名称和返回值与 redis-py 同步客户端一致，可直接替代缓存服务中的 Redis 客户端。
+
+    使用示例：
+        store = FallbackStore(max_size=10000)
+        store.set("captcha:abc", b"1234", ex=300)
+        store.get("captcha:abc")  # b"1234"
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        初始化降级存储
+
+        Args:
+            max_size: 最大键数量，超出时淘汰最久未使用的键
+        """
+        self.max_size = max_size
+        # 键 -> (值, 过期时间点)，过期时间点为 None 表示永不过期
+        self._data: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ==================== 内部方法（调用方需持有锁） ====================
+
+    def _get_item(self, key: str) -> tuple[bytes, float | None] | None:
+        """获取未过期的条目"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expire_at = item[1]
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item
+
+    def _put(self, key: str, value: bytes, expire_at: float | None) -> None:
+        """写入条目并按容量淘汰"""
+        self._data[key] = (value, expire_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    # ==================== Redis 兼容命令 ====================
+
+    def get(self, name: str | bytes) -> bytes | None:
+        with self._lock:
+            item = self._get_item(_encode_key(name))
+            return None if item is None else item[0]
+
+    def mget(self, keys: list, *args) -> list[bytes | None]:
+        keys = [*keys, *args] if isinstance(keys, list | tuple) else [keys, *args]
+        with self._lock:
+            return [self.get(key) for key in keys]
+
+    def set(
+        self,
+        name: str | bytes,
+        value: Any,
+        ex: int | None = None,
+        px: int | None = None,
+        nx: bool = False,
+        xx: bool = False,
+        **kwargs,
+    ) -> bool | None:
+        key = _encode_key(name)
+        ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+        with self._lock:
+            exists = self._get_item(key) is not None
+            if (nx and exists) or (xx and not exists):
+                return None
+            expire_at = None if ttl is None else time.monotonic() + ttl
+            self._put(key, _encode_value(value), expire_at)
+            return True
+
+    def setex(self, name: str | bytes, time_: int, value: Any) -> bool:
+        return bool(self.set(name, value, ex=time_))
+
+    def delete(self, *names: str | bytes) -> int:
+        with self._lock:
+            deleted = 0
+            for name in names:
+                key = _encode_key(name)
+                if self._get_item(key) is not None:
+                    del self._data[key]
+                    deleted += 1
+            return deleted
+
+    def unlink(self, *names: str | bytes) -> int:
+        return self.delete(*names)
+
+    def exists(self, *names: str | bytes) -> int:
+        with self._lock:
+            return sum(
+                1 for name in names if self._get_item(_encode_key(name)) is not None
+            )
+
+    def expire(self, name: str | bytes, time_: int, **kwargs) -> bool:
+        key = _encode_key(name)
+        with self._lock:
+            item = self._get_item(key)
+            if item is None:
+                return False
+            self._data[key] = (item[0], time.monotonic() + time_)
+            return True
+
+    def ttl(self, name: str | bytes) -> int:
+        with self._lock:
+            item = self._get_item(_encode_key(name))
+            if item is None:
+                return -2
+            if item[1] is None:
+                return -1
+            return max(0, math.ceil(item[1] - time.monotonic()))
+
+    def pttl(self, name: str | bytes) -> int:
+        with self._lock:
+            item = self._get_item(_encode_key(name))
+            if item is None:
+                return -2
+            if item[1] is None:
+                return -1
+            return max(0, math.ceil((item[1] - time.monotonic()) * 1000))
+
+    def incrby(self, name: str | bytes, amount: int = 1) -> int:
+        key = _encode_key(name)
+        with self._lock:
+            item = self._get_item(key)
+            try:
+                value = int(item[0]) + amount if item is not None else amount
+            except ValueError as e:
+                raise ResponseError("value is not an integer or out of range") from e
+            # 与 Redis 一致，INCRBY 保留原有的过期时间
+            expire_at = item[1] if item is not None else None
+            self._put(key, str(value).encode("utf-8"), expire_at)
+            return value
+
+    def incr(self, name: str | bytes, amount: int = 1) -> int:
+        return self.incrby(name, amount)
+
+    def decrby(self, name: str | bytes, amount: int = 1) -> int:
+        return self.incrby(name, -amount)
+
+    def decr(self, name: str | bytes, amount: int = 1) -> int:
+        return self.incrby(name, -amount)
+
+    def scan_iter(
+        self, match: str | None = None, count: int | None = None, **kwargs
+    ) -> Iterator[bytes]:
+        with self._lock:
+            keys = [key for key in list(self._data) if self._get_item(key) is not None]
+        for key in keys:
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key.encode("utf-8")
+
+    def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        if script_sha(script) not in _script_handlers:
+            raise ResponseError("降级模式下不支持该 Lua 脚本")
+        return self.evalsha(script_sha(script), numkeys, *keys_and_args)
+
+    def evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        handler = _script_handlers.get(sha)
+        if handler is None:
+            # 与 Redis 一致，调用方收到 NOSCRIPT 后会执行 SCRIPT LOAD 并重试
+            raise NoScriptError("降级模式下不支持该 Lua 脚本")
+        keys = [_encode_key(key) for key in keys_and_args[:numkeys]]
+        with self._lock:
+            return handler(self, keys, list(keys_and_args[numkeys:]))
+
+    def script_load(self, script: str) -> str:
+        if script_sha(script) not in _script_handlers:
+            raise ResponseError("降级模式下不支持该 Lua 脚本")
+        return script_sha(script)
+
+    def publish(self, channel: str, message: Any) -> int:
+        # 降级期间没有其他订阅者可以收到消息
+        return 0
+
+    def ping(self, **kwargs) -> bool:
+        return True
+
+    def flushdb(self, **kwargs) -> bool:
+        self.clear()
+        return True
+
+    def clear(self) -> None:
+        """清空降级存储"""
+        with self._lock:
+            self._data.clear()
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Any = None
+    ) -> "FallbackPipeline":
+        return FallbackPipeline(self)
+
+
+class FallbackPipeline:
+    """降级存储的管道（排队的命令在 execute 时持锁依次执行）"""
+
+    def __init__(self, store: FallbackStore):
+        self._store = store
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __getattr__(self, name: str) -> Callable[..., "FallbackPipeline"]:
+        if name.startswith("_") or not callable(getattr(self._store, name, None)):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs) -> "FallbackPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self, raise_on_error: bool = True) -> list[Any]:
+        results = []
+        with self._store._lock:
+            for name, args, kwargs in self._commands:
+                try:
+                    results.append(getattr(self._store, name)(*args, **kwargs))
+                except ResponseError as e:
+                    if raise_on_error:
+                        self._commands = []
+                        raise
+                    results.append(e)
+        self._commands = []
+        return results
+
+    def reset(self) -> None:
+        self._commands = []
+
+
+class AsyncFallbackPipeline(FallbackPipeline):
+    """降级存储的异步管道"""
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        return super().execute(raise_on_error)
+
+    async def reset(self) -> None:
+        super().reset()
+
+
+class AsyncFallbackClient:
+    """
+    降级存储的异步客户端
+
+    与 redis.asyncio.Redis 接口一致，实际操作在内存中同步完成。
+    """
+
+    def __init__(self, store: FallbackStore):
+        self.store = store
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.store, name)
+        if name.startswith("_") or not callable(method):
+            return method
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        self.__dict__[name] = call
+        return call
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Any = None
+    ) -> AsyncFallbackPipeline:
+        return AsyncFallbackPipeline(self.store)
+
+    async def scan_iter(
+        self, match: str | None = None, count: int | None = None, **kwargs
+    ) -> AsyncIterator[bytes]:
+        for key in self.store.scan_iter(match=match, count=count):
+            yield key
+
+
+# ==================== 内置脚本的降级实现 ====================
+
+
+def _to_bytes(value: Any) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+def _lock_acquire_fallback(store: FallbackStore, keys: list, args: list) -> int:
+    """加锁 + 栅栏令牌"""
+    if not store.set(keys[0], _to_bytes(args[0]), px=int(args[1]), nx=True):
+        return 0
+    token = store.incr(keys[1])
+    store.expire(keys[1], int(args[2]) / 1000)
+    return token
+
+
+def _lock_release_fallback(store: FallbackStore, keys: list, args: list) -> int:
+    """校验持有者后解锁"""
+    if store.get(keys[0]) == _to_bytes(args[0]):
+        return store.delete(keys[0])
+    return 0
+
+
+def _incr_with_ttl_fallback(store: FallbackStore, keys: list, args: list) -> int:
+    """递增并在首次创建时设置过期时间"""
+    value = store.incrby(keys[0], int(args[0]))
+    if int(args[1]) > 0 and store.ttl(keys[0]) == -1:
+        store.expire(keys[0], int(args[1]))
+    return value
+
+
+def _sliding_window_fallback(store: FallbackStore, keys: list, args: list) -> list:
+    """滑动窗口计数（窗口内的时间戳以逗号分隔保存）"""
+    now, window, limit = int(args[0]), int(args[1]), int(args[2])
+    raw = store.get(keys[0])
+    hits = [int(hit) for hit in raw.split(b",")] if raw else []
+    hits = [hit for hit in hits if hit > now - window]
+    allowed = len(hits) < limit
+    if allowed:
+        hits.append(now)
+    if hits:
+        store.set(keys[0], b",".join(str(hit).encode() for hit in hits), px=window)
+    return [1 if allowed else 0, len(hits)]
+
+
+register_fallback_script(LOCK_ACQUIRE_SCRIPT, _lock_acquire_fallback)
+register_fallback_script(LOCK_RELEASE_SCRIPT, _lock_release_fallback)
+register_fallback_script(INCR_WITH_TTL_SCRIPT, _incr_with_ttl_fallback)
+register_fallback_script(SLIDING_WINDOW_SCRIPT, _sliding_window_fallback)
+
+
+# ==================== 全局实例 ====================
+
+_fallback_store: FallbackStore | None = None
+_global_lock = threading.Lock()
+
+
+def get_fallback_store(max_size: int = 10000) -> FallbackStore:
+    """
+    获取进程内降级存储（单例模式，同步 / 异步缓存服务共用）
+
+    参数仅在首次创建时生效。
+
+    Returns:
+        降级存储实例
+    """
+    global _fallback_store
+
+    if _fallback_store is None:
+        with _global_lock:
+            if _fallback_store is None:
+                _fallback_store = FallbackStore(max_size)
+    return _fallback_store
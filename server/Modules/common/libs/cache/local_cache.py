@@ -0,0 +1,396 @@
+"""
+进程内本地缓存（L1）
+
+在 Redis（L2）之前提供一层有界、带 TTL 的 LRU 内存缓存，
+并通过 Redis 发布/订阅在所有 uvicorn / Celery 进程之间广播失效消息。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from loguru import logger
+
+
+class LocalCache:
+    """
+    进程内 LRU 缓存
+
+    主要功能：
+    - 容量有界，超出时淘汰最久未使用的键
+    - 每个键独立过期时间
+    - 按键前缀统计命中 / 未命中次数
+    - 通过失效代数（generation）避免并发读写导致的脏数据回填
+
+    使用示例：
+        local = LocalCache(max_size=1000, default_ttl=60)
+        local.set("sys_config:group:site", b"{...}")
+        hit, value = local.get("sys_config:group:site")
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        default_ttl: int = 60,
+        prefixes: Iterable[str] | None = None,
+    ):
+        """
+        初始化本地缓存
+
+        Args:
+            max_size: 最大缓存键数量
+            default_ttl: 默认过期时间（秒）
+            prefixes: 允许进入本地缓存的键前缀，为空表示所有键
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.prefixes: tuple[str, ...] = tuple(prefixes or ())
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._stats: dict[str, dict[str, int]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """当前失效代数，每次失效操作都会递增"""
+        return self._generation
+
+    def accepts(self, key: str) -> bool:
+        """
+        判断键是否允许进入本地缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            是否允许缓存
+        """
+        return not self.prefixes or key.startswith(self.prefixes)
+
+    @staticmethod
+    def _stat_prefix(key: str) -> str:
+        """统计用的键前缀（去掉最后一段），如 sys_config:group:site -> sys_config:group"""
+        return key.rsplit(":", 1)[0] if ":" in key else key
+
+    def _record(self, key: str, field: str) -> None:
+        """记录命中 / 未命中（调用方需持有锁）"""
+        prefix = self._stat_prefix(key)
+        stats = self._stats.get(prefix)
+        if stats is None:
+            stats = self._stats[prefix] = {"hits": 0, "misses": 0}
+        stats[field] += 1
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        获取本地缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            (是否命中, 缓存值)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expire_at, value = item
+                if expire_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self._record(key, "hits")
+                    return True, value
+                del self._data[key]
+            self._record(key, "misses")
+            return False, None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        generation: int | None = None,
+    ) -> bool:
+        """
+        写入本地缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 过期时间（秒，通常为 Redis 中的剩余过期时间），None 表示使用默认过期时间，
+                超过默认过期时间时按默认过期时间
+            generation: 读取 Redis 之前记录的失效代数，
+                若期间发生过失效则放弃写入，避免回填旧值
+
+        Returns:
+            是否写入成功
+        """
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            return False
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            return True
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """
+        删除多个本地缓存键
+
+        Args:
+            keys: 缓存键列表
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete(self, key: str) -> None:
+        """删除单个本地缓存键"""
+        self.delete_many([key])
+
+    def clear(self) -> None:
+        """清空本地缓存"""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含容量、当前大小和按前缀统计的命中信息
+        """
+        with self._lock:
+            prefixes = {}
+            for prefix, stats in self._stats.items():
+                total = stats["hits"] + stats["misses"]
+                prefixes[prefix] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / total, 4) if total else 0.0,
+                }
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "prefixes": prefixes,
+            }
+
+    def reset_stats(self) -> None:
+        """重置命中统计"""
+        with self._lock:
+            self._stats.clear()
+
+
+class CacheInvalidationListener:
+    """
+    缓存失效消息订阅器
+
+    在后台线程中订阅 Redis 频道，收到失效消息后清除本地缓存中的对应键。
+    订阅断开期间本地缓存不可用（healthy 为 False），重新订阅时会清空本地缓存，
+    从而保证不会因为错过失效消息而返回过期数据。
+    """
+
+    def __init__(
+        self,
+        local_cache: LocalCache,
+        client_getter: Callable[[], Any],
+        channel: str,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+    ):
+        """
+        初始化订阅器
+
+        Args:
+            local_cache: 本地缓存实例
+            client_getter: 返回同步 Redis 客户端的函数
+            channel: 失效消息频道
+            retry_interval: 订阅失败后的初始重试间隔（秒）
+            max_retry_interval: 连续失败时重试间隔的上限（秒），每次失败间隔翻倍
+        """
+        self._local_cache = local_cache
+        self._client_getter = client_getter
+        self.channel = channel
+        self._retry_interval = retry_interval
+        self._max_retry_interval = max(max_retry_interval, retry_interval)
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._pid: int | None = None
+        self.healthy = False
+
+    def ensure_started(self) -> None:
+        """确保订阅线程已启动（fork 出的子进程会重新启动）"""
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._start_lock:
+            if (
+                self._pid == pid
+                and self._thread is not None
+                and self._thread.is_alive()
+            ):
+                return
+
+            if self._pid is not None and self._pid != pid:
+                # 子进程继承了父进程的本地缓存，可能已经过期
+                self._local_cache.clear()
+
+            self._pid = pid
+            self.healthy = False
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="cache-invalidation-listener",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """停止订阅线程"""
+        self._stop_event.set()
+        self.healthy = False
+
+    def _run(self) -> None:
+        """订阅循环（连续失败时按指数退避重试，只在首次失败时记录警告）"""
+        stop_event = self._stop_event
+        delay = self._retry_interval
+        failures = 0
+        while not stop_event.is_set():
+            pubsub = None
+            try:
+                client = self._client_getter()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # 订阅建立之前可能错过了失效消息，清空本地缓存
+                self._local_cache.clear()
+                self.healthy = True
+                delay = self._retry_interval
+                failures = 0
+                logger.info(f"缓存失效订阅已建立 - channel: {self.channel}")
+
+                while not stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_message(message.get("data"))
+            except Exception as e:
+                failures += 1
+                log = logger.warning if failures == 1 else logger.debug
+                log(
+                    f"缓存失效订阅异常 - channel: {self.channel}, "
+                    f"failures: {failures}, retry_in: {delay}s, error: {e}"
+                )
+            finally:
+                self.healthy = False
+                self._local_cache.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+            stop_event.wait(delay)
+            if failures:
+                delay = min(delay * 2, self._max_retry_interval)
+
+    def handle_message(self, data: str | bytes | None) -> None:
+        """
+        处理失效消息
+
+        Args:
+            data: 消息内容，格式为 {"keys": [...]} 或 {"all": true}
+        """
+        if data is None:
+            return
+        try:
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            payload = json.loads(data)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"缓存失效消息格式错误 - data: {data}, error: {e}")
+            return
+
+        if payload.get("all"):
+            self._local_cache.clear()
+        else:
+            self._local_cache.delete_many(payload.get("keys", []))
+
+    @staticmethod
+    def build_message(keys: list[str] | None) -> str:
+        """
+        构建失效消息
+
+        Args:
+            keys: 失效的键列表，None 表示清空所有本地缓存
+
+        Returns:
+            消息字符串
+        """
+        if keys is None:
+            return json.dumps({"all": True})
+        return json.dumps({"keys": keys}, ensure_ascii=False)
+
+
+# ==================== 全局实例 ====================
+
+_local_cache: LocalCache | None = None
+_invalidation_listener: CacheInvalidationListener | None = None
+_global_lock = threading.Lock()
+
+
+def get_local_cache(
+    max_size: int = 10000,
+    default_ttl: int = 60,
+    prefixes: Iterable[str] | None = None,
+) -> LocalCache:
+    """
+    获取进程内本地缓存实例（单例模式）
+
+    参数仅在首次创建时生效。
+
+    Returns:
+        本地缓存实例
+    """
+    global _local_cache
+
+    if _local_cache is None:
+        with _global_lock:
+            if _local_cache is None:
+                _local_cache = LocalCache(max_size, default_ttl, prefixes)
+    return _local_cache
+
+
+def get_invalidation_listener(
+    client_getter: Callable[[], Any],
+    channel: str,
+) -> CacheInvalidationListener:
+    """
+    获取并启动缓存失效订阅器（单例模式）
+
+    Args:
+        client_getter: 返回同步 Redis 客户端的函数
+        channel: 失效消息频道
+
+    Returns:
+        缓存失效订阅器实例
+    """
+    global _invalidation_listener
+
+    if _invalidation_listener is None:
+        with _global_lock:
+            if _invalidation_listener is None:
+                _invalidation_listener = CacheInvalidationListener(
+                    get_local_cache(), client_getter, channel
+                )
+    _invalidation_listener.ensure_started()
+    return _invalidation_listener
@@ -0,0 +1,223 @@
+"""
+缓存管道
+
+将多条缓存命令合并为一次网络往返（可选 MULTI/EXEC 事务），
+自动处理键名前缀、序列化 / 反序列化以及本地缓存失效广播。
+
+集群模式下 redis-py 的集群管道不支持 PUBLISH 和多键 DEL：
+DEL 按键逐条排队，失效广播在管道执行后通过客户端单独发送。
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cache import _BaseCacheService
+
+# 单条 DEL 命令的最大键数量，避免生成过大的命令
+DELETE_CHUNK_SIZE = 1000
+
+
+class _BaseCachePipeline:
+    """
+    缓存管道基类
+
+    负责命令排队和结果处理，执行逻辑由同步 / 异步子类实现。
+    每个排队方法返回管道自身，支持链式调用。
+    """
+
+    def __init__(self, service: "_BaseCacheService", pipe: Any, cluster: bool = False):
+        """
+        初始化缓存管道
+
+        Args:
+            service: 所属缓存服务
+            pipe: Redis 原生管道对象
+            cluster: 是否为集群管道
+        """
+        self._service = service
+        self._pipe = pipe
+        self._cluster = cluster
+        self._handlers: list[Callable[[Any], Any]] = []
+        self._invalidate_keys: list[str] = []
+        self.results: list[Any] = []
+
+    def __len__(self) -> int:
+        """已排队的命令数量"""
+        return len(self._handlers)
+
+    def _resolve_ttl(self, ttl: int | None) -> int:
+        """解析过期时间，None 表示使用默认过期时间"""
+        return self._service._default_ttl if ttl is None else ttl
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> "_BaseCachePipeline":
+        """排队设置缓存值（SETEX），结果为是否成功"""
+        self._pipe.setex(
+            self._service._build_key(key),
+            self._resolve_ttl(ttl),
+            self._service._serialize(value, key),
+        )
+        self._handlers.append(bool)
+        self._invalidate_keys.append(key)
+        return self
+
+    def setnx(
+        self, key: str, value: Any, ttl: int | None = None
+    ) -> "_BaseCachePipeline":
+        """排队原子设置缓存值（SET NX EX），结果为是否设置成功"""
+        self._pipe.set(
+            self._service._build_key(key),
+            self._service._serialize(value, key),
+            nx=True,
+            ex=self._resolve_ttl(ttl),
+        )
+        self._handlers.append(bool)
+        self._invalidate_keys.append(key)
+        return self
+
+    def get(self, key: str) -> "_BaseCachePipeline":
+        """排队获取缓存值，结果为反序列化后的值（不存在时为 None）"""
+        self._pipe.get(self._service._build_key(key))
+        self._handlers.append(self._service._deserialize)
+        return self
+
+    def delete(self, *keys: str) -> "_BaseCachePipeline":
+        """排队删除缓存，结果为删除数量（键较多时自动分批，集群模式下每个键一条结果）"""
+        if not keys:
+            return self
+
+        full_keys = [self._service._build_key(key) for key in keys]
+        chunk_size = 1 if self._cluster else DELETE_CHUNK_SIZE
+        for start in range(0, len(full_keys), chunk_size):
+            self._pipe.delete(*full_keys[start : start + chunk_size])
+            self._handlers.append(int)
+        self._invalidate_keys.extend(keys)
+        return self
+
+    def expire(self, key: str, ttl: int) -> "_BaseCachePipeline":
+        """排队设置过期时间，结果为是否成功"""
+        self._pipe.expire(self._service._build_key(key), ttl)
+        self._handlers.append(bool)
+        self._invalidate_keys.append(key)
+        return self
+
+    def increment(self, key: str, delta: int = 1) -> "_BaseCachePipeline":
+        """排队递增缓存值，结果为递增后的值"""
+        self._pipe.incrby(self._service._build_key(key), delta)
+        self._handlers.append(int)
+        self._invalidate_keys.append(key)
+        return self
+
+    def _prepare_execute(self) -> tuple[int, list[str], str | None]:
+        """
+        执行前追加本地缓存失效广播（与其他命令同一次往返）
+
+        本地缓存在执行完成后才清除（见 _finish_execute），
+        避免执行期间的并发读取用旧值回填本地缓存。
+
+        Returns:
+            (业务命令数量（不含失效广播）, 需要失效的键,
+             需要在执行后单独广播的失效消息（集群模式）)
+        """
+        count = len(self._handlers)
+        keys = self._invalidate_keys
+        message = self._service._build_invalidation(keys)
+        if message is not None and not self._cluster:
+            self._pipe.publish(self._service._invalidation_channel, message)
+            message = None
+        return count, keys, message
+
+    def _finish_execute(
+        self, raw_results: list[Any], count: int, keys: list[str]
+    ) -> list[Any]:
+        """清除本地缓存、处理执行结果并重置排队状态"""
+        self._service._clear_local(keys)
+        self.results = [
+            handler(result)
+            for handler, result in zip(self._handlers, raw_results[:count], strict=True)
+        ]
+        self._handlers = []
+        self._invalidate_keys = []
+        return self.results
+
+
+class SyncCachePipeline(_BaseCachePipeline):
+    """
+    同步缓存管道
+
+    使用示例：
+        with cache.pipeline() as p:
+            p.set("a", 1).set("b", 2, ttl=60).delete("c")
+        print(p.results)  # [True, True, 1]
+    """
+
+    def execute(self) -> list[Any]:
+        """
+        执行所有排队命令（一次网络往返）
+
+        Returns:
+            各命令的结果列表（与排队顺序一致）
+        """
+        if not self._handlers:
+            return []
+        count, keys, message = self._prepare_execute()
+        results = self._finish_execute(self._pipe.execute(), count, keys)
+        if message is not None:
+            self._service._publish_invalidation(message)
+        return results
+
+    def reset(self) -> None:
+        """丢弃所有排队命令"""
+        self._pipe.reset()
+        self._handlers = []
+        self._invalidate_keys = []
+
+    def __enter__(self) -> "SyncCachePipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.execute()
+        else:
+            self.reset()
+
+
+class AsyncCachePipeline(_BaseCachePipeline):
+    """
+    异步缓存管道
+
+    使用示例：
+        async with cache.pipeline() as p:
+            p.set("a", 1).set("b", 2, ttl=60).delete("c")
+        print(p.results)  # [True, True, 1]
+    """
+
+    async def execute(self) -> list[Any]:
+        """
+        执行所有排队命令（一次网络往返）
+
+        Returns:
+            各命令的结果列表（与排队顺序一致）
+        """
+        if not self._handlers:
+            return []
+        count, keys, message = self._prepare_execute()
+        results = self._finish_execute(await self._pipe.execute(), count, keys)
+        if message is not None:
+            await self._service._publish_invalidation(message)
+        return results
+
+    async def reset(self) -> None:
+        """丢弃所有排队命令"""
+        await self._pipe.reset()
+        self._handlers = []
+        self._invalidate_keys = []
+
+    async def __aenter__(self) -> "AsyncCachePipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            await self.execute()
+        else:
+            await self.reset()
@@ -0,0 +1,149 @@
+"""
+进程内单飞（single-flight）控制
+
+同一进程内对同一个键的并发计算只执行一次，其余调用方等待并共享结果。
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class _SyncCall:
+    """同步单飞调用记录"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SyncSingleFlight:
+    """
+    同步单飞控制器（线程安全）
+
+    使用示例：
+        flight = SyncSingleFlight()
+        value = flight.do("user:1", lambda: load_user(1))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _SyncCall] = {}
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        stale: Any = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """
+        执行函数，同一键的并发调用只执行一次
+
+        Args:
+            key: 键名
+            fn: 计算函数
+            stale: 旧值，存在时非领导者直接返回旧值而不等待
+            timeout: 非领导者的最长等待时间（秒），超时后自行执行计算函数
+
+        Returns:
+            计算结果
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _SyncCall()
+
+        if not leader:
+            if stale is not None:
+                return stale
+            if not call.event.wait(timeout):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+
+class _LeaderCancelledError(Exception):
+    """领导者协程被取消，等待方需要自行计算"""
+
+
+class AsyncSingleFlight:
+    """
+    异步单飞控制器
+
+    以 (事件循环, 键) 区分调用，避免跨事件循环共享 Future。
+
+    使用示例：
+        flight = AsyncSingleFlight()
+        value = await flight.do("user:1", lambda: load_user(1))
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple[int, str], asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        stale: Any = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """
+        执行协程函数，同一键的并发调用只执行一次
+
+        Args:
+            key: 键名
+            fn: 返回协程的计算函数
+            stale: 旧值，存在时非领导者直接返回旧值而不等待
+            timeout: 非领导者的最长等待时间（秒），超时后自行执行计算函数
+
+        Returns:
+            计算结果
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+
+        future = self._calls.get(call_key)
+        if future is not None:
+            if stale is not None:
+                return stale
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except (TimeoutError, _LeaderCancelledError):
+                return await fn()
+
+        future = loop.create_future()
+        self._calls[call_key] = future
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # 标记异常已被读取，避免无人等待时输出警告
+            future.exception()
+            raise
+        except BaseException:
+            future.set_exception(_LeaderCancelledError())
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(call_key, None)
@@ -147,14 +147,29 @@ class CaptchaService:
             # 验证答案（忽略大小写）
             is_valid = str(answer).strip().lower() == str(stored_answer).lower()
 
+            max_attempts = self._config.max_attempts
+            attempts_key = f"{cache_key}:attempts"
             if is_valid:
                 # 验证成功，删除验证码（一次性使用）
-                await self._cache_service.delete(cache_key)
+                if max_attempts > 0:
+                    await self._cache_service.delete_many([cache_key, attempts_key])
+                else:
+                    await self._cache_service.delete(cache_key)
                 logger.debug(f"验证码验证成功: {captcha_id}")
             else:
                 logger.warning(
                     f"验证码验证失败: {captcha_id}, 输入: {answer}, 正确: {stored_answer}"
                 )
+                # 开启错误次数限制时计数，计数与验证码同时过期（递增和设置过期时间原子完成）
+                if max_attempts > 0:
+                    attempts = await self._cache_service.increment(
+                        attempts_key, ttl=self._config.expire_seconds
+                    )
+                    if attempts >= max_attempts:
+                        await self._cache_service.delete_many([cache_key, attempts_key])
+                        logger.warning(
+                            f"验证码错误次数过多，已失效: {captcha_id}, 次数: {attempts}"
+                        )
 
             return is_valid
 
@@ -4,6 +4,7 @@ Celery 服务类
 该模块提供 Celery 应用实例的完整管理功能，包括：
 - Celery 应用初始化和配置
 - FastAPI 集成
+- 任务的 SQL 执行统计（慢查询日志、N+1 检测）
 
 使用示例:
     from Modules.common.libs.celery.celery_service import get_celery_service
@@ -34,8 +35,28 @@ from typing import Any
 from loguru import logger
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
 
 from ..config import Config
+from ..database.sql.instrumentation import begin_tracking, end_tracking
+
+# 执行中任务的 SQL 统计（任务ID -> (统计对象, 令牌)）
+_task_query_stats: dict[str, Any] = {}
+
+
+@task_prerun.connect
+def _begin_task_query_stats(task_id=None, task=None, **kwargs) -> None:
+    """任务开始执行时开启 SQL 统计（慢查询日志、N+1 检测、任务结束时的统计摘要）"""
+    if task_id is not None:
+        _task_query_stats[task_id] = begin_tracking(f"task {task.name}")
+
+
+@task_postrun.connect
+def _end_task_query_stats(task_id=None, **kwargs) -> None:
+    """任务执行结束时输出 SQL 统计摘要"""
+    entry = _task_query_stats.pop(task_id, None)
+    if entry is not None:
+        end_tracking(*entry)
 
 
 class CeleryService:
@@ -45,6 +66,7 @@ class CeleryService:
     提供 Celery 应用的完整管理功能：
     - 应用初始化和配置
     - FastAPI 集成
+    - 任务的 SQL 执行统计（task_prerun / task_postrun 信号）
 
     主要功能：
     - 封装 Celery 应用实例
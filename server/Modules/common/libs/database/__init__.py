@@ -11,6 +11,7 @@ from .redis import (
     close_redis_clients,
     close_redis_clients_sync,
     get_async_redis_client,
+    get_circuit_breaker_stats,
     get_redis,
     get_redis_client,
     init_redis_clients,
@@ -52,4 +53,5 @@ __all__ = [
     "get_redis",
     "close_redis_clients",
     "close_redis_clients_sync",
+    "get_circuit_breaker_stats",
 ]
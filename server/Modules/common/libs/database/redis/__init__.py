@@ -4,6 +4,14 @@ Redis 模块
 提供 Redis 客户端管理和操作功能。
 """
 
+from .circuit_breaker import (
+    AsyncGuardedRedis,
+    CircuitBreaker,
+    CircuitOpenError,
+    GuardedRedis,
+    get_circuit_breaker,
+    get_circuit_breaker_stats,
+)
 from .client import (
     RedisClientManager,
     close_redis_clients,
@@ -11,8 +19,28 @@ from .client import (
     get_async_redis_client,
     get_redis,
     get_redis_client,
+    get_redis_pool_stats,
+    get_redis_script,
     init_redis_clients,
     redis_manager,
+    register_redis_script,
+)
+from .pool import PoolMetrics, build_connection_pool
+from .scripts import (
+    SCRIPT_INCR_WITH_TTL,
+    SCRIPT_LOCK_ACQUIRE,
+    SCRIPT_LOCK_RELEASE,
+    SCRIPT_SLIDING_WINDOW,
+    RedisScript,
+    ScriptRegistry,
+)
+from .topology import (
+    MODE_CLUSTER,
+    MODE_SENTINEL,
+    MODE_STANDALONE,
+    RedisTopology,
+    build_topology,
+    parse_nodes,
 )
 
 __all__ = [
@@ -26,4 +54,31 @@ __all__ = [
     "get_redis",
     "close_redis_clients",
     "close_redis_clients_sync",
+    "get_redis_pool_stats",
+    "get_redis_script",
+    "register_redis_script",
+    # 连接池
+    "PoolMetrics",
+    "build_connection_pool",
+    # 部署模式
+    "MODE_STANDALONE",
+    "MODE_SENTINEL",
+    "MODE_CLUSTER",
+    "RedisTopology",
+    "build_topology",
+    "parse_nodes",
+    # Lua 脚本
+    "RedisScript",
+    "ScriptRegistry",
+    "SCRIPT_LOCK_ACQUIRE",
+    "SCRIPT_LOCK_RELEASE",
+    "SCRIPT_INCR_WITH_TTL",
+    "SCRIPT_SLIDING_WINDOW",
+    # 熔断器
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "GuardedRedis",
+    "AsyncGuardedRedis",
+    "get_circuit_breaker",
+    "get_circuit_breaker_stats",
 ]
@@ -0,0 +1,504 @@
+"""
+Redis 熔断器
+
+Redis 变慢或宕机时，每次命令都要等待 socket_timeout 才会失败。
+熔断器在连续失败达到阈值后打开，冷却期内直接拒绝命令（不再等待超时），
+冷却结束后进入半开状态，只放行少量探测命令：探测成功则关闭熔断，失败则重新打开。
+
+状态流转：
+    closed --连续失败 N 次--> open --冷却结束--> half_open --探测成功--> closed
+                                ^                    |
+                                +------探测失败-------+
+"""
+
+import inspect
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any
+
+from loguru import logger
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+# 计入熔断的异常（网络类故障），命令本身的错误（如 WRONGTYPE）不计入
+FAILURE_EXCEPTIONS: tuple[type[BaseException], ...] = (
+    RedisConnectionError,
+    RedisTimeoutError,
+)
+
+
+class CircuitOpenError(RedisConnectionError):
+    """熔断器打开时拒绝执行命令"""
+
+
+class CircuitBreaker:
+    """
+    熔断器（线程安全，同步 / 异步客户端共用）
+
+    使用示例：
+        breaker = CircuitBreaker("cache", failure_threshold=5, recovery_timeout=30)
+        probe = breaker.before_call()  # 熔断打开时抛出 CircuitOpenError
+        try:
+            result = client.get("foo")
+        except FAILURE_EXCEPTIONS as e:
+            breaker.record_failure(e, probe)
+            raise
+        breaker.record_success(probe)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            name: 熔断器名称（通常为 Redis 连接名称）
+            failure_threshold: 连续失败多少次后打开熔断
+            recovery_timeout: 熔断打开后的冷却时间（秒）
+            half_open_max_calls: 半开状态下同时放行的探测命令数量
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._failures_total = 0
+        self._rejected_total = 0
+        self._opened_total = 0
+        self._last_error: str | None = None
+        self._last_failure_at: float | None = None
+        self._state_changed_at = time.time()
+        self._listeners: list[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+
+    # ==================== 状态 ====================
+
+    def _refresh_state(self, changes: list[tuple[str, str]]) -> str:
+        """冷却结束时由 open 进入 half_open（调用方需持有锁）"""
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._probes_in_flight = 0
+            self._set_state(self.HALF_OPEN, changes)
+        return self._state
+
+    def _set_state(self, state: str, changes: list[tuple[str, str]]) -> None:
+        """切换状态并记录变更（调用方需持有锁）"""
+        if state == self._state:
+            return
+        changes.append((self._state, state))
+        self._state = state
+        self._state_changed_at = time.time()
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self._opened_total += 1
+        elif state == self.CLOSED:
+            self._consecutive_failures = 0
+
+    def _notify(self, changes: list[tuple[str, str]]) -> None:
+        """在锁外记录日志并通知监听器"""
+        for old, new in changes:
+            if new == self.OPEN:
+                logger.warning(
+                    f"Redis 熔断已打开 - name: {self.name}, "
+                    f"冷却时间: {self.recovery_timeout}s, error: {self._last_error}"
+                )
+            else:
+                logger.info(f"Redis 熔断状态变更 - name: {self.name}, {old} -> {new}")
+            for listener in list(self._listeners):
+                try:
+                    listener(old, new)
+                except Exception as e:
+                    logger.warning(
+                        f"熔断状态监听器执行失败 - name: {self.name}, error: {e}"
+                    )
+
+    @property
+    def state(self) -> str:
+        """当前状态：closed / open / half_open"""
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            state = self._refresh_state(changes)
+        self._notify(changes)
+        return state
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> None:
+        """
+        注册状态变更监听器（重复注册同一个函数无副作用）
+
+        Args:
+            listener: 回调函数，参数为 (旧状态, 新状态)
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    # ==================== 调用控制 ====================
+
+    def allow_request(self) -> bool:
+        """
+        当前是否应当访问 Redis（不占用探测名额）
+
+        Returns:
+            closed 时为 True；half_open 且探测名额未用完时为 True；否则为 False
+        """
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            state = self._refresh_state(changes)
+            allowed = state == self.CLOSED or (
+                state == self.HALF_OPEN
+                and self._probes_in_flight < self.half_open_max_calls
+            )
+        self._notify(changes)
+        return allowed
+
+    def before_call(self) -> bool:
+        """
+        命令执行前调用
+
+        Returns:
+            本次调用是否为半开状态下的探测调用
+
+        Raises:
+            CircuitOpenError: 熔断打开或探测名额已用完
+        """
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            state = self._refresh_state(changes)
+            if state == self.CLOSED:
+                probe = False
+            elif (
+                state == self.HALF_OPEN
+                and self._probes_in_flight < self.half_open_max_calls
+            ):
+                self._probes_in_flight += 1
+                probe = True
+            else:
+                self._rejected_total += 1
+                probe = None
+        self._notify(changes)
+        if probe is None:
+            raise CircuitOpenError(f"Redis 熔断已打开 - name: {self.name}")
+        return probe
+
+    def record_success(self, probe: bool = False) -> None:
+        """
+        记录命令成功
+
+        Args:
+            probe: 是否为探测调用
+        """
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            if probe:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if self._state == self.HALF_OPEN:
+                    self._set_state(self.CLOSED, changes)
+            elif self._state == self.CLOSED:
+                self._consecutive_failures = 0
+        self._notify(changes)
+
+    def record_failure(
+        self, error: BaseException | None = None, probe: bool = False
+    ) -> None:
+        """
+        记录命令失败
+
+        Args:
+            error: 失败原因
+            probe: 是否为探测调用
+        """
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            self._failures_total += 1
+            self._last_failure_at = time.time()
+            if error is not None:
+                self._last_error = f"{type(error).__name__}: {error}"
+
+            if probe:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if self._state == self.HALF_OPEN:
+                    self._set_state(self.OPEN, changes)
+            elif self._state == self.CLOSED:
+                self._consecutive_failures += 1
+                if self._consecutive_failures >= self.failure_threshold:
+                    self._set_state(self.OPEN, changes)
+        self._notify(changes)
+
+    def reset(self) -> None:
+        """强制关闭熔断（如运维确认 Redis 已恢复）"""
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            self._probes_in_flight = 0
+            self._set_state(self.CLOSED, changes)
+        self._notify(changes)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        获取熔断器状态（用于监控）
+
+        Returns:
+            状态、失败计数、拒绝次数和剩余冷却时间等信息
+        """
+        changes: list[tuple[str, str]] = []
+        with self._lock:
+            state = self._refresh_state(changes)
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(
+                    0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)
+                )
+            stats = {
+                "name": self.name,
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+                "retry_in": round(retry_in, 3),
+                "failures_total": self._failures_total,
+                "rejected_total": self._rejected_total,
+                "opened_total": self._opened_total,
+                "last_error": self._last_error,
+                "last_failure_at": self._last_failure_at,
+                "state_changed_at": self._state_changed_at,
+            }
+        self._notify(changes)
+        return stats
+
+
+# ==================== 客户端包装 ====================
+
+# 不经过熔断器的客户端属性（不执行命令或有独立的连接管理）
+_UNGUARDED = frozenset(
+    {
+        "pubsub",
+        "monitor",
+        "lock",
+        "register_script",
+        "close",
+        "aclose",
+        "connection_pool",
+        "get_encoder",
+        "get_connection_kwargs",
+    }
+)
+
+
+class _GuardedPipeline:
+    """受熔断器保护的同步管道（仅 execute 会访问 Redis）"""
+
+    def __init__(self, pipe: Any, breaker: CircuitBreaker):
+        self._pipe = pipe
+        self._breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pipe, name)
+
+    def __len__(self) -> int:
+        return len(self._pipe)
+
+    def execute(self, *args, **kwargs) -> list[Any]:
+        probe = self._breaker.before_call()
+        try:
+            result = self._pipe.execute(*args, **kwargs)
+        except FAILURE_EXCEPTIONS as e:
+            self._breaker.record_failure(e, probe)
+            raise
+        except BaseException:
+            self._breaker.record_success(probe)
+            raise
+        self._breaker.record_success(probe)
+        return result
+
+
+class _AsyncGuardedPipeline(_GuardedPipeline):
+    """受熔断器保护的异步管道"""
+
+    async def execute(self, *args, **kwargs) -> list[Any]:
+        probe = self._breaker.before_call()
+        try:
+            result = await self._pipe.execute(*args, **kwargs)
+        except FAILURE_EXCEPTIONS as e:
+            self._breaker.record_failure(e, probe)
+            raise
+        except BaseException:
+            self._breaker.record_success(probe)
+            raise
+        self._breaker.record_success(probe)
+        return result
+
+
+class GuardedRedis:
+    """
+    受熔断器保护的同步 Redis 客户端
+
+    所有命令调用前经过熔断器检查，网络类异常计入失败；
+    其他属性（如 pubsub）直接透传给原始客户端。
+    """
+
+    def __init__(self, client: Any, breaker: CircuitBreaker):
+        """
+        初始化包装客户端
+
+        Args:
+            client: 原始 Redis 客户端
+            breaker: 熔断器
+        """
+        self.client = client
+        self.breaker = breaker
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+        if name.startswith("_") or name in _UNGUARDED or not callable(attr):
+            return attr
+        wrapper = self._wrap(attr)
+        # 缓存包装后的方法，后续访问不再经过 __getattr__
+        self.__dict__[name] = wrapper
+        return wrapper
+
+    def _wrap(self, method: Callable) -> Callable:
+        breaker = self.breaker
+
+        def guarded(*args, **kwargs):
+            probe = breaker.before_call()
+            try:
+                result = method(*args, **kwargs)
+            except FAILURE_EXCEPTIONS as e:
+                breaker.record_failure(e, probe)
+                raise
+            except BaseException:
+                breaker.record_success(probe)
+                raise
+            breaker.record_success(probe)
+            return result
+
+        return guarded
+
+    def pipeline(self, *args, **kwargs) -> _GuardedPipeline:
+        """创建受保护的管道"""
+        return _GuardedPipeline(self.client.pipeline(*args, **kwargs), self.breaker)
+
+    def scan_iter(self, *args, **kwargs) -> Iterator[Any]:
+        """受保护的 SCAN 遍历（整个遍历过程视为一次调用）"""
+        probe = self.breaker.before_call()
+        try:
+            yield from self.client.scan_iter(*args, **kwargs)
+        except FAILURE_EXCEPTIONS as e:
+            self.breaker.record_failure(e, probe)
+            raise
+        except BaseException:
+            self.breaker.record_success(probe)
+            raise
+        self.breaker.record_success(probe)
+
+
+class AsyncGuardedRedis(GuardedRedis):
+    """受熔断器保护的异步 Redis 客户端"""
+
+    def _wrap(self, method: Callable) -> Callable:
+        breaker = self.breaker
+
+        async def run(awaitable: Awaitable, probe: bool) -> Any:
+            try:
+                result = await awaitable
+            except FAILURE_EXCEPTIONS as e:
+                breaker.record_failure(e, probe)
+                raise
+            except BaseException:
+                breaker.record_success(probe)
+                raise
+            breaker.record_success(probe)
+            return result
+
+        def guarded(*args, **kwargs):
+            result = method(*args, **kwargs)
+            if not inspect.isawaitable(result):
+                return result
+            try:
+                probe = breaker.before_call()
+            except CircuitOpenError:
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise
+            return run(result, probe)
+
+        return guarded
+
+    def pipeline(self, *args, **kwargs) -> _AsyncGuardedPipeline:
+        """创建受保护的管道"""
+        return _AsyncGuardedPipeline(
+            self.client.pipeline(*args, **kwargs), self.breaker
+        )
+
+    async def scan_iter(self, *args, **kwargs) -> AsyncIterator[Any]:
+        """受保护的 SCAN 遍历（整个遍历过程视为一次调用）"""
+        probe = self.breaker.before_call()
+        try:
+            async for key in self.client.scan_iter(*args, **kwargs):
+                yield key
+        except FAILURE_EXCEPTIONS as e:
+            self.breaker.record_failure(e, probe)
+            raise
+        except BaseException:
+            self.breaker.record_success(probe)
+            raise
+        self.breaker.record_success(probe)
+
+
+# ==================== 全局实例 ====================
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    name: str,
+    failure_threshold: int = 5,
+    recovery_timeout: float = 30.0,
+) -> CircuitBreaker:
+    """
+    获取 Redis 连接对应的熔断器（同一连接的同步 / 异步客户端共用）
+
+    参数仅在首次创建时生效。
+
+    Args:
+        name: Redis 连接名称
+        failure_threshold: 连续失败多少次后打开熔断
+        recovery_timeout: 冷却时间（秒）
+
+    Returns:
+        熔断器实例
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(
+                    name, failure_threshold, recovery_timeout
+                )
+    return breaker
+
+
+def get_circuit_breaker_stats() -> dict[str, dict[str, Any]]:
+    """
+    获取所有熔断器的状态（用于监控）
+
+    Returns:
+        连接名称 -> 熔断器状态
+    """
+    return {name: breaker.stats() for name, breaker in list(_breakers.items())}
@@ -1,17 +1,19 @@
 """
 Redis 客户端管理类
 
-负责创建和管理 Redis 连接，支持多个 Redis 实例和连接池配置。
+负责创建和管理 Redis 连接，支持多个 Redis 实例和连接池配置，
+以及单节点、哨兵（Sentinel）和集群（Cluster）三种部署模式。
 """
 
 from typing import Any
 
 from loguru import logger
 from redis import Redis
-from redis.asyncio import ConnectionPool
 from redis.asyncio import Redis as AsyncRedis
 
 from ...config import Config
+from .scripts import BUILTIN_SCRIPTS, RedisScript, ScriptRegistry
+from .topology import build_topology
 
 
 class RedisClientManager:
@@ -25,7 +27,15 @@ class RedisClientManager:
         # 全局 Redis 客户端实例
         self._clients: dict[str, Redis] = {}
         self._async_clients: dict[str, AsyncRedis] = {}
-        self._connection_pools: dict[str, ConnectionPool] = {}
+        # 只读（从节点）客户端，仅哨兵 / 集群模式下存在
+        self._replica_clients: dict[str, Redis] = {}
+        self._async_replica_clients: dict[str, AsyncRedis] = {}
+        # 连接名称 -> {sync / async / sync_replica / async_replica: 连接池}
+        self._connection_pools: dict[str, dict[str, Any]] = {}
+        # 连接名称 -> 部署模式
+        self._modes: dict[str, str] = {}
+        # Lua 脚本注册表（所有连接共用）
+        self._scripts = ScriptRegistry(BUILTIN_SCRIPTS)
 
     @staticmethod
     def _build_redis_url(config: dict[str, Any]) -> str:
@@ -78,9 +88,13 @@ class RedisClientManager:
         # 为每个连接创建客户端
         for name, config in redis_configs.items():
             try:
-                # 构建连接 URL
-                redis_url = self._build_redis_url(config)
-                logger.info(f"正在创建 Redis 客户端 '{name}': {redis_url}")
+                mode = config.get("mode") or "standalone"
+                if mode == "standalone":
+                    # 构建连接 URL
+                    redis_url = self._build_redis_url(config)
+                    logger.info(f"正在创建 Redis 客户端 '{name}': {redis_url}")
+                else:
+                    logger.info(f"正在创建 Redis 客户端 '{name}' - mode: {mode}")
 
                 # 连接池配置
                 pool_kwargs = {
@@ -96,32 +110,77 @@ class RedisClientManager:
                     "health_check_interval": config.get("health_check_interval", 30),
                 }
 
-                # 创建异步连接池
-                async_pool = ConnectionPool(**pool_kwargs)
-                self._connection_pools[name] = async_pool
-
-                # 创建同步客户端
-                sync_client = Redis.from_url(redis_url)
-                self._clients[name] = sync_client
-
-                # 创建异步客户端
-                async_client = AsyncRedis(connection_pool=async_pool)
-                self._async_clients[name] = async_client
+                # 按部署模式创建同步 / 异步客户端（同步和异步使用相同的连接配置）
+                topology = build_topology(config, pool_kwargs)
+                self._clients[name] = topology.client
+                self._async_clients[name] = topology.async_client
+                if topology.replica_client is not None:
+                    self._replica_clients[name] = topology.replica_client
+                if topology.async_replica_client is not None:
+                    self._async_replica_clients[name] = topology.async_replica_client
+                self._connection_pools[name] = topology.pools
+                self._modes[name] = topology.mode
 
                 logger.info(f"Redis 客户端 '{name}' 创建成功")
 
+                self._load_scripts(name)
+
             except Exception as e:
                 logger.error(f"创建 Redis 客户端 '{name}' 失败: {e}")
                 continue
 
         logger.info("Redis 客户端初始化完成")
 
-    def get_client(self, name: str = "default") -> Redis:
+    def _load_scripts(self, name: str) -> None:
+        """
+        预加载 Lua 脚本
+
+        加载失败（如 Redis 暂时不可用）不影响客户端创建，首次执行脚本时会自动加载。
+
+        Args:
+            name: 连接名称
+        """
+        try:
+            self._scripts.load(self._clients[name])
+            logger.info(f"Redis 客户端 '{name}' 已预加载 {len(self._scripts)} 个脚本")
+        except Exception as e:
+            logger.warning(f"预加载 Redis 脚本失败 - name: {name}, error: {e}")
+
+    def register_script(self, name: str, source: str) -> RedisScript:
+        """
+        注册 Lua 脚本
+
+        Args:
+            name: 脚本名称
+            source: Lua 脚本内容
+
+        Returns:
+            脚本实例，调用 script(client, keys, args) 执行
+        """
+        return self._scripts.register(name, source)
+
+    def get_script(self, name: str) -> RedisScript:
+        """
+        获取已注册的 Lua 脚本
+
+        Args:
+            name: 脚本名称
+
+        Returns:
+            脚本实例
+
+        Raises:
+            ValueError: 脚本未注册
+        """
+        return self._scripts.get(name)
+
+    def get_client(self, name: str = "default", replica: bool = False) -> Redis:
         """
         获取 Redis 客户端（同步）
 
         Args:
             name: 连接名称，默认为 "default"
+            replica: 是否获取只读（从节点）客户端，没有从节点时返回主节点客户端
 
         Returns:
             Redis: Redis 客户端实例
@@ -132,14 +191,19 @@ class RedisClientManager:
         if name not in self._clients:
             raise ValueError(f"Redis 客户端 '{name}' 不存在")
 
+        if replica and name in self._replica_clients:
+            return self._replica_clients[name]
         return self._clients[name]
 
-    def get_async_client(self, name: str = "default") -> AsyncRedis:
+    def get_async_client(
+        self, name: str = "default", replica: bool = False
+    ) -> AsyncRedis:
         """
         获取 Redis 客户端（异步）
 
         Args:
             name: 连接名称，默认为 "default"
+            replica: 是否获取只读（从节点）客户端，没有从节点时返回主节点客户端
 
         Returns:
             AsyncRedis: 异步 Redis 客户端实例
@@ -150,8 +214,45 @@ class RedisClientManager:
         if name not in self._async_clients:
             raise ValueError(f"异步 Redis 客户端 '{name}' 不存在")
 
+        if replica and name in self._async_replica_clients:
+            return self._async_replica_clients[name]
         return self._async_clients[name]
 
+    def get_mode(self, name: str = "default") -> str:
+        """
+        获取连接的部署模式
+
+        Args:
+            name: 连接名称，默认为 "default"
+
+        Returns:
+            standalone / sentinel / cluster
+        """
+        return self._modes.get(name, "standalone")
+
+    def get_pool_stats(self, name: str | None = None) -> dict[str, dict[str, Any]]:
+        """
+        获取连接池指标
+
+        Args:
+            name: 连接名称，None 表示所有连接
+
+        Returns:
+            连接名称 -> {"sync": 同步连接池指标, "async": 异步连接池指标, ...}，
+            哨兵模式下还包括 sync_replica / async_replica；
+            集群模式由客户端按节点管理连接池，不提供指标
+        """
+        names = [name] if name is not None else list(self._clients)
+        stats = {}
+        for pool_name in names:
+            pools = self._connection_pools.get(pool_name, {})
+            stats[pool_name] = {
+                kind: pool.stats()
+                for kind, pool in pools.items()
+                if hasattr(pool, "stats")
+            }
+        return stats
+
     async def close_clients(self) -> None:
         """
         关闭所有 Redis 客户端
@@ -161,34 +262,43 @@ class RedisClientManager:
         """
         logger.info("正在关闭 Redis 客户端...")
 
-        # 关闭同步客户端
-        for name, client in self._clients.items():
-            try:
-                client.close()
-                logger.info(f"同步 Redis 客户端 '{name}' 已关闭")
-            except Exception as e:
-                logger.error(f"关闭同步 Redis 客户端 '{name}' 失败: {e}")
-
-        # 关闭异步客户端
-        for name, client in self._async_clients.items():
-            try:
-                await client.close()
-                logger.info(f"异步 Redis 客户端 '{name}' 已关闭")
-            except Exception as e:
-                logger.error(f"关闭异步 Redis 客户端 '{name}' 失败: {e}")
+        # 关闭同步客户端（包括只读客户端）
+        for clients in (self._clients, self._replica_clients):
+            for name, client in clients.items():
+                try:
+                    client.close()
+                    logger.info(f"同步 Redis 客户端 '{name}' 已关闭")
+                except Exception as e:
+                    logger.error(f"关闭同步 Redis 客户端 '{name}' 失败: {e}")
+
+        # 关闭异步客户端（包括只读客户端）
+        for clients in (self._async_clients, self._async_replica_clients):
+            for name, client in clients.items():
+                try:
+                    await client.aclose()
+                    logger.info(f"异步 Redis 客户端 '{name}' 已关闭")
+                except Exception as e:
+                    logger.error(f"关闭异步 Redis 客户端 '{name}' 失败: {e}")
 
         # 关闭连接池
-        for name, pool in self._connection_pools.items():
-            try:
-                await pool.disconnect()
-                logger.info(f"Redis 连接池 '{name}' 已关闭")
-            except Exception as e:
-                logger.error(f"关闭 Redis 连接池 '{name}' 失败: {e}")
+        for name, pools in self._connection_pools.items():
+            for kind, pool in pools.items():
+                try:
+                    if kind.startswith("async"):
+                        await pool.disconnect()
+                    else:
+                        pool.disconnect()
+                    logger.info(f"Redis 连接池 '{name}' ({kind}) 已关闭")
+                except Exception as e:
+                    logger.error(f"关闭 Redis 连接池 '{name}' ({kind}) 失败: {e}")
 
         # 清空客户端字典
         self._clients.clear()
         self._async_clients.clear()
+        self._replica_clients.clear()
+        self._async_replica_clients.clear()
         self._connection_pools.clear()
+        self._modes.clear()
 
         logger.info("Redis 客户端关闭完成")
 
@@ -223,14 +333,29 @@ def init_redis_clients() -> None:
     redis_manager.init_clients()
 
 
-def get_redis_client(name: str = "default") -> Redis:
+def get_redis_client(name: str = "default", replica: bool = False) -> Redis:
     """获取 Redis 客户端（同步，便捷函数）"""
-    return redis_manager.get_client(name)
+    return redis_manager.get_client(name, replica)
 
 
-def get_async_redis_client(name: str = "default") -> AsyncRedis:
+def get_async_redis_client(name: str = "default", replica: bool = False) -> AsyncRedis:
     """获取 Redis 客户端（异步，便捷函数）"""
-    return redis_manager.get_async_client(name)
+    return redis_manager.get_async_client(name, replica)
+
+
+def get_redis_script(name: str) -> RedisScript:
+    """获取已注册的 Lua 脚本（便捷函数）"""
+    return redis_manager.get_script(name)
+
+
+def register_redis_script(name: str, source: str) -> RedisScript:
+    """注册 Lua 脚本（便捷函数）"""
+    return redis_manager.register_script(name, source)
+
+
+def get_redis_pool_stats(name: str | None = None) -> dict[str, dict[str, Any]]:
+    """获取 Redis 连接池指标（便捷函数）"""
+    return redis_manager.get_pool_stats(name)
 
 
 async def close_redis_clients() -> None:
@@ -0,0 +1,232 @@
+"""
+Redis 连接池
+
+在 redis-py 连接池的基础上记录连接池指标（使用中 / 空闲连接数、获取连接耗时、累计创建数），
+用于按实际的 worker 并发量调整 max_connections。
+
+同步和异步各提供普通连接池和阻塞连接池：
+- 普通连接池：连接数达到 max_connections 后立即抛出 ConnectionError
+- 阻塞连接池：连接数达到上限后等待其他请求归还连接，最多等待 timeout 秒
+"""
+
+import threading
+import time
+from typing import Any
+
+from redis import BlockingConnectionPool, ConnectionPool
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
+from redis.asyncio import ConnectionPool as AsyncConnectionPool
+from redis.asyncio.sentinel import (
+    SentinelConnectionPool as AsyncSentinelConnectionPool,
+)
+from redis.sentinel import SentinelConnectionPool
+
+
+class PoolMetrics:
+    """
+    连接池指标（线程安全）
+
+    获取连接耗时包括等待空闲连接和新建连接的时间。
+    """
+
+    def __init__(self) -> None:
+        self.created_total = 0
+        self.acquired_total = 0
+        self.errors_total = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_created(self) -> None:
+        """记录新建连接"""
+        with self._lock:
+            self.created_total += 1
+
+    def record_acquire(self, wait: float, success: bool) -> None:
+        """
+        记录一次获取连接
+
+        Args:
+            wait: 获取连接耗时（秒）
+            success: 是否获取成功
+        """
+        with self._lock:
+            if success:
+                self.acquired_total += 1
+            else:
+                self.errors_total += 1
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+
+    def snapshot(self) -> dict[str, Any]:
+        """获取指标快照"""
+        with self._lock:
+            attempts = self.acquired_total + self.errors_total
+            return {
+                "created_total": self.created_total,
+                "acquired_total": self.acquired_total,
+                "errors_total": self.errors_total,
+                "wait_avg_ms": round(self.wait_total / attempts * 1000, 3)
+                if attempts
+                else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+    def reset(self) -> None:
+        """重置累计指标（不影响连接池本身）"""
+        with self._lock:
+            self.created_total = 0
+            self.acquired_total = 0
+            self.errors_total = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+
+class _InstrumentedPoolMixin:
+    """连接池指标公共逻辑"""
+
+    blocking = False
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = PoolMetrics()
+        super().__init__(*args, **kwargs)
+
+    def make_connection(self):
+        connection = super().make_connection()
+        self.metrics.record_created()
+        return connection
+
+    def _connection_counts(self) -> tuple[int, int]:
+        """
+        当前使用中和空闲的连接数（读取 redis-py 连接池内部属性）
+
+        Returns:
+            (使用中, 空闲)
+        """
+        if hasattr(self, "_in_use_connections"):
+            return len(self._in_use_connections), len(self._available_connections)
+
+        # 同步阻塞连接池：队列中非 None 的元素为空闲连接
+        idle = sum(1 for connection in list(self.pool.queue) if connection is not None)
+        return len(self._connections) - idle, idle
+
+    def stats(self) -> dict[str, Any]:
+        """
+        获取连接池指标
+
+        Returns:
+            包含最大连接数、使用中 / 空闲连接数、获取连接耗时和累计创建数的字典
+        """
+        in_use, idle = self._connection_counts()
+        return {
+            "blocking": self.blocking,
+            "max_connections": self.max_connections,
+            "in_use": in_use,
+            "idle": idle,
+            **self.metrics.snapshot(),
+        }
+
+
+class _SyncInstrumentedMixin(_InstrumentedPoolMixin):
+    """同步连接池：记录获取连接耗时"""
+
+    def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except BaseException:
+            self.metrics.record_acquire(time.perf_counter() - start, False)
+            raise
+        self.metrics.record_acquire(time.perf_counter() - start, True)
+        return connection
+
+
+class _AsyncInstrumentedMixin(_InstrumentedPoolMixin):
+    """异步连接池：记录获取连接耗时"""
+
+    async def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except BaseException:
+            self.metrics.record_acquire(time.perf_counter() - start, False)
+            raise
+        self.metrics.record_acquire(time.perf_counter() - start, True)
+        return connection
+
+
+class InstrumentedConnectionPool(_SyncInstrumentedMixin, ConnectionPool):
+    """带指标的同步连接池"""
+
+
+class InstrumentedBlockingConnectionPool(
+    _SyncInstrumentedMixin, BlockingConnectionPool
+):
+    """带指标的同步阻塞连接池"""
+
+    blocking = True
+
+
+class InstrumentedSentinelConnectionPool(
+    _SyncInstrumentedMixin, SentinelConnectionPool
+):
+    """带指标的同步哨兵连接池（自动跟随主从切换）"""
+
+
+class AsyncInstrumentedConnectionPool(_AsyncInstrumentedMixin, AsyncConnectionPool):
+    """带指标的异步连接池"""
+
+
+class AsyncInstrumentedBlockingConnectionPool(
+    _AsyncInstrumentedMixin, AsyncBlockingConnectionPool
+):
+    """带指标的异步阻塞连接池"""
+
+    blocking = True
+
+
+class AsyncInstrumentedSentinelConnectionPool(
+    _AsyncInstrumentedMixin, AsyncSentinelConnectionPool
+):
+    """带指标的异步哨兵连接池（自动跟随主从切换）"""
+
+
+def build_connection_pool(
+    config: dict[str, Any], pool_kwargs: dict[str, Any], is_async: bool
+) -> Any:
+    """
+    根据连接配置创建连接池
+
+    Args:
+        config: Redis 连接配置（url、blocking_pool、pool_timeout）
+        pool_kwargs: 连接参数（地址、认证、超时、最大连接数等）
+        is_async: 是否为异步连接池
+
+    Returns:
+        连接池实例
+    """
+    blocking = bool(config.get("blocking_pool", False))
+    if is_async:
+        pool_class = (
+            AsyncInstrumentedBlockingConnectionPool
+            if blocking
+            else AsyncInstrumentedConnectionPool
+        )
+    else:
+        pool_class = (
+            InstrumentedBlockingConnectionPool
+            if blocking
+            else InstrumentedConnectionPool
+        )
+
+    kwargs = dict(pool_kwargs)
+    if blocking:
+        kwargs["timeout"] = config.get("pool_timeout", 5)
+
+    # 提供了完整的 URL 时，地址和认证信息以 URL 为准
+    if config.get("url"):
+        for key in ("host", "port", "db", "username", "password"):
+            kwargs.pop(key, None)
+        return pool_class.from_url(config["url"], **kwargs)
+    return pool_class(**kwargs)
@@ -0,0 +1,211 @@
+"""
+Redis Lua 脚本注册表
+
+把需要多次往返、存在竞态窗口的命令组合（加锁 + 栅栏令牌、校验持有者后解锁、
+递增 + 设置过期时间、滑动窗口计数）写成 Lua 脚本，在 Redis 端原子执行，一次往返完成。
+
+脚本在客户端初始化时通过 SCRIPT LOAD 预加载，调用时使用 EVALSHA 只传输 SHA1；
+Redis 重启或执行 SCRIPT FLUSH 后返回 NOSCRIPT，此时自动重新加载并重试一次。
+
+使用示例：
+    from Modules.common.libs.database.redis import SCRIPT_INCR_WITH_TTL, get_redis_script
+
+    script = get_redis_script(SCRIPT_INCR_WITH_TTL)
+    count = script(client, keys=["login:fail:1"], args=[1, 600])
+"""
+
+import hashlib
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from redis.exceptions import NoScriptError
+
+# ==================== 内置脚本 ====================
+
+SCRIPT_LOCK_ACQUIRE = "lock_acquire"
+SCRIPT_LOCK_RELEASE = "lock_release"
+SCRIPT_INCR_WITH_TTL = "incr_with_ttl"
+SCRIPT_SLIDING_WINDOW = "sliding_window"
+
+# 加锁并生成栅栏令牌
+# KEYS[1]: 锁键，KEYS[2]: 栅栏计数键（集群模式下需与锁键位于同一槽位）
+# ARGV[1]: 持有者标识，ARGV[2]: 锁过期时间（毫秒），ARGV[3]: 栅栏计数键过期时间（毫秒，需长于锁）
+# 返回：加锁成功返回单调递增的栅栏令牌，失败返回 0
+LOCK_ACQUIRE_SCRIPT = """
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    local token = redis.call('incr', KEYS[2])
+    redis.call('pexpire', KEYS[2], ARGV[3])
+    return token
+end
+return 0
+"""
+
+# 仅当锁仍由自己持有时才删除（防止误删其他进程的锁）
+# KEYS[1]: 锁键，ARGV[1]: 持有者标识
+# 返回：删除成功返回 1，否则返回 0
+LOCK_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# 递增计数并在首次创建时设置过期时间（已有过期时间时保持不变，实现固定窗口）
+# KEYS[1]: 计数键，ARGV[1]: 递增量，ARGV[2]: 过期时间（秒，<= 0 表示不设置）
+# 返回：递增后的值
+INCR_WITH_TTL_SCRIPT = """
+local value = redis.call('incrby', KEYS[1], ARGV[1])
+if tonumber(ARGV[2]) > 0 and redis.call('ttl', KEYS[1]) == -1 then
+    redis.call('expire', KEYS[1], ARGV[2])
+end
+return value
+"""
+
+# 滑动窗口计数（有序集合保存窗口内每次请求的时间戳）
+# KEYS[1]: 窗口键
+# ARGV[1]: 当前时间（毫秒），ARGV[2]: 窗口长度（毫秒），ARGV[3]: 窗口内允许的次数，ARGV[4]: 本次请求的唯一成员
+# 返回：{是否允许（1 / 0）, 窗口内的请求次数（包括本次允许的请求）}
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('zremrangebyscore', KEYS[1], '-inf', now - window)
+local count = redis.call('zcard', KEYS[1])
+if count < tonumber(ARGV[3]) then
+    redis.call('zadd', KEYS[1], now, ARGV[4])
+    redis.call('pexpire', KEYS[1], window)
+    return {1, count + 1}
+end
+return {0, count}
+"""
+
+BUILTIN_SCRIPTS = {
+    SCRIPT_LOCK_ACQUIRE: LOCK_ACQUIRE_SCRIPT,
+    SCRIPT_LOCK_RELEASE: LOCK_RELEASE_SCRIPT,
+    SCRIPT_INCR_WITH_TTL: INCR_WITH_TTL_SCRIPT,
+    SCRIPT_SLIDING_WINDOW: SLIDING_WINDOW_SCRIPT,
+}
+
+
+def script_sha(source: str) -> str:
+    """计算脚本的 SHA1（与 SCRIPT LOAD 的返回值一致）"""
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+class RedisScript:
+    """
+    已注册的 Lua 脚本
+
+    可以在同步 / 异步客户端、熔断包装后的客户端以及降级存储上执行。
+    """
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self.sha = script_sha(source)
+
+    def __repr__(self) -> str:
+        return f"RedisScript(name={self.name!r}, sha={self.sha!r})"
+
+    def __call__(
+        self, client: Any, keys: Sequence[Any] = (), args: Sequence[Any] = ()
+    ) -> Any:
+        """
+        执行脚本（同步）
+
+        Args:
+            client: 同步 Redis 客户端
+            keys: 脚本访问的键
+            args: 脚本参数
+
+        Returns:
+            脚本返回值
+        """
+        try:
+            return client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            client.script_load(self.source)
+            return client.evalsha(self.sha, len(keys), *keys, *args)
+
+    async def run_async(
+        self, client: Any, keys: Sequence[Any] = (), args: Sequence[Any] = ()
+    ) -> Any:
+        """
+        执行脚本（异步）
+
+        Args:
+            client: 异步 Redis 客户端
+            keys: 脚本访问的键
+            args: 脚本参数
+
+        Returns:
+            脚本返回值
+        """
+        try:
+            return await client.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            await client.script_load(self.source)
+            return await client.evalsha(self.sha, len(keys), *keys, *args)
+
+
+class ScriptRegistry:
+    """
+    Lua 脚本注册表（名称 -> 脚本）
+
+    默认包含内置脚本，业务脚本通过 register 注册后在下次初始化客户端时预加载。
+    """
+
+    def __init__(self, scripts: dict[str, str] | None = None):
+        self._scripts: dict[str, RedisScript] = {}
+        for name, source in (scripts or {}).items():
+            self.register(name, source)
+
+    def __iter__(self) -> Iterator[RedisScript]:
+        return iter(list(self._scripts.values()))
+
+    def __len__(self) -> int:
+        return len(self._scripts)
+
+    def register(self, name: str, source: str) -> RedisScript:
+        """
+        注册脚本（同名脚本会被替换）
+
+        Args:
+            name: 脚本名称
+            source: Lua 脚本内容
+
+        Returns:
+            脚本实例
+        """
+        script = RedisScript(name, source)
+        self._scripts[name] = script
+        return script
+
+    def get(self, name: str) -> RedisScript:
+        """
+        获取脚本
+
+        Args:
+            name: 脚本名称
+
+        Returns:
+            脚本实例
+
+        Raises:
+            ValueError: 脚本未注册
+        """
+        script = self._scripts.get(name)
+        if script is None:
+            raise ValueError(f"Redis 脚本 '{name}' 未注册")
+        return script
+
+    def load(self, client: Any) -> list[str]:
+        """
+        通过 SCRIPT LOAD 预加载所有脚本（集群模式下会加载到所有主节点）
+
+        Args:
+            client: 同步 Redis 客户端
+
+        Returns:
+            已加载的脚本 SHA1 列表
+        """
+        return [client.script_load(script.source) for script in self]
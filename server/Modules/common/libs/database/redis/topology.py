@@ -0,0 +1,223 @@
+"""
+Redis 部署模式
+
+根据连接配置中的 mode 创建主节点客户端和只读（从节点）客户端：
+- standalone：单节点（默认），没有从节点客户端
+- sentinel：哨兵模式，主节点客户端随故障转移自动切换，只读客户端轮询从节点（无可用从节点时回退到主节点）
+- cluster：集群模式，键按槽位路由，只读客户端把读命令轮询发送到各分片的从节点
+"""
+
+from typing import Any
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio.cluster import ClusterNode as AsyncClusterNode
+from redis.asyncio.cluster import RedisCluster as AsyncRedisCluster
+from redis.asyncio.sentinel import Sentinel as AsyncSentinel
+from redis.cluster import ClusterNode, LoadBalancingStrategy, RedisCluster
+from redis.sentinel import Sentinel
+
+from .pool import (
+    AsyncInstrumentedSentinelConnectionPool,
+    InstrumentedSentinelConnectionPool,
+    build_connection_pool,
+)
+
+MODE_STANDALONE = "standalone"
+MODE_SENTINEL = "sentinel"
+MODE_CLUSTER = "cluster"
+
+# 节点地址之外的连接参数（哨兵 / 集群模式下地址由节点列表决定）
+_ADDRESS_KEYS = ("host", "port")
+
+
+class RedisTopology:
+    """
+    一个 Redis 连接的客户端集合
+
+    Attributes:
+        mode: 部署模式
+        client: 同步主节点客户端
+        async_client: 异步主节点客户端
+        replica_client: 同步只读客户端，None 表示没有从节点
+        async_replica_client: 异步只读客户端，None 表示没有从节点
+        pools: 需要统计指标的连接池，键为 sync / async / sync_replica / async_replica
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        client: Any,
+        async_client: Any,
+        replica_client: Any = None,
+        async_replica_client: Any = None,
+        pools: dict[str, Any] | None = None,
+    ):
+        self.mode = mode
+        self.client = client
+        self.async_client = async_client
+        self.replica_client = replica_client
+        self.async_replica_client = async_replica_client
+        self.pools = pools or {}
+
+
+def parse_nodes(nodes: Any) -> list[tuple[str, int]]:
+    """
+    解析节点列表
+
+    Args:
+        nodes: 节点列表，元素可以是 "host:port"、[host, port] 或 {"host": ..., "port": ...}
+
+    Returns:
+        (host, port) 列表
+
+    Raises:
+        ValueError: 节点列表为空或格式错误
+    """
+    if isinstance(nodes, str):
+        nodes = [node for node in nodes.split(",") if node.strip()]
+
+    result = []
+    for node in nodes or ():
+        if isinstance(node, dict):
+            host, port = node.get("host"), node.get("port")
+        elif isinstance(node, str):
+            host, _, port = node.strip().rpartition(":")
+        else:
+            host, port = node
+        if not host or not port:
+            raise ValueError(f"Redis 节点格式错误: {node}")
+        result.append((str(host), int(port)))
+
+    if not result:
+        raise ValueError("Redis 节点列表不能为空")
+    return result
+
+
+def _without_address(pool_kwargs: dict[str, Any]) -> dict[str, Any]:
+    """去掉地址参数"""
+    return {k: v for k, v in pool_kwargs.items() if k not in _ADDRESS_KEYS}
+
+
+def _build_standalone(config: dict[str, Any], pool_kwargs: dict[str, Any]):
+    """单节点：同步 / 异步客户端各使用一个带指标的连接池"""
+    async_pool = build_connection_pool(config, pool_kwargs, is_async=True)
+    sync_pool = build_connection_pool(config, pool_kwargs, is_async=False)
+    return RedisTopology(
+        MODE_STANDALONE,
+        client=Redis(connection_pool=sync_pool),
+        async_client=AsyncRedis(connection_pool=async_pool),
+        pools={"sync": sync_pool, "async": async_pool},
+    )
+
+
+def _build_sentinel(config: dict[str, Any], pool_kwargs: dict[str, Any]):
+    """哨兵：通过哨兵发现主从节点，故障转移后自动重连新的主节点"""
+    nodes = parse_nodes(config.get("sentinels"))
+    service_name = config.get("service_name", "mymaster")
+    sentinel_kwargs = {
+        "socket_timeout": pool_kwargs.get("socket_timeout"),
+        "socket_connect_timeout": pool_kwargs.get("socket_connect_timeout"),
+    }
+    if config.get("sentinel_password"):
+        sentinel_kwargs["password"] = config["sentinel_password"]
+    if config.get("sentinel_username"):
+        sentinel_kwargs["username"] = config["sentinel_username"]
+    connection_kwargs = _without_address(pool_kwargs)
+
+    sentinel = Sentinel(nodes, sentinel_kwargs=sentinel_kwargs)
+    async_sentinel = AsyncSentinel(nodes, sentinel_kwargs=sentinel_kwargs)
+
+    client = sentinel.master_for(
+        service_name,
+        connection_pool_class=InstrumentedSentinelConnectionPool,
+        **connection_kwargs,
+    )
+    replica_client = sentinel.slave_for(
+        service_name,
+        connection_pool_class=InstrumentedSentinelConnectionPool,
+        **connection_kwargs,
+    )
+    async_client = async_sentinel.master_for(
+        service_name,
+        connection_pool_class=AsyncInstrumentedSentinelConnectionPool,
+        **connection_kwargs,
+    )
+    async_replica_client = async_sentinel.slave_for(
+        service_name,
+        connection_pool_class=AsyncInstrumentedSentinelConnectionPool,
+        **connection_kwargs,
+    )
+    return RedisTopology(
+        MODE_SENTINEL,
+        client=client,
+        async_client=async_client,
+        replica_client=replica_client,
+        async_replica_client=async_replica_client,
+        pools={
+            "sync": client.connection_pool,
+            "async": async_client.connection_pool,
+            "sync_replica": replica_client.connection_pool,
+            "async_replica": async_replica_client.connection_pool,
+        },
+    )
+
+
+def _build_cluster(config: dict[str, Any], pool_kwargs: dict[str, Any]):
+    """集群：键按槽位路由到各分片，每个节点单独维护连接池（max_connections 为单节点上限）"""
+    nodes = parse_nodes(config.get("startup_nodes"))
+    kwargs = {k: v for k, v in _without_address(pool_kwargs).items() if k != "db"}
+    # 异步集群客户端不支持 retry_on_timeout，超时重试由集群客户端自身处理
+    async_kwargs = {k: v for k, v in kwargs.items() if k != "retry_on_timeout"}
+    replica_strategy = LoadBalancingStrategy.ROUND_ROBIN_REPLICAS
+
+    client = RedisCluster(
+        startup_nodes=[ClusterNode(host, port) for host, port in nodes], **kwargs
+    )
+    replica_client = RedisCluster(
+        startup_nodes=[ClusterNode(host, port) for host, port in nodes],
+        load_balancing_strategy=replica_strategy,
+        **kwargs,
+    )
+    async_client = AsyncRedisCluster(
+        startup_nodes=[AsyncClusterNode(host, port) for host, port in nodes],
+        **async_kwargs,
+    )
+    async_replica_client = AsyncRedisCluster(
+        startup_nodes=[AsyncClusterNode(host, port) for host, port in nodes],
+        load_balancing_strategy=replica_strategy,
+        **async_kwargs,
+    )
+    return RedisTopology(
+        MODE_CLUSTER,
+        client=client,
+        async_client=async_client,
+        replica_client=replica_client,
+        async_replica_client=async_replica_client,
+    )
+
+
+def build_topology(
+    config: dict[str, Any], pool_kwargs: dict[str, Any]
+) -> RedisTopology:
+    """
+    根据连接配置创建客户端
+
+    Args:
+        config: Redis 连接配置
+        pool_kwargs: 连接参数（地址、认证、超时、最大连接数等）
+
+    Returns:
+        客户端集合
+
+    Raises:
+        ValueError: 部署模式不支持或节点配置错误
+    """
+    mode = (config.get("mode") or MODE_STANDALONE).lower()
+    if mode == MODE_STANDALONE:
+        return _build_standalone(config, pool_kwargs)
+    if mode == MODE_SENTINEL:
+        return _build_sentinel(config, pool_kwargs)
+    if mode == MODE_CLUSTER:
+        return _build_cluster(config, pool_kwargs)
+    raise ValueError(f"不支持的 Redis 部署模式: {mode}")
@@ -4,8 +4,11 @@
 提供基于ORM模型的通用分表功能,支持多种分表策略。
 """
 
+from .async_manager import AsyncShardingManager
 from .cache_utils import ShardingCacheManager
-from .manager import ShardingManager
+from .dialects import DialectAdapter, get_dialect_adapter
+from .manager import BatchInsertStats, ShardingManager
+from .registry import ShardRegistry, get_shard_registry
 from .strategies.base import ShardingStrategy
 from .strategies.hash_based import HashBasedShardingStrategy
 from .strategies.id_based import IdBasedShardingStrategy
@@ -15,6 +18,8 @@ from .table_creator import ShardingTableCreator
 __all__ = [
     # 管理器
     "ShardingManager",
+    "AsyncShardingManager",
+    "BatchInsertStats",
     "ShardingTableCreator",
     # 分表策略
     "ShardingStrategy",
@@ -23,4 +28,9 @@ __all__ = [
     "HashBasedShardingStrategy",
     # 缓存工具
     "ShardingCacheManager",
+    "ShardRegistry",
+    "get_shard_registry",
+    # 方言适配
+    "DialectAdapter",
+    "get_dialect_adapter",
 ]
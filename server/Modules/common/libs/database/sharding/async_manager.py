@@ -0,0 +1,498 @@
+"""
+异步分表管理器
+
+在异步引擎上并发查询各分表，用于异步服务（FastAPI 请求、异步任务），不阻塞事件循环。
+跨表查询和统计同时查询多张表（并发数由信号量限制），耗时接近最慢的一张表，而不是各表耗时之和。
+
+表路由、SQL 构建和排序规则与 ShardingManager 相同；建表和写入方法继承自 ShardingManager，仍使用同步引擎。
+异步方法使用 _async 后缀，不覆盖同名的同步方法，继承的同步方法在异步管理器上仍然可用。
+"""
+
+import asyncio
+import heapq
+from itertools import islice
+
+from loguru import logger
+from sqlalchemy import inspect, text
+
+from .dialects import get_dialect_adapter
+from .manager import ShardingManager
+from .registry import get_shard_registry, registry_scope
+
+
+class AsyncShardingManager(ShardingManager):
+    """
+    异步分表管理器
+
+    query_single_table_async / query_multi_tables_async / count_async / aggregate_async 为异步方法：
+    - 各表查询并发执行，同时执行的查询数不超过 concurrency（占用异步连接池的连接数）
+    - 结果按完成顺序处理，已取够 offset + limit 条时取消其余的查询
+    - 超过 timeout 秒未完成时取消所有未完成的查询并抛出 TimeoutError
+    """
+
+    def __init__(
+        self,
+        model,
+        sharding_strategy,
+        engine=None,
+        async_engine=None,
+        concurrency=None,
+        timeout=None,
+    ):
+        """
+        初始化异步分表管理器
+
+        Args:
+            model: SQLModel模型类
+            sharding_strategy: 分表策略实例
+            engine: 同步数据库引擎(可选,延迟获取,用于建表和写入)
+            async_engine: 异步数据库引擎(可选,延迟获取,用于查询)
+            concurrency: 同时查询的表数(默认使用配置 database.sharding_query_concurrency)
+            timeout: 跨表查询超时时间(秒,默认使用配置 database.sharding_query_timeout,0 表示不限制)
+        """
+        super().__init__(model, sharding_strategy, engine=engine)
+        self._async_engine = async_engine
+        self._async_dialect = None
+        self._registry_scope = None
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    @property
+    def async_engine(self):
+        """延迟获取异步数据库引擎"""
+        if self._async_engine is None:
+            from ..sql.engine import get_async_db_engine
+            from ..sql.routing import get_model_connection
+
+            self._async_engine = get_async_db_engine(get_model_connection(self.model))
+        return self._async_engine
+
+    @property
+    def query_dialect(self):
+        """查询 SQL 使用的方言适配器(按异步引擎的驱动,写入仍使用同步引擎的适配器)"""
+        if self._async_dialect is None:
+            self._async_dialect = get_dialect_adapter(self.async_engine.sync_engine)
+        return self._async_dialect
+
+    @property
+    def registry_scope(self):
+        """分表注册表中的数据库标识(按异步引擎,与同步引擎的标识相同)"""
+        if self._registry_scope is None:
+            self._registry_scope = registry_scope(self.async_engine)
+        return self._registry_scope
+
+    # ==================== 表管理 ====================
+
+    async def table_exists_async(self, table_name) -> bool:
+        """
+        检查表是否存在(与 table_exists 共用分表注册表 / 缓存)
+
+        Args:
+            table_name: 表名
+
+        Returns:
+            bool: 表是否存在
+        """
+        registry = get_shard_registry()
+        if registry.enabled:
+            exists = registry.lookup(self.registry_scope, self.table_prefix, table_name)
+            if exists is None:
+                exists = table_name in await self.refresh_registry_async()
+            return exists
+
+        from ...cache import async_cache_get, async_cache_set
+
+        cache_key = f"{self.cache_manager.cache_prefix}{table_name}"
+        try:
+            cached = await async_cache_get(cache_key)
+        except Exception as e:
+            logger.warning(f"获取缓存失败: key={cache_key}, 错误: {e}")
+            cached = None
+        if cached is not None:
+            return str(cached) == "1" or cached == 1
+
+        async with self.async_engine.connect() as conn:
+            exists = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).has_table(table_name)
+            )
+
+        try:
+            await async_cache_set(
+                cache_key, "1" if exists else "0", ttl=self.cache_manager.cache_ttl
+            )
+        except Exception as e:
+            logger.warning(f"设置缓存失败: key={cache_key}, 错误: {e}")
+        return exists
+
+    async def refresh_registry_async(self):
+        """
+        从数据库加载基础表的全部分表到分表注册表(使用异步引擎)
+
+        Returns:
+            list[str]: 已存在的分表名列表
+        """
+        async with self.async_engine.connect() as conn:
+            table_names = await conn.run_sync(
+                lambda sync_conn: self.query_dialect.list_tables(
+                    sync_conn, self.table_prefix
+                )
+            )
+        get_shard_registry().load(self.registry_scope, self.table_prefix, table_names)
+        return table_names
+
+    async def _prepare_registry(self):
+        """并发查询各表之前加载分表注册表(避免各表的查询同时加载)"""
+        registry = get_shard_registry()
+        if registry.enabled and not registry.loaded(
+            self.registry_scope, self.table_prefix
+        ):
+            await self.refresh_registry_async()
+
+    # ==================== 查询方法 ====================
+
+    async def query_single_table_async(
+        self,
+        table_name,
+        conditions=None,
+        limit=None,
+        offset=0,
+        order_by=None,
+    ):
+        """
+        查询单张表的数据
+
+        Args:
+            table_name: 表名
+            conditions: 查询条件字典
+            limit: 返回记录数限制
+            offset: 偏移量
+            order_by: 排序规则
+
+        Returns:
+            list[dict]: 查询结果
+        """
+        # 检查表是否存在
+        if not await self.table_exists_async(table_name):
+            logger.warning(f"[分表管理器-查询单表-表不存在] 表名: {table_name}")
+            return []
+
+        sql, params = self._build_select_sql(
+            table_name, conditions, limit, offset, order_by
+        )
+
+        # 执行查询
+        try:
+            return await self._execute_query_async(sql, params)
+        except Exception as e:
+            logger.error(f"[分表管理器-查询单表-失败] 表名: {table_name}, 错误: {e}")
+            return []
+
+    async def query_multi_tables_async(
+        self,
+        sharding_key_range=None,
+        conditions=None,
+        limit=None,
+        order_by=None,
+        max_tables=None,
+        offset=0,
+    ):
+        """
+        查询多张表的数据(并发跨表查询)
+
+        与 ShardingManager.query_multi_tables 的结果相同：
+        - 按分表键排序且分表按分表键区间划分时，按排序方向依次启动各表的查询，
+          排在前面的表已取够 offset + limit 条时取消其余的查询
+        - 按其他字段排序时，各表的有序结果使用堆进行多路归并
+        - 不排序时任意几张表已取够即结束
+
+        Args:
+            sharding_key_range: 分表键范围(起始值, 结束值)
+            conditions: 查询条件字典
+            limit: 返回记录数限制
+            order_by: 排序规则(如 "trade_date DESC")
+            max_tables: 最大查询表数限制
+            offset: 偏移量(与 limit 一起使用)
+
+        Returns:
+            list[dict]: 查询结果(已合并和排序)
+
+        Raises:
+            TimeoutError: 超过 timeout 秒仍未完成
+        """
+        # 如果没有指定分表键范围,无法跨表查询
+        if sharding_key_range is None:
+            logger.warning("[分表管理器-跨表查询-失败] 未指定分表键范围,无法跨表查询")
+            return []
+
+        await self._prepare_registry()
+        table_names = self._range_table_names(sharding_key_range, max_tables)
+        exists = await asyncio.gather(
+            *(self.table_exists_async(name) for name in table_names)
+        )
+        table_names = [
+            name for name, found in zip(table_names, exists, strict=True) if found
+        ]
+        order = self._resolve_order_by(order_by)
+
+        # 排序字段无法识别(如多字段排序):查询全部数据后在内存中排序
+        if order_by and order is None:
+            results = await self._fan_out(
+                table_names,
+                lambda name: self.query_single_table_async(
+                    name, conditions=conditions, order_by=order_by
+                ),
+            )
+            all_data = self._merge_and_sort(
+                [row for rows in results for row in rows], order_by
+            )
+            if limit is not None:
+                return all_data[offset : offset + limit]
+            return all_data[offset:]
+
+        wanted = offset + limit if limit is not None else None
+        order_clause = order and self._order_clause(*order)
+
+        def fetch(name):
+            return self.query_single_table_async(
+                name, conditions=conditions, limit=wanted, order_by=order_clause
+            )
+
+        # 按其他字段排序:各表取前 offset + limit 条，多路归并
+        if order is not None and not (
+            order[0] == self.sharding_strategy.sharding_key
+            and self.sharding_strategy.ordered_tables
+        ):
+            field, descending = order
+            merged = heapq.merge(
+                *await self._fan_out(table_names, fetch),
+                key=self._sort_key(field, descending),
+                reverse=descending,
+            )
+            return list(islice(merged, offset, wanted))
+
+        if order is not None and order[1]:
+            table_names = list(reversed(table_names))
+
+        if order is None:
+            # 不排序:已完成的表取够即可
+            def enough(results):
+                return sum(len(rows) for rows in results if rows is not None) >= wanted
+
+        else:
+            # 按分表键排序:排在前面且都已完成的表取够才可以结束
+            def enough(results):
+                collected = 0
+                for rows in results:
+                    if rows is None:
+                        return False
+                    collected += len(rows)
+                    if collected >= wanted:
+                        return True
+                return False
+
+        results = await self._fan_out(
+            table_names, fetch, enough if wanted is not None else None
+        )
+        all_data = [row for rows in results if rows is not None for row in rows]
+        return all_data[offset:wanted]
+
+    async def count_async(self, sharding_key_range=None, conditions=None) -> int:
+        """
+        统计数据数量(并发统计各表)
+
+        Args:
+            sharding_key_range: 分表键范围(起始值, 结束值)
+            conditions: 查询条件字典
+
+        Returns:
+            int: 数据数量
+
+        Raises:
+            TimeoutError: 超过 timeout 秒仍未完成
+        """
+        # 如果没有指定分表键范围,无法统计
+        if sharding_key_range is None:
+            logger.warning("未指定分表键范围,无法统计")
+            return 0
+
+        async def count_table(table_name):
+            if not await self.table_exists_async(table_name):
+                return 0
+
+            sql, params = self._build_count_sql(table_name, conditions)
+            try:
+                async with self.async_engine.connect() as conn:
+                    result = await conn.execute(
+                        text(sql), self.query_dialect.adapt_params(params)
+                    )
+                    return int(result.scalar() or 0)
+            except Exception as e:
+                logger.error(f"统计失败: {table_name}, 错误: {e}")
+                return 0
+
+        await self._prepare_registry()
+        counts = await self._fan_out(
+            self._range_table_names(sharding_key_range), count_table
+        )
+        return sum(counts)
+
+    async def aggregate_async(
+        self,
+        sharding_key_range,
+        aggregates,
+        group_by=None,
+        conditions=None,
+        max_tables=None,
+    ):
+        """
+        跨表聚合查询(并发聚合各表,参数和结果与 ShardingManager.aggregate 相同)
+
+        Args:
+            sharding_key_range: 分表键范围(起始值, 结束值)，同时作为查询条件
+            aggregates: 聚合字典 {别名: (函数, 字段)}，函数为 count / sum / min / max / avg
+            group_by: 分组字段列表
+            conditions: 查询条件字典
+            max_tables: 最大查询表数限制
+
+        Returns:
+            list[dict]: 每个分组一行；不分组时返回一行
+
+        Raises:
+            ValueError: 聚合函数或字段不支持
+            TimeoutError: 超过 timeout 秒仍未完成
+        """
+        if sharding_key_range is None:
+            logger.warning("[分表管理器-聚合查询-失败] 未指定分表键范围,无法聚合")
+            return []
+
+        from ...cache import get_async_cache_service
+
+        group_by, partials, sql_template, params = self._aggregate_plan(
+            sharding_key_range, aggregates, group_by, conditions
+        )
+        await self._prepare_registry()
+        table_names = self._range_table_names(sharding_key_range, max_tables)
+        exists = await asyncio.gather(
+            *(self.table_exists_async(name) for name in table_names)
+        )
+        table_names = [
+            name for name, found in zip(table_names, exists, strict=True) if found
+        ]
+
+        ttl = self._aggregate_cache_ttl()
+        closed = [
+            name
+            for name in table_names
+            if ttl and self.sharding_strategy.is_closed_table(name, self.table_prefix)
+        ]
+        cache_keys = self._aggregate_cache_keys(closed, sql_template, params)
+        cached, versions = {}, {}
+        if closed:
+            try:
+                found = await get_async_cache_service().get_many(
+                    [key for pair in cache_keys.values() for key in pair]
+                )
+                cached, versions = self._unwrap_aggregate_cache(cache_keys, found)
+            except Exception as e:
+                logger.warning(f"[分表管理器-聚合查询-读取缓存失败] 错误: {e}")
+
+        async def aggregate_table(table_name):
+            if table_name in cached:
+                return cached[table_name]
+            try:
+                async with self.async_engine.connect() as conn:
+                    result = await conn.execute(
+                        text(sql_template.format(table=table_name)),
+                        self.query_dialect.adapt_params(params),
+                    )
+                    rows = [list(row) for row in result.fetchall()]
+            except Exception as e:
+                logger.error(
+                    f"[分表管理器-聚合查询-失败] 表名: {table_name}, 错误: {e}"
+                )
+                return []
+            if table_name in cache_keys:
+                try:
+                    await get_async_cache_service().set(
+                        cache_keys[table_name][0],
+                        {"version": versions.get(table_name, 0), "rows": rows},
+                        ttl=ttl,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"[分表管理器-聚合查询-写入缓存失败] 表名: {table_name}, 错误: {e}"
+                    )
+            return rows
+
+        merged = {}
+        for rows in await self._fan_out(table_names, aggregate_table):
+            self._merge_partials(merged, rows, len(group_by), partials)
+        return self._finalize_aggregates(merged, aggregates, group_by, partials)
+
+    # ==================== 私有方法 ====================
+
+    async def _execute_query_async(self, sql, params):
+        """执行查询SQL"""
+        async with self.async_engine.connect() as conn:
+            result = await conn.execute(
+                text(sql), self.query_dialect.adapt_params(params)
+            )
+            rows = result.fetchall()
+            columns = result.keys()
+            return [dict(zip(columns, row, strict=True)) for row in rows]
+
+    async def _fan_out(self, table_names, fetch, enough=None):
+        """
+        并发执行各表的查询
+
+        查询按 table_names 的顺序获取信号量，同时执行的查询数不超过 concurrency。
+        每完成一张表调用一次 enough(results)，返回 True 时取消其余的查询；
+        超过 timeout 秒时取消未完成的查询并抛出 TimeoutError。
+
+        Args:
+            table_names: 表名列表
+            fetch: 查询单张表的协程函数,接收表名
+            enough: 判断结果是否已足够的函数,接收按表顺序排列的结果列表(未完成的表为 None)
+
+        Returns:
+            list: 按表顺序排列的各表结果(提前结束时未完成的表为 None)
+        """
+        from ...config import Config
+
+        concurrency = self.concurrency or Config.get(
+            "database.sharding_query_concurrency", 8
+        )
+        timeout = self.timeout
+        if timeout is None:
+            timeout = Config.get("database.sharding_query_timeout", 30)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        results = [None] * len(table_names)
+
+        async def run(index, table_name):
+            async with semaphore:
+                results[index] = await fetch(table_name)
+
+        tasks = [
+            asyncio.create_task(run(index, table_name))
+            for index, table_name in enumerate(table_names)
+        ]
+        try:
+            for future in asyncio.as_completed(tasks, timeout=timeout or None):
+                await future
+                if enough is not None and enough(results):
+                    break
+        except TimeoutError:
+            pending = sum(1 for task in tasks if not task.done())
+            logger.error(
+                f"[分表管理器-跨表查询-超时] 超时时间: {timeout}s, "
+                f"未完成的表: {pending}/{len(table_names)}"
+            )
+            raise
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return results
@@ -7,8 +7,10 @@
 from loguru import logger
 
 from ...cache import (
+    sync_cache_acquire_lock,
     sync_cache_delete,
     sync_cache_get,
+    sync_cache_release_lock,
     sync_cache_set,
     sync_cache_setnx,
 )
@@ -164,18 +166,16 @@ class ShardingCacheManager:
         """
         cache_key = f"{self.cache_prefix}{table_name}"
 
-        # 如果缓存可用,先查缓存
-        if self.is_cache_available():
-            cached = self.cache_get(cache_key)
-            if cached is not None:
-                return str(cached) == "1" or cached == 1
+        # 先查缓存(cache_get 失败时返回 None,不需要额外的可用性探测)
+        cached = self.cache_get(cache_key)
+        if cached is not None:
+            return str(cached) == "1" or cached == 1
 
         # 查询数据库
         exists = check_db_func(table_name)
 
-        # 如果缓存可用,写入缓存
-        if self.is_cache_available():
-            self.cache_set(cache_key, "1" if exists else "0")
+        # 写入缓存
+        self.cache_set(cache_key, "1" if exists else "0")
 
         return exists
 
@@ -189,26 +189,28 @@ class ShardingCacheManager:
             table_name: 表名
 
         Returns:
-            bool: 是否成功获取锁
+            str | None: 获取成功返回持有者标识（释放锁时传入），失败返回 None
         """
         if not self.is_cache_available():
-            return False
+            return None
 
         lock_key = f"{self.lock_prefix}{table_name}"
-        return self.cache_setnx(lock_key, "1", ttl=self.lock_timeout)
+        acquired = sync_cache_acquire_lock(lock_key, ttl=self.lock_timeout)
+        return acquired[0] if acquired else None
 
-    def release_lock(self, table_name):
+    def release_lock(self, table_name, owner):
         """
-        释放分布式锁
+        释放分布式锁（仅当锁仍由 owner 持有时释放，锁超时后不会误删其他进程的锁）
 
         Args:
             table_name: 表名
+            owner: acquire_lock 返回的持有者标识
 
         Returns:
             bool: 是否成功释放锁
         """
-        if not self.is_cache_available():
+        if not self._check_cache_available():
             return False
 
         lock_key = f"{self.lock_prefix}{table_name}"
-        return self.cache_delete(lock_key)
+        return sync_cache_release_lock(lock_key, owner)
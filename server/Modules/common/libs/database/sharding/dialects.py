@@ -0,0 +1,364 @@
+"""
+分表方言适配器
+
+封装分表管理器中与数据库方言相关的 SQL：标识符引用、驱动层位置参数占位符、
+插入冲突时更新（upsert）、按基础表复制分表结构、检查表是否存在、列出分表。
+
+支持的方言：
+- mysql：ON DUPLICATE KEY UPDATE，SHOW CREATE TABLE 复制表结构（保留注释、存储引擎、字符集）
+- postgresql：ON CONFLICT (...) DO UPDATE，CREATE TABLE ... (LIKE ... INCLUDING ALL) 复制表结构
+- sqlite：ON CONFLICT (...) DO UPDATE，按模型定义创建表结构（用于本地测试和基准测试）
+
+其他方言按模型定义创建表结构，upsert 使用 ON CONFLICT 语法。
+"""
+
+import hashlib
+import re
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import Connection, Engine, MetaData, Table, inspect, text
+
+
+class DialectAdapter:
+    """
+    方言适配器基类（ON CONFLICT 语法，按模型定义创建分表）
+
+    Attributes:
+        engine: 同步数据库引擎
+    """
+
+    name = "default"
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._preparer = engine.dialect.identifier_preparer
+
+    # ==================== 标识符 ====================
+
+    def quote(self, identifier: str) -> str:
+        """
+        引用标识符（表名、字段名）
+
+        Args:
+            identifier: 标识符
+
+        Returns:
+            str: 引用后的标识符，如 MySQL 的 `name`、PostgreSQL / SQLite 的 "name"
+        """
+        return self._preparer.quote_identifier(identifier)
+
+    def adapt_params(self, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        转换 text() 语句的参数（text() 语句不经过字段类型处理，驱动不支持的类型在这里转换）
+
+        Args:
+            params: 参数字典
+
+        Returns:
+            dict[str, Any]: 转换后的参数字典
+        """
+        return params
+
+    def adapt_row(self, values: tuple[Any, ...]) -> tuple[Any, ...]:
+        """
+        转换 executemany 的一行位置参数（与 adapt_params 相同，用于驱动层批量执行）
+
+        Args:
+            values: 一行参数
+
+        Returns:
+            tuple[Any, ...]: 转换后的参数
+        """
+        return values
+
+    def placeholders(self, count: int) -> str:
+        """
+        生成驱动层 SQL 的位置参数占位符（按驱动的 paramstyle）
+
+        Args:
+            count: 参数个数
+
+        Returns:
+            str: 逗号分隔的占位符，如 pymysql / psycopg2 的 "%s, %s"、sqlite3 的 "?, ?"
+        """
+        style = self.engine.dialect.paramstyle
+        if style == "qmark":
+            return ", ".join(["?"] * count)
+        if style == "numeric":
+            return ", ".join(f":{i}" for i in range(1, count + 1))
+        if style == "numeric_dollar":
+            return ", ".join(f"${i}" for i in range(1, count + 1))
+        return ", ".join(["%s"] * count)
+
+    # ==================== 插入冲突时更新 ====================
+
+    def upsert_clause(
+        self, conflict_keys: list[str], assignments: dict[str, str | None]
+    ) -> str:
+        """
+        构建追加在 INSERT 语句之后的冲突处理子句
+
+        Args:
+            conflict_keys: 冲突判断字段（主键）
+            assignments: 冲突时更新的字段，值为 None 表示使用本次插入的值，
+                否则为 SQL 表达式（如 ":updated_at"）
+
+        Returns:
+            str: 冲突处理子句，没有需要更新的字段时忽略冲突
+        """
+        target = ", ".join(self.quote(key) for key in conflict_keys)
+        if not assignments:
+            return f"ON CONFLICT ({target}) DO NOTHING"
+        updates = ", ".join(
+            f"{self.quote(field)} = {expr or 'excluded.' + self.quote(field)}"
+            for field, expr in assignments.items()
+        )
+        return f"ON CONFLICT ({target}) DO UPDATE SET {updates}"
+
+    # ==================== 表结构 ====================
+
+    def table_exists(self, table_name: str) -> bool:
+        """
+        检查表是否存在（从数据库）
+
+        Args:
+            table_name: 表名
+
+        Returns:
+            bool: 表是否存在
+        """
+        return inspect(self.engine).has_table(table_name)
+
+    def list_tables(self, conn: Connection, prefix: str) -> list[str]:
+        """
+        列出以指定前缀开头的表（一次查询，用于加载分表注册表）
+
+        Args:
+            conn: 同步数据库连接（异步连接通过 run_sync 调用）
+            prefix: 表名前缀（基础表名）
+
+        Returns:
+            list[str]: 表名列表
+        """
+        return [
+            name for name in inspect(conn).get_table_names() if name.startswith(prefix)
+        ]
+
+    def _list_tables_like(self, conn: Connection, sql: str, prefix: str) -> list[str]:
+        """按 LIKE 前缀查询 information_schema 中的表名（_ 和 % 需要转义）"""
+        pattern = (
+            prefix.replace("\\", "\\\\").replace("_", "\\_").replace("%", "\\%") + "%"
+        )
+        rows = conn.execute(text(sql), {"pattern": pattern}).fetchall()
+        return [row[0] for row in rows if row[0].startswith(prefix)]
+
+    def clone_table(
+        self,
+        model_table: Table,
+        base_table_name: str,
+        table_name: str,
+        table_comment: str | None = None,
+    ) -> None:
+        """
+        按基础表的结构创建分表（表已存在时不做任何操作）
+
+        Args:
+            model_table: 模型的表定义
+            base_table_name: 基础表名
+            table_name: 分表表名
+            table_comment: 分表的表注释，None 表示沿用基础表的注释
+        """
+        self._create_from_model(model_table, table_name, table_comment)
+
+    def _create_from_model(
+        self, model_table: Table, table_name: str, table_comment: str | None
+    ) -> None:
+        """按模型定义创建表（索引名加上分表表名，避免与其他分表的索引重名）"""
+        table = model_table.to_metadata(MetaData(), name=table_name)
+        for index in table.indexes:
+            if index.name:
+                index.name = self._shard_index_name(
+                    model_table.name, table_name, index.name
+                )
+        if table_comment:
+            table.comment = table_comment
+        table.create(self.engine, checkfirst=True)
+
+    def _shard_index_name(
+        self, base_table_name: str, table_name: str, index_name: str
+    ) -> str:
+        """分表的索引名（超过方言标识符长度限制时截断并加上哈希）"""
+        if index_name.startswith(base_table_name):
+            name = table_name + index_name[len(base_table_name) :]
+        else:
+            name = f"{table_name}_{index_name}"
+
+        max_length = self.engine.dialect.max_identifier_length or 63
+        if len(name) > max_length:
+            digest = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
+            name = f"{name[: max_length - 9]}_{digest}"
+        return name
+
+
+class MySQLDialectAdapter(DialectAdapter):
+    """MySQL 方言适配器"""
+
+    name = "mysql"
+
+    def upsert_clause(
+        self, conflict_keys: list[str], assignments: dict[str, str | None]
+    ) -> str:
+        """ON DUPLICATE KEY UPDATE（按主键和唯一索引判断冲突，conflict_keys 仅用于其他方言）"""
+        if not assignments:
+            return ""
+        updates = ", ".join(
+            f"{self.quote(field)} = {expr or f'VALUES({self.quote(field)})'}"
+            for field, expr in assignments.items()
+        )
+        return f"ON DUPLICATE KEY UPDATE {updates}"
+
+    def clone_table(
+        self,
+        model_table: Table,
+        base_table_name: str,
+        table_name: str,
+        table_comment: str | None = None,
+    ) -> None:
+        """使用 SHOW CREATE TABLE 复制基础表（保留注释、存储引擎、字符集等），基础表不存在时按模型创建"""
+        original_sql = self._show_create_table(base_table_name)
+        if not original_sql:
+            self._create_from_model(model_table, table_name, table_comment)
+            return
+
+        # 替换表名
+        new_sql = original_sql.replace(
+            f"CREATE TABLE {self.quote(base_table_name)}",
+            f"CREATE TABLE IF NOT EXISTS {self.quote(table_name)}",
+            1,
+        )
+
+        # 如果指定了新的表注释，替换 COMMENT='xxx'
+        if table_comment:
+            escaped = table_comment.replace("'", "''")
+            new_sql = re.sub(r"COMMENT='(?:[^']|'')*'\s*$", "", new_sql).rstrip()
+            new_sql = f"{new_sql} COMMENT='{escaped}'"
+
+        with self.engine.begin() as conn:
+            conn.execute(text(new_sql))
+
+    def list_tables(self, conn: Connection, prefix: str) -> list[str]:
+        """从 information_schema.TABLES 查询当前库中以指定前缀开头的表"""
+        return self._list_tables_like(
+            conn,
+            "SELECT TABLE_NAME FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME LIKE :pattern",
+            prefix,
+        )
+
+    def _show_create_table(self, table_name: str) -> str:
+        """
+        获取表的 CREATE TABLE SQL
+
+        Args:
+            table_name: 表名
+
+        Returns:
+            str: CREATE TABLE SQL，表不存在时返回空字符串
+        """
+        # SHOW CREATE TABLE 不支持参数化查询，需要验证表名以防止 SQL 注入
+        if not table_name.replace("_", "").replace("-", "").isalnum():
+            raise ValueError(f"无效的表名: {table_name}")
+
+        if not self.table_exists(table_name):
+            return ""
+
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(f"SHOW CREATE TABLE {self.quote(table_name)}")
+            ).fetchone()
+            if row and len(row) > 1:
+                return row[1]
+        return ""
+
+
+class PostgreSQLDialectAdapter(DialectAdapter):
+    """PostgreSQL 方言适配器"""
+
+    name = "postgresql"
+
+    def list_tables(self, conn: Connection, prefix: str) -> list[str]:
+        """从 information_schema.tables 查询当前 schema 中以指定前缀开头的表"""
+        return self._list_tables_like(
+            conn,
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = current_schema() AND table_name LIKE :pattern",
+            prefix,
+        )
+
+    def clone_table(
+        self,
+        model_table: Table,
+        base_table_name: str,
+        table_name: str,
+        table_comment: str | None = None,
+    ) -> None:
+        """使用 LIKE ... INCLUDING ALL 复制基础表（包括默认值、约束、索引、注释），基础表不存在时按模型创建"""
+        if not self.table_exists(base_table_name):
+            self._create_from_model(model_table, table_name, table_comment)
+            return
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {self.quote(table_name)} "
+                    f"(LIKE {self.quote(base_table_name)} INCLUDING ALL)"
+                )
+            )
+            if table_comment:
+                escaped = table_comment.replace("'", "''")
+                conn.execute(
+                    text(f"COMMENT ON TABLE {self.quote(table_name)} IS '{escaped}'")
+                )
+
+
+class SQLiteDialectAdapter(DialectAdapter):
+    """SQLite 方言适配器（不支持表注释，按模型定义创建分表）"""
+
+    name = "sqlite"
+
+    def adapt_params(self, params: dict[str, Any]) -> dict[str, Any]:
+        """pysqlite 不支持 Decimal 参数，转换为字符串（按字段的 NUMERIC 亲和性保存）"""
+        return {
+            key: str(value) if isinstance(value, Decimal) else value
+            for key, value in params.items()
+        }
+
+    def adapt_row(self, values: tuple[Any, ...]) -> tuple[Any, ...]:
+        """pysqlite 不支持 Decimal 参数，转换为字符串"""
+        return tuple(
+            str(value) if isinstance(value, Decimal) else value for value in values
+        )
+
+
+_ADAPTERS: dict[str, type[DialectAdapter]] = {
+    MySQLDialectAdapter.name: MySQLDialectAdapter,
+    PostgreSQLDialectAdapter.name: PostgreSQLDialectAdapter,
+    SQLiteDialectAdapter.name: SQLiteDialectAdapter,
+}
+
+
+def get_dialect_adapter(engine: Any) -> DialectAdapter:
+    """
+    获取引擎对应的方言适配器
+
+    Args:
+        engine: 同步数据库引擎（MariaDB 使用 MySQL 适配器）
+
+    Returns:
+        DialectAdapter: 方言适配器
+    """
+    name = engine.dialect.name
+    if name == "mariadb":
+        name = MySQLDialectAdapter.name
+    return _ADAPTERS.get(name, DialectAdapter)(engine)
@@ -2,8 +2,18 @@
 分表管理器
 
 提供统一的分表管理功能，包括表路由、表管理、数据查询和数据写入。
+SQL 中与方言相关的部分（标识符引用、upsert）由 dialects 模块的方言适配器生成。
 """
 
+import contextvars
+import hashlib
+import heapq
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
 from loguru import logger
 from sqlalchemy import text
 
@@ -12,6 +22,37 @@ from ...time.utils import now
 # 常量配置
 MAX_TABLES_PER_QUERY = 50  # 单次查询最大表数
 
+# 支持下推到各表的聚合函数
+_AGGREGATE_FUNCTIONS = ("count", "sum", "min", "max", "avg")
+
+# 封存分表聚合结果的缓存键前缀
+AGGREGATE_KEY_PREFIX = "sharding:aggregate:"
+
+
+@dataclass
+class BatchInsertStats:
+    """
+    批量写入统计
+
+    Attributes:
+        rows: 成功写入的记录数
+        failed: 写入失败的记录数
+        tables: 写入的分表数
+        chunks: 执行的批次数（每批一个事务、一次 executemany）
+        elapsed: 耗时（秒）
+    """
+
+    rows: int = 0
+    failed: int = 0
+    tables: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """写入速度（行/秒）"""
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
 
 class ShardingManager:
     """
@@ -46,8 +87,10 @@ class ShardingManager:
         """延迟获取数据库引擎"""
         if self._engine is None:
             from ..sql.engine import get_db_engine
+            from ..sql.routing import get_model_connection
 
-            self._engine = get_db_engine()
+            # 模型通过 __bind_key__ / 按模块配置指定了连接时使用该连接
+            self._engine = get_db_engine(get_model_connection(self.model))
         return self._engine
 
     @property
@@ -59,6 +102,16 @@ class ShardingManager:
             self._table_creator = ShardingTableCreator(self.model, self.engine)
         return self._table_creator
 
+    @property
+    def dialect(self):
+        """方言适配器(与表创建器共用)"""
+        return self.table_creator.dialect
+
+    @property
+    def query_dialect(self):
+        """查询 SQL 使用的方言适配器"""
+        return self.dialect
+
     @property
     def cache_manager(self):
         """延迟获取缓存管理器"""
@@ -104,7 +157,7 @@ class ShardingManager:
 
     def table_exists(self, table_name) -> bool:
         """
-        检查表是否存在(带缓存)
+        检查表是否存在(分表注册表 / 缓存)
 
         Args:
             table_name: 表名
@@ -112,9 +165,7 @@ class ShardingManager:
         Returns:
             bool: 表是否存在
         """
-        return self.cache_manager.check_table_exists_with_cache(
-            table_name, self.table_creator._check_table_exists_from_db
-        )
+        return self.table_creator.table_exists(table_name)
 
     def ensure_table_exists(self, table_name) -> bool:
         """
@@ -181,28 +232,9 @@ class ShardingManager:
             logger.warning(f"[分表管理器-查询单表-表不存在] 表名: {table_name}")
             return []
 
-        # 构建查询条件
-        where_clause, params = self._build_where_clause(conditions or {})
-
-        # 构建排序
-        order_clause = ""
-        if order_by:
-            order_clause = f"ORDER BY {order_by}"
-
-        # 构建限制
-        limit_clause = ""
-        if limit is not None:
-            limit_clause = f"LIMIT {limit}"
-            if offset > 0:
-                limit_clause += f" OFFSET {offset}"
-
-        # 构建SQL
-        sql = f"""
-            SELECT * FROM {table_name}
-            WHERE {where_clause}
-            {order_clause}
-            {limit_clause}
-        """
+        sql, params = self._build_select_sql(
+            table_name, conditions, limit, offset, order_by
+        )
 
         # 执行查询
         try:
@@ -218,16 +250,23 @@ class ShardingManager:
         limit=None,
         order_by=None,
         max_tables=None,
+        offset=0,
     ):
         """
         查询多张表的数据(跨表查询)
 
+        指定 limit 时每张表只查询前 offset + limit 条（ORDER BY + LIMIT 下推到每张表）：
+        - 按分表键排序且分表按分表键区间划分(如按时间分表)时，按排序方向逐表查询，取够后不再查询其余的表
+        - 按其他字段排序时，各表的有序结果使用堆进行多路归并
+        - 不排序时按表顺序查询，取够后不再查询其余的表
+
         Args:
             sharding_key_range: 分表键范围(起始值, 结束值)
             conditions: 查询条件字典
             limit: 返回记录数限制
-            order_by: 排序规则
+            order_by: 排序规则(如 "trade_date DESC")
             max_tables: 最大查询表数限制
+            offset: 偏移量(与 limit 一起使用)
 
         Returns:
             list[dict]: 查询结果(已合并和排序)
@@ -237,6 +276,72 @@ class ShardingManager:
             logger.warning("[分表管理器-跨表查询-失败] 未指定分表键范围,无法跨表查询")
             return []
 
+        table_names = [
+            name
+            for name in self._range_table_names(sharding_key_range, max_tables)
+            if self.table_exists(name)
+        ]
+        order = self._resolve_order_by(order_by)
+
+        # 排序字段无法识别(如多字段排序):查询全部数据后在内存中排序
+        if order_by and order is None:
+            all_data = []
+            for table_name in table_names:
+                all_data.extend(
+                    self.query_single_table(
+                        table_name=table_name,
+                        conditions=conditions,
+                        order_by=order_by,
+                    )
+                )
+            all_data = self._merge_and_sort(all_data, order_by)
+            if limit is not None:
+                return all_data[offset : offset + limit]
+            return all_data[offset:]
+
+        wanted = offset + limit if limit is not None else None
+
+        # 不排序，或按分表键排序且各表按分表键区间划分:逐表查询，取够后结束
+        if order is None or (
+            order[0] == self.sharding_strategy.sharding_key
+            and self.sharding_strategy.ordered_tables
+        ):
+            if order is not None and order[1]:
+                table_names = list(reversed(table_names))
+            all_data = []
+            for table_name in table_names:
+                all_data.extend(
+                    self.query_single_table(
+                        table_name=table_name,
+                        conditions=conditions,
+                        limit=None if wanted is None else wanted - len(all_data),
+                        order_by=order and self._order_clause(*order),
+                    )
+                )
+                if wanted is not None and len(all_data) >= wanted:
+                    break
+            return all_data[offset:wanted]
+
+        # 按其他字段排序:各表取前 offset + limit 条，多路归并
+        field, descending = order
+        sorted_lists = [
+            self.query_single_table(
+                table_name=table_name,
+                conditions=conditions,
+                limit=wanted,
+                order_by=self._order_clause(field, descending),
+            )
+            for table_name in table_names
+        ]
+        merged = heapq.merge(
+            *sorted_lists,
+            key=self._sort_key(field, descending),
+            reverse=descending,
+        )
+        return list(islice(merged, offset, wanted))
+
+    def _range_table_names(self, sharding_key_range, max_tables=None):
+        """获取分表键范围涉及的表名(按 max_tables 限制表数量)"""
         start_value, end_value = sharding_key_range
 
         # 获取涉及的表名
@@ -251,27 +356,7 @@ class ShardingManager:
             )
             table_names = table_names[:max_tables]
 
-        # 查询每张表
-        all_data = []
-        for table_name in table_names:
-            if not self.table_exists(table_name):
-                continue
-
-            data = self.query_single_table(
-                table_name=table_name,
-                conditions=conditions,
-                order_by=order_by,
-            )
-            all_data.extend(data)
-
-        # 合并和排序
-        all_data = self._merge_and_sort(all_data, order_by)
-
-        # 应用limit
-        if limit is not None:
-            all_data = all_data[:limit]
-
-        return all_data
+        return table_names
 
     def count(self, sharding_key_range=None, conditions=None) -> int:
         """
@@ -289,24 +374,13 @@ class ShardingManager:
             logger.warning("未指定分表键范围,无法统计")
             return 0
 
-        start_value, end_value = sharding_key_range
-
-        # 获取涉及的表名
-        table_names = self.sharding_strategy.get_table_names_by_range(
-            start_value, end_value, self.table_prefix
-        )
-
         # 统计每张表的数据量
         total_count = 0
-        for table_name in table_names:
+        for table_name in self._range_table_names(sharding_key_range):
             if not self.table_exists(table_name):
                 continue
 
-            # 构建查询条件
-            where_clause, params = self._build_where_clause(conditions or {})
-
-            # 构建SQL
-            sql = f"SELECT COUNT(*) as count FROM {table_name} WHERE {where_clause}"
+            sql, params = self._build_count_sql(table_name, conditions)
 
             try:
                 count = self._execute_query_scalar(sql, params)
@@ -317,6 +391,91 @@ class ShardingManager:
 
         return total_count
 
+    def aggregate(
+        self,
+        sharding_key_range,
+        aggregates,
+        group_by=None,
+        conditions=None,
+        max_tables=None,
+    ):
+        """
+        跨表聚合查询(GROUP BY 和聚合函数下推到每张表)
+
+        每张表返回按分组聚合后的部分结果，再合并：COUNT / SUM 相加，MIN / MAX 取最小 / 最大值，
+        AVG 由各表的 SUM 和 COUNT 合并后计算。已封存的分表(如按年分表时往年的表)的部分结果
+        缓存 sharding_aggregate_cache_ttl 秒，写入该表时失效。
+
+        Args:
+            sharding_key_range: 分表键范围(起始值, 结束值)，同时作为查询条件
+            aggregates: 聚合字典 {别名: (函数, 字段)}，函数为 count / sum / min / max / avg，
+                count 的字段可以为 "*"
+            group_by: 分组字段列表
+            conditions: 查询条件字典
+            max_tables: 最大查询表数限制
+
+        Returns:
+            list[dict]: 每个分组一行(包含分组字段和各别名，按分组字段排序)；
+                不分组时返回一行
+
+        Raises:
+            ValueError: 聚合函数或字段不支持
+
+        Examples:
+            >>> manager.aggregate(
+            ...     sharding_key_range=(date(2023, 1, 1), date(2023, 12, 31)),
+            ...     aggregates={"avg_amount": ("avg", "amount"), "days": ("count", "*")},
+            ...     group_by=["stock_id"],
+            ... )
+            [{'stock_id': 1, 'avg_amount': Decimal('...'), 'days': 242}, ...]
+        """
+        if sharding_key_range is None:
+            logger.warning("[分表管理器-聚合查询-失败] 未指定分表键范围,无法聚合")
+            return []
+
+        group_by, partials, sql_template, params = self._aggregate_plan(
+            sharding_key_range, aggregates, group_by, conditions
+        )
+        table_names = [
+            name
+            for name in self._range_table_names(sharding_key_range, max_tables)
+            if self.table_exists(name)
+        ]
+
+        ttl = self._aggregate_cache_ttl()
+        closed = [
+            name
+            for name in table_names
+            if ttl and self.sharding_strategy.is_closed_table(name, self.table_prefix)
+        ]
+        cache_keys = self._aggregate_cache_keys(closed, sql_template, params)
+        cached, versions = {}, {}
+        if closed:
+            from ...cache import get_sync_cache_service
+
+            try:
+                found = get_sync_cache_service().get_many(
+                    [key for pair in cache_keys.values() for key in pair]
+                )
+                cached, versions = self._unwrap_aggregate_cache(cache_keys, found)
+            except Exception as e:
+                logger.warning(f"[分表管理器-聚合查询-读取缓存失败] 错误: {e}")
+
+        merged = {}
+        for table_name in table_names:
+            rows = cached.get(table_name)
+            if rows is None:
+                rows = self._aggregate_table(table_name, sql_template, params)
+                if rows is None:
+                    continue
+                if table_name in cache_keys:
+                    self._store_aggregate_cache(
+                        cache_keys[table_name][0], versions.get(table_name, 0), rows
+                    )
+            self._merge_partials(merged, rows, len(group_by), partials)
+
+        return self._finalize_aggregates(merged, aggregates, group_by, partials)
+
     # ==================== 写入方法 ====================
 
     def insert(self, sharding_key_value, data, on_duplicate="UPDATE") -> bool:
@@ -347,10 +506,11 @@ class ShardingManager:
         # 执行SQL
         try:
             self._execute_update(sql, params)
-            return True
         except Exception as e:
             logger.error(f"插入数据失败: {table_name}, 错误: {e}")
             return False
+        self._bump_table_versions([table_name])
+        return True
 
     def batch_insert(self, data_list, on_duplicate="UPDATE") -> int:
         """
@@ -363,8 +523,37 @@ class ShardingManager:
         Returns:
             int: 成功插入的记录数
         """
+        return self.batch_write(data_list, on_duplicate).rows
+
+    def batch_write(
+        self,
+        data_list,
+        on_duplicate="UPDATE",
+        batch_rows=None,
+        batch_bytes=None,
+        max_workers=None,
+    ) -> BatchInsertStats:
+        """
+        批量写入数据并返回统计
+
+        数据按分表分组，每张表按记录数和估算大小切分为多批，每批在一个事务中使用驱动层
+        executemany（位置参数）执行；不同分表由多个线程使用独立连接同时写入。
+
+        Args:
+            data_list: 数据列表
+            on_duplicate: 重复时的处理方式
+            batch_rows: 每批最大记录数，None 表示使用配置 sharding_batch_rows
+            batch_bytes: 每批估算大小上限（字节），None 表示使用配置 sharding_batch_bytes
+            max_workers: 并发写入的线程数，None 表示使用配置 sharding_write_workers
+
+        Returns:
+            BatchInsertStats: 写入统计（成功 / 失败记录数、批次数、耗时、行/秒）
+        """
+        stats = BatchInsertStats()
         if not data_list:
-            return 0
+            return stats
+
+        started = time.perf_counter()
 
         # 按表分组
         data_by_table = {}
@@ -380,33 +569,120 @@ class ShardingManager:
 
             data_by_table[table_name].append(data)
 
-        # 批量写入每张表
-        success_count = 0
+        # 确保表存在（建表在写入前依次完成）
+        jobs = []
         for table_name, table_data_list in data_by_table.items():
-            # 确保表存在
             if not self.ensure_table_exists(table_name):
                 logger.error(f"[分表管理器-批量插入-表创建失败] 表名: {table_name}")
+                stats.failed += len(table_data_list)
                 continue
+            jobs.append((table_name, table_data_list))
+        stats.tables = len(jobs)
+
+        from ...config import Config
+
+        batch_rows = batch_rows or Config.get("database.sharding_batch_rows", 1000)
+        batch_bytes = batch_bytes or Config.get(
+            "database.sharding_batch_bytes", 1048576
+        )
+        max_workers = min(
+            max_workers or Config.get("database.sharding_write_workers", 4),
+            len(jobs),
+        )
+
+        def write(job):
+            table_name, table_data_list = job
+            return self._write_table(
+                table_name, table_data_list, on_duplicate, batch_rows, batch_bytes
+            )
+
+        # 写入每张表
+        if max_workers <= 1:
+            results = [write(job) for job in jobs]
+        else:
+            # 线程池不复制 contextvar：每个任务在调用方上下文的副本中执行，
+            # 写入语句才会计入当前请求 / 任务的 SQL 统计（track_queries）
+            contexts = [contextvars.copy_context() for _ in jobs]
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="sharding-writer"
+            ) as executor:
+                results = list(
+                    executor.map(lambda ctx, job: ctx.run(write, job), contexts, jobs)
+                )
+
+        for written, failed, chunks in results:
+            stats.rows += written
+            stats.failed += failed
+            stats.chunks += chunks
+        self._bump_table_versions([table_name for table_name, _ in jobs])
+        stats.elapsed = time.perf_counter() - started
+
+        logger.info(
+            f"[分表管理器-批量插入-完成] 表数: {stats.tables}, 成功: {stats.rows}, "
+            f"失败: {stats.failed}, 批次: {stats.chunks}, 耗时: {stats.elapsed:.3f}s, "
+            f"速度: {stats.rows_per_second:.0f} 行/秒"
+        )
+        return stats
+
+    def _write_table(
+        self, table_name, data_list, on_duplicate, batch_rows, batch_bytes
+    ):
+        """
+        分批写入一张表（在写入线程中执行）
 
-            # 构建批量插入SQL
-            sql, params = self._build_batch_insert_sql(
-                table_name,
-                table_data_list,
-                self._field_mapping,
-                self._primary_keys,
-                on_duplicate,
+        Returns:
+            tuple[int, int, int]: (成功记录数, 失败记录数, 批次数)
+        """
+        sql, fields = self._build_batch_insert_sql(
+            table_name,
+            data_list,
+            self._field_mapping,
+            self._primary_keys,
+            on_duplicate,
+        )
+        timestamp = now()
+        rows = (
+            self.dialect.adapt_row(
+                tuple(
+                    timestamp
+                    if key == "updated_at" or (key == "created_at" and key not in data)
+                    else data.get(key)
+                    for key in fields
+                )
             )
+            for data in data_list
+        )
 
-            # 执行SQL
+        written = failed = chunks = 0
+        for chunk in self._iter_batches(rows, batch_rows, batch_bytes):
+            chunks += 1
             try:
-                self._execute_update(sql, params)
-                success_count += len(table_data_list)
+                with self.engine.begin() as conn:
+                    conn.exec_driver_sql(sql, chunk)
+                written += len(chunk)
             except Exception as e:
+                failed += len(chunk)
                 logger.error(
-                    f"[分表管理器-批量插入-失败] 表名: {table_name}, 错误: {e}"
+                    f"[分表管理器-批量插入-失败] 表名: {table_name}, "
+                    f"批次记录数: {len(chunk)}, 错误: {e}"
                 )
-
-        return success_count
+        return written, failed, chunks
+
+    @staticmethod
+    def _iter_batches(rows, batch_rows, batch_bytes):
+        """按记录数和估算大小切分批次（单条记录超过大小上限时单独成批）"""
+        batch = []
+        size = 0
+        for row in rows:
+            row_size = sum(4 if value is None else len(str(value)) + 3 for value in row)
+            if batch and (len(batch) >= batch_rows or size + row_size > batch_bytes):
+                yield batch
+                batch = []
+                size = 0
+            batch.append(row)
+            size += row_size
+        if batch:
+            yield batch
 
     def update(self, sharding_key_value, pk_values, data) -> bool:
         """
@@ -437,6 +713,7 @@ class ShardingManager:
         try:
             result = self._execute_update(sql, params)
             if result.rowcount > 0:
+                self._bump_table_versions([table_name])
                 return True
             else:
                 logger.warning(f"更新数据失败: 记录不存在, {table_name}")
@@ -463,7 +740,7 @@ class ShardingManager:
     def _execute_query(self, sql, params):
         """执行查询SQL"""
         with self.engine.connect() as conn:
-            result = conn.execute(text(sql), params)
+            result = conn.execute(text(sql), self.dialect.adapt_params(params))
             rows = result.fetchall()
             columns = result.keys()
             return [dict(zip(columns, row, strict=True)) for row in rows]
@@ -471,12 +748,12 @@ class ShardingManager:
     def _execute_update(self, sql, params):
         """执行更新/插入SQL"""
         with self.engine.begin() as conn:
-            return conn.execute(text(sql), params)
+            return conn.execute(text(sql), self.dialect.adapt_params(params))
 
     def _execute_query_scalar(self, sql, params):
         """执行标量查询SQL"""
         with self.engine.connect() as conn:
-            result = conn.execute(text(sql), params)
+            result = conn.execute(text(sql), self.dialect.adapt_params(params))
             return result.scalar()
 
     def _build_where_clause(self, conditions):
@@ -497,6 +774,229 @@ class ShardingManager:
         where_clause = " AND ".join(clauses)
         return where_clause, params
 
+    def _build_select_sql(self, table_name, conditions, limit, offset, order_by):
+        """构建单表查询SQL"""
+        # 构建查询条件
+        where_clause, params = self._build_where_clause(conditions or {})
+
+        # 构建排序
+        order_clause = ""
+        if order_by:
+            order_clause = f"ORDER BY {order_by}"
+
+        # 构建限制
+        limit_clause = ""
+        if limit is not None:
+            limit_clause = f"LIMIT {limit}"
+            if offset > 0:
+                limit_clause += f" OFFSET {offset}"
+
+        # 构建SQL
+        sql = f"""
+            SELECT * FROM {table_name}
+            WHERE {where_clause}
+            {order_clause}
+            {limit_clause}
+        """
+        return sql, params
+
+    def _build_count_sql(self, table_name, conditions):
+        """构建单表统计SQL"""
+        where_clause, params = self._build_where_clause(conditions or {})
+        sql = f"SELECT COUNT(*) as count FROM {table_name} WHERE {where_clause}"
+        return sql, params
+
+    def _aggregate_plan(self, sharding_key_range, aggregates, group_by, conditions):
+        """
+        构建下推到各表的聚合SQL
+
+        Returns:
+            tuple: (分组字段列表, 部分聚合列表 [(函数, 字段)], SQL 模板(表名为 {table}), 参数)
+        """
+        group_by = list(group_by or [])
+        if not aggregates:
+            raise ValueError("未指定聚合函数")
+
+        partials = []
+        for alias, (func, field) in aggregates.items():
+            func = func.lower()
+            if func not in _AGGREGATE_FUNCTIONS:
+                raise ValueError(f"不支持的聚合函数: {func}")
+            if field == "*" and func != "count":
+                raise ValueError(f"聚合函数 {func} 不支持字段 *")
+            if field != "*" and field not in self._field_mapping:
+                raise ValueError(f"聚合字段不存在: {alias} -> {field}")
+            # AVG 拆分为 SUM 和 COUNT，合并后再相除
+            for partial in (
+                [("sum", field), ("count", field)] if func == "avg" else [(func, field)]
+            ):
+                if partial not in partials:
+                    partials.append(partial)
+        for field in group_by:
+            if field not in self._field_mapping:
+                raise ValueError(f"分组字段不存在: {field}")
+
+        where_clause, params = self._build_where_clause(conditions or {})
+        start_value, end_value = sharding_key_range
+        sharding_key = self.query_dialect.quote(self.sharding_strategy.sharding_key)
+        where_clause += (
+            f" AND {sharding_key} >= :sharding_range_start"
+            f" AND {sharding_key} <= :sharding_range_end"
+        )
+        params.update(sharding_range_start=start_value, sharding_range_end=end_value)
+
+        quoted_groups = [self.query_dialect.quote(field) for field in group_by]
+        columns = quoted_groups + [
+            f"{func.upper()}({'*' if field == '*' else self.query_dialect.quote(field)})"
+            f" AS p{index}"
+            for index, (func, field) in enumerate(partials)
+        ]
+        sql = f"SELECT {', '.join(columns)} FROM {{table}} WHERE {where_clause}"
+        if quoted_groups:
+            sql += f" GROUP BY {', '.join(quoted_groups)}"
+        return group_by, partials, sql, params
+
+    def _aggregate_table(self, table_name, sql_template, params):
+        """执行单表聚合,失败时返回 None"""
+        try:
+            with self.engine.connect() as conn:
+                result = conn.execute(
+                    text(sql_template.format(table=table_name)),
+                    self.query_dialect.adapt_params(params),
+                )
+                return [list(row) for row in result.fetchall()]
+        except Exception as e:
+            logger.error(f"[分表管理器-聚合查询-失败] 表名: {table_name}, 错误: {e}")
+            return None
+
+    @staticmethod
+    def _aggregate_cache_ttl():
+        """封存分表聚合结果的缓存时间(秒)"""
+        from ...config import Config
+
+        return Config.get("database.sharding_aggregate_cache_ttl", 86400)
+
+    @staticmethod
+    def _aggregate_cache_keys(table_names, sql_template, params):
+        """
+        封存分表的聚合缓存键
+
+        Returns:
+            dict[str, tuple[str, str]]: 表名 -> (结果缓存键, 表版本计数键)
+        """
+        from ...cache.decorators import tag_key
+        from ..sql.query_cache import table_tag
+
+        digest = hashlib.sha1(
+            json.dumps([sql_template, params], sort_keys=True, default=str).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        return {
+            name: (f"{AGGREGATE_KEY_PREFIX}{name}:{digest}", tag_key(table_tag(name)))
+            for name in table_names
+        }
+
+    @staticmethod
+    def _unwrap_aggregate_cache(cache_keys, found):
+        """
+        解析缓存的部分结果(表版本与写入时不一致视为失效)
+
+        Returns:
+            tuple[dict, dict]: (表名 -> 部分结果, 表名 -> 当前表版本)
+        """
+        cached, versions = {}, {}
+        for table_name, (entry_key, version_key) in cache_keys.items():
+            version = int(found.get(version_key) or 0)
+            versions[table_name] = version
+            entry = found.get(entry_key)
+            if isinstance(entry, dict) and entry.get("version") == version:
+                cached[table_name] = entry["rows"]
+        return cached, versions
+
+    def _store_aggregate_cache(self, cache_key, version, rows):
+        """缓存封存分表的部分结果(使用查询前读取的表版本,查询期间的写入会使其立即失效)"""
+        from ...cache import get_sync_cache_service
+
+        try:
+            get_sync_cache_service().set(
+                cache_key,
+                {"version": version, "rows": rows},
+                ttl=self._aggregate_cache_ttl(),
+            )
+        except Exception as e:
+            logger.warning(
+                f"[分表管理器-聚合查询-写入缓存失败] 键: {cache_key}, 错误: {e}"
+            )
+
+    def _bump_table_versions(self, table_names):
+        """
+        写入提交后递增分表的表版本
+
+        驱动层 SQL 不经过会话事件，需要在这里递增：
+        启用查询缓存时递增所有写入的分表，否则只递增封存分表（使其聚合缓存失效）。
+        """
+        from ...cache import invalidate_tags
+        from ..sql.query_cache import is_query_cache_installed, table_tag
+
+        if not is_query_cache_installed():
+            table_names = [
+                name
+                for name in table_names
+                if self.sharding_strategy.is_closed_table(name, self.table_prefix)
+            ]
+        if table_names:
+            invalidate_tags(*(table_tag(name) for name in dict.fromkeys(table_names)))
+
+    @staticmethod
+    def _merge_partials(merged, rows, group_count, partials):
+        """合并一张表的部分聚合结果(COUNT / SUM 相加,MIN / MAX 取最小 / 最大值)"""
+        for row in rows:
+            key = tuple(row[:group_count])
+            values = row[group_count:]
+            current = merged.get(key)
+            if current is None:
+                merged[key] = list(values)
+                continue
+            for index, (func, _) in enumerate(partials):
+                value = values[index]
+                if value is None:
+                    continue
+                if current[index] is None:
+                    current[index] = value
+                elif func in ("count", "sum"):
+                    current[index] += value
+                elif func == "min":
+                    current[index] = min(current[index], value)
+                else:
+                    current[index] = max(current[index], value)
+
+    @staticmethod
+    def _finalize_aggregates(merged, aggregates, group_by, partials):
+        """由合并后的部分结果计算各别名的值"""
+        if not group_by and not merged:
+            # 没有数据时与数据库一致:COUNT 为 0,其他为 NULL
+            merged[()] = [0 if func == "count" else None for func, _ in partials]
+
+        results = []
+        for key in sorted(
+            merged,
+            key=lambda k: tuple((v is None, v if v is not None else "") for v in k),
+        ):
+            values = merged[key]
+            row = dict(zip(group_by, key, strict=True))
+            for alias, (func, field) in aggregates.items():
+                func = func.lower()
+                if func == "avg":
+                    total = values[partials.index(("sum", field))]
+                    count = values[partials.index(("count", field))]
+                    row[alias] = total / count if count else None
+                else:
+                    value = values[partials.index((func, field))]
+                    row[alias] = (value or 0) if func == "count" else value
+            results.append(row)
+        return results
+
     def _build_insert_sql(
         self, table_name, data, field_mapping, primary_keys, on_duplicate
     ):
@@ -520,34 +1020,42 @@ class ShardingManager:
             params["created_at"] = now()
 
         # 构建SQL
+        quote = self.dialect.quote
         sql = f"""
-            INSERT INTO `{table_name}` ({", ".join(f"`{f}`" for f in valid_fields)})
+            INSERT INTO {quote(table_name)} ({", ".join(quote(f) for f in valid_fields)})
             VALUES ({", ".join(values)})
         """
 
-        # 添加ON DUPLICATE KEY UPDATE
+        # 添加冲突时更新子句(MySQL: ON DUPLICATE KEY UPDATE, 其他: ON CONFLICT DO UPDATE)
         if on_duplicate == "UPDATE":
-            update_fields = []
-            for key in valid_fields:
-                if key not in primary_keys and key != "created_at":
-                    update_fields.append(f"`{key}` = VALUES(`{key}`)")
+            assignments = {
+                key: None
+                for key in valid_fields
+                if key not in primary_keys and key != "created_at"
+            }
 
             if "updated_at" in field_mapping:
-                update_fields.append("`updated_at` = :updated_at")
+                assignments["updated_at"] = ":updated_at"
                 params["updated_at"] = now()
 
-            if update_fields:
-                sql += f" ON DUPLICATE KEY UPDATE {', '.join(update_fields)}"
+            clause = self.dialect.upsert_clause(primary_keys, assignments)
+            if clause:
+                sql += f" {clause}"
 
         return sql, params
 
     def _build_batch_insert_sql(
         self, table_name, data_list, field_mapping, primary_keys, on_duplicate
     ):
-        """构建批量INSERT SQL"""
+        """
+        构建批量INSERT SQL（驱动层位置参数，配合 executemany 使用）
+
+        Returns:
+            tuple[str, list[str]]: (SQL, 按参数顺序排列的字段列表)
+        """
 
         if not data_list:
-            return "", {}
+            return "", []
 
         # 使用第一条数据构建字段列表
         first_data = data_list[0]
@@ -564,49 +1072,27 @@ class ShardingManager:
         if "updated_at" in field_mapping and "updated_at" not in valid_fields:
             valid_fields.append("updated_at")
 
-        # 构建批量VALUES子句
-        values_clauses = []
-        params = {}
-
-        for i, data in enumerate(data_list):
-            value_placeholders = []
-            for key in valid_fields:
-                # 使用唯一的参数名,避免冲突
-                param_name = f"p_{i}_{key.replace('_', '_')}"
-                value_placeholders.append(f":{param_name}")
-
-                # 设置参数值
-                if key == "created_at" and key not in data:
-                    params[param_name] = now()
-                elif key == "updated_at":
-                    params[param_name] = now()
-                elif key in data and data[key] is not None:
-                    params[param_name] = data[key]
-                else:
-                    params[param_name] = None
-
-            values_clauses.append(f"({', '.join(value_placeholders)})")
-
         # 构建SQL
-        sql = f"""
-            INSERT INTO `{table_name}` ({", ".join(f"`{f}`" for f in valid_fields)})
-            VALUES {", ".join(values_clauses)}
-        """
+        quote = self.dialect.quote
+        sql = (
+            f"INSERT INTO {quote(table_name)} "
+            f"({', '.join(quote(f) for f in valid_fields)}) "
+            f"VALUES ({self.dialect.placeholders(len(valid_fields))})"
+        )
 
-        # 添加ON DUPLICATE KEY UPDATE
+        # 添加冲突时更新子句(MySQL: ON DUPLICATE KEY UPDATE, 其他: ON CONFLICT DO UPDATE)
         if on_duplicate == "UPDATE":
-            update_fields = []
-            for key in valid_fields:
-                if key not in primary_keys and key != "created_at":
-                    update_fields.append(f"`{key}` = VALUES(`{key}`)")
+            assignments = {
+                key: None
+                for key in valid_fields
+                if key not in primary_keys and key != "created_at"
+            }
 
-            if "updated_at" in field_mapping:
-                update_fields.append("`updated_at` = VALUES(`updated_at`)")
-
-            if update_fields:
-                sql += f" ON DUPLICATE KEY UPDATE {', '.join(update_fields)}"
+            clause = self.dialect.upsert_clause(primary_keys, assignments)
+            if clause:
+                sql += f" {clause}"
 
-        return sql, params
+        return sql, valid_fields
 
     def _build_update_sql(self, table_name, pk_values, data, field_mapping):
         """构建UPDATE SQL"""
@@ -615,28 +1101,29 @@ class ShardingManager:
         set_fields = []
         params = {}
 
+        quote = self.dialect.quote
         for key, value in data.items():
             if key in field_mapping and value is not None:
-                set_fields.append(f"`{key}` = :{key}")
+                set_fields.append(f"{quote(key)} = :{key}")
                 params[key] = value
 
         # 添加更新时间
         if "updated_at" in field_mapping:
-            set_fields.append("`updated_at` = :updated_at")
+            set_fields.append(f"{quote('updated_at')} = :updated_at")
             params["updated_at"] = now()
 
         # 构建WHERE子句
         where_clauses = []
         for key, value in pk_values.items():
             if key in field_mapping:
-                where_clauses.append(f"`{key}` = :pk_{key}")
+                where_clauses.append(f"{quote(key)} = :pk_{key}")
                 params[f"pk_{key}"] = value
 
         where_clause = " AND ".join(where_clauses)
 
         # 构建SQL
         sql = f"""
-            UPDATE `{table_name}`
+            UPDATE {quote(table_name)}
             SET {", ".join(set_fields)}
             WHERE {where_clause}
         """
@@ -654,17 +1141,59 @@ class ShardingManager:
         # 解析排序规则
         order_field, order_direction = self._parse_order_by(order_by)
 
-        # 排序(处理None值,将其放在最后)
+        # 排序(None值排在最后)
         reverse = order_direction.upper() == "DESC"
+        all_data.sort(key=self._sort_key(order_field, reverse), reverse=reverse)
 
-        def sort_key(item):
-            value = item.get(order_field)
-            # 将None值转换为最大值,使其排在最后
-            return (value is None, value if value is not None else "")
+        return all_data
 
-        all_data.sort(key=sort_key, reverse=reverse)
+    @staticmethod
+    def _sort_key(field, descending):
+        """内存排序 / 归并的排序键(无论升序还是倒序,None值都排在最后,与 _order_clause 一致)"""
+        if descending:
+            return lambda item: (
+                item.get(field) is not None,
+                item.get(field) if item.get(field) is not None else "",
+            )
+        return lambda item: (
+            item.get(field) is None,
+            item.get(field) if item.get(field) is not None else "",
+        )
 
-        return all_data
+    def _resolve_order_by(self, order_by):
+        """
+        解析可以下推到各表的排序规则
+
+        Returns:
+            tuple[str, bool] | None: (排序字段, 是否倒序)，未指定排序或排序规则不是 "字段 [ASC|DESC]" 时返回 None
+        """
+        if not order_by:
+            return None
+        parts = order_by.split()
+        if len(parts) > 2 or parts[0] not in self._field_mapping:
+            return None
+        field, direction = self._parse_order_by(order_by)
+        if direction.upper() not in ("ASC", "DESC"):
+            return None
+        return field, direction.upper() == "DESC"
+
+    def _order_clause(self, field, descending):
+        """
+        下推到各表的排序子句
+
+        可为 NULL 的字段先按是否为 NULL 排序，各数据库中 NULL 都排在最后（与 _sort_key 一致）；
+        分表键(写入时必须有值)和主键直接排序，可以使用索引。
+        """
+        quoted = self.query_dialect.quote(field)
+        direction = "DESC" if descending else "ASC"
+        column = self.model.__table__.columns[field]
+        if (
+            column.nullable
+            and not column.primary_key
+            and field != self.sharding_strategy.sharding_key
+        ):
+            return f"({quoted} IS NULL), {quoted} {direction}"
+        return f"{quoted} {direction}"
 
     def _parse_order_by(self, order_by):
         """解析排序规则"""
@@ -0,0 +1,183 @@
+"""
+分表注册表
+
+在进程内记录每张基础表已存在的分表，判断分表是否存在时不访问 Redis 和数据库：
+
+- 首次判断某张基础表的分表时，一次查询出该基础表的全部分表
+  （MySQL / PostgreSQL 查询 information_schema.tables，其他方言使用 Inspector）
+- 加载结果缓存 database.sharding_registry_ttl 秒，过期后重新加载，覆盖手动建表、删表等变化
+- 本进程创建分表后立即加入注册表，并通过 Redis 发布/订阅通知其他进程重新加载该基础表
+"""
+
+import threading
+import time
+
+from loguru import logger
+
+from ...cache.local_cache import CacheInvalidationListener
+from ..redis.client import get_redis_client
+
+# 分表变更消息频道
+REGISTRY_CHANNEL = "sharding:registry"
+
+
+def _settings() -> tuple[int, str]:
+    """(sharding_registry_ttl, 缓存 Redis 连接名称)"""
+    from ...config import Config
+
+    return (
+        Config.get("database.sharding_registry_ttl", 60),
+        Config.get("cache.connection", "cache"),
+    )
+
+
+def registry_scope(engine) -> str:
+    """
+    注册表中数据库的标识(同一数据库的同步 / 异步引擎使用相同的标识)
+
+    Args:
+        engine: 同步或异步数据库引擎
+
+    Returns:
+        str: 不含驱动名和密码的连接 URL
+    """
+    url = engine.url
+    return url.set(drivername=url.get_backend_name()).render_as_string(
+        hide_password=True
+    )
+
+
+class ShardRegistry:
+    """
+    进程内分表注册表
+
+    按 (数据库标识, 基础表名) 记录已存在的分表名集合和过期时间。
+    实现 clear / delete_many，由 CacheInvalidationListener 订阅分表变更消息后调用。
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], tuple[set[str], float]] = {}
+        self._lock = threading.Lock()
+        self._listener: CacheInvalidationListener | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用注册表(sharding_registry_ttl 为 0 时使用 Redis 缓存逐表检查)"""
+        ttl, _ = _settings()
+        return ttl > 0
+
+    def lookup(self, scope, base_table_name, table_name) -> bool | None:
+        """
+        查询分表是否存在
+
+        Args:
+            scope: 数据库标识(registry_scope)
+            base_table_name: 基础表名
+            table_name: 分表名
+
+        Returns:
+            bool | None: 分表是否存在，基础表未加载或已过期时返回 None(需要调用 load)
+        """
+        self._ensure_listener()
+        entry = self._entries.get((scope, base_table_name))
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return table_name in entry[0]
+
+    def loaded(self, scope, base_table_name) -> bool:
+        """基础表的分表是否已加载且未过期"""
+        entry = self._entries.get((scope, base_table_name))
+        return entry is not None and entry[1] > time.monotonic()
+
+    def load(self, scope, base_table_name, table_names) -> None:
+        """
+        保存基础表的全部分表(从数据库加载后调用)
+
+        Args:
+            scope: 数据库标识
+            base_table_name: 基础表名
+            table_names: 已存在的分表名列表
+        """
+        ttl, _ = _settings()
+        with self._lock:
+            self._entries[(scope, base_table_name)] = (
+                set(table_names),
+                time.monotonic() + ttl,
+            )
+        logger.debug(
+            f"[分表注册表-加载] 基础表: {base_table_name}, 分表数: {len(table_names)}"
+        )
+
+    def add(self, scope, base_table_name, table_name) -> None:
+        """
+        记录新创建的分表，并通知其他进程重新加载该基础表
+
+        Args:
+            scope: 数据库标识
+            base_table_name: 基础表名
+            table_name: 分表名
+        """
+        with self._lock:
+            entry = self._entries.get((scope, base_table_name))
+            if entry is not None:
+                entry[0].add(table_name)
+
+        # 通过缓存服务的熔断保护客户端发布，Redis 不可用时不阻塞建表流程
+        from ...cache import get_sync_cache_service
+
+        get_sync_cache_service().publish(
+            REGISTRY_CHANNEL,
+            CacheInvalidationListener.build_message([base_table_name]),
+        )
+
+    # ==================== 变更消息回调 ====================
+
+    def clear(self) -> None:
+        """清空注册表(订阅建立或断开时调用，之后按需重新加载)"""
+        with self._lock:
+            self._entries.clear()
+
+    def delete_many(self, base_table_names) -> None:
+        """
+        移除基础表的记录(收到分表变更消息时调用)
+
+        Args:
+            base_table_names: 基础表名列表
+        """
+        names = set(base_table_names)
+        with self._lock:
+            for key in [key for key in self._entries if key[1] in names]:
+                del self._entries[key]
+
+    def _ensure_listener(self) -> None:
+        """启动分表变更消息订阅(fork 出的子进程会重新启动)"""
+        if self._listener is None:
+            with self._lock:
+                if self._listener is None:
+                    _, connection_name = _settings()
+                    self._listener = CacheInvalidationListener(
+                        self,
+                        lambda: get_redis_client(connection_name),
+                        REGISTRY_CHANNEL,
+                    )
+        self._listener.ensure_started()
+
+
+_registry: ShardRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_shard_registry() -> ShardRegistry:
+    """
+    获取进程内分表注册表(单例模式)
+
+    Returns:
+        ShardRegistry: 分表注册表
+    """
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ShardRegistry()
+    return _registry
@@ -15,6 +15,10 @@ class ShardingStrategy(ABC):
     所有分表策略都需要继承此类并实现核心方法。
     """
 
+    # 分表是否按分表键值的区间划分：为 True 时 get_table_names_by_range 返回的表名顺序
+    # 即分表键的顺序（前一张表的分表键值都小于后一张表），按分表键排序的跨表查询可以按表顺序提前结束
+    ordered_tables: bool = False
+
     def __init__(self, sharding_key: str):
         """
         初始化分表策略
@@ -104,3 +108,20 @@ class ShardingStrategy(ABC):
         子类可以重写此方法以实现更严格的验证
         """
         return value is not None
+
+    def is_closed_table(self, table_name: str, table_prefix: str) -> bool:
+        """
+        分表是否已封存(正常情况下不再写入，如按时间分表时已经过去的年份)
+
+        封存的分表的聚合结果可以长期缓存，写入封存的分表时会使缓存失效。
+
+        Args:
+            table_name: 表名
+            table_prefix: 表名前缀
+
+        Returns:
+            bool: 是否已封存
+
+        默认实现：不封存任何分表
+        """
+        return False
@@ -57,6 +57,11 @@ class IdBasedShardingStrategy(ShardingStrategy):
             self.range_size = range_size
             self.mod_value = None
 
+    @property
+    def ordered_tables(self) -> bool:
+        """按范围分表时每张表对应一个连续的ID区间，取模分表没有顺序"""
+        return self.mode == self.MODE_RANGE
+
     def get_table_name(self, sharding_key_value: Any, table_prefix: str) -> str:
         """
         根据ID值获取表名
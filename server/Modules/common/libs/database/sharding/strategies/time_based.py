@@ -7,6 +7,7 @@
 from datetime import date, datetime, timedelta
 from typing import Any
 
+from ....time.utils import now
 from .base import ShardingStrategy
 
 
@@ -22,6 +23,9 @@ class TimeBasedShardingStrategy(ShardingStrategy):
     GRANULARITY_MONTH = "month"
     GRANULARITY_DAY = "day"
 
+    # 每张表对应一个连续的时间区间
+    ordered_tables = True
+
     def __init__(self, sharding_key: str, granularity: str = "year"):
         """
         初始化基于时间的分表策略
@@ -161,6 +165,26 @@ class TimeBasedShardingStrategy(ShardingStrategy):
         # 按表名排序
         return sorted(table_names)
 
+    def is_closed_table(self, table_name: str, table_prefix: str) -> bool:
+        """
+        分表是否已封存(时间区间早于当前所在的年 / 月 / 日)
+
+        Args:
+            table_name: 表名
+            table_prefix: 表名前缀
+
+        Returns:
+            bool: 是否已封存
+
+        Examples:
+            >>> strategy = TimeBasedShardingStrategy("trade_date", granularity="year")
+            >>> strategy.is_closed_table("quant_stock_klines_1d_2023", "quant_stock_klines_1d_")
+            True  # 当前为 2024 年
+        """
+        suffix = table_name[len(table_prefix) :]
+        current = self.get_table_name(now().date(), table_prefix)[len(table_prefix) :]
+        return suffix.isdigit() and len(suffix) == len(current) and suffix < current
+
     def _to_date(self, value: Any) -> date:
         """
         将值转换为date对象
@@ -2,13 +2,13 @@
 分表创建器
 
 专门负责从SQLModel模型创建分表,支持动态修改表名、表注释等。
+建表语句按数据库方言生成(MySQL / PostgreSQL / SQLite),详见 dialects 模块。
 """
 
 import re
 import time
 
 from loguru import logger
-from sqlalchemy import inspect, text
 
 
 class ShardingTableCreator:
@@ -34,14 +34,18 @@ class ShardingTableCreator:
         self._engine = engine
         self.base_table_name = self._extract_base_table_name()
         self._cache_manager = None  # 延迟初始化缓存管理器
+        self._dialect = None  # 延迟初始化方言适配器
+        self._registry_scope = None  # 分表注册表中的数据库标识
 
     @property
     def engine(self):
         """延迟获取数据库引擎"""
         if self._engine is None:
             from ..sql.engine import get_db_engine
+            from ..sql.routing import get_model_connection
 
-            self._engine = get_db_engine()
+            # 模型通过 __bind_key__ / 按模块配置指定了连接时使用该连接
+            self._engine = get_db_engine(get_model_connection(self.model))
         return self._engine
 
     @property
@@ -71,30 +75,39 @@ class ShardingTableCreator:
 
         return table_name
 
-    def _get_original_table_sql(self, table_name):
-        """
-        获取原始表的 CREATE TABLE SQL
+    @property
+    def dialect(self):
+        """延迟获取方言适配器"""
+        if self._dialect is None:
+            from .dialects import get_dialect_adapter
 
-        Args:
-            table_name: 表名
+            self._dialect = get_dialect_adapter(self.engine)
+        return self._dialect
+
+    @property
+    def registry_scope(self):
+        """分表注册表中的数据库标识"""
+        if self._registry_scope is None:
+            from .registry import registry_scope
+
+            self._registry_scope = registry_scope(self.engine)
+        return self._registry_scope
+
+    def refresh_registry(self):
+        """
+        从数据库加载基础表的全部分表到分表注册表
 
         Returns:
-            str: 原始表的 CREATE TABLE SQL
+            list[str]: 已存在的分表名列表
         """
-        # 使用 SHOW CREATE TABLE 获取原始表的完整 SQL
-        # 注意: SHOW CREATE TABLE 不支持参数化查询,使用字符串拼接
-        # 需要验证表名以防止 SQL 注入
-        if not table_name.replace("_", "").replace("-", "").isalnum():
-            raise ValueError(f"无效的表名: {table_name}")
+        from .registry import get_shard_registry
 
         with self.engine.connect() as conn:
-            result = conn.execute(text(f"SHOW CREATE TABLE `{table_name}`"))
-            row = result.fetchone()
-            if row and len(row) > 1:
-                return row[1]
-
-        # 如果获取失败,返回空字符串
-        return ""
+            table_names = self.dialect.list_tables(conn, self.base_table_name)
+        get_shard_registry().load(
+            self.registry_scope, self.base_table_name, table_names
+        )
+        return table_names
 
     def _check_table_exists_from_db(self, table_name):
         """
@@ -106,23 +119,7 @@ class ShardingTableCreator:
         Returns:
             bool: 表是否存在
         """
-        inspector = inspect(self.engine)
-        exists = inspector.has_table(table_name)
-        return exists
-
-    def _execute_create_table_sql(self, sql):
-        """
-        执行 CREATE TABLE SQL
-
-        Args:
-            sql: CREATE TABLE SQL 语句
-        """
-        with self.engine.begin() as conn:
-            conn.execute(text(sql))
-
-    def _release_lock(self, lock_key):
-        """释放分布式锁"""
-        self.cache_manager.cache_delete(lock_key)
+        return self.dialect.table_exists(table_name)
 
     # ==================== 表创建方法 ====================
 
@@ -147,39 +144,17 @@ class ShardingTableCreator:
             if str(cached) == "1" or cached == 1:
                 return True
 
-            # 获取原始表的 CREATE TABLE SQL
-            original_sql = self._get_original_table_sql(self.base_table_name)
-
-            if not original_sql:
-                logger.error(
-                    f"[创建分表-失败] 表名: {table_name}, 无法获取原始表的 CREATE TABLE SQL: {self.base_table_name}"
-                )
-                return False
-
-            # 替换表名(使用更精确的替换逻辑)
-            new_sql = original_sql.replace(
-                f"CREATE TABLE `{self.base_table_name}`", f"CREATE TABLE `{table_name}`"
+            # 按基础表结构创建分表(各方言的实现见 dialects 模块)
+            self.dialect.clone_table(
+                self.model.__table__, self.base_table_name, table_name, table_comment
             )
 
-            # 如果指定了新的表注释,替换表注释
-            if table_comment:
-                # 替换 COMMENT='xxx' 为 COMMENT='yyy'
-
-                new_sql = re.sub(
-                    r"COMMENT='[^']*'", f"COMMENT='{table_comment}'", new_sql
-                )
-
-            # 使用 CREATE TABLE IF NOT EXISTS 避免表已存在错误
-            new_sql = new_sql.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS")
-
-            # 执行SQL
-            self._execute_create_table_sql(new_sql)
-
             logger.info(f"[创建分表-成功] 表名: {table_name}")
 
             # 立即更新缓存为"1"(表存在)
             cache_key = f"{self.cache_manager.cache_prefix}{table_name}"
             self.cache_manager.cache_set(cache_key, "1")
+            self._register_table(table_name)
 
             return True
 
@@ -191,6 +166,7 @@ class ShardingTableCreator:
                 table_name = f"{self.base_table_name}{table_suffix}"
                 cache_key = f"{self.cache_manager.cache_prefix}{table_name}"
                 self.cache_manager.cache_set(cache_key, "1")
+                self._register_table(table_name)
 
                 return True
 
@@ -199,7 +175,10 @@ class ShardingTableCreator:
 
     def table_exists(self, table_name):
         """
-        检查表是否存在(带缓存)
+        检查表是否存在
+
+        启用分表注册表时从进程内注册表判断(过期时一次加载基础表的全部分表)，
+        否则逐表查询 Redis 缓存 / 数据库。
 
         Args:
             table_name: 表名
@@ -207,10 +186,35 @@ class ShardingTableCreator:
         Returns:
             bool: 表是否存在
         """
+        from .registry import get_shard_registry
+
+        registry = get_shard_registry()
+        if registry.enabled:
+            exists = registry.lookup(
+                self.registry_scope, self.base_table_name, table_name
+            )
+            if exists is None:
+                exists = table_name in self.refresh_registry()
+            return exists
+
         return self.cache_manager.check_table_exists_with_cache(
             table_name, self._check_table_exists_from_db
         )
 
+    def _forget_registry(self):
+        """丢弃本进程注册表中基础表的记录(下次判断时重新加载)"""
+        from .registry import get_shard_registry
+
+        get_shard_registry().delete_many([self.base_table_name])
+
+    def _register_table(self, table_name):
+        """将新创建的分表加入分表注册表,并通知其他进程"""
+        from .registry import get_shard_registry
+
+        registry = get_shard_registry()
+        if registry.enabled:
+            registry.add(self.registry_scope, self.base_table_name, table_name)
+
     def ensure_table_exists(self, table_suffix, table_comment=None):
         """
         确保表存在(使用Redis分布式锁)
@@ -230,23 +234,24 @@ class ShardingTableCreator:
             return True
 
         # 如果缓存可用,使用分布式锁
-        acquired = self.cache_manager.acquire_lock(table_name)
+        lock_owner = self.cache_manager.acquire_lock(table_name)
 
-        if acquired:
+        if lock_owner:
             # 获取锁成功
-            # 双重检查
-            if self.table_exists(table_name):
-                self.cache_manager.release_lock(table_name)
-                return True
-
-            # 创建表
-            result = self.create_sharded_table(table_suffix, table_comment)
-            self.cache_manager.release_lock(table_name)
-            return result
+            try:
+                # 双重检查
+                if self.table_exists(table_name):
+                    return True
+
+                # 创建表
+                return self.create_sharded_table(table_suffix, table_comment)
+            finally:
+                self.cache_manager.release_lock(table_name, lock_owner)
         else:
-            # 获取锁失败,等待1秒后重试
+            # 获取锁失败,等待1秒后重试(其他进程刚创建的表可能还不在注册表中,重新加载)
 
             time.sleep(1)
+            self._forget_registry()
             return self.table_exists(table_name)
 
     def batch_create_tables(self, suffixes, table_comment=None):
@@ -4,20 +4,48 @@ SQL 数据库模块
 提供数据库引擎和会话管理功能。
 """
 
+from .bulk import bulk_delete, bulk_update, bulk_upsert, missing_ids
+from .counting import count_rows, estimate_table_rows
 from .engine import (
     close_db_engine,
     close_db_engine_sync,
     get_async_db_engine,
+    get_async_replica_engine,
     get_db_engine,
+    get_replica_engine,
     init_db_engine,
 )
+from .instrumentation import (
+    QueryStats,
+    QueryStatsMiddleware,
+    begin_tracking,
+    end_tracking,
+    get_query_stats,
+    track_queries,
+)
+from .pagination import CursorPage, keyset_paginate
+from .query_cache import install_query_cache, table_tag
+from .replica import ReplicaSelector, use_primary
+from .routing import clear_model_connections, get_model_connection
+from .search import (
+    SEARCH_CONTAINS,
+    SEARCH_FULLTEXT,
+    SEARCH_PREFIX,
+    SearchBackend,
+    clear_search_index,
+    get_search_backend,
+    search_condition,
+)
 from .session import (
+    RequestSessionMiddleware,
+    after_request_commit,
     get_async_session,
     get_async_session_maker,
     get_db_session,
     get_session_maker,
     get_sync_session,
     init_session_maker,
+    request_session,
 )
 
 __all__ = [
@@ -27,6 +55,8 @@ __all__ = [
     "get_async_db_engine",
     "close_db_engine",
     "close_db_engine_sync",
+    "get_replica_engine",
+    "get_async_replica_engine",
     # 会话相关
     "init_session_maker",
     "get_session_maker",
@@ -34,4 +64,42 @@ __all__ = [
     "get_async_session",
     "get_db_session",
     "get_sync_session",
+    "request_session",
+    "after_request_commit",
+    "RequestSessionMiddleware",
+    # 读写分离
+    "ReplicaSelector",
+    "use_primary",
+    # 多连接路由
+    "get_model_connection",
+    "clear_model_connections",
+    # SQL 执行统计
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "get_query_stats",
+    "track_queries",
+    "begin_tracking",
+    "end_tracking",
+    # 列表总数统计
+    "count_rows",
+    "estimate_table_rows",
+    # 文本搜索
+    "SEARCH_CONTAINS",
+    "SEARCH_PREFIX",
+    "SEARCH_FULLTEXT",
+    "SearchBackend",
+    "get_search_backend",
+    "search_condition",
+    "clear_search_index",
+    # 批量写入
+    "missing_ids",
+    "bulk_delete",
+    "bulk_update",
+    "bulk_upsert",
+    # 游标分页
+    "CursorPage",
+    "keyset_paginate",
+    # 查询缓存
+    "install_query_cache",
+    "table_tag",
 ]
@@ -0,0 +1,392 @@
+"""
+集合式批量写入
+
+逐条加载 ORM 对象再修改 / 删除时，N 条记录至少需要 N 次往返；这里的函数按主键列表或
+数据列表构建少量集合式语句（每批 bulk_chunk_size 条）：
+
+- missing_ids：只查询主键，用集合差得出不存在的 id
+- bulk_delete：DELETE ... WHERE id IN (...)，同时清理多对多关联表、
+  按 ORM 的默认行为把一对多子表的外键置为 NULL（或删除 cascade="delete" 的子表记录）
+- bulk_update：UPDATE ... SET col = CASE id WHEN ... END WHERE id IN (...)，
+  所有记录取值相同的字段直接赋值
+- bulk_upsert：按方言使用 ON DUPLICATE KEY UPDATE（MySQL）/ ON CONFLICT DO UPDATE
+  （PostgreSQL、SQLite），其他方言拆分为 INSERT 和 bulk_update
+
+语句不经过 ORM 对象，不触发模型的 ORM 事件，会话中已加载的对象不会同步更新。
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import case, delete, insert, inspect, literal, select, tuple_, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import RelationshipDirection
+
+# 单条语句的参数个数上限（asyncpg 为 32767，SQLite 3.32+ 为 32766，MySQL 为 65535）
+_MAX_PARAMS = 30000
+
+# 支持插入冲突时更新的方言
+_UPSERT_INSERTS = {
+    "mysql": mysql.insert,
+    "mariadb": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _chunk_size(chunk_size: int | None) -> int:
+    """每批记录数（None 表示使用配置 database.bulk_chunk_size）"""
+    if chunk_size is None:
+        from ...config import Config
+
+        chunk_size = Config.get("database.bulk_chunk_size", 1000)
+    return max(int(chunk_size), 1)
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    """按 size 切分列表"""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _unique(ids: Iterable[Any]) -> list[Any]:
+    """去重并保持原有顺序"""
+    return list(dict.fromkeys(ids))
+
+
+def _primary_key(model_class: Any) -> Any:
+    """模型的单列主键"""
+    mapper = inspect(model_class)
+    if len(mapper.primary_key) != 1:
+        raise ValueError(f"{model_class.__name__} 不是单列主键，不支持按 id 批量操作")
+    return getattr(
+        model_class, mapper.get_property_by_column(mapper.primary_key[0]).key
+    )
+
+
+def _dialect_name(session: Any, model_class: Any) -> str:
+    """模型所在连接的方言名称"""
+    return session.get_bind(mapper=inspect(model_class)).dialect.name
+
+
+async def missing_ids(
+    session: Any,
+    model_class: Any,
+    ids: Iterable[Any],
+    chunk_size: int | None = None,
+) -> list[Any]:
+    """
+    查询不存在的 id（只查询主键列）
+
+    Args:
+        session: 异步会话
+        model_class: 模型类
+        ids: 要检查的 id
+        chunk_size: 每批 id 数，None 表示使用配置
+
+    Returns:
+        list[Any]: 不存在的 id（按传入顺序，已去重）
+    """
+    ids = _unique(ids)
+    pk = _primary_key(model_class)
+    found: set[Any] = set()
+    for chunk in _chunks(ids, _chunk_size(chunk_size)):
+        result = await session.execute(select(pk).where(pk.in_(chunk)))
+        found.update(result.scalars().all())
+    return [id for id in ids if id not in found]
+
+
+async def _clear_relationships(
+    session: Any, model_class: Any, chunk: Sequence[Any]
+) -> None:
+    """
+    删除前处理关联数据（与 session.delete() 的默认行为一致）
+
+    - 多对多：删除关联表中的记录
+    - 一对多：cascade 包含 delete 时删除子表记录，否则把子表外键置为 NULL
+      （passive_deletes 的关系交给数据库外键处理）
+    """
+    for relationship in inspect(model_class).relationships:
+        if relationship.viewonly:
+            continue
+
+        if relationship.secondary is not None:
+            conditions = [
+                secondary_column.in_(chunk)
+                for _, secondary_column in relationship.synchronize_pairs
+            ]
+            await session.execute(delete(relationship.secondary).where(*conditions))
+            continue
+
+        if (
+            relationship.direction is not RelationshipDirection.ONETOMANY
+            or relationship.passive_deletes
+        ):
+            continue
+
+        target = relationship.mapper.class_
+        pairs = relationship.synchronize_pairs
+        if len(pairs) != 1:
+            continue
+        child_column = pairs[0][1]
+        if relationship.cascade.delete:
+            await session.execute(
+                delete(target)
+                .where(child_column.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            await session.execute(
+                update(target)
+                .where(child_column.in_(chunk))
+                .values({child_column: None})
+                .execution_options(synchronize_session=False)
+            )
+
+
+async def bulk_delete(
+    session: Any,
+    model_class: Any,
+    ids: Iterable[Any],
+    chunk_size: int | None = None,
+) -> int:
+    """
+    按 id 批量删除（每批一条 DELETE ... WHERE id IN (...)）
+
+    cascade="delete" 的子表只处理一层，子表自身的关联由数据库外键处理。
+
+    Args:
+        session: 异步会话（由调用方提交）
+        model_class: 模型类
+        ids: 要删除的 id
+        chunk_size: 每批 id 数，None 表示使用配置
+
+    Returns:
+        int: 删除的记录数
+    """
+    pk = _primary_key(model_class)
+    deleted = 0
+    for chunk in _chunks(_unique(ids), _chunk_size(chunk_size)):
+        await _clear_relationships(session, model_class, chunk)
+        result = await session.execute(
+            delete(model_class)
+            .where(pk.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        deleted += result.rowcount or 0
+    return deleted
+
+
+async def bulk_update(
+    session: Any,
+    model_class: Any,
+    rows: Sequence[dict[str, Any]],
+    key: str = "id",
+    chunk_size: int | None = None,
+) -> int:
+    """
+    按 key 批量更新（每批一条 UPDATE ... SET col = CASE key WHEN ... END）
+
+    每条数据只更新自身包含的字段，某个字段在本批所有数据中取值相同时直接赋值。
+
+    Args:
+        session: 异步会话（由调用方提交）
+        model_class: 模型类
+        rows: 更新数据，每条必须包含 key 字段
+        key: 定位记录的字段（主键或唯一字段）
+        chunk_size: 每批记录数，None 表示使用配置
+
+    Returns:
+        int: 匹配的记录数
+    """
+    key_column = getattr(model_class, key)
+    columns = {attr.key: attr.columns[0] for attr in inspect(model_class).column_attrs}
+    updated = 0
+    for chunk in _chunks(list(rows), _chunk_size(chunk_size)):
+        keys = [row[key] for row in chunk]
+        fields = _unique(
+            field for row in chunk for field in row if field != key and field in columns
+        )
+        if not fields:
+            continue
+
+        values: dict[str, Any] = {}
+        for field in fields:
+            column = columns[field]
+            present = [(row[key], row[field]) for row in chunk if field in row]
+            distinct = {repr(value) for _, value in present}
+            if len(present) == len(chunk) and len(distinct) == 1:
+                values[field] = present[0][1]
+            else:
+                values[field] = case(
+                    {
+                        row_key: literal(value, column.type)
+                        for row_key, value in present
+                    },
+                    value=key_column,
+                    else_=getattr(model_class, field),
+                )
+
+        result = await session.execute(
+            update(model_class)
+            .where(key_column.in_(keys))
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount or 0
+    return updated
+
+
+async def _existing_keys(
+    session: Any,
+    model_class: Any,
+    conflict_keys: Sequence[str],
+    chunk: Sequence[dict[str, Any]],
+) -> set[tuple[Any, ...]]:
+    """查询本批数据中已存在的冲突字段取值"""
+    key_columns = [getattr(model_class, key) for key in conflict_keys]
+    values = [tuple(row[key] for key in conflict_keys) for row in chunk]
+    if len(key_columns) == 1:
+        condition = key_columns[0].in_([value[0] for value in values])
+    else:
+        condition = tuple_(*key_columns).in_(values)
+    result = await session.execute(select(*key_columns).where(condition))
+    return {tuple(row) for row in result.all()}
+
+
+async def bulk_upsert(
+    session: Any,
+    model_class: Any,
+    rows: Sequence[dict[str, Any]],
+    conflict_keys: Sequence[str],
+    update_fields: Sequence[str] | None = None,
+    update_values: dict[str, Any] | None = None,
+    chunk_size: int | None = None,
+) -> tuple[int, int]:
+    """
+    批量插入，冲突时更新（按方言使用 ON DUPLICATE KEY UPDATE / ON CONFLICT DO UPDATE）
+
+    每批先查询一次已存在的冲突字段取值，用于统计新增和更新的条数。
+
+    Args:
+        session: 异步会话（由调用方提交）
+        model_class: 模型类
+        rows: 插入数据，每条必须包含 conflict_keys 字段
+        conflict_keys: 冲突判断字段（主键或唯一索引字段）
+        update_fields: 冲突时使用本次插入值更新的字段，None 表示除冲突字段、主键和 created_at 外的所有字段
+        update_values: 冲突时更新为固定值的字段（如 {"updated_at": now()}）
+        chunk_size: 每批记录数，None 表示使用配置（按字段数限制单条语句的参数个数）
+
+    Returns:
+        tuple[int, int]: (新增条数, 更新条数)
+
+    Raises:
+        ValueError: 方言不支持 upsert 且冲突字段不是单个字段
+    """
+    rows = list(rows)
+    if not rows:
+        return 0, 0
+
+    mapper = inspect(model_class)
+    pk_keys = {
+        mapper.get_property_by_column(column).key for column in mapper.primary_key
+    }
+    if update_fields is None:
+        excluded = set(conflict_keys) | pk_keys | {"created_at"}
+        update_fields = _unique(
+            field for row in rows for field in row if field not in excluded
+        )
+    update_values = update_values or {}
+
+    dialect = _dialect_name(session, model_class)
+    insert_factory = _UPSERT_INSERTS.get(dialect)
+    if insert_factory is None and len(conflict_keys) != 1:
+        raise ValueError(f"{dialect} 不支持多字段冲突判断的批量 upsert")
+
+    # 按字段集合分组，同一条 INSERT 的每行字段一致
+    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(tuple(row), []).append(row)
+
+    inserted = updated = 0
+    for fields, group in groups.items():
+        size = min(_chunk_size(chunk_size), max(_MAX_PARAMS // len(fields), 1))
+        for chunk in _chunks(group, size):
+            existing = await _existing_keys(session, model_class, conflict_keys, chunk)
+            new_rows = [
+                row
+                for row in chunk
+                if tuple(row[key] for key in conflict_keys) not in existing
+            ]
+            inserted += len(new_rows)
+            updated += len(chunk) - len(new_rows)
+
+            if insert_factory is None:
+                await _fallback_upsert(
+                    session,
+                    model_class,
+                    chunk,
+                    new_rows,
+                    conflict_keys[0],
+                    update_fields,
+                    update_values,
+                )
+                continue
+
+            stmt = insert_factory(model_class).values(list(chunk))
+            if dialect in ("mysql", "mariadb"):
+                assignments = {
+                    field: stmt.inserted[field]
+                    for field in update_fields
+                    if field in fields
+                }
+                assignments.update(update_values)
+                stmt = (
+                    stmt.on_duplicate_key_update(assignments)
+                    if assignments
+                    else stmt.prefix_with("IGNORE")
+                )
+            else:
+                assignments = {
+                    field: stmt.excluded[field]
+                    for field in update_fields
+                    if field in fields
+                }
+                assignments.update(update_values)
+                stmt = (
+                    stmt.on_conflict_do_update(
+                        index_elements=list(conflict_keys), set_=assignments
+                    )
+                    if assignments
+                    else stmt.on_conflict_do_nothing(index_elements=list(conflict_keys))
+                )
+            await session.execute(stmt)
+
+    return inserted, updated
+
+
+async def _fallback_upsert(
+    session: Any,
+    model_class: Any,
+    chunk: Sequence[dict[str, Any]],
+    new_rows: list[dict[str, Any]],
+    conflict_key: str,
+    update_fields: Sequence[str],
+    update_values: dict[str, Any],
+) -> None:
+    """不支持 upsert 语法的方言：新记录 INSERT，已存在的记录 bulk_update"""
+    if new_rows:
+        await session.execute(insert(model_class).values(new_rows))
+
+    new_keys = {row[conflict_key] for row in new_rows}
+    update_rows = [
+        {
+            conflict_key: row[conflict_key],
+            **{field: row[field] for field in update_fields if field in row},
+            **update_values,
+        }
+        for row in chunk
+        if row[conflict_key] not in new_keys
+    ]
+    if update_rows:
+        await bulk_update(session, model_class, update_rows, key=conflict_key)
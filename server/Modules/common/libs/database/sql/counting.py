@@ -0,0 +1,204 @@
+"""
+列表总数统计策略
+
+分页列表每次都对筛选后的查询执行 COUNT(*)，百万行的日志表上 COUNT 比分页查询本身还慢。
+按表的大小选择统计方式：
+
+- exact：执行 COUNT(*)，结果准确
+- cached：按 "编译后的 SQL + 参数"（即归一化的筛选条件）缓存 COUNT 结果，
+  缓存时间较短（count_cache_ttl），命中缓存时总数可能与实际相差缓存期间的写入
+- estimated：使用数据库统计信息中的表行数（MySQL information_schema.TABLES.TABLE_ROWS、
+  PostgreSQL pg_class.reltuples），只用于没有筛选条件的查询
+- auto（默认）：表行数估算值小于 count_estimate_threshold 时使用 exact；
+  大表没有筛选条件时使用 estimated，有筛选条件时使用 cached
+
+返回值同时说明总数是否准确（命中缓存和估算值视为不准确），前端可以显示为 "约 N 条"。
+"""
+
+import hashlib
+import json
+import time
+from typing import Any
+
+from fastapi_pagination.ext.sqlalchemy import create_count_query
+from loguru import logger
+from sqlalchemy import inspect, text
+
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_ESTIMATED = "estimated"
+COUNT_AUTO = "auto"
+
+# 缓存键前缀
+COUNT_KEY_PREFIX = "count_cache:"
+
+# 表行数估算值的进程内缓存：(连接标识, 表名) -> (估算值, 过期时间 time.monotonic)
+_estimates: dict[tuple[str, str], tuple[int | None, float]] = {}
+
+# 表行数估算 SQL（按方言）
+_ESTIMATE_SQL = {
+    "mysql": (
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+    ),
+    "postgresql": (
+        "SELECT reltuples::bigint FROM pg_class "
+        "WHERE oid = to_regclass(:table_name) AND reltuples >= 0"
+    ),
+}
+
+
+def _settings() -> tuple[int, int]:
+    """(count_cache_ttl, count_estimate_threshold)"""
+    from ...config import Config
+
+    return (
+        Config.get("database.count_cache_ttl", 30),
+        Config.get("database.count_estimate_threshold", 100000),
+    )
+
+
+def _is_filtered(query: Any) -> bool:
+    """查询是否有筛选条件（WHERE / JOIN / GROUP BY / DISTINCT 都会改变行数）"""
+    return bool(
+        query.whereclause is not None
+        or query._setup_joins
+        or query._group_by_clauses
+        or query._distinct
+    )
+
+
+async def estimate_table_rows(session: Any, model_class: Any) -> int | None:
+    """
+    估算模型对应表的行数（使用数据库统计信息，不扫描表）
+
+    估算值在进程内缓存 count_cache_ttl 秒。
+
+    Args:
+        session: 异步会话
+        model_class: 模型类
+
+    Returns:
+        int | None: 表行数估算值，方言不支持或没有统计信息时返回 None
+    """
+    mapper = inspect(model_class)
+    bind = session.get_bind(mapper=mapper)
+    dialect = bind.dialect.name
+    if dialect == "mariadb":
+        dialect = "mysql"
+    sql = _ESTIMATE_SQL.get(dialect)
+    if sql is None:
+        return None
+
+    table_name = mapper.local_table.name
+    cache_key = (bind.url.render_as_string(hide_password=True), table_name)
+    cached = _estimates.get(cache_key)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    try:
+        result = await session.execute(
+            text(sql),
+            {"table_name": table_name},
+            bind_arguments={"mapper": mapper},
+        )
+        value = result.scalar()
+        estimate = int(value) if value is not None else None
+    except Exception as e:
+        logger.warning(f"表行数估算失败 - table: {table_name}, error: {e}")
+        estimate = None
+
+    ttl, _ = _settings()
+    _estimates[cache_key] = (estimate, time.monotonic() + ttl)
+    return estimate
+
+
+def _count_cache_key(session: Any, count_query: Any, model_class: Any) -> str:
+    """COUNT 结果的缓存键（编译后的 SQL + 参数）"""
+    bind = session.get_bind(mapper=inspect(model_class))
+    compiled = count_query.compile(dialect=bind.dialect)
+    digest = hashlib.sha1(
+        json.dumps(
+            [str(compiled), dict(compiled.params)], sort_keys=True, default=str
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"{COUNT_KEY_PREFIX}{digest}"
+
+
+async def _exact_count(session: Any, count_query: Any) -> int:
+    """执行 COUNT 查询"""
+    return (await session.execute(count_query)).scalar() or 0
+
+
+async def _cached_count(
+    session: Any, count_query: Any, model_class: Any, ttl: int
+) -> tuple[int, bool]:
+    """读取缓存的 COUNT 结果，未命中时执行 COUNT 并写入缓存"""
+    from ...cache import async_cache_get, async_cache_set
+
+    try:
+        cache_key = _count_cache_key(session, count_query, model_class)
+        cached = await async_cache_get(cache_key)
+    except Exception as e:
+        logger.warning(f"总数缓存读取失败，直接统计 - error: {e}")
+        return await _exact_count(session, count_query), True
+
+    if cached is not None:
+        return int(cached), False
+
+    total = await _exact_count(session, count_query)
+    try:
+        await async_cache_set(cache_key, total, ttl=ttl)
+    except Exception as e:
+        logger.warning(f"总数缓存写入失败 - error: {e}")
+    return total, True
+
+
+async def count_rows(
+    session: Any, query: Any, model_class: Any, strategy: str = COUNT_AUTO
+) -> tuple[int, bool]:
+    """
+    按统计策略获取查询的总行数
+
+    Args:
+        session: 异步会话
+        query: 分页前的查询对象（select(模型)）
+        model_class: 模型类（用于估算表行数和选择连接）
+        strategy: 统计策略，exact / cached / estimated / auto
+
+    Returns:
+        tuple[int, bool]: (总行数, 是否准确)
+
+    Raises:
+        ValueError: 统计策略不支持
+    """
+    if strategy not in (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED, COUNT_AUTO):
+        raise ValueError(f"不支持的总数统计策略: {strategy}")
+
+    ttl, threshold = _settings()
+    count_query = create_count_query(query)
+
+    if strategy == COUNT_AUTO:
+        if threshold <= 0:
+            strategy = COUNT_EXACT
+        else:
+            estimate = await estimate_table_rows(session, model_class)
+            if estimate is None or estimate < threshold:
+                strategy = COUNT_EXACT
+            elif _is_filtered(query):
+                strategy = COUNT_CACHED
+            else:
+                return estimate, False
+
+    if strategy == COUNT_ESTIMATED:
+        # 有筛选条件时表行数不能代表查询结果数，改用缓存的 COUNT
+        if not _is_filtered(query):
+            estimate = await estimate_table_rows(session, model_class)
+            if estimate is not None:
+                return estimate, False
+        strategy = COUNT_CACHED
+
+    if strategy == COUNT_CACHED and ttl > 0:
+        return await _cached_count(session, count_query, model_class, ttl)
+
+    return await _exact_count(session, count_query), True
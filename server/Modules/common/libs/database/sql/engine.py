@@ -1,16 +1,22 @@
 """
 数据库引擎管理
 
-负责创建和管理数据库引擎，支持多种数据库类型和连接池配置。
+负责创建和管理数据库引擎，支持多种数据库类型和连接池配置，
+以及为每个连接创建只读副本引擎（读写分离）。
+
+启动时只创建默认连接的引擎，其他连接（如模型通过 __bind_key__ 指定的连接）在首次使用时创建。
 """
 
+import threading
 from typing import Any
 
 from loguru import logger
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from ...config import Config
+from .instrumentation import install_sql_instrumentation
+from .replica import STRATEGY_ROUND_ROBIN, ReplicaSelector
 
 
 class DatabaseEngineManager:
@@ -20,6 +26,11 @@ class DatabaseEngineManager:
         """初始化数据库引擎管理器"""
         self._engines: dict[str, Engine] = {}
         self._async_engines: dict[str, AsyncEngine] = {}
+        # 只读副本选择器（连接名称 -> 选择器），仅配置了 replicas 的连接存在
+        self._replica_selectors: dict[str, ReplicaSelector] = {}
+        self._async_replica_selectors: dict[str, ReplicaSelector] = {}
+        # 延迟创建引擎时使用的锁
+        self._lock = threading.Lock()
 
     @staticmethod
     def _build_database_url(config: dict[str, Any]) -> str:
@@ -82,15 +93,204 @@ class DatabaseEngineManager:
 
         return url
 
+    @staticmethod
+    def _build_async_url(database_url: str) -> str:
+        """
+        同步连接 URL 转换为异步驱动的 URL
+
+        Args:
+            database_url: 同步连接 URL
+
+        Returns:
+            str: 异步连接 URL
+        """
+        async_url = database_url.replace("mysql+mysqldb", "mysql+aiomysql")
+        async_url = async_url.replace("postgresql+asyncpg", "postgresql+asyncpg")
+        if async_url.startswith("sqlite://"):
+            async_url = async_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return async_url
+
+    @staticmethod
+    def _create_engines(
+        config: dict[str, Any], database_url: str
+    ) -> tuple[Engine, AsyncEngine]:
+        """
+        创建同步和异步引擎
+
+        Args:
+            config: 数据库配置字典（连接池参数）
+            database_url: 同步连接 URL
+
+        Returns:
+            (同步引擎, 异步引擎)
+        """
+        # 创建同步引擎
+        engine = create_engine(
+            database_url,
+            # 连接池配置
+            pool_size=config.get("pool_size", 10),
+            max_overflow=config.get("max_overflow", 20),
+            pool_timeout=config.get("pool_timeout", 30),
+            # 减少连接回收时间，避免MySQL服务器先关闭连接
+            pool_recycle=config.get("pool_recycle", 1800),  # 30分钟
+            # 启用连接预检查，在获取连接前测试连接有效性
+            pool_pre_ping=True,
+            # 其他配置
+            echo=config.get("echo", False),
+            future=True,
+        )
+
+        # 创建异步引擎
+        # 对于异步引擎，需要使用相应的异步驱动
+        async_url = DatabaseEngineManager._build_async_url(database_url)
+        async_engine = create_async_engine(
+            async_url,
+            # 连接池配置
+            pool_size=config.get("pool_size", 10),
+            max_overflow=config.get("max_overflow", 20),
+            pool_timeout=config.get("pool_timeout", 30),
+            # 减少连接回收时间，避免MySQL服务器先关闭连接
+            pool_recycle=config.get("pool_recycle", 1800),  # 30分钟
+            # 启用连接预检查，在获取连接前测试连接有效性
+            pool_pre_ping=True,
+            # 其他配置（SQL 统计和慢查询日志见 instrumentation 模块）
+            echo=config.get("echo", False),
+        )
+        if engine.dialect.name == "sqlite":
+            DatabaseEngineManager._enable_sqlite_transactions(engine)
+            DatabaseEngineManager._enable_sqlite_transactions(async_engine.sync_engine)
+        return engine, async_engine
+
+    @staticmethod
+    def _enable_sqlite_transactions(engine: Engine) -> None:
+        """
+        SQLite 驱动（pysqlite / aiosqlite）延迟到第一条写语句才开启事务，
+        导致 SAVEPOINT（请求级会话的 begin_nested）无法正常回滚，
+        这里改为由 SQLAlchemy 在事务开始时显式发送 BEGIN
+        """
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _on_begin(connection: Any) -> None:
+            connection.exec_driver_sql("BEGIN")
+
+    @staticmethod
+    def _build_replica_config(
+        config: dict[str, Any], replica: str | dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        构建只读副本的连接配置
+
+        Args:
+            config: 主库连接配置
+            replica: 副本的完整 URL，或覆盖主库配置的字典（如 {"host": "10.0.0.2"}）
+
+        Returns:
+            副本连接配置（未覆盖的参数沿用主库配置）
+        """
+        if isinstance(replica, str):
+            replica = {"url": replica}
+        return {**config, "url": None, **replica}
+
+    def _init_replica_engines(self, name: str, config: dict[str, Any]) -> None:
+        """
+        创建连接的只读副本引擎
+
+        Args:
+            name: 连接名称
+            config: 主库连接配置
+        """
+        replicas = config.get("replicas") or []
+        if not replicas:
+            return
+
+        engines = []
+        async_engines = []
+        for index, replica in enumerate(replicas):
+            try:
+                replica_config = self._build_replica_config(config, replica)
+                engine, async_engine = self._create_engines(
+                    replica_config, self._build_database_url(replica_config)
+                )
+                engines.append(engine)
+                async_engines.append(async_engine)
+            except Exception as e:
+                logger.error(f"创建只读副本引擎 '{name}' #{index} 失败: {e}")
+
+        strategy = config.get("replica_strategy") or STRATEGY_ROUND_ROBIN
+        self._replica_selectors[name] = ReplicaSelector(engines, strategy)
+        self._async_replica_selectors[name] = ReplicaSelector(async_engines, strategy)
+        logger.info(
+            f"数据库连接 '{name}' 已创建 {len(engines)} 个只读副本引擎 - strategy: {strategy}"
+        )
+
+    def _create_connection(self, name: str, config: dict[str, Any]) -> bool:
+        """
+        创建连接的主库引擎和只读副本引擎
+
+        Args:
+            name: 连接名称
+            config: 连接配置
+
+        Returns:
+            bool: 是否创建成功
+        """
+        try:
+            # 构建数据库 URL
+            database_url = self._build_database_url(config)
+            # 日志中隐藏密码
+            safe_url = make_url(database_url).render_as_string(hide_password=True)
+            logger.info(f"正在创建数据库引擎 '{name}': {safe_url}")
+
+            engine, async_engine = self._create_engines(config, database_url)
+            self._engines[name] = engine
+            self._async_engines[name] = async_engine
+
+            # 创建只读副本引擎
+            self._init_replica_engines(name, config)
+
+            logger.info(f"数据库引擎 '{name}' 创建成功")
+            return True
+
+        except Exception as e:
+            logger.error(f"创建数据库引擎 '{name}' 失败: {e}")
+            return False
+
+    def _ensure_connection(self, name: str) -> None:
+        """
+        确保连接的引擎已创建（首次使用时按配置创建）
+
+        Args:
+            name: 连接名称
+        """
+        if name in self._engines:
+            return
+
+        with self._lock:
+            if name in self._engines:
+                return
+            connections = Config.get("database.connections") or {}
+            if name in connections:
+                self._create_connection(name, connections[name])
+
     def init_db_engine(self) -> None:
         """
         初始化数据库引擎
 
-        从配置中读取数据库连接信息，创建相应的数据库引擎。
+        从配置中读取数据库连接信息，创建默认连接的数据库引擎。
         支持同步和异步两种引擎。
         """
         logger.info("正在初始化数据库引擎...")
 
+        # 注册 SQL 执行统计（慢查询日志、请求统计、N+1 检测）
+        install_sql_instrumentation(
+            slow_query_ms=Config.get("database.slow_query_ms", 500),
+            n_plus_one_threshold=Config.get("database.n_plus_one_threshold", 10),
+        )
+
         # 获取默认连接名称
         default_connection = Config.get("database.default")
         connections = Config.get("database.connections")
@@ -100,59 +300,11 @@ class DatabaseEngineManager:
             logger.error("数据库配置不存在")
             return
 
-        # 为每个连接创建引擎
-        for name, config in connections.items():
-            if default_connection != name:
-                continue
-            try:
-                # 构建数据库 URL
-                database_url = self._build_database_url(config)
-                logger.info(f"正在创建数据库引擎 '{name}': {database_url}")
-
-                # 创建同步引擎
-                engine = create_engine(
-                    database_url,
-                    # 连接池配置
-                    pool_size=config.get("pool_size", 10),
-                    max_overflow=config.get("max_overflow", 20),
-                    pool_timeout=config.get("pool_timeout", 30),
-                    # 减少连接回收时间，避免MySQL服务器先关闭连接
-                    pool_recycle=config.get("pool_recycle", 1800),  # 30分钟
-                    # 启用连接预检查，在获取连接前测试连接有效性
-                    pool_pre_ping=True,
-                    # 其他配置
-                    echo=config.get("echo", False),
-                    future=True,
-                )
-                self._engines[name] = engine
-
-                # 创建异步引擎
-                # 对于异步引擎，需要使用相应的异步驱动
-                async_url = database_url.replace("mysql+mysqldb", "mysql+aiomysql")
-                async_url = async_url.replace(
-                    "postgresql+asyncpg", "postgresql+asyncpg"
-                )
-                print(async_url)
-                async_engine = create_async_engine(
-                    async_url,
-                    # 连接池配置
-                    pool_size=config.get("pool_size", 10),
-                    max_overflow=config.get("max_overflow", 20),
-                    pool_timeout=config.get("pool_timeout", 30),
-                    # 减少连接回收时间，避免MySQL服务器先关闭连接
-                    pool_recycle=config.get("pool_recycle", 1800),  # 30分钟
-                    # 启用连接预检查，在获取连接前测试连接有效性
-                    pool_pre_ping=True,
-                    # 其他配置
-                    echo=True,
-                )
-                self._async_engines[name] = async_engine
-
-                logger.info(f"数据库引擎 '{name}' 创建成功")
-
-            except Exception as e:
-                logger.error(f"创建数据库引擎 '{name}' 失败: {e}")
-                continue
+        # 启动时只创建默认连接的引擎，其他连接在首次使用时创建
+        if default_connection in connections:
+            self._create_connection(default_connection, connections[default_connection])
+        else:
+            logger.error(f"默认数据库连接 '{default_connection}' 未配置")
 
         logger.info("数据库引擎初始化完成")
 
@@ -172,6 +324,7 @@ class DatabaseEngineManager:
         if name is None:
             name = Config.get("database.default", "mysql")
 
+        self._ensure_connection(name)
         if name not in self._engines:
             raise ValueError(f"数据库引擎 '{name}' 不存在")
 
@@ -193,11 +346,46 @@ class DatabaseEngineManager:
         if name is None:
             name = Config.get("database.default", "mysql")
 
+        self._ensure_connection(name)
         if name not in self._async_engines:
             raise ValueError(f"异步数据库引擎 '{name}' 不存在")
 
         return self._async_engines[name]
 
+    def get_replica_engine(self, name: str | None = None) -> Engine | None:
+        """
+        按选择策略获取只读副本引擎（同步）
+
+        Args:
+            name: 连接名称，如果为 None 则使用默认连接
+
+        Returns:
+            Engine | None: 副本引擎，未配置副本时返回 None
+        """
+        if name is None:
+            name = Config.get("database.default", "mysql")
+
+        self._ensure_connection(name)
+        selector = self._replica_selectors.get(name)
+        return selector.select() if selector else None
+
+    def get_async_replica_engine(self, name: str | None = None) -> AsyncEngine | None:
+        """
+        按选择策略获取只读副本引擎（异步）
+
+        Args:
+            name: 连接名称，如果为 None 则使用默认连接
+
+        Returns:
+            AsyncEngine | None: 异步副本引擎，未配置副本时返回 None
+        """
+        if name is None:
+            name = Config.get("database.default", "mysql")
+
+        self._ensure_connection(name)
+        selector = self._async_replica_selectors.get(name)
+        return selector.select() if selector else None
+
     async def close_db_engine(self) -> None:
         """
         关闭所有数据库引擎
@@ -224,9 +412,25 @@ class DatabaseEngineManager:
             except Exception as e:
                 logger.error(f"关闭异步数据库引擎 '{name}' 失败: {e}")
 
+        # 关闭只读副本引擎
+        for name, selector in self._replica_selectors.items():
+            for engine in selector.engines:
+                try:
+                    engine.dispose()
+                except Exception as e:
+                    logger.error(f"关闭只读副本引擎 '{name}' 失败: {e}")
+        for name, selector in self._async_replica_selectors.items():
+            for engine in selector.engines:
+                try:
+                    await engine.dispose()
+                except Exception as e:
+                    logger.error(f"关闭异步只读副本引擎 '{name}' 失败: {e}")
+
         # 清空引擎字典
         self._engines.clear()
         self._async_engines.clear()
+        self._replica_selectors.clear()
+        self._async_replica_selectors.clear()
 
         logger.info("数据库引擎关闭完成")
 
@@ -271,6 +475,16 @@ def get_async_db_engine(name: str | None = None) -> AsyncEngine:
     return db_engine_manager.get_async_db_engine(name)
 
 
+def get_replica_engine(name: str | None = None) -> Engine | None:
+    """获取只读副本引擎（函数接口）"""
+    return db_engine_manager.get_replica_engine(name)
+
+
+def get_async_replica_engine(name: str | None = None) -> AsyncEngine | None:
+    """获取异步只读副本引擎（函数接口）"""
+    return db_engine_manager.get_async_replica_engine(name)
+
+
 async def close_db_engine() -> None:
     """关闭数据库引擎（函数接口，异步）"""
     return await db_engine_manager.close_db_engine()
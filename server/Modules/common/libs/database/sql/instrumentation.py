@@ -0,0 +1,298 @@
+"""
+SQL 执行统计
+
+通过引擎的 before_cursor_execute / after_cursor_execute 事件统计每条 SQL 的执行时间：
+- 慢查询日志：执行时间超过 slow_query_ms 的语句记录 WARNING 日志
+- 请求统计：QueryStatsMiddleware 为每个请求统计查询次数和总耗时，
+  调试模式下通过响应头 X-DB-Query-Count / X-DB-Query-Time 返回
+- N+1 检测：同一请求中相同结构的语句执行次数超过 n_plus_one_threshold 时记录 WARNING 日志
+
+Celery 任务由 task_prerun / task_postrun 信号自动统计（见 CeleryService），
+其他请求之外的代码（脚本）可以使用 track_queries 统计：
+
+    with track_queries("sync_stock_list_task"):
+        asyncio.run(service.sync_stock_list(market))
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Engine, event
+
+# 连接 info 中保存 (执行上下文, 开始时间) 栈的键
+_START_TIME_KEY = "query_start_time"
+
+# 日志中语句的最大长度
+_MAX_STATEMENT_LENGTH = 500
+
+# 语句结构归一化：合并 IN (?, ?, ...) / VALUES (...), (...) 等可变长度的占位符列表和空白
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)"
+)
+_REPEATED_GROUPS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_installed = False
+_slow_query_seconds = 0.5
+_n_plus_one_threshold = 10
+
+_query_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "db_query_stats", default=None
+)
+
+
+class QueryStats:
+    """
+    一个请求 / 任务内的 SQL 执行统计
+
+    Attributes:
+        label: 统计名称（请求路径或任务名称）
+        count: 查询次数
+        total_time: 查询总耗时（秒）
+        shapes: 语句结构 -> 执行次数
+        n_plus_one: 执行次数超过阈值的语句结构
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.n_plus_one: list[str] = []
+        # 线程池中的查询（复制了上下文）可能同时记录
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """
+        记录一次查询
+
+        Args:
+            statement: SQL 语句
+            elapsed: 执行时间（秒）
+        """
+        shape = normalize_statement(statement) if _n_plus_one_threshold > 0 else None
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            if shape is None:
+                return
+            self.shapes[shape] += 1
+            # 超过阈值时只记录一次
+            detected = self.shapes[shape] == _n_plus_one_threshold + 1
+            if detected:
+                self.n_plus_one.append(shape)
+        if detected:
+            logger.warning(
+                f"检测到 N+1 查询 [{self.label}]: 相同语句执行超过 "
+                f"{_n_plus_one_threshold} 次 - {_truncate(shape)}"
+            )
+
+    def report(self) -> None:
+        """请求 / 任务结束时输出统计摘要（存在 N+1 查询时为 WARNING，否则为 DEBUG）"""
+        message = (
+            f"SQL 统计 [{self.label}]: {self.count} 次查询，"
+            f"耗时 {self.total_time * 1000:.1f}ms"
+        )
+        if self.n_plus_one:
+            repeated = ", ".join(
+                f"{self.shapes[shape]}x {_truncate(shape, 120)}"
+                for shape in self.n_plus_one
+            )
+            logger.warning(f"{message}，N+1 查询: {repeated}")
+        else:
+            logger.debug(message)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    归一化语句结构（用于 N+1 检测）
+
+    合并空白和可变长度的占位符列表，使 IN 列表长度不同的同一语句视为相同结构。
+
+    Args:
+        statement: SQL 语句
+
+    Returns:
+        归一化后的语句
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _REPEATED_GROUPS.sub("(?)", shape)
+
+
+def _truncate(statement: str, length: int = _MAX_STATEMENT_LENGTH) -> str:
+    """截断过长的语句"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+def get_query_stats() -> QueryStats | None:
+    """获取当前上下文的 SQL 统计，未开启统计时返回 None"""
+    return _query_stats.get()
+
+
+@contextmanager
+def track_queries(label: str) -> Iterator[QueryStats]:
+    """
+    统计上下文内执行的 SQL（结束时输出统计摘要）
+
+    统计对象保存在 contextvar 中，上下文内创建的异步任务和 asyncio.to_thread 任务同样会被统计；
+    ThreadPoolExecutor / run_in_executor 不复制 contextvar，提交的任务需要使用
+    contextvars.copy_context().run 包装才会被统计。
+
+    Args:
+        label: 统计名称（请求路径或任务名称）
+
+    Yields:
+        QueryStats: 统计对象
+    """
+    stats, token = begin_tracking(label)
+    try:
+        yield stats
+    finally:
+        end_tracking(stats, token)
+
+
+def begin_tracking(label: str) -> tuple[QueryStats, Token]:
+    """
+    开始统计（用于无法使用 with 语句的场景，如 Celery 的 task_prerun / task_postrun 信号）
+
+    Args:
+        label: 统计名称
+
+    Returns:
+        tuple[QueryStats, Token]: (统计对象, 传给 end_tracking 的令牌)
+    """
+    stats = QueryStats(label)
+    return stats, _query_stats.set(stats)
+
+
+def end_tracking(stats: QueryStats, token: Token) -> None:
+    """
+    结束 begin_tracking 开始的统计并输出统计摘要
+
+    Args:
+        stats: 统计对象
+        token: begin_tracking 返回的令牌
+    """
+    try:
+        _query_stats.reset(token)
+    except ValueError:
+        # 不在开始统计时的上下文中（令牌无法还原），直接清除
+        _query_stats.set(None)
+    stats.report()
+
+
+# ==================== 事件处理 ====================
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault(_START_TIME_KEY, []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    start_times = conn.info.get(_START_TIME_KEY)
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()[1]
+
+    if 0 < _slow_query_seconds <= elapsed:
+        # 不记录参数，避免在日志中泄露业务数据
+        logger.warning(f"慢查询 {elapsed * 1000:.1f}ms: {_truncate(statement)}")
+
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context: Any) -> None:
+    """语句执行失败时移除其开始时间（after_cursor_execute 不会触发）"""
+    conn = exception_context.connection
+    if conn is None:
+        return
+    start_times = conn.info.get(_START_TIME_KEY)
+    if start_times and start_times[-1][0] is exception_context.execution_context:
+        start_times.pop()
+
+
+def install_sql_instrumentation(
+    slow_query_ms: float = 500, n_plus_one_threshold: int = 10
+) -> None:
+    """
+    注册 SQL 执行统计事件（对所有引擎生效，包括只读副本和异步引擎，重复调用只更新阈值）
+
+    Args:
+        slow_query_ms: 慢查询阈值（毫秒），<= 0 表示不记录慢查询
+        n_plus_one_threshold: 同一请求中相同语句的执行次数阈值，<= 0 表示不检测 N+1
+    """
+    global _installed, _slow_query_seconds, _n_plus_one_threshold
+
+    _slow_query_seconds = slow_query_ms / 1000
+    _n_plus_one_threshold = n_plus_one_threshold
+    if _installed:
+        return
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+# ==================== 请求中间件 ====================
+
+
+class QueryStatsMiddleware:
+    """
+    请求 SQL 统计中间件（ASGI）
+
+    为每个 HTTP 请求开启 SQL 统计，请求结束时输出统计摘要；
+    expose_headers=True（调试模式）时在响应头中返回查询次数和总耗时（毫秒）。
+
+    使用示例：
+        app.add_middleware(QueryStatsMiddleware, expose_headers=Config.get("app.debug"))
+    """
+
+    def __init__(self, app: Any, expose_headers: bool = False):
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope.get('method', '')} {scope.get('path', '')}"
+        with track_queries(label) as stats:
+
+            async def send_wrapper(message: Any) -> None:
+                if self.expose_headers and message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append(
+                        (b"x-db-query-time", f"{stats.total_time * 1000:.1f}".encode())
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,352 @@
+"""
+游标分页（keyset pagination）
+
+按 (排序字段, id) 定位下一页的起点，代替 OFFSET 跳过前面的记录：
+
+    WHERE (sort_col, id) < (:last_sort_value, :last_id)
+    ORDER BY sort_col DESC, id DESC
+    LIMIT :size + 1
+
+第 N 页与第 1 页的查询代价相同（排序字段有索引时只扫描 size + 1 行），
+不返回总数时也不需要 COUNT 查询。
+
+id 的排序方向可以与排序字段不同（例如 record_date 倒序、同一天内 id 正序），
+此时定位条件展开为 sort_col < :v OR (sort_col = :v AND id > :last_id)，
+对应的联合索引需要按相同方向建立（MySQL 8 支持 (sort_col DESC, id) 降序索引）。
+
+游标是不透明字符串（base64url 编码的 JSON），保存上一页最后一条记录的排序值、id、
+排序字段和方向；排序条件变化后旧游标失效，需要从第一页重新开始。
+
+排序字段允许为 NULL：NULL 值固定排在最后，NULL 之间按 id 排序。
+NULL 部分单独查询（WHERE sort_col IS NULL ORDER BY id），两部分都能使用
+(sort_col, id) 联合索引的范围扫描，不需要额外排序。
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import and_, func, or_, select, tuple_
+
+# 游标中排序值的类型标记（JSON 不支持的类型）
+_TYPE_DECIMAL = "decimal"
+_TYPE_DATETIME = "datetime"
+_TYPE_DATE = "date"
+_TYPE_TIME = "time"
+
+# 每页最大记录数（与 CustomParams 一致）
+MAX_PAGE_SIZE = 10000
+
+
+@dataclass
+class CursorPage:
+    """
+    游标分页结果
+
+    Attributes:
+        items: 当前页的记录
+        next_cursor: 下一页游标，没有下一页时为 None
+        has_more: 是否还有下一页
+        size: 每页记录数
+        total: 总记录数，未统计时为 None
+    """
+
+    items: list[Any]
+    next_cursor: str | None
+    has_more: bool
+    size: int
+    total: int | None = None
+
+    def to_dict(self, items: list[Any] | None = None) -> dict[str, Any]:
+        """
+        转换为响应数据（不统计总数时不返回 total）
+
+        Args:
+            items: 格式化后的记录，None 表示使用 self.items
+
+        Returns:
+            dict[str, Any]: items / next_cursor / has_more / size [/ total]
+        """
+        data: dict[str, Any] = {
+            "items": self.items if items is None else items,
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+            "size": self.size,
+        }
+        if self.total is not None:
+            data["total"] = self.total
+        return data
+
+
+def _dump_value(value: Any) -> Any:
+    """排序值转换为 JSON 可序列化的值"""
+    if isinstance(value, Decimal):
+        return {"t": _TYPE_DECIMAL, "v": str(value)}
+    if isinstance(value, datetime):
+        return {"t": _TYPE_DATETIME, "v": value.isoformat()}
+    if isinstance(value, date):
+        return {"t": _TYPE_DATE, "v": value.isoformat()}
+    if isinstance(value, time):
+        return {"t": _TYPE_TIME, "v": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    """还原 _dump_value 转换的排序值"""
+    if not isinstance(value, dict):
+        return value
+    kind, raw = value.get("t"), value.get("v")
+    if kind == _TYPE_DECIMAL:
+        return Decimal(raw)
+    if kind == _TYPE_DATETIME:
+        return datetime.fromisoformat(raw)
+    if kind == _TYPE_DATE:
+        return date.fromisoformat(raw)
+    if kind == _TYPE_TIME:
+        return time.fromisoformat(raw)
+    raise ValueError(f"未知的游标值类型: {kind}")
+
+
+def encode_cursor(
+    sort_field: str,
+    descending: bool,
+    value: Any,
+    row_id: Any,
+    id_descending: bool | None = None,
+) -> str:
+    """
+    编码游标
+
+    Args:
+        sort_field: 排序字段
+        descending: 是否倒序
+        value: 最后一条记录的排序值
+        row_id: 最后一条记录的 id
+        id_descending: id 是否倒序，None 表示与排序字段相同
+
+    Returns:
+        str: 游标字符串（base64url，无填充）
+    """
+    payload = {
+        "f": sort_field,
+        "d": 1 if descending else 0,
+        "v": _dump_value(value),
+        "i": row_id,
+    }
+    if id_descending is not None and id_descending != descending:
+        payload["r"] = 1 if id_descending else 0
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    sort_field: str,
+    descending: bool,
+    id_descending: bool | None = None,
+) -> tuple[Any, Any]:
+    """
+    解码游标
+
+    Args:
+        cursor: 游标字符串
+        sort_field: 当前请求的排序字段
+        descending: 当前请求是否倒序
+        id_descending: 当前请求的 id 是否倒序，None 表示与排序字段相同
+
+    Returns:
+        tuple[Any, Any]: (排序值, id)
+
+    Raises:
+        ValueError: 游标格式错误，或与当前排序条件不一致
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        field, desc, value, row_id = (
+            payload["f"],
+            payload["d"],
+            payload["v"],
+            payload["i"],
+        )
+        id_desc = payload.get("r", desc)
+        value = _load_value(value)
+    except (
+        binascii.Error,
+        UnicodeError,
+        json.JSONDecodeError,
+        KeyError,
+        TypeError,
+        ValueError,
+    ) as e:
+        raise ValueError("无效的分页游标") from e
+
+    if id_descending is None:
+        id_descending = descending
+    if (
+        field != sort_field
+        or bool(desc) != descending
+        or bool(id_desc) != id_descending
+    ):
+        raise ValueError("分页游标与当前排序条件不一致，请从第一页重新查询")
+    return value, row_id
+
+
+def _is_nullable(column: Any, id_column: Any) -> bool:
+    """排序字段是否可能为 NULL（无法判断时按可为 NULL 处理）"""
+    if column is id_column:
+        return False
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def _keyset_condition(
+    column: Any,
+    id_column: Any,
+    descending: bool,
+    id_descending: bool,
+    value: Any,
+    row_id: Any,
+) -> Any:
+    """下一页的定位条件：(column, id) 在游标之后（排序值不为 NULL 的部分）"""
+    if column is id_column:
+        return column < value if descending else column > value
+    if id_descending == descending:
+        key, cursor_key = tuple_(column, id_column), tuple_(value, row_id)
+        return key < cursor_key if descending else key > cursor_key
+    # 方向不同时无法使用行比较，展开为等价条件
+    after = column < value if descending else column > value
+    tie = id_column < row_id if id_descending else id_column > row_id
+    return or_(after, and_(column == value, tie))
+
+
+def _keyset_order_by(
+    column: Any, id_column: Any, descending: bool, id_descending: bool
+) -> list[Any]:
+    """排序条件：(column, id)，与 (排序字段, id) 联合索引的顺序一致"""
+    order_by = []
+    if column is not id_column:
+        order_by.append(column.desc() if descending else column.asc())
+    order_by.append(id_column.desc() if id_descending else id_column.asc())
+    return order_by
+
+
+def _check_size(size: int) -> None:
+    """校验每页记录数（与 CustomParams 的范围一致）"""
+    if size < 1:
+        raise ValueError("每页记录数必须大于0")
+    if size > MAX_PAGE_SIZE:
+        raise ValueError(f"每页记录数不能超过{MAX_PAGE_SIZE}")
+
+
+async def _fetch(session: Any, query: Any, limit: int) -> list[Any]:
+    """执行查询并返回前 limit 条记录"""
+    return list((await session.execute(query.limit(limit))).scalars().all())
+
+
+async def keyset_paginate(
+    session: Any,
+    query: Any,
+    sort_field: str,
+    column: Any,
+    id_column: Any,
+    descending: bool,
+    cursor: str | None = None,
+    size: int = 20,
+    with_total: bool = False,
+    id_descending: bool | None = None,
+) -> CursorPage:
+    """
+    游标分页查询
+
+    排序字段可为 NULL 时分两段查询，每段都能使用 (排序字段, id) 索引的范围扫描：
+    先查询排序值不为 NULL 的记录，不足一页时再按 id 查询排序值为 NULL 的记录补足。
+
+    Args:
+        session: 异步会话
+        query: 查询对象（不包含排序，由本方法按 (column, id_column) 排序）
+        sort_field: 排序字段名（写入游标）
+        column: 排序字段
+        id_column: 唯一的决胜字段（通常为主键 id）
+        descending: 是否倒序
+        cursor: 上一页返回的 next_cursor，None 或空字符串表示第一页
+        size: 每页记录数（1 ~ MAX_PAGE_SIZE）
+        with_total: 是否统计总记录数（额外执行一次 COUNT 查询）
+        id_descending: id 是否倒序，None 表示与排序字段相同
+
+    Returns:
+        CursorPage: 分页结果
+
+    Raises:
+        ValueError: 每页记录数超出范围，游标格式错误，或与当前排序条件不一致
+    """
+    _check_size(size)
+    if id_descending is None or column is id_column:
+        id_descending = descending
+    value = row_id = None
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_field, descending, id_descending)
+
+    total = None
+    if with_total:
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+        total = (await session.execute(count_query)).scalar_one()
+
+    query = query.order_by(None)
+    nullable = _is_nullable(column, id_column)
+    # 上一页最后一条记录的排序值为 NULL：已进入 NULL 部分
+    in_null_segment = bool(cursor) and value is None
+    # 多取一条判断是否还有下一页
+    limit = size + 1
+
+    rows: list[Any] = []
+    if not in_null_segment:
+        segment = query
+        if cursor:
+            segment = segment.where(
+                _keyset_condition(
+                    column, id_column, descending, id_descending, value, row_id
+                )
+            )
+        elif nullable:
+            segment = segment.where(column.is_not(None))
+        segment = segment.order_by(
+            *_keyset_order_by(column, id_column, descending, id_descending)
+        )
+        rows = await _fetch(session, segment, limit)
+
+    # 排序值为 NULL 的记录排在最后，按 id 排序
+    if nullable and len(rows) < limit:
+        segment = query.where(column.is_(None))
+        if in_null_segment:
+            segment = segment.where(
+                id_column < row_id if id_descending else id_column > row_id
+            )
+        segment = segment.order_by(
+            *_keyset_order_by(id_column, id_column, id_descending, id_descending)
+        )
+        rows.extend(await _fetch(session, segment, limit - len(rows)))
+
+    has_more = len(rows) > size
+    items = rows[:size]
+
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort_field,
+            descending,
+            getattr(last, column.key),
+            getattr(last, id_column.key),
+            id_descending,
+        )
+    return CursorPage(
+        items=items,
+        next_cursor=next_cursor,
+        has_more=has_more,
+        size=size,
+        total=total,
+    )
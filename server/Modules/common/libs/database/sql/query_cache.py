@@ -0,0 +1,394 @@
+"""
+ORM 查询结果缓存
+
+按 "编译后的 SQL + 参数" 缓存 SELECT 结果，并记录语句读取的表；
+任何会话对表的写入（flush / ORM 批量 UPDATE / DELETE / INSERT / text() 写入语句）
+在事务提交后递增该表的版本号，读取时版本号不一致即视为失效，无需各个服务手写失效逻辑。
+不经过会话的写入（如分表管理器的驱动层 SQL）需要在提交后自行调用 invalidate_tags(table_tag(表名))。
+
+缓存条目使用 pickle 序列化（结果中包含 ORM 实例），写入时附加 HMAC-SHA256 签名，
+读取时签名不匹配的条目直接丢弃，避免反序列化被篡改的 Redis 数据。
+
+表版本复用缓存标签机制（标签名为 db_table:<表名>），
+因此 @cached 的方法也可以通过 tags=["db_table:<表名>"] 随表数据自动失效。
+
+使用示例：
+    async with get_async_session(query_cache=True) as session:
+        result = await session.execute(select(QuantConcept.id, QuantConcept.name))
+
+    # 单条语句关闭缓存 / 指定过期时间
+    await session.execute(stmt.execution_options(query_cache=False))
+    await session.execute(stmt.execution_options(query_cache_ttl=60))
+"""
+
+import hashlib
+import hmac
+import json
+import pickle
+import re
+import secrets
+import threading
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Table, event
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Load, ORMExecuteState, Session, loading
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.util import await_only
+
+# 会话 info 中的键
+SESSION_ENABLED_KEY = "query_cache"
+SESSION_ASYNC_KEY = "query_cache_async"
+_PENDING_TABLES_KEY = "query_cache_pending_tables"
+_COLLECTOR_KEY = "query_cache_collector"
+
+# 缓存键前缀
+QUERY_KEY_PREFIX = "query_cache:"
+
+# 语句形状 -> 实际读取过的表（包括关系加载），进程内记录
+_MAX_SHAPES = 10000
+_statement_tables: dict[str, frozenset[str]] = {}
+_statement_tables_lock = threading.Lock()
+
+_installed = False
+_default_ttl = 300
+_signing_key = b""
+
+# 缓存条目签名长度（HMAC-SHA256）
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+# text() 写入语句的目标表（INSERT INTO / REPLACE INTO / UPDATE / DELETE FROM）
+_DML_TABLE_PATTERN = re.compile(
+    r"^\s*(?:(?:INSERT|REPLACE)(?:\s+(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE))*"
+    r"\s+INTO|UPDATE(?:\s+(?:LOW_PRIORITY|IGNORE))*|DELETE(?:\s+(?:LOW_PRIORITY|QUICK|IGNORE))*"
+    r"\s+FROM)\s+(?:[`\"\[]?\w+[`\"\]]?\.)?[`\"\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def table_tag(table_name: str) -> str:
+    """表版本对应的缓存标签"""
+    return f"db_table:{table_name}"
+
+
+def _tables_of(statement: Any) -> set[str]:
+    """语句涉及的表名（包括 JOIN、子查询）"""
+    return {
+        table.name
+        for table in find_tables(
+            statement,
+            include_aliases=True,
+            include_joins=True,
+            include_selects=True,
+            include_crud=True,
+        )
+        if isinstance(table, Table)
+    }
+
+
+def _text_dml_tables(statement: TextClause) -> set[str]:
+    """text() 写入语句的目标表（非写入语句返回空集合）"""
+    match = _DML_TABLE_PATTERN.match(statement.text)
+    return {match.group(1)} if match else set()
+
+
+def _options_signature(statement: Any) -> list[Any] | None:
+    """
+    加载选项签名（如 selectinload / load_only），用于区分主 SQL 相同但加载内容不同的查询
+
+    Returns:
+        签名列表，包含无法识别的选项时返回 None（不缓存）
+    """
+    signature = []
+    for option in getattr(statement, "_with_options", ()):
+        if not isinstance(option, Load):
+            return None
+        for element in option.context:
+            signature.append(
+                [
+                    str(element.path),
+                    element.strategy,
+                    sorted(element.local_opts.items()),
+                ]
+            )
+    return signature
+
+
+def _cache_ttl(orm_context: ORMExecuteState) -> int | None:
+    """
+    解析语句的缓存过期时间
+
+    Returns:
+        过期时间（秒），None 表示不缓存
+    """
+    options = orm_context.execution_options
+    enabled = options.get(
+        "query_cache", orm_context.session.info.get(SESSION_ENABLED_KEY, False)
+    )
+    if not enabled:
+        return None
+    return options.get("query_cache_ttl", _default_ttl)
+
+
+def _build_cache_key(
+    orm_context: ORMExecuteState, options_signature: list[Any]
+) -> tuple[str, str]:
+    """
+    构建缓存键
+
+    Returns:
+        (缓存键, 语句形状摘要)
+    """
+    bind = orm_context.session.get_bind(mapper=orm_context.bind_mapper)
+    compiled = orm_context.statement.compile(dialect=bind.dialect)
+    sql = str(compiled)
+    shape = hashlib.sha1(
+        json.dumps([sql, options_signature], default=str).encode("utf-8")
+    ).hexdigest()
+
+    params = dict(compiled.params)
+    if isinstance(orm_context.parameters, dict):
+        params.update(orm_context.parameters)
+    digest = hashlib.sha1(
+        json.dumps([shape, params], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{QUERY_KEY_PREFIX}{digest}", shape
+
+
+def _remember_tables(shape: str, snapshot: set[str], collected: set[str]) -> bool:
+    """
+    记录语句形状实际读取的表
+
+    Args:
+        shape: 语句形状摘要
+        snapshot: 执行前已读取版本号的表
+        collected: 执行过程中实际读取的表（包括关系加载）
+
+    Returns:
+        实际读取的表是否都已读取版本号（否则结果不能缓存，下次执行时会一并读取）
+    """
+    if collected <= snapshot:
+        return True
+    with _statement_tables_lock:
+        if len(_statement_tables) >= _MAX_SHAPES:
+            _statement_tables.clear()
+        _statement_tables[shape] = frozenset(
+            _statement_tables.get(shape, frozenset()) | collected
+        )
+    return False
+
+
+# ==================== 缓存读写 ====================
+
+
+def _get_many(session: Session, keys: list[str]) -> dict[str, Any]:
+    """读取缓存（异步会话通过 await_only 在当前事件循环中执行）"""
+    from ...cache import get_async_cache_service, get_sync_cache_service
+
+    if session.info.get(SESSION_ASYNC_KEY):
+        return await_only(get_async_cache_service().get_many(keys))
+    return get_sync_cache_service().get_many(keys)
+
+
+def _set(session: Session, key: str, value: bytes, ttl: int) -> None:
+    """写入缓存"""
+    from ...cache import get_async_cache_service, get_sync_cache_service
+
+    if session.info.get(SESSION_ASYNC_KEY):
+        await_only(get_async_cache_service().set(key, value, ttl=ttl))
+    else:
+        get_sync_cache_service().set(key, value, ttl=ttl)
+
+
+def _sign(payload: bytes) -> bytes:
+    """为缓存条目附加签名"""
+    return hmac.new(_signing_key, payload, hashlib.sha256).digest() + payload
+
+
+def _verify(entry: bytes) -> bytes | None:
+    """
+    校验缓存条目签名
+
+    Returns:
+        签名正确时返回负载，否则返回 None
+    """
+    signature, payload = entry[:_SIGNATURE_SIZE], entry[_SIGNATURE_SIZE:]
+    expected = hmac.new(_signing_key, payload, hashlib.sha256).digest()
+    return payload if hmac.compare_digest(signature, expected) else None
+
+
+def _bump_tables(session: Session, tables: set[str]) -> None:
+    """递增表版本"""
+    from ...cache import async_invalidate_tags, invalidate_tags
+
+    tags = [table_tag(table) for table in sorted(tables)]
+    if session.info.get(SESSION_ASYNC_KEY):
+        await_only(async_invalidate_tags(*tags))
+    else:
+        invalidate_tags(*tags)
+
+
+def _version_key(table: str) -> str:
+    """表版本计数键"""
+    from ...cache.decorators import tag_key
+
+    return tag_key(table_tag(table))
+
+
+# ==================== 事件处理 ====================
+
+
+def _on_do_orm_execute(orm_context: ORMExecuteState) -> Any:
+    """拦截会话执行：记录写入的表、读取 / 写入查询缓存"""
+    session = orm_context.session
+
+    if orm_context.is_insert or orm_context.is_update or orm_context.is_delete:
+        session.info.setdefault(_PENDING_TABLES_KEY, set()).update(
+            _tables_of(orm_context.statement)
+        )
+        return None
+
+    if isinstance(orm_context.statement, TextClause):
+        tables = _text_dml_tables(orm_context.statement)
+        if tables:
+            session.info.setdefault(_PENDING_TABLES_KEY, set()).update(tables)
+        return None
+
+    if not orm_context.is_select:
+        return None
+
+    collector = session.info.get(_COLLECTOR_KEY)
+    if orm_context.is_relationship_load or orm_context.is_column_load:
+        # 外层缓存查询触发的关系加载，记录读取的表
+        if collector is not None:
+            collector.update(_tables_of(orm_context.statement))
+        return None
+
+    ttl = _cache_ttl(orm_context)
+    if ttl is None or collector is not None:
+        return None
+
+    statement = orm_context.statement
+    if getattr(statement, "_for_update_arg", None) is not None:
+        return None
+
+    options_signature = _options_signature(statement)
+    tables = _tables_of(statement)
+    if options_signature is None or not tables:
+        return None
+
+    # 本事务已写入但尚未提交的表，缓存结果可能看不到这些修改
+    if tables & session.info.get(_PENDING_TABLES_KEY, set()):
+        return None
+
+    try:
+        cache_key, shape = _build_cache_key(orm_context, options_signature)
+        tables |= _statement_tables.get(shape, frozenset())
+        version_keys = {table: _version_key(table) for table in tables}
+
+        found = _get_many(session, [cache_key, *version_keys.values()])
+        versions = {
+            table: int(found.get(key) or 0) for table, key in version_keys.items()
+        }
+
+        entry = found.get(cache_key)
+        payload = _verify(entry) if isinstance(entry, bytes) else None
+        if isinstance(entry, bytes) and payload is None:
+            logger.warning(f"查询缓存条目签名不匹配，已忽略 - key: {cache_key}")
+        if payload is not None:
+            cached_versions, frozen = pickle.loads(payload)
+            if cached_versions == versions:
+                return loading.merge_frozen_result(
+                    session, statement, frozen, load=False
+                )()
+    except Exception as e:
+        logger.warning(f"查询缓存读取失败，直接查询数据库 - error: {e}")
+        return None
+
+    # 执行查询并收集关系加载读取的表
+    session.info[_COLLECTOR_KEY] = collected = set(tables)
+    try:
+        frozen = orm_context.invoke_statement().freeze()
+    finally:
+        session.info.pop(_COLLECTOR_KEY, None)
+
+    if _remember_tables(shape, tables, collected):
+        try:
+            _set(
+                session,
+                cache_key,
+                _sign(
+                    pickle.dumps((versions, frozen), protocol=pickle.HIGHEST_PROTOCOL)
+                ),
+                ttl,
+            )
+        except Exception as e:
+            logger.warning(f"查询缓存写入失败 - error: {e}")
+
+    return frozen()
+
+
+def _on_after_flush(session: Session, flush_context: Any) -> None:
+    """记录本次 flush 写入的表（提交后再递增版本）"""
+    tables = session.info.setdefault(_PENDING_TABLES_KEY, set())
+    for instance in (*session.new, *session.deleted):
+        tables.update(table.name for table in sa_inspect(instance).mapper.tables)
+    for instance in session.dirty:
+        if session.is_modified(instance):
+            tables.update(table.name for table in sa_inspect(instance).mapper.tables)
+
+
+def _on_after_commit(session: Session) -> None:
+    """事务提交后递增写入过的表的版本"""
+    tables = session.info.pop(_PENDING_TABLES_KEY, None)
+    if tables:
+        try:
+            _bump_tables(session, tables)
+        except Exception as e:
+            logger.error(f"查询缓存表版本更新失败 - tables: {tables}, error: {e}")
+
+
+def _on_after_transaction_end(session: Session, transaction: Any) -> None:
+    """顶层事务结束（回滚）后丢弃未提交的写入记录"""
+    if transaction.parent is None:
+        session.info.pop(_PENDING_TABLES_KEY, None)
+
+
+def install_query_cache(default_ttl: int = 300, secret_key: str = "") -> None:
+    """
+    注册查询缓存事件（对所有会话生效，重复调用无副作用）
+
+    启用后所有会话的写入都会在提交后递增表版本；
+    只有通过 query_cache=True 打开的会话（或设置了 query_cache 执行选项的语句）才会读写缓存。
+
+    Args:
+        default_ttl: 查询结果默认缓存时间（秒）
+        secret_key: 缓存条目签名密钥，所有进程需要相同；为空时使用进程内随机密钥
+            （其他进程写入的缓存条目无法通过校验）
+    """
+    global _installed, _default_ttl, _signing_key
+
+    _default_ttl = default_ttl
+    if secret_key:
+        _signing_key = hmac.new(
+            secret_key.encode("utf-8"), b"query_cache", hashlib.sha256
+        ).digest()
+    elif not _signing_key:
+        _signing_key = secrets.token_bytes(32)
+        logger.warning("未配置查询缓存签名密钥，使用进程内随机密钥")
+    if _installed:
+        return
+
+    event.listen(Session, "do_orm_execute", _on_do_orm_execute)
+    event.listen(Session, "after_flush", _on_after_flush)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_transaction_end", _on_after_transaction_end)
+    _installed = True
+    logger.info(f"ORM 查询缓存已启用 - ttl: {default_ttl}")
+
+
+def is_query_cache_installed() -> bool:
+    """查询缓存事件是否已注册"""
+    return _installed
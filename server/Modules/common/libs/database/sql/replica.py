@@ -0,0 +1,345 @@
+"""
+读写分离
+
+连接配置了只读副本（replicas）时，通过 readonly=True 打开的会话读取副本，其余会话读写主库：
+
+    async with get_async_session(readonly=True) as session:
+        rows = (await session.execute(select(Admin))).scalars().all()
+
+副本选择策略：
+- round_robin：按顺序轮询
+- least_busy：选择连接池中已借出连接数最少的副本
+
+写后读一致性（read-your-writes）：会话提交了写入后，同一上下文（同一个请求 / 异步任务 / 线程）
+在 read_your_writes_seconds 秒内的只读会话仍然读取主库，避免刚写入的数据因为复制延迟读不到。
+HTTP 请求还会按客户端（访问令牌，没有令牌时为客户端 IP）把提交过写入的连接记录到 Redis，
+同一客户端在窗口内的后续请求（如保存后刷新列表）的只读会话同样读取主库。
+"""
+
+import hashlib
+import itertools
+import math
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql.elements import TextClause
+
+STRATEGY_ROUND_ROBIN = "round_robin"
+STRATEGY_LEAST_BUSY = "least_busy"
+
+# 会话 info 中的键
+SESSION_READONLY_KEY = "replica_readonly"
+_PENDING_WRITE_KEY = "replica_pending_write"
+COMMITTED_WRITE_KEY = "replica_committed_write"
+
+# 连接名称 -> 最近一次提交写入的时间（time.monotonic）
+_last_writes: ContextVar[dict[str, float] | None] = ContextVar(
+    "db_last_writes", default=None
+)
+# 跨请求写入记录的 Redis 键前缀（客户端标识:连接名称）
+CLIENT_WRITE_KEY_PREFIX = "db_last_write:"
+
+
+class ClientWrites:
+    """
+    当前 HTTP 请求所属客户端的写入记录
+
+    Attributes:
+        client_key: 客户端标识
+        written: 本请求提交过写入的连接
+        checked: 已从 Redis 读取过写入记录的连接
+        pinned: Redis 中记录了近期写入（需要读取主库）的连接
+    """
+
+    def __init__(self, client_key: str):
+        self.client_key = client_key
+        self.written: set[str] = set()
+        self.checked: set[str] = set()
+        self.pinned: set[str] = set()
+
+    def redis_key(self, name: str) -> str:
+        """连接对应的 Redis 键"""
+        return f"{CLIENT_WRITE_KEY_PREFIX}{self.client_key}:{name}"
+
+
+# 当前请求的客户端写入记录（由 RequestSessionMiddleware 设置）
+_client_writes: ContextVar[ClientWrites | None] = ContextVar(
+    "db_client_writes", default=None
+)
+# 强制读取主库（use_primary 上下文内）
+_force_primary: ContextVar[bool] = ContextVar("db_force_primary", default=False)
+
+# text() 语句中视为只读的首个关键字
+_READ_KEYWORDS = frozenset({"SELECT", "SHOW", "EXPLAIN", "DESCRIBE", "DESC"})
+
+_installed = False
+
+
+class ReplicaSelector:
+    """
+    只读副本选择器（线程安全）
+
+    同步和异步引擎各使用一个选择器。
+    """
+
+    def __init__(self, engines: Sequence[Any], strategy: str = STRATEGY_ROUND_ROBIN):
+        """
+        初始化选择器
+
+        Args:
+            engines: 副本引擎列表（Engine 或 AsyncEngine）
+            strategy: 选择策略，round_robin / least_busy
+
+        Raises:
+            ValueError: 选择策略不支持
+        """
+        if strategy not in (STRATEGY_ROUND_ROBIN, STRATEGY_LEAST_BUSY):
+            raise ValueError(f"不支持的副本选择策略: {strategy}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    @staticmethod
+    def _checked_out(engine: Any) -> int:
+        """引擎连接池中已借出的连接数（SQLite 等没有计数的连接池视为 0）"""
+        checkedout = getattr(engine.pool, "checkedout", None)
+        return checkedout() if callable(checkedout) else 0
+
+    def select(self) -> Any | None:
+        """
+        选择一个副本
+
+        Returns:
+            副本引擎，没有副本时返回 None
+        """
+        if not self.engines:
+            return None
+        if len(self.engines) == 1:
+            return self.engines[0]
+
+        with self._lock:
+            index = next(self._counter) % len(self.engines)
+        if self.strategy == STRATEGY_LEAST_BUSY:
+            # 从轮询位置开始比较，负载相同时依次分摊
+            ordered = self.engines[index:] + self.engines[:index]
+            return min(ordered, key=self._checked_out)
+        return self.engines[index]
+
+
+# ==================== 写后读一致性 ====================
+
+
+def mark_primary_write(name: str) -> None:
+    """
+    记录当前上下文向主库提交了写入
+
+    Args:
+        name: 连接名称
+    """
+    writes = dict(_last_writes.get() or {})
+    writes[name] = time.monotonic()
+    _last_writes.set(writes)
+    client = _client_writes.get()
+    if client is not None:
+        client.written.add(name)
+
+
+def is_pinned_to_primary(name: str, window: float) -> bool:
+    """
+    当前上下文的只读会话是否应读取主库
+
+    Args:
+        name: 连接名称
+        window: 写后读主库的时间窗口（秒）
+
+    Returns:
+        是否读取主库
+    """
+    if _force_primary.get():
+        return True
+    client = _client_writes.get()
+    if client is not None and name in client.pinned:
+        return True
+    last_write = (_last_writes.get() or {}).get(name)
+    return last_write is not None and time.monotonic() - last_write < window
+
+
+def client_key_from_headers(
+    authorization: str | None, client_host: str | None
+) -> str | None:
+    """
+    客户端标识：访问令牌的摘要，没有令牌时为客户端 IP
+
+    Args:
+        authorization: Authorization 请求头
+        client_host: 客户端 IP
+
+    Returns:
+        客户端标识，无法识别时返回 None
+    """
+    if authorization:
+        return hashlib.sha1(authorization.encode("utf-8")).hexdigest()
+    return client_host or None
+
+
+@contextmanager
+def track_client_writes(client_key: str | None) -> Iterator[ClientWrites | None]:
+    """
+    在上下文内记录客户端的写入（client_key 为 None 时不记录）
+
+    Args:
+        client_key: 客户端标识
+    """
+    client = ClientWrites(client_key) if client_key else None
+    token = _client_writes.set(client)
+    try:
+        yield client
+    finally:
+        _client_writes.reset(token)
+
+
+async def load_client_writes(name: str) -> None:
+    """
+    读取当前客户端在其他请求中对连接的近期写入（每个请求每个连接只读取一次）
+
+    Args:
+        name: 连接名称
+    """
+    client = _client_writes.get()
+    if client is None or name in client.checked:
+        return
+    client.checked.add(name)
+
+    from ...cache import get_async_cache_service
+
+    try:
+        if await get_async_cache_service().exists(client.redis_key(name)):
+            client.pinned.add(name)
+    except Exception as e:
+        logger.warning(f"读取客户端写入记录失败 - connection: {name}, error: {e}")
+
+
+async def save_client_writes(names: Iterable[str], window: float) -> None:
+    """
+    记录当前客户端提交过写入的连接（过期时间为写后读窗口，向上取整到秒）
+
+    Args:
+        names: 连接名称
+        window: 写后读主库的时间窗口（秒）
+    """
+    client = _client_writes.get()
+    names = list(names)
+    if client is None or not names or window <= 0:
+        return
+
+    from ...cache import get_async_cache_service
+
+    try:
+        await get_async_cache_service().set_many(
+            {client.redis_key(name): 1 for name in names}, ttl=math.ceil(window)
+        )
+    except Exception as e:
+        logger.warning(f"记录客户端写入失败 - connections: {names}, error: {e}")
+
+
+def client_written_connections() -> set[str]:
+    """当前请求提交过写入的连接"""
+    client = _client_writes.get()
+    return set(client.written) if client is not None else set()
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """
+    上下文内的只读会话全部读取主库（用于必须读到最新数据的流程）
+
+    使用示例：
+        with use_primary():
+            async with get_async_session(readonly=True) as session:
+                ...
+    """
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+def has_pending_write(session: Session) -> bool:
+    """会话当前事务中是否有未提交的写入（包括尚未 flush 的对象）"""
+    return bool(
+        session.info.get(_PENDING_WRITE_KEY)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
+# ==================== 事件处理 ====================
+
+
+def _is_read_statement(orm_context: ORMExecuteState) -> bool:
+    """语句是否为只读语句（text() 语句按首个关键字判断）"""
+    if orm_context.is_select:
+        return True
+    statement = orm_context.statement
+    if isinstance(statement, TextClause):
+        keyword = statement.text.lstrip().split(None, 1)[:1]
+        return bool(keyword) and keyword[0].upper() in _READ_KEYWORDS
+    return False
+
+
+def _on_do_orm_execute(orm_context: ORMExecuteState) -> None:
+    """记录会话执行过写语句"""
+    if not _is_read_statement(orm_context):
+        orm_context.session.info[_PENDING_WRITE_KEY] = True
+
+
+def _on_before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    """只读会话禁止 flush 写入"""
+    if session.info.get(SESSION_READONLY_KEY) and (
+        session.new or session.deleted or session.dirty
+    ):
+        raise RuntimeError("只读会话（readonly=True）不允许写入数据")
+
+
+def _on_after_flush(session: Session, flush_context: Any) -> None:
+    session.info[_PENDING_WRITE_KEY] = True
+
+
+def _on_after_commit(session: Session) -> None:
+    """事务提交后标记写入已生效，由会话管理器在会话结束时记录到当前上下文"""
+    if session.info.pop(_PENDING_WRITE_KEY, False):
+        session.info[COMMITTED_WRITE_KEY] = True
+
+
+def _on_after_transaction_end(session: Session, transaction: Any) -> None:
+    """顶层事务结束（回滚）后丢弃未提交的写入标记"""
+    if transaction.parent is None:
+        session.info.pop(_PENDING_WRITE_KEY, None)
+
+
+def install_write_tracking() -> None:
+    """注册写入跟踪事件（对所有会话生效，重复调用无副作用）"""
+    global _installed
+
+    if _installed:
+        return
+
+    event.listen(Session, "do_orm_execute", _on_do_orm_execute)
+    event.listen(Session, "before_flush", _on_before_flush)
+    event.listen(Session, "after_flush", _on_after_flush)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_transaction_end", _on_after_transaction_end)
+    _installed = True
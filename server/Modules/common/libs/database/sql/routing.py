@@ -0,0 +1,53 @@
+"""
+模型连接路由
+
+模型默认使用会话所属的连接（通常为默认连接），以下两种方式可以把模型路由到其他连接：
+
+1. 模型声明 __bind_key__（优先）：
+
+    class QuantStockKline1d(BaseTableModel, table=True):
+        __bind_key__ = "analytics"
+
+2. 按模块配置（DB_MODULE_CONNECTIONS），Modules/<模块名>/ 下的所有模型使用指定连接：
+
+    DB_MODULE_CONNECTIONS={"quant": "analytics"}
+
+连接名称对应 database.connections 中的配置，引擎在首次使用时创建。
+"""
+
+from typing import Any
+
+from ...config import Config
+
+# 模型类 -> 连接名称（None 表示使用会话所属的连接）
+_model_connections: dict[type, str | None] = {}
+
+
+def get_model_connection(model: Any) -> str | None:
+    """
+    获取模型使用的连接名称
+
+    Args:
+        model: 模型类或 Mapper
+
+    Returns:
+        连接名称，None 表示没有单独指定（使用会话所属的连接）
+    """
+    model = getattr(model, "class_", model)
+    if model in _model_connections:
+        return _model_connections[model]
+
+    name = getattr(model, "__bind_key__", None)
+    if not name:
+        parts = getattr(model, "__module__", "").split(".")
+        if len(parts) > 1 and parts[0] == "Modules":
+            module_connections = Config.get("database.module_connections", {}) or {}
+            name = module_connections.get(parts[1])
+
+    _model_connections[model] = name or None
+    return _model_connections[model]
+
+
+def clear_model_connections() -> None:
+    """清空模型连接缓存（修改 module_connections 配置后调用）"""
+    _model_connections.clear()
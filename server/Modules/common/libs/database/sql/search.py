@@ -0,0 +1,384 @@
+"""
+文本搜索
+
+apply_search_filters 的文本字段默认转换为 LIKE '%关键词%'，无法使用索引，搜索耗时随表的大小线性增长。
+服务类可以为字段指定搜索模式：
+
+- contains（默认）：LIKE '%关键词%'，不使用索引
+- prefix：LIKE '关键词%'，可以使用字段上的 B-tree 索引（适合股票代码、编码等按前缀输入的字段）
+- fulltext：全文搜索，按字段所在连接的数据库选择实现：
+    - MySQL：中日韩关键词使用 MATCH ... AGAINST（BOOLEAN MODE），需要 ngram 解析器的 FULLTEXT 索引；
+      包含字母、数字等其他字符的关键词使用 LIKE
+    - SQLite：进程内倒排索引（按字符二元组），先得到候选 id 再用 LIKE 精确过滤
+    - 其他数据库：退化为 contains
+
+使用示例：
+
+    class ContentArticleService(BaseService):
+        fulltext_fields = ("title",)
+        prefix_fields = ("slug",)
+"""
+
+import asyncio
+import re
+import time
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import and_, event, false, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from ...config import Config
+from .engine import get_async_db_engine, get_db_engine
+from .routing import get_model_connection
+
+SEARCH_CONTAINS = "contains"
+SEARCH_PREFIX = "prefix"
+SEARCH_FULLTEXT = "fulltext"
+
+# MySQL ngram 解析器的分词长度（ngram_token_size，默认 2），更短的关键词无法通过全文索引匹配
+_NGRAM_TOKEN_SIZE = 2
+
+# 中日韩字符（假名、汉字、兼容汉字、谚文），只由这些字符组成的词才使用 MySQL 全文索引
+_CJK_TERM = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+"
+)
+
+# 倒排索引的候选 id 超过该数量时直接使用 LIKE（关键词区分度太低，IN 列表反而更慢）
+_MAX_CANDIDATES = 5000
+
+# 倒排索引的重建间隔（秒），用于发现其他进程或 text() 语句写入的数据
+_REBUILD_SECONDS = 300
+
+# 会话 info 中的键：本事务写入的需要更新倒排索引的记录
+_PENDING_INDEX_KEY = "search_index_pending"
+
+
+class SearchBackend:
+    """搜索实现基类（LIKE '%关键词%'）"""
+
+    name = SEARCH_CONTAINS
+
+    async def condition(self, model_class: Any, field: str, value: str) -> Any:
+        """
+        构建搜索条件
+
+        Args:
+            model_class: 模型类
+            field: 字段名
+            value: 关键词（已去除首尾空白）
+
+        Returns:
+            SQLAlchemy 条件表达式
+        """
+        return getattr(model_class, field).contains(value, autoescape=True)
+
+
+class PrefixSearchBackend(SearchBackend):
+    """前缀搜索（LIKE '关键词%'，可以使用 B-tree 索引）"""
+
+    name = SEARCH_PREFIX
+
+    async def condition(self, model_class: Any, field: str, value: str) -> Any:
+        return getattr(model_class, field).startswith(value, autoescape=True)
+
+
+class MySQLFulltextBackend(SearchBackend):
+    """
+    MySQL 全文搜索（MATCH ... AGAINST ... IN BOOLEAN MODE）
+
+    字段需要 ngram 解析器的 FULLTEXT 索引：
+        Index("ft_title", "title", mysql_prefix="FULLTEXT", mysql_with_parser="ngram")
+
+    关键词按空白拆分，每个词作为必须出现的短语（+"词"）。以下情况退化为 LIKE：
+    - 有词短于 ngram_token_size，无法通过全文索引匹配
+    - 有词包含中日韩以外的字符：InnoDB 停用词表（a、i 等）会使包含这些字母的二元组不进入索引，
+      英文、数字关键词可能漏掉匹配
+    """
+
+    name = SEARCH_FULLTEXT
+
+    async def condition(self, model_class: Any, field: str, value: str) -> Any:
+        terms = [term.replace('"', "") for term in value.split()]
+        terms = [term for term in terms if term]
+        if not terms or any(
+            len(term) < _NGRAM_TOKEN_SIZE or not _CJK_TERM.fullmatch(term)
+            for term in terms
+        ):
+            return await super().condition(model_class, field, value)
+
+        against = " ".join(f'+"{term}"' for term in terms)
+        return match(getattr(model_class, field), against=against).in_boolean_mode()
+
+
+class _FieldIndex:
+    """单个字段的倒排索引：字符一元组 / 二元组 -> 记录 id"""
+
+    def __init__(self) -> None:
+        self.postings: dict[str, set[Any]] = {}
+        # 重建期间新建的倒排列表（重建期间提交的写入同时写入两份）
+        self.building: dict[str, set[Any]] | None = None
+        self.built_at = 0.0
+        self.stale = True
+        self.lock = asyncio.Lock()
+
+    def add(self, row_id: Any, value: Any) -> None:
+        """添加记录（只增不删：删除或修改后多出的候选 id 会被 LIKE 过滤掉）"""
+        _add_posting(self.postings, row_id, value)
+        if self.building is not None:
+            _add_posting(self.building, row_id, value)
+
+    def candidates(self, value: str) -> set[Any] | None:
+        """可能包含关键词的记录 id，关键词无法分词时返回 None"""
+        grams = _grams(value)
+        if not grams:
+            return None
+        result: set[Any] | None = None
+        # 从最短的倒排列表开始求交集
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            ids = self.postings.get(gram)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else result & ids
+            if not result:
+                return result
+        return result
+
+
+def _add_posting(postings: dict[str, set[Any]], row_id: Any, value: Any) -> None:
+    """把字段值的分词写入倒排列表"""
+    if value is None:
+        return
+    for gram in _grams(str(value)):
+        postings.setdefault(gram, set()).add(row_id)
+
+
+def _grams(value: str) -> set[str]:
+    """分词：小写后按空白拆分，每段取字符一元组和二元组"""
+    grams: set[str] = set()
+    for segment in value.lower().split():
+        grams.update(segment)
+        grams.update(segment[i : i + 2] for i in range(len(segment) - 1))
+    return grams
+
+
+class InvertedIndexBackend(SearchBackend):
+    """
+    进程内倒排索引（用于 SQLite 等没有中文全文索引的数据库）
+
+    首次搜索时读取字段的全部值建立索引，之后通过 ORM 提交的新增和修改增量更新；
+    批量 UPDATE / INSERT 语句使索引失效，下次搜索时重建；
+    每 _REBUILD_SECONDS 秒重建一次，以发现其他进程写入的数据。
+
+    倒排索引只用于缩小候选范围，最终结果仍由 LIKE '%关键词%' 判断，与 contains 模式的结果一致。
+    """
+
+    name = SEARCH_FULLTEXT
+
+    def __init__(self) -> None:
+        # (表名, 字段名) -> 倒排索引
+        self.indexes: dict[tuple[str, str], _FieldIndex] = {}
+        # 表名 -> 建立了索引的字段
+        self.table_fields: dict[str, set[str]] = {}
+
+    async def condition(self, model_class: Any, field: str, value: str) -> Any:
+        like = await super().condition(model_class, field, value)
+        mapper = sa_inspect(model_class)
+        primary_key = mapper.primary_key
+        if len(primary_key) != 1:
+            return like
+
+        index = await self._get_index(model_class, field)
+        candidates = index.candidates(value)
+        if candidates is None or len(candidates) > _MAX_CANDIDATES:
+            return like
+        if not candidates:
+            return false()
+        return and_(primary_key[0].in_(candidates), like)
+
+    async def _get_index(self, model_class: Any, field: str) -> _FieldIndex:
+        """获取字段的倒排索引（失效或过期时重建）"""
+        table_name = sa_inspect(model_class).local_table.name
+        key = (table_name, field)
+        index = self.indexes.get(key)
+        if index is None:
+            install_search_index()
+            index = self.indexes.setdefault(key, _FieldIndex())
+            self.table_fields.setdefault(table_name, set()).add(field)
+
+        if index.stale or time.monotonic() - index.built_at > _REBUILD_SECONDS:
+            async with index.lock:
+                if index.stale or time.monotonic() - index.built_at > _REBUILD_SECONDS:
+                    await self._build(model_class, field, index)
+        return index
+
+    @staticmethod
+    async def _build(model_class: Any, field: str, index: _FieldIndex) -> None:
+        """读取字段的全部值建立倒排索引"""
+        started = time.perf_counter()
+        primary_key = sa_inspect(model_class).primary_key[0]
+        engine = get_async_db_engine(get_model_connection(model_class))
+
+        # 先标记为有效，建立期间的批量写入会再次标记失效
+        index.stale = False
+        index.building = postings = {}
+        try:
+            async with engine.connect() as conn:
+                result = await conn.stream(
+                    select(primary_key, getattr(model_class, field))
+                )
+                async for row_id, value in result:
+                    _add_posting(postings, row_id, value)
+        except Exception:
+            index.stale = True
+            raise
+        finally:
+            index.building = None
+
+        index.postings = postings
+        index.built_at = time.monotonic()
+        logger.debug(
+            f"倒排索引已建立 - {sa_inspect(model_class).local_table.name}.{field}, "
+            f"耗时 {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def invalidate(self, table_name: str | None = None) -> None:
+        """使倒排索引失效（下次搜索时重建），table_name 为 None 时全部失效"""
+        for (table, _), index in self.indexes.items():
+            if table_name is None or table == table_name:
+                index.stale = True
+
+    def apply(self, table_name: str, row_id: Any, values: dict[str, Any]) -> None:
+        """把已提交的新增 / 修改写入倒排索引"""
+        for field, value in values.items():
+            index = self.indexes.get((table_name, field))
+            if index is not None:
+                index.add(row_id, value)
+
+
+_inverted_index = InvertedIndexBackend()
+_contains = SearchBackend()
+_prefix = PrefixSearchBackend()
+_mysql_fulltext = MySQLFulltextBackend()
+
+_installed = False
+
+
+def get_search_backend(model_class: Any, mode: str = SEARCH_CONTAINS) -> SearchBackend:
+    """
+    获取搜索实现
+
+    Args:
+        model_class: 模型类（全文搜索按模型所在连接的数据库选择实现）
+        mode: 搜索模式，contains / prefix / fulltext
+
+    Returns:
+        SearchBackend: 搜索实现
+
+    Raises:
+        ValueError: 搜索模式不支持
+    """
+    if mode == SEARCH_CONTAINS:
+        return _contains
+    if mode == SEARCH_PREFIX:
+        return _prefix
+    if mode != SEARCH_FULLTEXT:
+        raise ValueError(f"不支持的搜索模式: {mode}")
+
+    if not Config.get("database.fulltext_search_enabled", False):
+        return _contains
+    dialect = get_db_engine(get_model_connection(model_class)).dialect.name
+    if dialect in ("mysql", "mariadb"):
+        return _mysql_fulltext
+    if dialect == "sqlite":
+        return _inverted_index
+    return _contains
+
+
+async def search_condition(
+    model_class: Any, field: str, value: str, mode: str = SEARCH_CONTAINS
+) -> Any:
+    """
+    构建文本搜索条件
+
+    Args:
+        model_class: 模型类
+        field: 字段名
+        value: 关键词（已去除首尾空白）
+        mode: 搜索模式，contains / prefix / fulltext
+
+    Returns:
+        SQLAlchemy 条件表达式
+    """
+    return await get_search_backend(model_class, mode).condition(
+        model_class, field, value
+    )
+
+
+def clear_search_index(table_name: str | None = None) -> None:
+    """
+    使进程内倒排索引失效（通过 text() 语句批量写入数据后调用）
+
+    Args:
+        table_name: 表名，None 表示全部
+    """
+    _inverted_index.invalidate(table_name)
+
+
+# ==================== 倒排索引增量更新 ====================
+
+
+def _on_after_flush(session: Session, flush_context: Any) -> None:
+    """记录本次 flush 新增 / 修改的、建立了倒排索引的字段值（提交后再写入索引）"""
+    table_fields = _inverted_index.table_fields
+    if not table_fields:
+        return
+    for instance in (*session.new, *session.dirty):
+        mapper = sa_inspect(instance).mapper
+        table_name = mapper.local_table.name
+        fields = table_fields.get(table_name)
+        if not fields or len(mapper.primary_key) != 1:
+            continue
+        # 新增记录在 after_flush 时还没有 identity，直接读取主键属性
+        row_id = mapper.primary_key_from_instance(instance)[0]
+        values = {field: getattr(instance, field, None) for field in fields}
+        session.info.setdefault(_PENDING_INDEX_KEY, []).append(
+            (table_name, row_id, values)
+        )
+
+
+def _on_after_commit(session: Session) -> None:
+    for table_name, row_id, values in session.info.pop(_PENDING_INDEX_KEY, []):
+        _inverted_index.apply(table_name, row_id, values)
+
+
+def _on_after_transaction_end(session: Session, transaction: Any) -> None:
+    """顶层事务结束（回滚）后丢弃未提交的记录"""
+    if transaction.parent is None:
+        session.info.pop(_PENDING_INDEX_KEY, None)
+
+
+def _on_do_orm_execute(orm_context: ORMExecuteState) -> None:
+    """批量 INSERT / UPDATE 语句无法逐条更新索引，使对应表的索引失效"""
+    if not (orm_context.is_insert or orm_context.is_update):
+        return
+    table_fields = _inverted_index.table_fields
+    mapper = orm_context.bind_mapper
+    if mapper is not None and mapper.local_table.name in table_fields:
+        _inverted_index.invalidate(mapper.local_table.name)
+
+
+def install_search_index() -> None:
+    """注册倒排索引增量更新事件（首次建立倒排索引时调用，重复调用无副作用）"""
+    global _installed
+
+    if _installed:
+        return
+
+    event.listen(Session, "after_flush", _on_after_flush)
+    event.listen(Session, "after_commit", _on_after_commit)
+    event.listen(Session, "after_transaction_end", _on_after_transaction_end)
+    event.listen(Session, "do_orm_execute", _on_do_orm_execute)
+    _installed = True
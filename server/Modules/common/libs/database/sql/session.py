@@ -2,20 +2,167 @@
 数据库会话管理
 
 负责创建和管理数据库会话，提供上下文管理器和依赖注入支持。
+只读会话（readonly=True）在配置了只读副本时读取副本，详见 replica 模块；
+声明了 __bind_key__ 或按模块配置了连接的模型路由到对应连接，详见 routing 模块。
+
+请求级会话（RequestSessionMiddleware）：同一请求内的 get_async_session() 默认加入同一个会话，
+一个请求只使用一个连接和一个事务，每个 async with 块对应一个 SAVEPOINT，响应发送前统一提交；
+需要独立事务时使用 get_async_session(new=True)。
 """
 
 import asyncio
+import threading
 import time
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
 from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any
 
 from fastapi import Depends
 from loguru import logger
+from sqlalchemy import Engine
 from sqlalchemy.exc import DisconnectionError, OperationalError
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
-from .engine import get_async_db_engine, get_db_engine
+from .engine import (
+    get_async_db_engine,
+    get_async_replica_engine,
+    get_db_engine,
+    get_replica_engine,
+)
+from .query_cache import SESSION_ASYNC_KEY, SESSION_ENABLED_KEY, install_query_cache
+from .replica import (
+    COMMITTED_WRITE_KEY,
+    SESSION_READONLY_KEY,
+    client_key_from_headers,
+    client_written_connections,
+    has_pending_write,
+    install_write_tracking,
+    is_pinned_to_primary,
+    load_client_writes,
+    mark_primary_write,
+    save_client_writes,
+    track_client_writes,
+)
+from .routing import get_model_connection
+
+# 会话 info 中的键：会话所属的连接名称、会话内路由到其他连接时使用的引擎
+SESSION_CONNECTION_KEY = "connection"
+_ROUTED_BINDS_KEY = "routed_binds"
+
+
+class RoutingSession(Session):
+    """
+    按模型路由连接的会话
+
+    模型指定了其他连接时，语句发送到该连接的引擎（只读会话使用该连接的副本），
+    同一会话内每个连接只选择一次引擎，保证同一事务使用同一个数据库连接。
+    注意：跨连接写入不是分布式事务，各连接依次提交。
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if mapper is not None:
+            name = get_model_connection(mapper)
+            if name and name != self.info.get(SESSION_CONNECTION_KEY):
+                routed = self.info.setdefault(_ROUTED_BINDS_KEY, {})
+                if name not in routed:
+                    routed[name] = db_session_manager.bind_for(
+                        name,
+                        readonly=self.info.get(SESSION_READONLY_KEY, False),
+                        is_async=self.info.get(SESSION_ASYNC_KEY, False),
+                    )
+                return routed[name]
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+class RequestSession:
+    """
+    请求级会话
+
+    会话在请求内首次调用 get_async_session() 时创建，请求结束（响应发送前）时提交并关闭。
+    只在创建它的异步任务中共享，请求内另开的任务（asyncio.gather 等）仍然使用独立会话，
+    避免多个任务并发使用同一个 AsyncSession。
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.session: AsyncSession | None = None
+        self.closed = False
+        self._task = asyncio.current_task()
+        self._after_commit: list[Callable[[], Awaitable[Any]]] = []
+
+    def joinable(self, name: str, readonly: bool) -> bool:
+        """
+        get_async_session 是否加入该会话
+
+        只读会话只有在请求事务中有未提交的写入时才加入（读到本请求的写入），否则读取副本。
+        """
+        if self.closed or name != self.name or asyncio.current_task() is not self._task:
+            return False
+        if readonly:
+            return self.session is not None and has_pending_write(
+                self.session.sync_session
+            )
+        return True
+
+    async def finish(self, commit: bool) -> None:
+        """
+        结束请求事务（重复调用无副作用）
+
+        Args:
+            commit: 是否提交，False 时回滚
+        """
+        if self.closed:
+            return
+        self.closed = True
+        session = self.session
+        callbacks, self._after_commit = self._after_commit, []
+        if session is None:
+            return
+        try:
+            if commit:
+                await session.commit()
+                DatabaseSessionManager._mark_writes(self.name, session.sync_session)
+            else:
+                await session.rollback()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+        if commit:
+            for callback in callbacks:
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.warning(f"请求事务提交后回调执行失败: {e}")
+
+    def after_commit(self, callback: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        登记请求事务提交后执行的回调（回滚时丢弃）
+
+        Args:
+            callback: 无参数的异步函数
+
+        Returns:
+            bool: 是否已登记，当前任务没有加入该会话时返回 False
+        """
+        if (
+            self.closed
+            or self.session is None
+            or asyncio.current_task() is not self._task
+        ):
+            return False
+        self._after_commit.append(callback)
+        return True
+
+
+# 当前请求的请求级会话
+_request_session: ContextVar[RequestSession | None] = ContextVar(
+    "db_request_session", default=None
+)
 
 
 class DatabaseSessionManager:
@@ -25,6 +172,10 @@ class DatabaseSessionManager:
         """初始化数据库会话管理器"""
         self._session_maker: dict[str, sessionmaker[Session]] = {}
         self._async_session_maker: dict[str, async_sessionmaker[AsyncSession]] = {}
+        # 写后读主库的时间窗口（秒）
+        self._read_your_writes_seconds = 5.0
+        # 延迟创建会话工厂时使用的锁
+        self._lock = threading.Lock()
 
     def init_session_maker(self) -> None:
         """
@@ -39,29 +190,82 @@ class DatabaseSessionManager:
 
         default_connection = Config.get("database.default", "mysql")
 
-        # 为默认连接创建会话工厂
+        # 注册 ORM 查询结果缓存事件
+        if Config.get("database.query_cache_enabled", False):
+            install_query_cache(
+                Config.get("database.query_cache_ttl", 300),
+                Config.get("database.query_cache_secret")
+                or Config.get("jwt.secret_key", ""),
+            )
+
+        # 注册写入跟踪事件（只读会话禁止写入、写后读主库）
+        install_write_tracking()
+        self._read_your_writes_seconds = Config.get(
+            "database.read_your_writes_seconds", 5.0
+        )
+
+        # 启动时只为默认连接创建会话工厂，其他连接在首次使用时创建
+        self._create_session_makers(default_connection)
+
+    def _create_session_makers(self, name: str) -> None:
+        """
+        创建连接的同步 / 异步会话工厂
+
+        Args:
+            name: 连接名称
+        """
         try:
             # 同步会话工厂
-            engine = get_db_engine(default_connection)
-            self._session_maker[default_connection] = sessionmaker(
+            engine = get_db_engine(name)
+            self._session_maker[name] = sessionmaker(
                 autocommit=False,
                 autoflush=False,
                 bind=engine,
                 future=True,
+                class_=RoutingSession,
+                info={SESSION_CONNECTION_KEY: name},
             )
 
             # 异步会话工厂
-            async_engine = get_async_db_engine(default_connection)
-            self._async_session_maker[default_connection] = async_sessionmaker(
+            async_engine = get_async_db_engine(name)
+            self._async_session_maker[name] = async_sessionmaker(
                 async_engine,
                 class_=AsyncSession,
+                sync_session_class=RoutingSession,
                 expire_on_commit=False,
+                # 标记为异步会话，查询缓存通过事件循环访问 Redis
+                info={SESSION_ASYNC_KEY: True, SESSION_CONNECTION_KEY: name},
             )
 
-            logger.info(f"数据库会话工厂 '{default_connection}' 初始化成功")
+            logger.info(f"数据库会话工厂 '{name}' 初始化成功")
 
         except Exception as e:
-            logger.error(f"初始化数据库会话工厂 '{default_connection}' 失败: {e}")
+            logger.error(f"初始化数据库会话工厂 '{name}' 失败: {e}")
+
+    def _ensure_session_makers(self, name: str) -> None:
+        """确保连接的会话工厂已创建（首次使用时创建）"""
+        if name in self._session_maker:
+            return
+        with self._lock:
+            if name not in self._session_maker:
+                self._create_session_makers(name)
+
+    def bind_for(self, name: str, readonly: bool, is_async: bool) -> Engine:
+        """
+        模型路由到其他连接时使用的引擎
+
+        Args:
+            name: 连接名称
+            readonly: 是否为只读会话（读取该连接的副本）
+            is_async: 是否为异步会话（返回异步引擎对应的同步引擎）
+
+        Returns:
+            Engine: 同步引擎
+        """
+        bind = self._replica_bind(name, readonly, 0, is_async)
+        if bind is None:
+            bind = get_async_db_engine(name) if is_async else get_db_engine(name)
+        return bind.sync_engine if is_async else bind
 
     def get_session_maker(self, name: str | None = None) -> sessionmaker[Session]:
         """
@@ -81,6 +285,7 @@ class DatabaseSessionManager:
 
             name = Config.get("database.default", "mysql")
 
+        self._ensure_session_makers(name)
         if name not in self._session_maker:
             raise ValueError(f"会话工厂 '{name}' 不存在")
 
@@ -107,36 +312,123 @@ class DatabaseSessionManager:
 
             name = Config.get("database.default", "mysql")
 
+        self._ensure_session_makers(name)
         if name not in self._async_session_maker:
             raise ValueError(f"异步会话工厂 '{name}' 不存在")
 
         return self._async_session_maker[name]
 
+    def _resolve_name(self, name: str | None) -> str:
+        """解析连接名称（None 表示默认连接）"""
+        if name is None:
+            from ...config import Config
+
+            name = Config.get("database.default", "mysql")
+        return name
+
+    def _replica_bind(
+        self, name: str, readonly: bool, attempt: int, is_async: bool
+    ) -> Engine | AsyncEngine | None:
+        """
+        只读会话使用的副本引擎
+
+        Args:
+            name: 连接名称
+            readonly: 是否为只读会话
+            attempt: 当前重试次数（重试时改为读取主库）
+            is_async: 是否为异步会话
+
+        Returns:
+            副本引擎，读取主库时返回 None
+        """
+        if not readonly or attempt > 0:
+            return None
+        if is_pinned_to_primary(name, self._read_your_writes_seconds):
+            return None
+        if is_async:
+            return get_async_replica_engine(name)
+        return get_replica_engine(name)
+
+    async def save_client_writes(self) -> None:
+        """把当前请求提交过写入、且配置了只读副本的连接记录到 Redis（同一客户端后续请求读取主库）"""
+        names = [
+            name
+            for name in client_written_connections()
+            if get_async_replica_engine(name) is not None
+        ]
+        await save_client_writes(names, self._read_your_writes_seconds)
+
+    @staticmethod
+    def _mark_writes(name: str, session: Session) -> None:
+        """会话提交过写入时，记录会话使用过的所有连接（写后读主库）"""
+        if session.info.pop(COMMITTED_WRITE_KEY, False):
+            for connection in (name, *session.info.get(_ROUTED_BINDS_KEY, ())):
+                mark_primary_write(connection)
+
+    @staticmethod
+    def _session_kwargs(bind: Any, readonly: bool) -> dict[str, Any]:
+        """会话工厂参数：副本引擎和只读标记"""
+        kwargs: dict[str, Any] = {}
+        if bind is not None:
+            kwargs["bind"] = bind
+        if readonly:
+            kwargs["info"] = {SESSION_READONLY_KEY: True}
+        return kwargs
+
     @asynccontextmanager
     async def get_async_session(
         self,
         name: str | None = None,
         max_retries: int = 2,
+        query_cache: bool = False,
+        readonly: bool = False,
+        new: bool = False,
     ) -> AsyncGenerator[AsyncSession, None]:
         """
         获取异步数据库会话（上下文管理器）
 
+        请求内默认加入请求级会话（见 RequestSessionMiddleware），退出时释放 SAVEPOINT，
+        请求结束时统一提交；开启查询缓存或 new=True 时使用独立会话，退出时提交。
+
         Args:
             name: 连接名称，如果为 None 则使用默认连接
             max_retries: 最大重试次数，默认为2次
+            query_cache: 是否缓存会话内的查询结果（需开启 DB_QUERY_CACHE_ENABLED）
+            readonly: 是否为只读会话（配置了只读副本时读取副本，会话内禁止写入）
+            new: 是否使用独立会话（独立事务，不加入请求级会话）
 
         Yields:
             AsyncSession: 异步数据库会话
         """
+        name = self._resolve_name(name)
+        request_session = _request_session.get()
+        if (
+            not new
+            and not query_cache
+            and request_session is not None
+            and request_session.joinable(name, readonly)
+        ):
+            async with self._join_request_session(request_session) as session:
+                yield session
+            return
+
         session_maker = self.get_async_session_maker(name)
         last_exception = None
 
+        if readonly and get_async_replica_engine(name) is not None:
+            await load_client_writes(name)
+
         for attempt in range(max_retries + 1):
             try:
-                async with session_maker() as session:
+                bind = self._replica_bind(name, readonly, attempt, is_async=True)
+                async with session_maker(
+                    **self._session_kwargs(bind, readonly)
+                ) as session:
+                    session.sync_session.info[SESSION_ENABLED_KEY] = query_cache
                     try:
                         yield session
                         await session.commit()
+                        self._mark_writes(name, session.sync_session)
                         return  # 成功执行，退出函数
                     except (DisconnectionError, OperationalError) as e:
                         await session.rollback()
@@ -173,10 +465,96 @@ class DatabaseSessionManager:
         if last_exception:
             raise last_exception
 
+    @asynccontextmanager
+    async def _join_request_session(
+        self, request_session: RequestSession
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        加入请求级会话，每个 async with 块对应一个 SAVEPOINT
+
+        块内异常只回滚该块的写入（与独立会话的行为一致），请求内其他块的写入不受影响。
+        块内的 session.commit() / session.rollback() 只作用于该块的 SAVEPOINT：
+        commit 释放 SAVEPOINT（写入在请求结束时随请求事务提交），rollback 回滚该块
+        未释放的写入，之后的写入使用新的 SAVEPOINT。
+        """
+        if request_session.session is None:
+            session_maker = self.get_async_session_maker(request_session.name)
+            request_session.session = session_maker()
+        session = request_session.session
+
+        savepoint = await session.begin_nested()
+
+        async def commit() -> None:
+            """释放当前 SAVEPOINT 并开启新的 SAVEPOINT"""
+            nonlocal savepoint
+            if savepoint.is_active:
+                await savepoint.commit()
+            savepoint = await session.begin_nested()
+
+        async def rollback() -> None:
+            """回滚当前 SAVEPOINT 并开启新的 SAVEPOINT"""
+            nonlocal savepoint
+            if savepoint.is_active:
+                await savepoint.rollback()
+            savepoint = await session.begin_nested()
+
+        # 嵌套加入时保存外层块的映射，退出时恢复
+        previous = {
+            attr: session.__dict__[attr]
+            for attr in ("commit", "rollback")
+            if attr in session.__dict__
+        }
+        session.commit = commit
+        session.rollback = rollback
+        try:
+            yield session
+            if savepoint.is_active:
+                await savepoint.commit()
+        except Exception as e:
+            if savepoint.is_active:
+                await savepoint.rollback()
+            logger.error(f"数据库会话异常: {e}")
+            raise
+        finally:
+            for attr in ("commit", "rollback"):
+                if attr in previous:
+                    setattr(session, attr, previous[attr])
+                else:
+                    delattr(session, attr)
+
+    @asynccontextmanager
+    async def request_session(
+        self, name: str | None = None
+    ) -> AsyncGenerator[RequestSession, None]:
+        """
+        开启请求级会话（上下文管理器）
+
+        上下文内的 get_async_session() 加入同一个会话，正常退出时提交，异常时回滚。
+        HTTP 请求由 RequestSessionMiddleware 开启，Celery 任务、脚本可以直接使用。
+
+        Args:
+            name: 连接名称，如果为 None 则使用默认连接
+
+        Yields:
+            RequestSession: 请求级会话
+        """
+        request_session = RequestSession(self._resolve_name(name))
+        token = _request_session.set(request_session)
+        try:
+            yield request_session
+        except BaseException:
+            await request_session.finish(commit=False)
+            raise
+        else:
+            await request_session.finish(commit=True)
+        finally:
+            _request_session.reset(token)
+
     def get_db_session(
         self,
         name: str | None = None,
         max_retries: int = 2,
+        readonly: bool = False,
     ) -> AsyncGenerator[AsyncSession, None]:
         """
         FastAPI 依赖注入：获取异步数据库会话
@@ -184,20 +562,27 @@ class DatabaseSessionManager:
         Args:
             name: 连接名称，如果为 None 则使用默认连接
             max_retries: 最大重试次数，默认为2次
+            readonly: 是否为只读会话（配置了只读副本时读取副本）
 
         Returns:
             AsyncGenerator[AsyncSession, None]: 异步数据库会话
         """
 
         async def _get_session() -> AsyncGenerator[AsyncSession, None]:
-            async with self.get_async_session(name, max_retries) as session:
+            async with self.get_async_session(
+                name, max_retries, readonly=readonly
+            ) as session:
                 yield session
 
         return Depends(_get_session)
 
     @contextmanager
     def get_sync_session(
-        self, name: str | None = None, max_retries: int = 2
+        self,
+        name: str | None = None,
+        max_retries: int = 2,
+        query_cache: bool = False,
+        readonly: bool = False,
     ) -> Generator[Session, None, None]:
         """
         获取同步数据库会话（上下文管理器）
@@ -205,19 +590,25 @@ class DatabaseSessionManager:
         Args:
             name: 连接名称，如果为 None 则使用默认连接
             max_retries: 最大重试次数，默认为2次
+            query_cache: 是否缓存会话内的查询结果（需开启 DB_QUERY_CACHE_ENABLED）
+            readonly: 是否为只读会话（配置了只读副本时读取副本，会话内禁止写入）
 
         Yields:
             Session: 同步数据库会话
         """
+        name = self._resolve_name(name)
         session_maker = self.get_session_maker(name)
         last_exception = None
 
         for attempt in range(max_retries + 1):
             try:
-                with session_maker() as session:
+                bind = self._replica_bind(name, readonly, attempt, is_async=False)
+                with session_maker(**self._session_kwargs(bind, readonly)) as session:
+                    session.info[SESSION_ENABLED_KEY] = query_cache
                     try:
                         yield session
                         session.commit()
+                        self._mark_writes(name, session)
                         return  # 成功执行，退出函数
                     except (DisconnectionError, OperationalError) as e:
                         session.rollback()
@@ -281,23 +672,128 @@ def get_async_session_maker(
 async def get_async_session(
     name: str | None = None,
     max_retries: int = 2,
+    query_cache: bool = False,
+    readonly: bool = False,
+    new: bool = False,
 ) -> AsyncGenerator[AsyncSession, None]:
     """获取异步数据库会话（函数接口）"""
-    async with db_session_manager.get_async_session(name, max_retries) as session:
+    async with db_session_manager.get_async_session(
+        name, max_retries, query_cache, readonly, new
+    ) as session:
         yield session
 
 
+@asynccontextmanager
+async def request_session(
+    name: str | None = None,
+) -> AsyncGenerator[RequestSession, None]:
+    """开启请求级会话（函数接口）"""
+    async with db_session_manager.request_session(name) as session:
+        yield session
+
+
+def after_request_commit(callback: Callable[[], Awaitable[Any]]) -> bool:
+    """
+    请求事务提交后执行回调（如再次失效缓存，避免提交前被其他请求用旧数据回填）
+
+    Args:
+        callback: 无参数的异步函数
+
+    Returns:
+        bool: 是否已登记，不在请求级会话中时返回 False（写入已经提交，调用方无需再执行）
+    """
+    request_session = _request_session.get()
+    return request_session is not None and request_session.after_commit(callback)
+
+
 def get_db_session(
-    name: str | None = None, max_retries: int = 2
+    name: str | None = None, max_retries: int = 2, readonly: bool = False
 ) -> AsyncGenerator[AsyncSession, None]:
     """FastAPI 依赖注入：获取异步数据库会话（函数接口）"""
-    return db_session_manager.get_db_session(name, max_retries)
+    return db_session_manager.get_db_session(name, max_retries, readonly)
 
 
 @contextmanager
 def get_sync_session(
-    name: str | None = None, max_retries: int = 2
+    name: str | None = None,
+    max_retries: int = 2,
+    query_cache: bool = False,
+    readonly: bool = False,
 ) -> Generator[Session, None, None]:
     """获取同步数据库会话（函数接口）"""
-    with db_session_manager.get_sync_session(name, max_retries) as session:
+    with db_session_manager.get_sync_session(
+        name, max_retries, query_cache, readonly
+    ) as session:
         yield session
+
+
+class RequestSessionMiddleware:
+    """
+    请求级会话中间件（ASGI）
+
+    为每个 HTTP 请求开启请求级会话：请求内的 get_async_session() 共享一个连接和事务，
+    在响应头发送前提交（提交失败时返回 500，不会出现响应成功但数据未保存的情况），
+    请求处理抛出异常时回滚。没有访问数据库的请求不会占用连接。
+
+    同时按客户端记录请求提交过的写入（见 replica 模块），
+    同一客户端在写后读窗口内的后续请求中，只读会话仍然读取主库。
+
+    使用示例：
+        app.add_middleware(RequestSessionMiddleware)
+    """
+
+    def __init__(self, app: Any, enabled: bool = True):
+        self.app = app
+        self.enabled = enabled
+
+    @staticmethod
+    def _client_key(scope: Any) -> str | None:
+        """客户端标识（访问令牌，没有令牌时为客户端 IP）"""
+        authorization = None
+        for key, value in scope.get("headers") or ():
+            if key == b"authorization":
+                authorization = value.decode("latin-1")
+                break
+        client = scope.get("client")
+        return client_key_from_headers(authorization, client[0] if client else None)
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_client_writes(self._client_key(scope)):
+            if not self.enabled:
+
+                async def send_plain(message: Any) -> None:
+                    if message["type"] == "http.response.start":
+                        await db_session_manager.save_client_writes()
+                    await send(message)
+
+                await self.app(scope, receive, send_plain)
+                return
+
+            async with request_session() as current:
+                commit_failed = False
+
+                async def send_wrapper(message: Any) -> None:
+                    nonlocal commit_failed
+                    if commit_failed:
+                        return
+                    if message["type"] == "http.response.start":
+                        try:
+                            await current.finish(commit=True)
+                        except Exception as e:
+                            from ...responses import error
+
+                            logger.error(f"请求事务提交失败: {e}")
+                            commit_failed = True
+                            response = error(
+                                message="数据保存失败，请稍后重试", code=500
+                            )
+                            await response(scope, receive, send)
+                            return
+                        await db_session_manager.save_client_writes()
+                    await send(message)
+
+                await self.app(scope, receive, send_wrapper)
@@ -244,7 +244,13 @@ class BaseTableModel(BaseModel):
                         # 添加前缀到索引名称
                         new_name = f"idx_{prefix}{index_name}"
                         # 创建新的 Index 对象
-                        new_index = Index(new_name, *item.expressions)
+                        # 保留唯一约束和方言参数（如 MySQL FULLTEXT 索引的 mysql_prefix）
+                        new_index = Index(
+                            new_name,
+                            *item.expressions,
+                            unique=item.unique,
+                            **item.dialect_kwargs,
+                        )
                         processed_items.append(new_index)
                     else:
                         # 不需要添加前缀，直接使用原索引
@@ -5,27 +5,99 @@
 
 import json
 import re
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
 from typing import Any
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from fastapi_pagination import Page
+from sqlalchemy import inspect, update
 from sqlmodel import select
 
+from Modules.common.libs.cache import async_invalidate_tags
 from Modules.common.libs.config.config import Config
-from Modules.common.libs.database.sql.session import get_async_session
+from Modules.common.libs.database.sql.bulk import (
+    bulk_delete,
+    bulk_update,
+    bulk_upsert,
+    missing_ids,
+)
+from Modules.common.libs.database.sql.counting import COUNT_AUTO, count_rows
+from Modules.common.libs.database.sql.pagination import CursorPage, keyset_paginate
+from Modules.common.libs.database.sql.search import (
+    SEARCH_CONTAINS,
+    SEARCH_FULLTEXT,
+    SEARCH_PREFIX,
+    search_condition,
+)
+from Modules.common.libs.database.sql.session import (
+    after_request_commit,
+    get_async_session,
+)
 from Modules.common.libs.responses.response import error, success
 from Modules.common.libs.time.utils import now
+from Modules.common.libs.validation.pagination_validator import CustomParams
 from Modules.common.utils.url_helper import get_base_url
 
 
 class BaseService:
     """基础服务类，所有服务类的基类"""
 
+    # common_add / common_update / common_destroy / common_destroy_all
+    # 成功后默认失效的缓存标签（配合 @cached 使用）
+    cache_tags: tuple[str, ...] = ()
+
+    # paginate_with_count 的总数统计策略：exact / cached / estimated / auto
+    count_strategy: str = COUNT_AUTO
+
+    # apply_search_filters 中使用全文搜索的文本字段（MySQL ngram FULLTEXT 索引 / SQLite 倒排索引）
+    fulltext_fields: tuple[str, ...] = ()
+
+    # apply_search_filters 中使用前缀匹配（LIKE '关键词%'，可使用 B-tree 索引）的文本字段
+    prefix_fields: tuple[str, ...] = ()
+
     def __init__(self):
         """初始化基础服务"""
         pass
 
+    async def invalidate_cache_tags(self, tags: Iterable[str] | None = None) -> None:
+        """
+        使缓存标签失效
+
+        Args:
+            tags: 标签列表，None 表示使用类属性 cache_tags
+        """
+        tags = self.cache_tags if tags is None else tuple(tags)
+        if tags:
+            await async_invalidate_tags(*tags)
+            # 请求级会话中写入在请求结束时才提交，提交前其他请求可能用旧数据回填缓存，提交后再失效一次
+            after_request_commit(lambda: async_invalidate_tags(*tags))
+
+    async def text_search_condition(
+        self, model_class: Any, field: str, value: str
+    ) -> Any:
+        """
+        构建文本搜索条件
+
+        字段在 fulltext_fields 中时使用全文搜索，在 prefix_fields 中时使用前缀匹配，
+        否则使用 LIKE '%关键词%'。
+
+        Args:
+            model_class: 模型类
+            field: 字段名
+            value: 关键词（已去除首尾空白）
+
+        Returns:
+            SQLAlchemy 条件表达式
+        """
+        if field in self.fulltext_fields:
+            mode = SEARCH_FULLTEXT
+        elif field in self.prefix_fields:
+            mode = SEARCH_PREFIX
+        else:
+            mode = SEARCH_CONTAINS
+        return await search_condition(model_class, field, value, mode)
+
     async def apply_search_filters(
         self, query, model_class, search_params: dict[str, Any]
     ) -> Any:
@@ -36,7 +108,7 @@ class BaseService:
             query: SQLAlchemy查询对象
             model_class: 模型类
             search_params: 搜索参数字典，包含以下可能的键：
-                - text_fields: 自定义文本搜索字段列表
+                - text_fields / fuzzy_fields: 文本搜索字段列表（搜索模式见 text_search_condition）
                 - exact_fields: 精确匹配字段字典
                 - range_fields: 范围字段字典
 
@@ -44,14 +116,18 @@ class BaseService:
             SQLAlchemy查询对象
         """
         # 处理文本搜索字段（模糊匹配）
-        text_fields = search_params.get("text_fields", [])
+        text_fields = [
+            *search_params.get("text_fields", []),
+            *search_params.get("fuzzy_fields", []),
+        ]
 
         # 应用文本搜索
         for field in text_fields:
             value = search_params.get(field)
             if value and value.strip():
-                field_attr = getattr(model_class, field)
-                query = query.filter(field_attr.like(f"%{value.strip()}%"))
+                query = query.filter(
+                    await self.text_search_condition(model_class, field, value.strip())
+                )
 
         # 处理精确匹配字段
         exact_fields = search_params.get("exact_fields", {})
@@ -77,6 +153,58 @@ class BaseService:
 
         return query
 
+    @staticmethod
+    def _split_sort(sort_param: str) -> tuple[str, str]:
+        """解析 "字段 方向" 格式的排序参数，例如 "id desc" """
+        return sort_param.split(" ", 1) if " " in sort_param else (sort_param, "asc")
+
+    @classmethod
+    def _resolve_sort(cls, model_class, sort_param: Any) -> list[tuple[str, bool]]:
+        """
+        解析排序参数（字段必须是模型的属性，否则使用ID倒序）
+
+        字典格式按键的顺序依次排序，例如 {"record_date":"desc","id":"asc"}
+        表示按日期倒序、同一天内按 ID 正序；模型不存在的字段被忽略。
+
+        Args:
+            model_class: 模型类
+            sort_param: 排序参数，可以是JSON字符串或字典，例如 {"id":"desc"} 或 "id desc"
+
+        Returns:
+            [(排序字段, 是否倒序), ...]，模型没有可用的排序字段时返回空列表
+        """
+        sort_items: list[tuple[Any, Any]] = []
+        if sort_param:
+            try:
+                # 尝试解析JSON格式的排序参数，例如 {"id":"desc"}
+                sort_data = (
+                    json.loads(sort_param)
+                    if isinstance(sort_param, str)
+                    else sort_param
+                )
+
+                if isinstance(sort_data, dict):
+                    # 按字典顺序获取所有排序字段和方向
+                    sort_items = list(sort_data.items())
+                else:
+                    # 如果不是字典，保持原来的解析方式作为后备
+                    sort_items = [cls._split_sort(sort_param)]
+            except (json.JSONDecodeError, TypeError):
+                # 如果JSON解析失败，使用原来的解析方式
+                sort_items = [cls._split_sort(sort_param)]
+
+        # 验证排序字段是否存在，都不存在时默认使用ID倒序
+        sorts = [
+            (field, str(direction).lower() == "desc")
+            for field, direction in sort_items
+            if isinstance(field, str) and field and hasattr(model_class, field)
+        ]
+        if sorts:
+            return sorts
+        if hasattr(model_class, "id"):
+            return [("id", True)]
+        return []
+
     async def apply_sorting(self, query, model_class, sort_param: Any) -> Any:
         """
         应用排序功能
@@ -84,52 +212,111 @@ class BaseService:
         Args:
             query: SQLAlchemy查询对象
             model_class: 模型类
-            sort_param: 排序参数，可以是JSON字符串或字典，例如 {"id":"desc"} 或 "id desc"
+            sort_param: 排序参数，可以是JSON字符串或字典，例如 {"id":"desc"} 或 "id desc"，
+                字典包含多个字段时按顺序依次排序
 
         Returns:
             SQLAlchemy查询对象
         """
-        if not sort_param:
-            # 如果没有排序参数，默认使用ID倒序
-            if hasattr(model_class, "id"):
-                query = query.order_by(model_class.id.desc())
-            return query
+        for sort_field, descending in self._resolve_sort(model_class, sort_param):
+            column = getattr(model_class, sort_field)
+            query = query.order_by(column.desc() if descending else column.asc())
+        return query
 
-        try:
-            # 尝试解析JSON格式的排序参数，例如 {"id":"desc"}
-            sort_data = (
-                json.loads(sort_param) if isinstance(sort_param, str) else sort_param
-            )
+    async def paginate_with_count(
+        self,
+        session: Any,
+        query: Any,
+        model_class: Any,
+        page: int = 1,
+        size: int = 20,
+        count_strategy: str | None = None,
+    ) -> tuple[Page, bool]:
+        """
+        分页查询，按统计策略获取总数（大表不必每次执行 COUNT(*)）
 
-            if isinstance(sort_data, dict):
-                # 从字典中获取排序字段和方向
-                sort_field = list(sort_data.keys())[0]
-                sort_direction = sort_data[sort_field]
-            else:
-                # 如果不是字典，保持原来的解析方式作为后备
-                sort_field, sort_direction = (
-                    sort_param.split(" ", 1)
-                    if " " in sort_param
-                    else (sort_param, "asc")
-                )
-        except (json.JSONDecodeError, TypeError):
-            # 如果JSON解析失败，使用原来的解析方式
-            sort_field, sort_direction = (
-                sort_param.split(" ", 1) if " " in sort_param else (sort_param, "asc")
-            )
+        当前页不满一页时直接由偏移量得出准确总数，不再统计。
 
-        # 验证排序字段是否存在
-        if hasattr(model_class, sort_field):
-            if sort_direction.lower() == "desc":
-                query = query.order_by(getattr(model_class, sort_field).desc())
-            else:
-                query = query.order_by(getattr(model_class, sort_field).asc())
+        Args:
+            session: 异步会话
+            query: 已应用筛选和排序的查询对象（select(模型)）
+            model_class: 模型类
+            page: 页码
+            size: 每页记录数
+            count_strategy: 总数统计策略，None 表示使用类属性 count_strategy
+
+        Returns:
+            tuple[Page, bool]: (分页结果, 总数是否准确)
+        """
+        params = CustomParams(page=page, size=size)
+        offset = (page - 1) * size
+        result = await session.execute(query.limit(size).offset(offset))
+        items = list(result.scalars().all())
+
+        if len(items) < size and (items or page == 1):
+            total, exact = offset + len(items), True
         else:
-            # 如果排序字段不存在，默认使用ID倒序
-            if hasattr(model_class, "id"):
-                query = query.order_by(model_class.id.desc())
+            total, exact = await count_rows(
+                session, query, model_class, count_strategy or self.count_strategy
+            )
+            # 估算值或缓存的总数小于已读取的记录数时以已读取的为准
+            if items:
+                total = max(total, offset + len(items))
 
-        return query
+        return Page.create(items, params, total=total), exact
+
+    async def cursor_paginate(
+        self,
+        session: Any,
+        query: Any,
+        model_class: Any,
+        sort_param: Any,
+        cursor: str | None = None,
+        size: int = 20,
+        with_total: bool = False,
+    ) -> CursorPage:
+        """
+        游标分页（按 (排序字段, id) 定位下一页，第 N 页与第 1 页的查询代价相同）
+
+        排序参数与 apply_sorting 相同（字段必须是模型的属性），
+        query 不需要再调用 apply_sorting。排序参数只能包含一个排序字段，
+        可以再附加 id 指定同值记录的顺序，例如 {"record_date":"desc","id":"asc"}。
+
+        Args:
+            session: 异步会话
+            query: 已应用筛选条件的查询对象
+            model_class: 模型类（必须有 id 字段）
+            sort_param: 排序参数，例如 {"total_market_cap":"desc"}
+            cursor: 上一页返回的 next_cursor，None 或空字符串表示第一页
+            size: 每页记录数
+            with_total: 是否统计总记录数（额外执行一次 COUNT 查询）
+
+        Returns:
+            CursorPage: 分页结果，to_dict() 转换为响应数据
+
+        Raises:
+            ValueError: 游标无效，与当前排序条件不一致，排序字段超过一个，或每页记录数超出范围
+        """
+        sorts = self._resolve_sort(model_class, sort_param) or [("id", True)]
+        sort_field, descending = sorts[0]
+        id_descending = descending
+        # 首个排序字段为 id 时后续字段不影响顺序（id 唯一）
+        if sort_field != "id" and len(sorts) > 1:
+            if sorts[1][0] != "id" or len(sorts) > 2:
+                raise ValueError("游标分页只支持一个排序字段，可附加 id 的排序方向")
+            id_descending = sorts[1][1]
+        return await keyset_paginate(
+            session,
+            query,
+            sort_field,
+            getattr(model_class, sort_field),
+            model_class.id,
+            descending,
+            cursor=cursor,
+            size=size,
+            with_total=with_total,
+            id_descending=id_descending,
+        )
 
     async def common_add(
         self,
@@ -139,12 +326,11 @@ class BaseService:
             [dict[str, Any], Any], Awaitable[tuple[dict[str, Any], Any] | JSONResponse]
         ]
         | None = None,
-        post_operation_callback: Callable[
-            [Any, dict[str, Any], Any], Awaitable[None]
-        ]
+        post_operation_callback: Callable[[Any, dict[str, Any], Any], Awaitable[None]]
         | None = None,
         success_message: str = "添加成功",
         error_message: str = "添加失败",
+        invalidate_tags: Iterable[str] | None = None,
     ) -> JSONResponse:
         """通用添加方法
 
@@ -155,6 +341,7 @@ class BaseService:
             post_operation_callback: 后置操作回调函数，接收instance、data和session参数（可选）
             success_message: 成功时的返回消息
             error_message: 失败时的返回消息
+            invalidate_tags: 成功后失效的缓存标签，None 表示使用类属性 cache_tags
 
         Returns:
             JSONResponse: 操作结果
@@ -180,6 +367,7 @@ class BaseService:
             session.add(instance)
             await session.commit()
             await session.refresh(instance)
+            await self.invalidate_cache_tags(invalidate_tags)
 
             # 执行后置操作回调（如果提供）
             if post_operation_callback:
@@ -198,12 +386,11 @@ class BaseService:
         ]
         | None = None,
         field_update_callback: Callable[[Any, dict[str, Any]], None] | None = None,
-        post_operation_callback: Callable[
-            [Any, dict[str, Any], Any], Awaitable[None]
-        ]
+        post_operation_callback: Callable[[Any, dict[str, Any], Any], Awaitable[None]]
         | None = None,
         success_message: str = "更新成功",
         error_message: str = "记录不存在",
+        invalidate_tags: Iterable[str] | None = None,
     ) -> JSONResponse:
         """通用更新方法
 
@@ -216,10 +403,29 @@ class BaseService:
             post_operation_callback: 后置操作回调函数，接收instance、data和session参数（可选）
             success_message: 成功时的返回消息
             error_message: 失败时的返回消息
+            invalidate_tags: 成功后失效的缓存标签，None 表示使用类属性 cache_tags
 
         Returns:
             JSONResponse: 操作结果
         """
+        # 不需要记录对象的更新直接执行 UPDATE ... WHERE id = :id，不加载记录对象
+        # （不触发 ORM 事件和 @validates，需要时传入 field_update_callback）
+        column_values = (
+            self._column_values(model_class, data)
+            if field_update_callback is None and post_operation_callback is None
+            else None
+        )
+        if column_values is not None:
+            return await self._update_by_id(
+                id,
+                data,
+                model_class,
+                pre_operation_callback,
+                success_message,
+                error_message,
+                invalidate_tags,
+            )
+
         async with get_async_session() as session:
             # 查询记录是否存在
             existing_record = await session.execute(
@@ -254,6 +460,7 @@ class BaseService:
             # 提交事务
             await session.commit()
             await session.refresh(record)
+            await self.invalidate_cache_tags(invalidate_tags)
 
             # 执行后置操作回调（如果提供）
             if post_operation_callback:
@@ -275,6 +482,7 @@ class BaseService:
             Awaitable[Any],
         ]
         | None = None,
+        invalidate_tags: Iterable[str] | None = None,
     ) -> JSONResponse:
         """通用删除方法
 
@@ -283,6 +491,7 @@ class BaseService:
             model_class: 模型类
             pre_operation_callback: 前置操作回调函数（可选）
             post_operation_callback: 后置操作回调函数（可选）
+            invalidate_tags: 成功后失效的缓存标签，None 表示使用类属性 cache_tags
 
         Returns:
             JSONResponse: 操作结果
@@ -307,6 +516,7 @@ class BaseService:
             # 删除记录
             await session.delete(record)
             await session.commit()
+            await self.invalidate_cache_tags(invalidate_tags)
 
             # 执行后置操作回调（如果提供）
             if post_operation_callback:
@@ -328,6 +538,7 @@ class BaseService:
             Awaitable[Any],
         ]
         | None = None,
+        invalidate_tags: Iterable[str] | None = None,
     ) -> JSONResponse:
         """通用批量删除方法
 
@@ -336,25 +547,18 @@ class BaseService:
             model_class: 模型类
             pre_operation_callback: 前置操作回调函数（可选）
             post_operation_callback: 后置操作回调函数（可选）
+            invalidate_tags: 成功后失效的缓存标签，None 表示使用类属性 cache_tags
 
         Returns:
             JSONResponse: 操作结果
         """
         async with get_async_session() as session:
-            # 查询记录是否存在
-            existing_records = await session.execute(
-                select(model_class).where(model_class.id.in_(id_array))
-            )
-            records = existing_records.scalars().all()
-
-            if not records:
+            # 检查是否所有请求的ID都存在（只查询主键）
+            not_found = await missing_ids(session, model_class, id_array)
+            if len(not_found) == len(set(id_array)):
                 return error("没有找到可删除的记录")
-
-            # 检查是否所有请求的ID都存在
-            found_ids = [record.id for record in records]
-            missing_ids = [id for id in id_array if id not in found_ids]
-            if missing_ids:
-                return error(f"以下ID的记录不存在: {missing_ids}")
+            if not_found:
+                return error(f"以下ID的记录不存在: {not_found}")
 
             # 执行前置操作回调（如果提供）
             if pre_operation_callback:
@@ -364,16 +568,189 @@ class BaseService:
                     return pre_result
 
             # 批量删除记录
-            for record in records:
-                await session.delete(record)
+            deleted = await bulk_delete(session, model_class, id_array)
 
             await session.commit()
+            await self.invalidate_cache_tags(invalidate_tags)
 
             # 执行后置操作回调（如果提供）
             if post_operation_callback:
                 await post_operation_callback(id_array, session)
 
-            return success(None, message=f"成功删除{len(records)}条记录")
+            return success(None, message=f"成功删除{deleted}条记录")
+
+    async def bulk_destroy(
+        self, session: Any, model_class: type[Any], id_array: list[Any]
+    ) -> tuple[int, list[Any]]:
+        """
+        按 id 批量删除（集合式语句，由调用方提交事务和失效缓存）
+
+        Args:
+            session: 异步会话
+            model_class: 模型类
+            id_array: 要删除的记录ID列表
+
+        Returns:
+            tuple[int, list[Any]]: (删除的记录数, 不存在的ID列表)
+        """
+        not_found = await missing_ids(session, model_class, id_array)
+        skipped = set(not_found)
+        deleted = await bulk_delete(
+            session, model_class, [id for id in id_array if id not in skipped]
+        )
+        return deleted, not_found
+
+    async def bulk_update(
+        self,
+        session: Any,
+        model_class: type[Any],
+        rows: list[dict[str, Any]],
+        key: str = "id",
+    ) -> int:
+        """
+        按 key 批量更新（UPDATE ... CASE，由调用方提交事务和失效缓存）
+
+        模型有 updated_at 字段时同时更新为当前时间。
+
+        Args:
+            session: 异步会话
+            model_class: 模型类
+            rows: 更新数据，每条必须包含 key 字段
+            key: 定位记录的字段
+
+        Returns:
+            int: 匹配的记录数
+        """
+        if hasattr(model_class, "updated_at"):
+            timestamp = now()
+            rows = [{**row, "updated_at": timestamp} for row in rows]
+        return await bulk_update(session, model_class, rows, key=key)
+
+    async def bulk_upsert(
+        self,
+        session: Any,
+        model_class: type[Any],
+        rows: list[dict[str, Any]],
+        conflict_keys: list[str],
+        update_fields: list[str] | None = None,
+    ) -> tuple[int, int]:
+        """
+        批量插入，冲突时更新（由调用方提交事务和失效缓存）
+
+        模型有 created_at 字段时新记录使用当前时间，有 updated_at 字段时冲突更新为当前时间。
+
+        Args:
+            session: 异步会话
+            model_class: 模型类
+            rows: 插入数据，每条必须包含 conflict_keys 字段
+            conflict_keys: 冲突判断字段（唯一索引字段）
+            update_fields: 冲突时更新的字段，None 表示除冲突字段、主键和 created_at 外的所有字段
+
+        Returns:
+            tuple[int, int]: (新增条数, 更新条数)
+        """
+        timestamp = now()
+        if hasattr(model_class, "created_at"):
+            rows = [{"created_at": timestamp, **row} for row in rows]
+        update_values = (
+            {"updated_at": timestamp} if hasattr(model_class, "updated_at") else None
+        )
+        return await bulk_upsert(
+            session,
+            model_class,
+            rows,
+            conflict_keys,
+            update_fields=update_fields,
+            update_values=update_values,
+        )
+
+    @staticmethod
+    def _column_values(
+        model_class: type[Any], data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """
+        提取 data 中的模型字段（忽略模型没有的键）
+
+        Returns:
+            dict[str, Any] | None: 字段值，data 中包含关系等非字段属性时返回 None
+        """
+        mapper = inspect(model_class)
+        columns = {attr.key for attr in mapper.column_attrs}
+        values = {}
+        for key, value in data.items():
+            if key in columns:
+                values[key] = value
+            elif key in mapper.all_orm_descriptors:
+                return None
+        return values
+
+    @staticmethod
+    async def _exists_by_id(session: Any, model_class: type[Any], id: int) -> bool:
+        """记录是否存在（只查询 id）"""
+        return bool(
+            (
+                await session.execute(
+                    select(model_class.id).where(model_class.id == id)
+                )
+            ).first()
+        )
+
+    async def _update_by_id(
+        self,
+        id: int,
+        data: dict[str, Any],
+        model_class: type[Any],
+        pre_operation_callback: Callable[
+            [int, dict[str, Any], Any],
+            Awaitable[tuple[dict[str, Any], Any] | JSONResponse],
+        ]
+        | None,
+        success_message: str,
+        error_message: str,
+        invalidate_tags: Iterable[str] | None,
+    ) -> JSONResponse:
+        """
+        common_update 不需要记录对象时的实现（UPDATE 匹配 0 行表示记录不存在）
+
+        直接执行 UPDATE 语句，不加载记录对象，因此不触发 ORM 事件（before_update 等）
+        和 @validates 校验（字段的 onupdate 仍然生效）；依赖这些行为的更新需要传入 field_update_callback。
+        """
+        async with get_async_session() as session:
+            # 执行前置操作回调（如果提供）
+            if pre_operation_callback:
+                # 与加载记录的路径一致：记录存在时才执行回调（只查询 id，不加载记录）
+                if not await self._exists_by_id(session, model_class, id):
+                    return error(error_message)
+                pre_result = await pre_operation_callback(id, data, session)
+                # 如果返回的是JSONResponse，直接返回错误信息
+                if isinstance(pre_result, JSONResponse):
+                    return pre_result
+                # 否则，获取处理后的data和session
+                data, session = pre_result
+
+            values = self._column_values(model_class, data) or {}
+            values.pop("id", None)
+            if hasattr(model_class, "updated_at"):
+                values["updated_at"] = now()
+
+            if values:
+                result = await session.execute(
+                    update(model_class)
+                    .where(model_class.id == id)
+                    .values(values)
+                    .execution_options(synchronize_session=False)
+                )
+                found = result.rowcount > 0
+            else:
+                found = await self._exists_by_id(session, model_class, id)
+
+            if not found:
+                return error(error_message)
+
+            await session.commit()
+            await self.invalidate_cache_tags(invalidate_tags)
+
+            return success(None, message=success_message)
 
     def add_upload_path_prefix_to_html(
         self,
@@ -170,6 +170,13 @@ class ContentArticle(BaseTableModel, table=True):
         Index("idx_category_status", "category_id", "status"),
         Index("idx_topic_status", "topic_id", "status"),
         Index("idx_status_created", "status", "created_at"),
+        # 标题全文索引（ngram 解析器支持中文，用于 ArticleService 的标题搜索）
+        Index(
+            "ft_article_title",
+            "title",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
     )
 
     class Config:
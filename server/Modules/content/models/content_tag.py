@@ -7,7 +7,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, SmallInteger, String
+from sqlalchemy import Column, DateTime, Index, SmallInteger, String
 from sqlalchemy.dialects.mysql import INTEGER
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
@@ -102,6 +102,17 @@ class ContentTag(BaseTableModel, table=True):
         link_model=ContentArticleTag,
     )
 
+    # 索引
+    __table_args__ = (
+        # 名称全文索引（ngram 解析器支持中文，用于 TagService 的标签搜索）
+        Index(
+            "ft_tag_name",
+            "name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
+
     class Config:
         """Pydantic配置"""
 
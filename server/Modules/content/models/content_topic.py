@@ -7,7 +7,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, SmallInteger, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, SmallInteger, String, Text
 from sqlalchemy.dialects.mysql import INTEGER
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
@@ -210,6 +210,17 @@ class ContentTopic(BaseTableModel, table=True):
         back_populates="topic"
     )
 
+    # 索引
+    __table_args__ = (
+        # 标题全文索引（ngram 解析器支持中文，用于 TopicService 的标题搜索）
+        Index(
+            "ft_topic_title",
+            "title",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
+
     class Config:
         """Pydantic配置"""
 
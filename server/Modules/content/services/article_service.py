@@ -25,6 +25,9 @@ from Modules.content.models.content_topic import ContentTopic
 class ArticleService(BaseService):
     """Content文章服务 - 负责文章相关的业务逻辑"""
 
+    # 文章标题使用全文搜索
+    fulltext_fields = ("title",)
+
     def __init__(self):
         super().__init__()
 
@@ -39,7 +42,7 @@ class ArticleService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "updated_at", "published_at"]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，使用 selectinload 预加载关联数据，只加载需要的字段
             query = select(ContentArticle).options(
                 selectinload(ContentArticle.category).load_only(
@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlmodel import select
 
+from Modules.common.libs.cache import cached
 from Modules.common.libs.database.sql.session import get_async_session
 from Modules.common.libs.responses.response import error, success
 from Modules.common.libs.time.utils import format_datetime
@@ -20,6 +21,9 @@ from Modules.content.models.content_category import ContentCategory
 class CategoryService(BaseService):
     """Content文章分类服务 - 负责文章分类相关的业务逻辑"""
 
+    # 分类增删改后失效分类树缓存
+    cache_tags = ("content_category",)
+
     def __init__(self):
         super().__init__()
 
@@ -29,6 +33,13 @@ class CategoryService(BaseService):
         Args:
             status: 可选，1=只返回启用的分类，0=只返回禁用的分类，None=返回所有分类（默认）
         """
+        return success(await self._tree_data(status))
+
+    @cached(
+        ttl=3600, key="content_category:tree:{status}", tags=["content_category"]
+    )
+    async def _tree_data(self, status: int | None = None) -> list[dict[str, Any]]:
+        """查询并构建分类树（带缓存）"""
         async with get_async_session() as session:
             # 构建查询
             query = select(ContentCategory).order_by(ContentCategory.sort.asc())  # type: ignore
@@ -86,7 +97,7 @@ class CategoryService(BaseService):
             for node in tree_data:
                 remove_empty_children(node)
 
-            return success(jsonable_encoder(tree_data))
+            return jsonable_encoder(tree_data)
     """Content文章分类服务 - 负责文章分类相关的业务逻辑"""
 
     def __init__(self):
@@ -103,7 +114,7 @@ class CategoryService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "updated_at"]
 
-        async with get_async_session() as session:
+        async with get_async_session(query_cache=True, readonly=True) as session:
             # 构建基础查询
             query = select(ContentCategory)
             # 搜索
@@ -42,7 +42,7 @@ class PlatformAccountService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "updated_at", "last_verified"]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询
             query = select(ContentPlatformAccount)
             # 搜索
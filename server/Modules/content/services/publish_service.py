@@ -7,14 +7,12 @@ from typing import Any
 
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
 
 from Modules.common.libs.database.sql.session import get_async_session
 from Modules.common.libs.responses.response import error, success
 from Modules.common.libs.time.utils import format_datetime, now
-from Modules.common.libs.validation.pagination_validator import CustomParams
 from Modules.common.services.base_service import BaseService
 from Modules.content.models.content_article import ContentArticle
 from Modules.content.models.content_platform_account import ContentPlatformAccount
@@ -254,7 +252,7 @@ class PublishService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "completed_at"]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，使用 selectinload 预加载关联数据
             query = select(ContentPublishLog).options(
                 selectinload(ContentPublishLog.article).load_only(
@@ -295,8 +293,8 @@ class PublishService(BaseService):
                     query, ContentPublishLog, data.get("sort")
                 )
 
-            page_data = await paginate(
-                session, query, CustomParams(page=page, size=size)
+            page_data, total_exact = await self.paginate_with_count(
+                session, query, ContentPublishLog, page, size
             )
             items = []
             for log in page_data.items:
@@ -324,6 +322,7 @@ class PublishService(BaseService):
                         "page": page_data.page,
                         "size": page_data.size,
                         "pages": page_data.pages,
+                        "total_exact": total_exact,
                     }
                 )
             )
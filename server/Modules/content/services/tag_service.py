@@ -20,6 +20,9 @@ from Modules.content.models.content_tag import ContentTag
 class TagService(BaseService):
     """Content文章标签服务 - 负责文章标签相关的业务逻辑"""
 
+    # 标签名称使用全文搜索（列表筛选和 search 接口）
+    fulltext_fields = ("name",)
+
     def __init__(self):
         super().__init__()
 
@@ -34,7 +37,7 @@ class TagService(BaseService):
         # 应用范围筛选
         data["range_fields"] = ["created_at", "updated_at"]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询
             query = select(ContentTag)
             # 搜索
@@ -313,7 +316,7 @@ class TagService(BaseService):
 
         logger.info(f"[popular] 获取常用标签, limit={limit}, status={status}")
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 联表查询标签及其使用次数
             # 使用 LEFT JOIN 确保即使没有文章的标签也会被查出来
             # 然后按使用次数降序排序
@@ -383,15 +386,20 @@ class TagService(BaseService):
             f"[search] 搜索标签, keyword={keyword}, limit={limit}, status={status}"
         )
 
-        async with get_async_session() as session:
-            # 模糊搜索标签名称
+        async with get_async_session(readonly=True) as session:
+            # 搜索标签名称（全文搜索）
             query = (
                 select(ContentTag)
                 .where(ContentTag.status == status)
-                .where(ContentTag.name.contains(keyword))
                 .order_by(ContentTag.sort.asc(), ContentTag.created_at.desc())
                 .limit(limit)
             )
+            if keyword and keyword.strip():
+                query = query.where(
+                    await self.text_search_condition(
+                        ContentTag, "name", keyword.strip()
+                    )
+                )
 
             result = await session.execute(query)
             tags = result.scalars().all()
@@ -27,6 +27,9 @@ from Modules.content.services.publisher import ZhihuHandler
 class TopicService(BaseService):
     """Content话题服务 - 负责话题抓取和管理的业务逻辑"""
 
+    # 话题标题使用全文搜索
+    fulltext_fields = ("title",)
+
     def __init__(self):
         super().__init__()
 
@@ -195,7 +198,7 @@ class TopicService(BaseService):
         category_id_value = data.get("category_id")
         has_category_filter = False
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，使用关系映射加载 ContentCategory
             query = select(ContentTopic).options(
                 load_only(
@@ -660,16 +663,18 @@ class TopicService(BaseService):
                 else:
                     # 创建新子分类
                     try:
-                        child_category = ContentCategory(
-                            name=child_category_name,
-                            slug=child_slug,
-                            parent_id=parent_category.id,
-                            status=1,
-                            sort=999,
-                            created_at=now(),
-                            updated_at=now(),
-                        )
-                        session.add(child_category)
+                        # 在 SAVEPOINT 中插入，冲突时只回滚本次插入，不影响请求内其他写入
+                        async with session.begin_nested():
+                            child_category = ContentCategory(
+                                name=child_category_name,
+                                slug=child_slug,
+                                parent_id=parent_category.id,
+                                status=1,
+                                sort=999,
+                                created_at=now(),
+                                updated_at=now(),
+                            )
+                            session.add(child_category)
                         await session.commit()
                         await session.refresh(child_category)
                         child_is_new = True
@@ -683,8 +688,7 @@ class TopicService(BaseService):
                             logger.warning(
                                 f"[generate_and_update_category] 检测到并发插入冲突，尝试查询现有分类: {child_slug}"
                             )
-                            await session.rollback()
-                            # 重新查询
+                            # 插入所在的 SAVEPOINT 已回滚，重新查询
                             retry_result = await session.execute(
                                 select(ContentCategory).where(
                                     ContentCategory.slug == child_slug
@@ -704,6 +708,10 @@ class TopicService(BaseService):
                     f"[generate_and_update_category] 使用现有子分类: {child_category_name} (ID: {child_category.id})"
                 )
 
+        # 创建了新分类时失效分类树缓存（与 CategoryService.cache_tags 一致）
+        if parent_is_new or child_is_new:
+            await self.invalidate_cache_tags(("content_category",))
+
         # 6. 更新话题分类
         async with get_async_session() as session:
             result = await session.execute(
@@ -17,6 +17,10 @@ from fastapi.staticfiles import StaticFiles
 from Modules.admin.routers import main_router as admin_router
 from Modules.common.libs.app import lifespan
 from Modules.common.libs.config import Config, ConfigRegistry
+from Modules.common.libs.database.sql import (
+    QueryStatsMiddleware,
+    RequestSessionMiddleware,
+)
 from Modules.common.libs.exception import register_exception_handlers
 from Modules.common.libs.responses.response import success
 from Modules.content.routers import main_router as content_router
@@ -58,6 +62,14 @@ headers = Config.get("app.cors_headers")
 if allow_all:
     origins = ["*"]
 
+# 添加请求级会话 Middleware（同一请求内的 get_async_session() 共享一个连接和事务）
+app.add_middleware(
+    RequestSessionMiddleware, enabled=Config.get("database.request_session_enabled")
+)
+
+# 添加 SQL 统计 Middleware（慢查询、N+1 检测；调试模式下返回查询次数 / 耗时响应头）
+app.add_middleware(QueryStatsMiddleware, expose_headers=Config.get("app.debug"))
+
 # 添加 CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -65,6 +77,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=methods,
     allow_headers=headers,
+    # 调试模式下允许前端读取 SQL 统计响应头
+    expose_headers=["X-DB-Query-Count", "X-DB-Query-Time"]
+    if Config.get("app.debug")
+    else [],
 )
 
 
@@ -28,6 +28,10 @@ class QuantIndustryLogController:
         self,
         page: int = Query(1, description="页码"),
         limit: int = Query(20, description="每页返回多少条记录，用于控制每页显示数量"),
+        cursor: str | None = Query(
+            None, description="游标分页：上一页返回的 next_cursor，第一页传空字符串"
+        ),
+        with_total: bool = Query(False, description="游标分页时是否返回总数"),
         industry_id: int | None = Query(None, description="行业ID"),
         record_date_start: str | None = Query(
             None, alias="record_date[start]", description="记录日期开始"
@@ -108,6 +112,9 @@ class QuantIndustryLogController:
         支持的查询参数：
         - page: 页码，从1开始（默认1）
         - limit: 每页返回的记录数量（默认20）
+        - cursor: 游标分页，传入上一页返回的 next_cursor（第一页传空字符串），
+          传入后忽略 page，翻页代价与第一页相同
+        - with_total: 游标分页时是否返回总数（默认不返回，避免 COUNT 查询）
         - industry_id: 行业ID，精确匹配
         - record_date[start]: 记录日期范围查询的开始日期（格式：YYYY-MM-DD）
         - record_date[end]: 记录日期范围查询的结束日期（格式：YYYY-MM-DD）
@@ -145,6 +152,8 @@ class QuantIndustryLogController:
             {
                 "page": page,
                 "limit": limit,
+                "cursor": cursor,
+                "with_total": with_total,
                 "industry_id": industry_id,
                 "record_date_start": record_date_start,
                 "record_date_end": record_date_end,
@@ -34,6 +34,10 @@ class QuantStockController:
         self,
         page: int = Query(1, description="页码"),
         limit: int = Query(20, description="每页返回多少条记录，用于控制每页显示数量"),
+        cursor: str | None = Query(
+            None, description="游标分页：上一页返回的 next_cursor，第一页传空字符串"
+        ),
+        with_total: bool = Query(False, description="游标分页时是否返回总数"),
         concept_id: int | None = Query(None, description="概念id"),
         stock_code: str | None = Query(None, description="股票代码"),
         stock_name: str | None = Query(None, description="股票名称"),
@@ -223,6 +227,9 @@ class QuantStockController:
         支持的查询参数：
         - page: 页码，从1开始（默认1）
         - limit: 每页返回的记录数量（默认20）
+        - cursor: 游标分页，传入上一页返回的 next_cursor（第一页传空字符串），
+          传入后忽略 page，翻页代价与第一页相同
+        - with_total: 游标分页时是否返回总数（默认不返回，避免 COUNT 查询）
         - stock_code: 股票代码，支持模糊匹配
         - stock_name: 股票名称，支持模糊匹配
         - market: 市场类型，精确匹配
@@ -271,6 +278,8 @@ class QuantStockController:
             {
                 "page": page,
                 "limit": limit,
+                "cursor": cursor,
+                "with_total": with_total,
                 "stock_code": stock_code,
                 "stock_name": stock_name,
                 "market": market,
@@ -6,7 +6,7 @@
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Numeric, String, text
 from sqlalchemy.dialects.mysql import INTEGER
 from sqlmodel import Field
 
@@ -226,6 +226,12 @@ class QuantConceptLog(BaseTableModel, table=True):
         default=None,
     )
 
+    # 索引
+    __table_args__ = (
+        # 默认排序 (record_date 倒序, id 正序) 的分页索引，与排序方向一致以便游标分页范围扫描
+        Index("concept_log_date_id", text("record_date DESC"), "id"),
+    )
+
     class Config:
         """Pydantic配置"""
 
@@ -6,7 +6,7 @@
 
 from datetime import date, datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Numeric, String
 from sqlalchemy.dialects.mysql import INTEGER
 from sqlmodel import Field
 
@@ -230,6 +230,12 @@ class QuantIndustryLog(BaseTableModel, table=True):
         default=None,
     )
 
+    # 索引
+    __table_args__ = (
+        # 默认排序 (record_date 倒序, id 倒序) 的分页索引，供游标分页范围扫描
+        Index("industry_log_date_id", "record_date", "id"),
+    )
+
     class Config:
         """Pydantic配置"""
 
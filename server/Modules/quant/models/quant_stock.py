@@ -8,7 +8,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, SmallInteger, String
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, SmallInteger, String
 from sqlalchemy.dialects.mysql import DECIMAL, INTEGER
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship
@@ -369,6 +369,19 @@ class QuantStock(BaseTableModel, table=True):
     # 多对一：股票 → 行业
     industry: Mapped["QuantIndustry"] = Relationship(back_populates="stocks")
 
+    # 索引
+    __table_args__ = (
+        # 股票名称全文索引（ngram 解析器支持中文，用于 QuantStockService 的名称搜索）
+        Index(
+            "ft_stock_name",
+            "stock_name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+        # 按总市值排序的分页索引（id 作为同值记录的决胜字段，供游标分页范围扫描）
+        Index("stock_market_cap_id", "total_market_cap", "id"),
+    )
+
     class Config:
         """Pydantic配置"""
 
@@ -6,12 +6,10 @@ from typing import Any
 
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from fastapi_pagination.ext.sqlalchemy import paginate
 from sqlmodel import select
 
 from Modules.common.libs.database.sql.session import get_async_session
-from Modules.common.libs.responses.response import success
-from Modules.common.libs.validation.pagination_validator import CustomParams
+from Modules.common.libs.responses.response import error, success
 from Modules.common.services.base_service import BaseService
 from Modules.quant.models.quant_concept_log import QuantConceptLog
 
@@ -30,6 +28,9 @@ class QuantConceptLogService(BaseService):
         支持的筛选条件：
         - page: 页码，从1开始（默认1）
         - limit: 每页返回的记录数量（默认20）
+        - cursor: 游标分页，传入上一页返回的 next_cursor（第一页传空字符串），
+          传入后忽略 page，返回 items / next_cursor / has_more / size
+        - with_total: 游标分页时是否返回总数 total（额外执行一次 COUNT 查询）
         - concept_id: 概念ID，精确匹配
         - record_date: 记录日期，区间匹配
         - name: 概念名称，支持模糊匹配
@@ -62,6 +63,7 @@ class QuantConceptLogService(BaseService):
         """
         page = data.get("page", 1)
         size = data.get("limit", 20)
+        cursor = data.get("cursor")
 
         # 设置文本搜索字段
         data["text_fields"] = ["name", "code", "description", "leading_stock"]
@@ -92,7 +94,7 @@ class QuantConceptLogService(BaseService):
                 float(data["total_market_cap_end"]) * 100000000
             )
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询
             query = select(QuantConceptLog)
 
@@ -103,11 +105,25 @@ class QuantConceptLogService(BaseService):
             sort_param = data.get("sort")
             if not sort_param:
                 sort_param = {"record_date": "desc", "id": "asc"}
-            query = await self.apply_sorting(query, QuantConceptLog, sort_param)
-
-            page_data = await paginate(
-                session, query, CustomParams(page=page, size=size)
-            )
+            if cursor is not None:
+                # 游标分页：不使用 OFFSET，默认不统计总数
+                try:
+                    page_data = await self.cursor_paginate(
+                        session,
+                        query,
+                        QuantConceptLog,
+                        sort_param,
+                        cursor=cursor,
+                        size=size,
+                        with_total=bool(data.get("with_total")),
+                    )
+                except ValueError as e:
+                    return error(str(e))
+            else:
+                query = await self.apply_sorting(query, QuantConceptLog, sort_param)
+                page_data, total_exact = await self.paginate_with_count(
+                    session, query, QuantConceptLog, page, size
+                )
             items = []
             for log in page_data.items:
                 d = log.__dict__.copy()
@@ -138,6 +154,8 @@ class QuantConceptLogService(BaseService):
                     )
                 items.append(d)
 
+            if cursor is not None:
+                return success(jsonable_encoder(page_data.to_dict(items)))
             return success(
                 jsonable_encoder(
                     {
@@ -146,6 +164,7 @@ class QuantConceptLogService(BaseService):
                         "page": page_data.page,
                         "size": page_data.size,
                         "pages": page_data.pages,
+                        "total_exact": total_exact,
                     }
                 )
             )
@@ -11,6 +11,7 @@ from fastapi_pagination.ext.sqlalchemy import paginate
 from loguru import logger
 from sqlmodel import delete, select
 
+from Modules.common.libs.cache import cached
 from Modules.common.libs.database.sql.session import (
     get_async_session,
     get_sync_session,
@@ -29,6 +30,9 @@ from Modules.quant.services.quant_data_fetch_service import QuantDataFetchServic
 class QuantConceptService(BaseService):
     """概念业务服务 - 负责概念相关的业务逻辑"""
 
+    # 概念增删改后失效概念列表缓存
+    cache_tags = ("quant_concept",)
+
     def __init__(self):
         """初始化概念服务"""
         super().__init__()
@@ -100,7 +104,7 @@ class QuantConceptService(BaseService):
                 float(data["total_market_cap_end"]) * 100000000
             )
 
-        async with get_async_session() as session:
+        async with get_async_session(query_cache=True, readonly=True) as session:
             # 构建基础查询
             query = select(QuantConcept)
 
@@ -412,61 +416,33 @@ class QuantConceptService(BaseService):
                 }
                 concept_list.append(concept_data)
 
-            # 批量插入或更新数据库
+            # 批量插入或更新数据库（按代码去重，同一代码以最后一条为准）
+            rows = {
+                concept_data["code"]: {**concept_data, "status": 1}
+                for concept_data in concept_list
+            }
             async with get_async_session() as session:
-                added_count = 0
-                updated_count = 0
-
-                for concept_data in concept_list:
-                    concept_code = concept_data["code"]
-
-                    # 检查是否存在
-                    existing = await session.execute(
-                        select(QuantConcept).where(QuantConcept.code == concept_code)
-                    )
-                    existing_concept = existing.scalar_one_or_none()
-
-                    if existing_concept:
-                        # 更新
-                        existing_concept.name = concept_data["name"]
-                        existing_concept.sort = concept_data["sort"]
-                        existing_concept.latest_price = concept_data["latest_price"]
-                        existing_concept.change_amount = concept_data["change_amount"]
-                        existing_concept.change_percent = concept_data["change_percent"]
-                        existing_concept.total_market_cap = concept_data[
-                            "total_market_cap"
-                        ]
-                        existing_concept.turnover_rate = concept_data["turnover_rate"]
-                        existing_concept.up_count = concept_data["up_count"]
-                        existing_concept.down_count = concept_data["down_count"]
-                        existing_concept.leading_stock = concept_data["leading_stock"]
-                        existing_concept.leading_stock_change = concept_data[
-                            "leading_stock_change"
-                        ]
-                        existing_concept.updated_at = now()
-                        updated_count += 1
-                    else:
-                        # 插入
-                        concept = QuantConcept(
-                            code=concept_data["code"],
-                            name=concept_data["name"],
-                            sort=concept_data["sort"],
-                            latest_price=concept_data["latest_price"],
-                            change_amount=concept_data["change_amount"],
-                            change_percent=concept_data["change_percent"],
-                            total_market_cap=concept_data["total_market_cap"],
-                            turnover_rate=concept_data["turnover_rate"],
-                            up_count=concept_data["up_count"],
-                            down_count=concept_data["down_count"],
-                            leading_stock=concept_data["leading_stock"],
-                            leading_stock_change=concept_data["leading_stock_change"],
-                            status=1,
-                            created_at=now(),
-                        )
-                        session.add(concept)
-                        added_count += 1
-
+                added_count, updated_count = await self.bulk_upsert(
+                    session,
+                    QuantConcept,
+                    list(rows.values()),
+                    conflict_keys=["code"],
+                    update_fields=[
+                        "name",
+                        "sort",
+                        "latest_price",
+                        "change_amount",
+                        "change_percent",
+                        "total_market_cap",
+                        "turnover_rate",
+                        "up_count",
+                        "down_count",
+                        "leading_stock",
+                        "leading_stock_change",
+                    ],
+                )
                 await session.commit()
+                await self.invalidate_cache_tags()
 
             # 记录日志（在主事务提交后）
             logs_created_count = 0
@@ -611,17 +587,24 @@ class QuantConceptService(BaseService):
         if data is None:
             data = {}
 
+        return success(
+            await self._simple_list_items(data.get("status"), data.get("sort"))
+        )
+
+    @cached(ttl=3600, tags=["quant_concept"])
+    async def _simple_list_items(
+        self, status: int | None = None, sort_param: Any = None
+    ) -> list[dict[str, Any]]:
+        """查询概念简单列表（带缓存）"""
         async with get_async_session() as session:
             # 构建基础查询，只查询 id 和 name 字段
             query = select(QuantConcept.id, QuantConcept.name)
 
             # 应用状态筛选
-            status = data.get("status")
             if status is not None:
                 query = query.where(QuantConcept.status == status)
 
             # 应用排序（默认按 id 升序）
-            sort_param = data.get("sort")
             if sort_param:
                 query = await self.apply_sorting(query, QuantConcept, sort_param)
             else:
@@ -632,12 +615,10 @@ class QuantConceptService(BaseService):
             concepts = result.mappings().all()
 
             # 转换为列表格式
-            items = [
+            return [
                 {"id": concept["id"], "name": concept["name"]} for concept in concepts
             ]
 
-            return success(items)
-
     def sync_single_concept_relation_sync(
         self, concept_id: int, concept_code: str
     ) -> dict:
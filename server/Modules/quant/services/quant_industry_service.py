@@ -99,7 +99,7 @@ class QuantIndustryService(BaseService):
                 float(data["total_market_cap_end"]) * 100000000
             )
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询
             query = select(QuantIndustry)
 
@@ -411,62 +411,31 @@ class QuantIndustryService(BaseService):
                 }
                 industry_list.append(industry_data)
 
-            # 批量插入或更新数据库
+            # 批量插入或更新数据库（按代码去重，同一代码以最后一条为准）
+            rows = {
+                industry_data["code"]: {**industry_data, "status": 1}
+                for industry_data in industry_list
+            }
             async with get_async_session() as session:
-                added_count = 0
-                updated_count = 0
-
-                for industry_data in industry_list:
-                    industry_code = industry_data["code"]
-
-                    # 检查是否存在
-                    existing = await session.execute(
-                        select(QuantIndustry).where(QuantIndustry.code == industry_code)
-                    )
-                    existing_industry = existing.scalar_one_or_none()
-
-                    if existing_industry:
-                        # 更新
-                        existing_industry.name = industry_data["name"]
-                        existing_industry.sort = industry_data["sort"]
-                        existing_industry.latest_price = industry_data["latest_price"]
-                        existing_industry.change_amount = industry_data["change_amount"]
-                        existing_industry.change_percent = industry_data[
-                            "change_percent"
-                        ]
-                        existing_industry.total_market_cap = industry_data[
-                            "total_market_cap"
-                        ]
-                        existing_industry.turnover_rate = industry_data["turnover_rate"]
-                        existing_industry.up_count = industry_data["up_count"]
-                        existing_industry.down_count = industry_data["down_count"]
-                        existing_industry.leading_stock = industry_data["leading_stock"]
-                        existing_industry.leading_stock_change = industry_data[
-                            "leading_stock_change"
-                        ]
-                        existing_industry.updated_at = now()
-                        updated_count += 1
-                    else:
-                        # 插入
-                        industry = QuantIndustry(
-                            code=industry_data["code"],
-                            name=industry_data["name"],
-                            sort=industry_data["sort"],
-                            latest_price=industry_data["latest_price"],
-                            change_amount=industry_data["change_amount"],
-                            change_percent=industry_data["change_percent"],
-                            total_market_cap=industry_data["total_market_cap"],
-                            turnover_rate=industry_data["turnover_rate"],
-                            up_count=industry_data["up_count"],
-                            down_count=industry_data["down_count"],
-                            leading_stock=industry_data["leading_stock"],
-                            leading_stock_change=industry_data["leading_stock_change"],
-                            status=1,
-                            created_at=now(),
-                        )
-                        session.add(industry)
-                        added_count += 1
-
+                added_count, updated_count = await self.bulk_upsert(
+                    session,
+                    QuantIndustry,
+                    list(rows.values()),
+                    conflict_keys=["code"],
+                    update_fields=[
+                        "name",
+                        "sort",
+                        "latest_price",
+                        "change_amount",
+                        "change_percent",
+                        "total_market_cap",
+                        "turnover_rate",
+                        "up_count",
+                        "down_count",
+                        "leading_stock",
+                        "leading_stock_change",
+                    ],
+                )
                 await session.commit()
 
             # 记录日志（在主事务提交后）
@@ -609,7 +578,7 @@ class QuantIndustryService(BaseService):
         if data is None:
             data = {}
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询，只查询 id 和 name 字段
             query = select(QuantIndustry.id, QuantIndustry.name)
 
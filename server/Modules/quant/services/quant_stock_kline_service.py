@@ -2,6 +2,7 @@
 股票K线数据业务服务 - 负责股票K线数据同步相关的业务逻辑
 """
 
+import asyncio
 from datetime import timedelta
 
 from fastapi.responses import JSONResponse
@@ -9,6 +10,7 @@ from loguru import logger
 from sqlmodel import select
 
 from Modules.common.libs.database.sharding import (
+    AsyncShardingManager,
     ShardingManager,
     TimeBasedShardingStrategy,
 )
@@ -37,6 +39,13 @@ class QuantStockKlineService(BaseService):
                 "trade_date", granularity="year"
             ),
         )
+        # 异步管理器：用于异步方法（并发查询分表，不阻塞事件循环）
+        self.kline_sharding_manager = AsyncShardingManager(
+            model=QuantStockKline1d,
+            sharding_strategy=TimeBasedShardingStrategy(
+                "trade_date", granularity="year"
+            ),
+        )
 
     async def sync_kline_1d(self) -> JSONResponse:
         """
@@ -177,8 +186,8 @@ class QuantStockKlineService(BaseService):
                 f"[股票K线同步-查询最新记录-异步] 股票代码: {stock_code}, 股票ID: {stock_id}, 查询范围: {thirty_years_ago_date} - {current_date_obj}"
             )
 
-            # 跨表查询最新记录（使用同步版本）
-            latest_records = self.kline_sharding_manager_sync.query_multi_tables(
+            # 跨表查询最新记录（异步并发查询）
+            latest_records = await self.kline_sharding_manager.query_multi_tables_async(
                 sharding_key_range=(thirty_years_ago_date, current_date_obj),
                 conditions={"stock_id": stock_id},
                 limit=1,
@@ -281,14 +290,19 @@ class QuantStockKlineService(BaseService):
             )
 
             # 批量插入数据（使用ON DUPLICATE KEY UPDATE自动处理重复）
-            success_count = self.kline_sharding_manager_sync.batch_insert(
-                data_list, on_duplicate="UPDATE"
+            # 写入使用同步引擎，在线程中执行，避免阻塞事件循环
+            stats = await asyncio.to_thread(
+                self.kline_sharding_manager_sync.batch_write,
+                data_list,
+                on_duplicate="UPDATE",
             )
+            success_count = stats.rows
 
             logger.info(
                 f"[股票K线同步-完成-异步] 股票代码: {stock_code}, "
                 f"共 {len(df)} 条记录，"
-                f"成功处理 {success_count} 条"
+                f"成功处理 {success_count} 条，"
+                f"耗时 {stats.elapsed:.3f}s（{stats.rows_per_second:.0f} 行/秒）"
             )
 
             return {
@@ -449,14 +463,16 @@ class QuantStockKlineService(BaseService):
             )
 
             # 批量插入数据（使用ON DUPLICATE KEY UPDATE自动处理重复）
-            success_count = self.kline_sharding_manager_sync.batch_insert(
+            stats = self.kline_sharding_manager_sync.batch_write(
                 data_list, on_duplicate="UPDATE"
             )
+            success_count = stats.rows
 
             logger.info(
                 f"[股票K线同步-完成-同步] 股票代码: {stock_code}, "
                 f"共 {len(df)} 条记录，"
-                f"成功处理 {success_count} 条"
+                f"成功处理 {success_count} 条，"
+                f"耗时 {stats.elapsed:.3f}s（{stats.rows_per_second:.0f} 行/秒）"
             )
 
             return {
@@ -14,7 +14,6 @@ from sqlmodel import select
 
 from Modules.common.libs.database.sql.session import get_async_session
 from Modules.common.libs.responses.response import error, success
-from Modules.common.libs.time.utils import now
 from Modules.common.libs.validation.pagination_validator import CustomParams
 from Modules.common.services.base_service import BaseService
 from Modules.quant.models.quant_concept import QuantConcept
@@ -26,6 +25,10 @@ from Modules.quant.services.quant_data_fetch_service import QuantDataFetchServic
 class QuantStockService(BaseService):
     """股票业务服务 - 负责股票相关的业务逻辑"""
 
+    # 股票名称使用全文搜索，股票代码按前缀匹配（使用唯一索引）
+    fulltext_fields = ("stock_name",)
+    prefix_fields = ("stock_code",)
+
     def __init__(self):
         """初始化股票服务"""
         super().__init__()
@@ -151,6 +154,9 @@ class QuantStockService(BaseService):
         支持的筛选条件：
         - page: 页码，从1开始（默认1）
         - limit: 每页返回的记录数量（默认20）
+        - cursor: 游标分页，传入上一页返回的 next_cursor（第一页传空字符串），
+          传入后忽略 page，返回 items / next_cursor / has_more / size
+        - with_total: 游标分页时是否返回总数 total（额外执行一次 COUNT 查询）
         - concept_id: 概念ID，精确匹配，筛选属于该概念的股票
         - stock_code: 股票代码，支持模糊匹配
         - stock_name: 股票名称，支持模糊匹配
@@ -204,6 +210,7 @@ class QuantStockService(BaseService):
         """
         page = data.get("page", 1)
         size = data.get("limit", 20)
+        cursor = data.get("cursor")
 
         # 转换单位：将搜索参数从显示单位（亿元/万股）转换回数据库单位（元/股）
         if data.get("total_market_cap_start") is not None:
@@ -315,7 +322,7 @@ class QuantStockService(BaseService):
             "change_ytd",
         ]
 
-        async with get_async_session() as session:
+        async with get_async_session(readonly=True) as session:
             # 构建基础查询
             query = select(QuantStock)
 
@@ -347,11 +354,25 @@ class QuantStockService(BaseService):
             sort_param = data.get("sort")
             if not sort_param:
                 sort_param = {"total_market_cap": "desc"}
-            query = await self.apply_sorting(query, QuantStock, sort_param)
-
-            page_data = await paginate(
-                session, query, CustomParams(page=page, size=size)
-            )
+            if cursor is not None:
+                # 游标分页：不使用 OFFSET，默认不统计总数
+                try:
+                    page_data = await self.cursor_paginate(
+                        session,
+                        query,
+                        QuantStock,
+                        sort_param,
+                        cursor=cursor,
+                        size=size,
+                        with_total=bool(data.get("with_total")),
+                    )
+                except ValueError as e:
+                    return error(str(e))
+            else:
+                query = await self.apply_sorting(query, QuantStock, sort_param)
+                page_data = await paginate(
+                    session, query, CustomParams(page=page, size=size)
+                )
             items = []
             for stock in page_data.items:
                 d = stock.__dict__.copy()
@@ -423,6 +444,8 @@ class QuantStockService(BaseService):
                     d["change_ytd"] = str(d["change_ytd"])
                 items.append(d)
 
+            if cursor is not None:
+                return success(jsonable_encoder(page_data.to_dict(items)))
             return success(
                 jsonable_encoder(
                     {
@@ -1037,161 +1060,83 @@ class QuantStockService(BaseService):
 
             logger.info(f"处理后得到 {len(stock_list)} 条有效股票数据")
 
-            # 批量插入或更新数据库
-            async with get_async_session() as session:
-                added_count = 0
-                updated_count = 0
-                error_count = 0
-                error_details = []
-
-                for stock_data in stock_list:
-                    try:
-                        stock_code = stock_data.get("code")
-
-                        # 清理无效值
-                        cleaned_data = self._clean_nan_values(stock_data)
-
-                        # 安全地转换 Decimal 类型
-                        for key in [
-                            "latest_price",
-                            "open_price",
-                            "close_price",
-                            "high_price",
-                            "low_price",
-                            "change_percent",
-                            "change_amount",
-                            "change_speed",
-                            "volume",
-                            "amount",
-                            "volume_ratio",
-                            "turnover_rate",
-                            "amplitude",
-                            "change_5min",
-                            "change_60day",
-                            "change_ytd",
-                            "pe_ratio",
-                            "pb_ratio",
-                            "total_market_cap",
-                            "circulating_market_cap",
-                        ]:
-                            if key in cleaned_data:
-                                cleaned_data[key] = self._safe_decimal_convert(
-                                    cleaned_data[key]
-                                )
-
-                        # 检查是否存在
-                        existing = await session.execute(
-                            select(QuantStock).where(
-                                QuantStock.stock_code == stock_code
-                            )
-                        )
-                        existing_stock = existing.scalar_one_or_none()
-
-                        if existing_stock:
-                            # 更新基础信息
-                            existing_stock.stock_name = cleaned_data.get("name")
-                            existing_stock.stock_type = cleaned_data.get("stock_type")
-                            existing_stock.exchange = cleaned_data.get("exchange")
-                            # 状态字段
-                            existing_stock.trade_status = cleaned_data.get(
-                                "trade_status"
-                            )
-                            existing_stock.is_st = cleaned_data.get("is_st")
-                            # 价格行情字段
-                            existing_stock.latest_price = cleaned_data.get(
-                                "latest_price"
-                            )
-                            existing_stock.open_price = cleaned_data.get("open_price")
-                            existing_stock.close_price = cleaned_data.get("close_price")
-                            existing_stock.high_price = cleaned_data.get("high_price")
-                            existing_stock.low_price = cleaned_data.get("low_price")
-                            existing_stock.change_percent = cleaned_data.get(
-                                "change_percent"
-                            )
-                            existing_stock.change_amount = cleaned_data.get(
-                                "change_amount"
-                            )
-                            existing_stock.change_speed = cleaned_data.get(
-                                "change_speed"
-                            )
-                            # 交易指标字段
-                            existing_stock.volume = cleaned_data.get("volume")
-                            existing_stock.amount = cleaned_data.get("amount")
-                            existing_stock.volume_ratio = cleaned_data.get(
-                                "volume_ratio"
-                            )
-                            existing_stock.turnover_rate = cleaned_data.get(
-                                "turnover_rate"
-                            )
-                            existing_stock.amplitude = cleaned_data.get("amplitude")
-                            existing_stock.change_5min = cleaned_data.get("change_5min")
-                            existing_stock.change_60day = cleaned_data.get(
-                                "change_60day"
-                            )
-                            existing_stock.change_ytd = cleaned_data.get("change_ytd")
-                            # 财务与估值字段
-                            existing_stock.pe_ratio = cleaned_data.get("pe_ratio")
-                            existing_stock.pb_ratio = cleaned_data.get("pb_ratio")
-                            existing_stock.total_market_cap = cleaned_data.get(
-                                "total_market_cap"
-                            )
-                            existing_stock.circulating_market_cap = cleaned_data.get(
-                                "circulating_market_cap"
-                            )
-                            existing_stock.updated_at = now()
-                            updated_count += 1
-                        else:
-                            # 插入完整信息
-                            stock = QuantStock(
-                                stock_code=cleaned_data["code"],
-                                stock_name=cleaned_data["name"],
-                                market=cleaned_data["market"],
-                                exchange=cleaned_data["exchange"],
-                                stock_type=cleaned_data["stock_type"],
-                                # 状态字段
-                                list_status=1,
-                                trade_status=cleaned_data.get("trade_status"),
-                                is_st=cleaned_data.get("is_st"),
-                                status=1,
-                                # 价格行情字段
-                                latest_price=cleaned_data.get("latest_price"),
-                                open_price=cleaned_data.get("open_price"),
-                                close_price=cleaned_data.get("close_price"),
-                                high_price=cleaned_data.get("high_price"),
-                                low_price=cleaned_data.get("low_price"),
-                                change_percent=cleaned_data.get("change_percent"),
-                                change_amount=cleaned_data.get("change_amount"),
-                                change_speed=cleaned_data.get("change_speed"),
-                                # 交易指标字段
-                                volume=cleaned_data.get("volume"),
-                                amount=cleaned_data.get("amount"),
-                                volume_ratio=cleaned_data.get("volume_ratio"),
-                                turnover_rate=cleaned_data.get("turnover_rate"),
-                                amplitude=cleaned_data.get("amplitude"),
-                                change_5min=cleaned_data.get("change_5min"),
-                                change_60day=cleaned_data.get("change_60day"),
-                                change_ytd=cleaned_data.get("change_ytd"),
-                                # 财务与估值字段
-                                pe_ratio=cleaned_data.get("pe_ratio"),
-                                pb_ratio=cleaned_data.get("pb_ratio"),
-                                total_market_cap=cleaned_data.get("total_market_cap"),
-                                circulating_market_cap=cleaned_data.get(
-                                    "circulating_market_cap"
-                                ),
-                                created_at=now(),
+            # 清理数据（按股票代码去重，同一代码以最后一条为准）
+            decimal_fields = [
+                "latest_price",
+                "open_price",
+                "close_price",
+                "high_price",
+                "low_price",
+                "change_percent",
+                "change_amount",
+                "change_speed",
+                "volume",
+                "amount",
+                "volume_ratio",
+                "turnover_rate",
+                "amplitude",
+                "change_5min",
+                "change_60day",
+                "change_ytd",
+                "pe_ratio",
+                "pb_ratio",
+                "total_market_cap",
+                "circulating_market_cap",
+            ]
+            rows: dict[str, dict[str, Any]] = {}
+            error_count = 0
+            error_details = []
+
+            for stock_data in stock_list:
+                try:
+                    # 清理无效值
+                    cleaned_data = self._clean_nan_values(stock_data)
+
+                    # 安全地转换 Decimal 类型
+                    for key in decimal_fields:
+                        if key in cleaned_data:
+                            cleaned_data[key] = self._safe_decimal_convert(
+                                cleaned_data[key]
                             )
-                            session.add(stock)
-                            added_count += 1
-
-                    except Exception as e:
-                        error_count += 1
-                        error_msg = (
-                            f"代码 {stock_data.get('code', 'unknown')}: {str(e)}"
-                        )
-                        error_details.append(error_msg)
-                        logger.error(f"处理股票数据失败: {error_msg}\n{format_exc()}")
-                        # 继续处理下一条数据，不中断整个流程
 
+                    rows[cleaned_data["code"]] = {
+                        "stock_code": cleaned_data["code"],
+                        "stock_name": cleaned_data["name"],
+                        "market": cleaned_data["market"],
+                        "exchange": cleaned_data["exchange"],
+                        "stock_type": cleaned_data["stock_type"],
+                        # 状态字段
+                        "list_status": 1,
+                        "trade_status": cleaned_data.get("trade_status"),
+                        "is_st": cleaned_data.get("is_st"),
+                        "status": 1,
+                        # 价格行情、交易指标、财务与估值字段
+                        **{key: cleaned_data.get(key) for key in decimal_fields},
+                    }
+
+                except Exception as e:
+                    error_count += 1
+                    error_msg = f"代码 {stock_data.get('code', 'unknown')}: {str(e)}"
+                    error_details.append(error_msg)
+                    logger.error(f"处理股票数据失败: {error_msg}\n{format_exc()}")
+                    # 继续处理下一条数据，不中断整个流程
+
+            # 批量插入或更新数据库（已存在的股票只更新基础信息、状态和行情字段）
+            async with get_async_session() as session:
+                added_count, updated_count = await self.bulk_upsert(
+                    session,
+                    QuantStock,
+                    list(rows.values()),
+                    conflict_keys=["stock_code"],
+                    update_fields=[
+                        "stock_name",
+                        "stock_type",
+                        "exchange",
+                        "trade_status",
+                        "is_st",
+                        *decimal_fields,
+                    ],
+                )
                 await session.commit()
 
             # 构建结果消息
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+性能基准测试工具
+
+对缓存等基础组件进行微基准测试，对比优化前后的网络往返次数和耗时。
+需要可用的 Redis（使用 .env 中的配置）。
+
+使用示例:
+    python -m commands.benchmark cache-batch
+    python -m commands.benchmark cache-batch --keys 1000 --rounds 5
+    python -m commands.benchmark cache-codec --rows 2000
+"""
+
+import argparse
+import datetime
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from redis.client import Pipeline
+
+    from Modules.common.libs.cache import CacheSerializer, get_sync_cache_service
+    from Modules.common.libs.config.registry import ConfigRegistry
+    from Modules.common.libs.database.redis import init_redis_clients
+except ImportError as e:
+    print(f"导入错误: {e}")
+    print("请确保已安装所有依赖包，并且在项目根目录下运行此脚本")
+    sys.exit(1)
+
+
+class RoundTripCounter:
+    """网络往返计数器：普通命令每条计一次，管道执行整体计一次"""
+
+    def __init__(self, client):
+        # 熔断器包装的客户端(GuardedRedis)把命令转发给原始客户端，
+        # 需要在原始客户端上统计，否则包装层之下的命令不会被计数
+        self.client = getattr(client, "client", client)
+        self.count = 0
+
+    @contextmanager
+    def counting(self):
+        """在上下文中统计往返次数"""
+        self.count = 0
+        original_execute_command = self.client.execute_command
+        original_pipeline_execute = Pipeline.execute
+
+        def execute_command(*args, **kwargs):
+            self.count += 1
+            return original_execute_command(*args, **kwargs)
+
+        def pipeline_execute(pipe, *args, **kwargs):
+            self.count += 1
+            return original_pipeline_execute(pipe, *args, **kwargs)
+
+        self.client.execute_command = execute_command
+        Pipeline.execute = pipeline_execute
+        try:
+            yield self
+        finally:
+            del self.client.execute_command
+            Pipeline.execute = original_pipeline_execute
+
+
+class CacheBatchBenchmark:
+    """缓存批量操作基准测试（逐条命令 vs 管道）"""
+
+    def __init__(self, key_count: int, rounds: int):
+        self.key_count = key_count
+        self.rounds = rounds
+        self.cache = get_sync_cache_service()
+        self.client = self.cache._get_redis_client()
+        self.counter = RoundTripCounter(self.client)
+        self.keys = [f"benchmark:batch:{i}" for i in range(key_count)]
+        self.mapping = {
+            key: {"index": i, "name": key} for i, key in enumerate(self.keys)
+        }
+
+    # ==================== 优化前（逐条命令） ====================
+
+    def legacy_set_many(self) -> None:
+        """逐条 SETEX"""
+        for key, value in self.mapping.items():
+            self.client.setex(
+                self.cache._build_key(key), 60, self.cache._serialize(value)
+            )
+
+    def legacy_setnx(self) -> None:
+        """SETNX + EXPIRE 两条命令"""
+        for key in self.keys:
+            full_key = self.cache._build_key(key)
+            if self.client.setnx(full_key, "1"):
+                self.client.expire(full_key, 60)
+
+    def legacy_delete_many(self) -> None:
+        """单条 DEL（清理）"""
+        self.client.delete(*[self.cache._build_key(key) for key in self.keys])
+
+    # ==================== 优化后（管道） ====================
+
+    def pipeline_set_many(self) -> None:
+        """管道 SETEX"""
+        self.cache.set_many(self.mapping, ttl=60)
+
+    def pipeline_setnx(self) -> None:
+        """管道 SET NX EX"""
+        with self.cache.pipeline() as pipe:
+            for key in self.keys:
+                pipe.setnx(key, "1", ttl=60)
+
+    def pipeline_delete_many(self) -> None:
+        """管道分批 DEL"""
+        self.cache.delete_many(self.keys)
+
+    # ==================== 执行 ====================
+
+    def _measure(
+        self, func: Callable[[], None], cleanup: Callable[[], None] | None = None
+    ) -> tuple[int, float]:
+        """多轮执行，返回往返次数和耗时中位数（毫秒）"""
+        durations = []
+        round_trips = 0
+        for _ in range(self.rounds):
+            if cleanup:
+                cleanup()
+            with self.counter.counting():
+                start = time.perf_counter()
+                func()
+                durations.append((time.perf_counter() - start) * 1000)
+                round_trips = self.counter.count
+        return round_trips, statistics.median(durations)
+
+    def run(self) -> None:
+        """运行所有场景并输出对比结果"""
+        scenarios = [
+            ("set_many", self.legacy_set_many, self.pipeline_set_many, None),
+            (
+                "setnx+ttl",
+                self.legacy_setnx,
+                self.pipeline_setnx,
+                self.legacy_delete_many,
+            ),
+            ("delete_many", self.legacy_delete_many, self.pipeline_delete_many, None),
+        ]
+
+        print(f"缓存批量操作基准测试 - 键数量: {self.key_count}, 轮数: {self.rounds}")
+        print(
+            f"{'场景':<14}{'优化前往返':>10}{'优化前(ms)':>12}"
+            f"{'优化后往返':>10}{'优化后(ms)':>12}{'加速比':>8}"
+        )
+        for name, before, after, cleanup in scenarios:
+            before_rt, before_ms = self._measure(before, cleanup)
+            after_rt, after_ms = self._measure(after, cleanup)
+            speedup = before_ms / after_ms if after_ms else 0
+            print(
+                f"{name:<14}{before_rt:>10}{before_ms:>12.2f}"
+                f"{after_rt:>10}{after_ms:>12.2f}{speedup:>7.1f}x"
+            )
+
+        self.legacy_delete_many()
+
+
+class CacheCodecBenchmark:
+    """缓存序列化基准测试（旧版 json 文本 vs 各编解码组合）"""
+
+    def __init__(self, rows: int, rounds: int):
+        self.rounds = rounds
+        now = datetime.datetime.now()
+        self.value = [
+            {
+                "code": f"{i:06d}",
+                "name": f"股票{i}",
+                "price": Decimal(f"{10 + i % 100}.{i % 100:02d}"),
+                "change_rate": Decimal("1.2345"),
+                "volume": i * 100,
+                "trade_date": now.date(),
+                "updated_at": now,
+            }
+            for i in range(rows)
+        ]
+
+    def _measure(self, func: Callable[[], object]) -> float:
+        """多轮执行，返回耗时中位数（毫秒）"""
+        durations = []
+        for _ in range(self.rounds):
+            start = time.perf_counter()
+            func()
+            durations.append((time.perf_counter() - start) * 1000)
+        return statistics.median(durations)
+
+    def run(self) -> None:
+        """运行所有组合并输出对比结果"""
+        print(f"缓存序列化基准测试 - 行数: {len(self.value)}, 轮数: {self.rounds}")
+        print(
+            f"{'组合':<18}{'字节数':>10}{'编码(ms)':>10}{'解码(ms)':>10}{'类型还原':>8}"
+        )
+
+        # 旧版：json.dumps 无法处理 Decimal / datetime，只能转成字符串
+        legacy = json.dumps(self.value, ensure_ascii=False, default=str)
+        print(
+            f"{'legacy-json':<18}{len(legacy.encode()):>10}"
+            f"{self._measure(lambda: json.dumps(self.value, ensure_ascii=False, default=str)):>10.2f}"
+            f"{self._measure(lambda: json.loads(legacy)):>10.2f}{'否':>8}"
+        )
+
+        for codec in ("json", "orjson", "msgpack"):
+            for compression in ("none", "zlib", "zstd", "lz4"):
+                serializer = CacheSerializer(codec=codec, compression=compression)
+                if serializer.default_codec.name != codec or (
+                    compression != "none"
+                    and (
+                        serializer.compressor is None
+                        or serializer.compressor.name != compression
+                    )
+                ):
+                    # 依赖未安装，跳过
+                    continue
+                data = serializer.dumps(self.value)
+                exact = serializer.loads(data) == self.value
+                print(
+                    f"{codec + '+' + compression:<18}{len(data):>10}"
+                    f"{self._measure(lambda s=serializer: s.dumps(self.value)):>10.2f}"
+                    f"{self._measure(lambda s=serializer, d=data: s.loads(d)):>10.2f}"
+                    f"{'是' if exact else '否':>8}"
+                )
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description="性能基准测试工具",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用示例:
+  python -m commands.benchmark cache-batch
+  python -m commands.benchmark cache-batch --keys 1000 --rounds 5
+  python -m commands.benchmark cache-codec --rows 2000
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", help="可用命令")
+
+    cache_batch = subparsers.add_parser(
+        "cache-batch", help="缓存批量操作：逐条命令 vs 管道"
+    )
+    cache_batch.add_argument("--keys", type=int, default=1000, help="键数量")
+    cache_batch.add_argument("--rounds", type=int, default=5, help="每个场景执行轮数")
+
+    cache_codec = subparsers.add_parser(
+        "cache-codec", help="缓存序列化：旧版 json vs 各编解码 / 压缩组合"
+    )
+    cache_codec.add_argument("--rows", type=int, default=2000, help="样例数据行数")
+    cache_codec.add_argument("--rounds", type=int, default=5, help="每个组合执行轮数")
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    if args.command == "cache-codec":
+        CacheCodecBenchmark(args.rows, args.rounds).run()
+        return
+
+    ConfigRegistry.load()
+    init_redis_clients()
+
+    if args.command == "cache-batch":
+        CacheBatchBenchmark(args.keys, args.rounds).run()
+
+
+if __name__ == "__main__":
+    main()
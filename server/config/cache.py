@@ -19,6 +19,9 @@ class CacheConfig(BaseConfig):
     - CACHE_CONNECTION=cache
     - CACHE_DEFAULT_TTL=3600
     - CACHE_KEY_PREFIX=
+    - CACHE_LOCAL_ENABLED=false
+    - CACHE_SERIALIZER=orjson
+    - CACHE_COMPRESSION=zlib
 
     使用示例：
         config = CacheConfig()
@@ -34,6 +37,28 @@ class CacheConfig(BaseConfig):
 
         # 键名前缀
         CACHE_KEY_PREFIX=
+
+        # 序列化与压缩
+        CACHE_SERIALIZER=orjson
+        CACHE_COMPRESSION=zlib
+        CACHE_COMPRESS_THRESHOLD=1024
+        CACHE_NAMESPACE_SERIALIZERS={"quant:": "msgpack"}
+
+        # 本地缓存（L1）
+        CACHE_LOCAL_ENABLED=true
+        CACHE_LOCAL_MAX_SIZE=10000
+        CACHE_LOCAL_TTL=60
+        CACHE_LOCAL_PREFIXES=["sys_config:", "sharding:table_exists:", "cache_tag:"]
+        CACHE_INVALIDATION_CHANNEL=cache:invalidate
+
+        # Redis 熔断与降级
+        CACHE_BREAKER_ENABLED=true
+        CACHE_BREAKER_FAILURE_THRESHOLD=5
+        CACHE_BREAKER_RECOVERY_TIMEOUT=30
+        CACHE_FALLBACK_MAX_SIZE=10000
+
+        # 读写分离（哨兵 / 集群模式）
+        CACHE_READ_FROM_REPLICAS=false
     """
 
     model_config = BaseConfig.model_config | {"env_prefix": "CACHE_"}
@@ -56,3 +81,86 @@ class CacheConfig(BaseConfig):
         default="",
         description="缓存键名前缀",
     )
+
+    scan_count: int = Field(
+        default=1000,
+        description="SCAN 遍历键时每次迭代的 COUNT 提示值，同时作为 clear 时每批 UNLINK 的键数量",
+    )
+
+    # ==================== 序列化配置 ====================
+
+    serializer: str = Field(
+        default="orjson",
+        description="默认序列化格式：json / orjson / msgpack，依赖未安装时回退为 json",
+    )
+
+    compression: str = Field(
+        default="zlib",
+        description="大值压缩算法：none / zlib / zstd / lz4，依赖未安装时回退为 zlib",
+    )
+
+    compress_threshold: int = Field(
+        default=1024,
+        description="触发压缩的最小序列化字节数",
+    )
+
+    namespace_serializers: dict[str, str] = Field(
+        default_factory=dict,
+        description='按键前缀指定序列化格式，如 {"quant:": "msgpack"}，最长前缀优先',
+    )
+
+    # ==================== 本地缓存（L1）配置 ====================
+
+    local_enabled: bool = Field(
+        default=False,
+        description="是否启用进程内本地缓存（L1），位于 Redis 之前",
+    )
+
+    local_max_size: int = Field(
+        default=10000,
+        description="本地缓存最大键数量，超出时按 LRU 淘汰",
+    )
+
+    local_ttl: int = Field(
+        default=60,
+        description="本地缓存过期时间（秒），不会超过 Redis 中的剩余过期时间",
+    )
+
+    local_prefixes: list[str] = Field(
+        default_factory=lambda: ["sys_config:", "sharding:table_exists:", "cache_tag:"],
+        description="允许进入本地缓存的键前缀，为空表示所有键",
+    )
+
+    invalidation_channel: str = Field(
+        default="cache:invalidate",
+        description="本地缓存失效消息的 Redis 发布/订阅频道",
+    )
+
+    # ==================== 熔断与降级配置 ====================
+
+    breaker_enabled: bool = Field(
+        default=True,
+        description="是否启用 Redis 熔断器，熔断期间缓存读写改用进程内降级存储",
+    )
+
+    breaker_failure_threshold: int = Field(
+        default=5,
+        description="连续失败多少次后打开熔断（仅统计连接 / 超时类错误）",
+    )
+
+    breaker_recovery_timeout: float = Field(
+        default=30,
+        description="熔断打开后的冷却时间（秒），之后放行探测命令检测 Redis 是否恢复",
+    )
+
+    fallback_max_size: int = Field(
+        default=10000,
+        description="降级存储最大键数量，超出时按 LRU 淘汰",
+    )
+
+    # ==================== 读写分离配置 ====================
+
+    read_from_replicas: bool = Field(
+        default=False,
+        description="只读操作（get / get_many / exists / ttl）是否读取从节点，需要 Redis 连接为哨兵或集群模式",
+    )
@@ -55,6 +55,7 @@ class CaptchaConfig(BaseConfig):
         CAPTCHA_DISTORTION=true
         CAPTCHA_DISTORTION_LEVEL=0.5
         CAPTCHA_EXPIRE_SECONDS=300
+        CAPTCHA_MAX_ATTEMPTS=0
         CAPTCHA_REDIS_KEY_PREFIX=captcha:
     """
 
@@ -176,6 +177,14 @@ class CaptchaConfig(BaseConfig):
         description="验证码过期时间（秒）",
     )
 
+    # 同一验证码允许的最大错误次数（0 表示不限制）
+    max_attempts: int = Field(
+        default=0,
+        ge=0,
+        le=20,
+        description="同一验证码允许的最大错误次数，超出后验证码失效，需要重新获取；0 表示不限制（默认）",
+    )
+
     # 验证码存储键前缀
     redis_key_prefix: str = Field(
         default="captcha:",
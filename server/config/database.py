@@ -34,6 +34,153 @@ class DatabaseConfig(BaseConfig):
     # 环境变量: DB_DEFAULT=mysql
     default: str = Field(default="mysql", description="默认数据库连接名称")
 
+    # ==================== ORM 查询结果缓存 ====================
+
+    # 是否启用 ORM 查询结果缓存
+    # 启用后所有会话的写入都会在提交后递增对应表的版本号（一次 Redis 往返），
+    # 通过 get_async_session(query_cache=True) 打开的会话会缓存 SELECT 结果
+    # 环境变量: DB_QUERY_CACHE_ENABLED=false
+    query_cache_enabled: bool = Field(
+        default=False, description="是否启用 ORM 查询结果缓存"
+    )
+
+    # 查询结果默认缓存时间（秒），可通过 execution_options(query_cache_ttl=...) 覆盖
+    # 环境变量: DB_QUERY_CACHE_TTL=300
+    query_cache_ttl: int = Field(default=300, description="查询结果默认缓存时间（秒）")
+
+    # 查询缓存条目的签名密钥（HMAC），所有进程需要相同；为空时使用 JWT 密钥
+    # 环境变量: DB_QUERY_CACHE_SECRET=
+    query_cache_secret: str = Field(default="", description="查询缓存条目签名密钥")
+
+    # ==================== 读写分离 ====================
+
+    # 写后读主库的时间窗口（秒）
+    # 同一请求 / 任务提交写入后，该时间内的只读会话（readonly=True）仍然读取主库，
+    # 避免刚写入的数据因为主从复制延迟读不到
+    # 环境变量: DB_READ_YOUR_WRITES_SECONDS=5
+    read_your_writes_seconds: float = Field(
+        default=5, ge=0, description="写后读主库的时间窗口（秒）"
+    )
+
+    # ==================== 请求级会话 ====================
+
+    # 是否启用请求级会话：同一请求内的 get_async_session() 共享一个连接和事务，响应发送前统一提交
+    # 需要独立事务的代码使用 get_async_session(new=True)
+    # 环境变量: DB_REQUEST_SESSION_ENABLED=true
+    request_session_enabled: bool = Field(
+        default=True, description="是否启用请求级会话"
+    )
+
+    # ==================== SQL 执行统计 ====================
+
+    # 慢查询阈值（毫秒），执行时间超过该值的语句记录 WARNING 日志（不记录参数），0 表示关闭
+    # 环境变量: DB_SLOW_QUERY_MS=500
+    slow_query_ms: float = Field(default=500, ge=0, description="慢查询阈值（毫秒）")
+
+    # N+1 检测阈值：同一请求 / 任务中相同结构的语句执行次数超过该值时记录 WARNING 日志，0 表示关闭
+    # 调试模式下响应头 X-DB-Query-Count / X-DB-Query-Time 返回请求的查询次数和总耗时（毫秒）
+    # 环境变量: DB_N_PLUS_ONE_THRESHOLD=10
+    n_plus_one_threshold: int = Field(
+        default=10, ge=0, description="N+1 检测阈值（相同语句执行次数）"
+    )
+
+    # ==================== 列表总数统计 ====================
+
+    # 分页列表总数的缓存时间（秒）：大表有筛选条件时按筛选条件缓存 COUNT 结果，
+    # 表行数估算值也在进程内缓存该时间，0 表示不缓存（每次执行 COUNT）
+    # 环境变量: DB_COUNT_CACHE_TTL=30
+    count_cache_ttl: int = Field(
+        default=30, ge=0, description="分页列表总数缓存时间（秒）"
+    )
+
+    # 大表阈值：表行数估算值（MySQL information_schema / PostgreSQL pg_class）不小于该值时，
+    # 没有筛选条件的列表使用估算值作为总数，有筛选条件时使用缓存的 COUNT 结果，0 表示总是执行 COUNT
+    # 环境变量: DB_COUNT_ESTIMATE_THRESHOLD=100000
+    count_estimate_threshold: int = Field(
+        default=100000, ge=0, description="使用估算总数的表行数阈值"
+    )
+
+    # ==================== 文本搜索 ====================
+
+    # 是否启用全文搜索：服务类 fulltext_fields 中的字段在 MySQL 上对中日韩关键词使用 ngram FULLTEXT 索引
+    # （MATCH ... AGAINST），在 SQLite 上使用进程内倒排索引；关闭时使用 LIKE '%关键词%'
+    # MySQL 需要先执行迁移创建 FULLTEXT 索引后再开启
+    # 环境变量: DB_FULLTEXT_SEARCH_ENABLED=false
+    fulltext_search_enabled: bool = Field(default=False, description="是否启用全文搜索")
+
+    # ==================== 批量写入 ====================
+
+    # 集合式批量操作（BaseService.bulk_destroy / bulk_update / bulk_upsert）每条语句处理的记录数，
+    # 批量 upsert 还会按字段数限制单条语句的参数个数
+    # 环境变量: DB_BULK_CHUNK_SIZE=1000
+    bulk_chunk_size: int = Field(
+        default=1000, ge=1, description="批量删除 / 更新 / upsert 每批记录数"
+    )
+
+    # ==================== 分表批量写入 ====================
+
+    # ShardingManager.batch_insert 每批（每个事务、每次 executemany）的最大记录数
+    # 环境变量: DB_SHARDING_BATCH_ROWS=1000
+    sharding_batch_rows: int = Field(
+        default=1000, ge=1, description="分表批量写入每批最大记录数"
+    )
+
+    # 每批数据的估算大小上限（字节），需要小于 MySQL 的 max_allowed_packet
+    # 环境变量: DB_SHARDING_BATCH_BYTES=1048576
+    sharding_batch_bytes: int = Field(
+        default=1048576, ge=1024, description="分表批量写入每批估算大小上限（字节）"
+    )
+
+    # 同时写入不同分表的线程数（每个线程使用独立连接），1 表示按表依次写入
+    # 不要超过连接池大小（pool_size + max_overflow）
+    # 环境变量: DB_SHARDING_WRITE_WORKERS=4
+    sharding_write_workers: int = Field(
+        default=4, ge=1, description="并发写入分表的线程数"
+    )
+
+    # ==================== 分表注册表 ====================
+
+    # 进程内分表注册表的有效期（秒）：判断分表是否存在时使用进程内记录，过期后一次查询出基础表的全部分表
+    # 本进程创建分表后通过 Redis 发布/订阅通知其他进程；0 表示不使用注册表，逐表查询 Redis 缓存 / 数据库
+    # 环境变量: DB_SHARDING_REGISTRY_TTL=60
+    sharding_registry_ttl: int = Field(
+        default=60, ge=0, description="分表注册表有效期（秒）"
+    )
+
+    # ==================== 分表聚合 ====================
+
+    # ShardingManager.aggregate 中已封存分表（如按年分表时往年的表）的部分聚合结果缓存时间（秒）
+    # 写入封存的分表时缓存立即失效；0 表示不缓存
+    # 环境变量: DB_SHARDING_AGGREGATE_CACHE_TTL=86400
+    sharding_aggregate_cache_ttl: int = Field(
+        default=86400, ge=0, description="封存分表聚合结果缓存时间（秒）"
+    )
+
+    # ==================== 分表异步查询 ====================
+
+    # AsyncShardingManager 跨表查询 / 统计时同时查询的表数（每张表占用一个异步连接）
+    # 不要超过异步连接池大小（pool_size + max_overflow）
+    # 环境变量: DB_SHARDING_QUERY_CONCURRENCY=8
+    sharding_query_concurrency: int = Field(
+        default=8, ge=1, description="并发查询分表的数量"
+    )
+
+    # 跨表查询 / 统计的超时时间（秒），超时后取消未完成的查询，0 表示不限制
+    # 环境变量: DB_SHARDING_QUERY_TIMEOUT=30
+    sharding_query_timeout: float = Field(
+        default=30, ge=0, description="跨表查询超时时间（秒）"
+    )
+
+    # ==================== 多连接路由 ====================
+
+    # 模块使用的连接（模块名 -> 连接名称），Modules/<模块名>/ 下的模型读写对应连接
+    # 模型声明的 __bind_key__ 优先；未配置的模块使用会话所属的连接（默认连接）
+    # 连接在首次使用时创建引擎
+    # 环境变量: DB_MODULE_CONNECTIONS={"quant": "analytics"}
+    module_connections: dict[str, str] = Field(
+        default_factory=dict, description="模块使用的连接（模块名 -> 连接名称）"
+    )
+
     # ==================== 数据库连接信息 ====================
 
     # 数据库连接配置字典
@@ -81,6 +228,12 @@ class DatabaseConfig(BaseConfig):
                 # 额外的驱动选项
                 # 可以设置各种 MySQL 特定的连接参数
                 "options": {},
+                # 只读副本列表（读写分离）
+                # 元素可以是完整 URL，或覆盖主库参数的字典（如 {"host": "10.0.0.2"}），
+                # 未覆盖的参数沿用主库配置；为空表示不启用读写分离
+                "replicas": [],
+                # 副本选择策略：round_robin（轮询）/ least_busy（借出连接最少）
+                "replica_strategy": "round_robin",
             },
         }
     )
@@ -123,6 +276,20 @@ class DatabaseConfig(BaseConfig):
                 "socket_connect_timeout": 5,
                 # 健康检查间隔（秒）
                 "health_check_interval": 30,
+                # 是否使用阻塞连接池（连接数达到上限时等待归还，而不是立即报错）
+                "blocking_pool": False,
+                # 阻塞连接池等待空闲连接的超时时间（秒）
+                "pool_timeout": 5,
+                # 部署模式：standalone（单节点）/ sentinel（哨兵）/ cluster（集群）
+                "mode": "standalone",
+                # 哨兵节点列表（mode=sentinel），格式 ["host:port", ...]
+                "sentinels": [],
+                # 哨兵监控的主节点名称（mode=sentinel）
+                "service_name": "mymaster",
+                # 哨兵节点认证密码（mode=sentinel，为空表示哨兵无需认证）
+                "sentinel_password": None,
+                # 集群启动节点列表（mode=cluster），格式 ["host:port", ...]
+                "startup_nodes": [],
             },
             # 缓存专用 Redis 连接配置
             "cache": {
@@ -153,6 +320,20 @@ class DatabaseConfig(BaseConfig):
                 "socket_connect_timeout": 5,
                 # 健康检查间隔（秒）
                 "health_check_interval": 30,
+                # 是否使用阻塞连接池（连接数达到上限时等待归还，而不是立即报错）
+                "blocking_pool": False,
+                # 阻塞连接池等待空闲连接的超时时间（秒）
+                "pool_timeout": 5,
+                # 部署模式：standalone（单节点）/ sentinel（哨兵）/ cluster（集群）
+                "mode": "standalone",
+                # 哨兵节点列表（mode=sentinel），格式 ["host:port", ...]
+                "sentinels": [],
+                # 哨兵监控的主节点名称（mode=sentinel）
+                "service_name": "mymaster",
+                # 哨兵节点认证密码（mode=sentinel，为空表示哨兵无需认证）
+                "sentinel_password": None,
+                # 集群启动节点列表（mode=cluster），格式 ["host:port", ...]
+                "startup_nodes": [],
             },
         }
     )
@@ -0,0 +1,11 @@
+"""
+测试公共配置
+
+将项目根目录加入 Python 路径，使测试可以导入 Modules / config。
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
@@ -0,0 +1,105 @@
+"""
+集群模式下的缓存管道
+
+redis-py 的集群管道在排队时拒绝 PUBLISH 和多键 DEL，
+缓存管道需要逐键排队 DEL，并在管道执行后通过客户端单独广播失效消息。
+"""
+
+from typing import Any
+
+from redis.cluster import ClusterPipeline, RedisCluster
+
+from Modules.common.libs.cache.cache import SyncCacheService
+from Modules.common.libs.cache.decorators import tag_key
+from Modules.common.libs.cache.local_cache import LocalCache
+from Modules.common.libs.database.redis.circuit_breaker import GuardedRedis
+
+
+class FakeClusterPipeline(ClusterPipeline):
+    """使用 redis-py 集群管道的排队逻辑，执行时返回模拟结果"""
+
+    def __init__(self, client: "FakeClusterClient"):
+        super().__init__(nodes_manager=None, commands_parser=None)
+        self._client = client
+
+    def execute(self, raise_on_error: bool = True) -> list[Any]:
+        commands = [command.args for command in self._execution_strategy.command_queue]
+        self._client.executed.append(commands)
+        self.reset()
+        results = {"SETEX": True, "DEL": 1, "INCRBY": 1, "SET": True, "GET": None}
+        return [results[command[0]] for command in commands]
+
+
+class FakeClusterClient(RedisCluster):
+    """不连接集群的集群客户端，记录管道命令和广播消息"""
+
+    def __init__(self):
+        self.executed: list[list[tuple]] = []
+        self.published: list[tuple[str, str]] = []
+
+    def pipeline(self, transaction: Any = None, shard_hint: Any = None):
+        return FakeClusterPipeline(self)
+
+    def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 0
+
+
+def make_service() -> tuple[SyncCacheService, FakeClusterClient]:
+    """创建使用模拟集群客户端、启用本地缓存的缓存服务"""
+    client = FakeClusterClient()
+    service = SyncCacheService()
+    service._config_loaded = True
+    service._local_cache = LocalCache(max_size=100, default_ttl=60)
+    service._setup_clients(client, client, GuardedRedis)
+    return service, client
+
+
+def test_cluster_mode_detected():
+    service, _ = make_service()
+    assert service._cluster
+
+
+def test_set_many_publishes_after_execute():
+    service, client = make_service()
+
+    assert service.set_many({"a": 1, "b": 2}, ttl=60)
+
+    assert [command[0] for command in client.executed[0]] == ["SETEX", "SETEX"]
+    assert len(client.published) == 1
+    assert client.published[0][0] == service._invalidation_channel
+
+
+def test_delete_many_queues_one_del_per_key():
+    service, client = make_service()
+
+    assert service.delete_many(["a", "b", "c"]) == 3
+
+    assert client.executed[0] == [("DEL", "a"), ("DEL", "b"), ("DEL", "c")]
+    assert len(client.published) == 1
+
+
+def test_pipeline_delete_results_per_key():
+    service, client = make_service()
+
+    with service.pipeline() as pipe:
+        pipe.set("a", 1).delete("b", "c")
+
+    assert pipe.results == [True, 1, 1]
+    assert not any(command[0] == "PUBLISH" for command in client.executed[0])
+
+
+def test_invalidate_tags_in_cluster_mode(monkeypatch):
+    service, client = make_service()
+    monkeypatch.setattr(
+        "Modules.common.libs.cache.decorators.get_sync_cache_service",
+        lambda: service,
+    )
+    from Modules.common.libs.cache.decorators import invalidate_tags
+
+    assert invalidate_tags("user", "article")
+
+    assert client.executed[0] == [
+        ("INCRBY", tag_key("user"), 1),
+        ("INCRBY", tag_key("article"), 1),
+    ]